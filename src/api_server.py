@@ -1,16 +1,15 @@
 
 import os
 import sys
+import asyncio
 import logging
-import tempfile
-import shutil
 import json
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -19,8 +18,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.core.engine import TalentOSEngine
 from src.core.config import get_config
-from src.core.exceptions import TalentOSError, UnsupportedFormatError
-from src.plugins.document_parsers import get_parser_for_file, get_parser
+from src.core.deadline import deadline_scope, within_deadline
+from src.core.document_store import StoredDocument
+from src.core.exceptions import TalentOSError, UnsupportedFormatError, DeadlineExceededError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,8 +41,10 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize engine: {e}")
         # We don't raise here to allow the server to start, but health check will fail
     yield
-    # Cleanup if necessary
     logger.info("Shutting down...")
+    if engine is not None:
+        # Flush write-behind cache saves before the process exits
+        engine.close()
 
 app = FastAPI(
     title="TalentOS API",
@@ -61,6 +63,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Client-supplied request budget in seconds (capped by analysis.deadline.max_seconds)
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def _request_deadline(request: Request) -> float:
+    """Deadline in seconds for a request (0 = none)."""
+    settings = get_config().analysis.get("deadline") or {}
+    seconds = (settings.get("endpoints") or {}).get(request.url.path, settings.get("default_seconds", 0))
+    header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = 0
+        if requested > 0:
+            max_seconds = settings.get("max_seconds", 0)
+            seconds = min(requested, max_seconds) if max_seconds else requested
+    return seconds
+
+
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    """Run each request under its deadline (see src.core.deadline)."""
+    with deadline_scope(_request_deadline(request)):
+        return await call_next(request)
+
+
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+    logger.warning(f"Deadline exceeded ({exc.stage}): {request.url.path}")
+    return JSONResponse(status_code=504, content={"detail": str(exc), "stage": exc.stage})
+
 # --- Pydantic Models ---
 
 class AnalysisResponse(BaseModel):
@@ -84,81 +118,126 @@ def get_file_extension(filename: str) -> str:
     _, ext = os.path.splitext(filename)
     return ext.lower()
 
-async def _process_upload_request(
-    resume_file: UploadFile,
-    jd_file: Optional[UploadFile],
-    jd_text: Optional[str]
-) -> tuple[str, str]:
-    """Helper to process uploaded files and text."""
-    # 0. Process JD (Text or File)
-    final_jd_text = ""
-    
-    if jd_file:
-        # Parse JD file
-        jd_ext = get_file_extension(jd_file.filename)
-        logger.info(f"Received JD file: {jd_file.filename} ({jd_ext})")
-        
-        # Map extension to parser
-        ext_map = {
-            '.pdf': 'pdf',
-            '.docx': 'docx',
-            '.doc': 'docx',
-            '.txt': 'text',
-            '.md': 'text'
-        }
-        jd_parser_name = ext_map.get(jd_ext)
-        if not jd_parser_name:
-                raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported JD file format: {jd_ext}. Supported: PDF, DOCX, TXT, MD"
-            )
-        
-        jd_parser = get_parser(jd_parser_name)
-        jd_bytes = await jd_file.read()
-        try:
-            final_jd_text = jd_parser.parse_content(jd_bytes, jd_ext)
-        except Exception as e:
-            logger.error(f"JD Parsing error: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
-    
-    elif jd_text:
-        final_jd_text = jd_text
-    
-    if not final_jd_text or len(final_jd_text.strip()) == 0:
-            raise HTTPException(status_code=400, detail="Job Description is required (text or file)")
+def _registered_jd_text(jd_id: str) -> str:
+    """Text of a registered JD (404 if the id is unknown)."""
+    record = engine.get_jd(jd_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown jd_id: {jd_id}")
+    return record.text
 
-    # 1. Validate resume file extension
-    ext = get_file_extension(resume_file.filename)
-    logger.info(f"Received file: {resume_file.filename} ({ext})")
-
-    # 2. Get appropriate parser
-    ext_map = {
-        '.pdf': 'pdf',
-        '.docx': 'docx',
-        '.doc': 'docx',
-        '.txt': 'text',
-        '.md': 'text'
-    }
-    
-    parser_name = ext_map.get(ext)
-    if not parser_name:
+# Upload formats the document parsers accept
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt', '.md')
+
+def _check_extension(filename: str, label: str = "file"):
+    """400 unless the upload has a supported extension."""
+    ext = get_file_extension(filename)
+    if ext not in SUPPORTED_EXTENSIONS:
         raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file format: {ext}. Supported: PDF, DOCX, TXT, MD"
+            status_code=400,
+            detail=f"Unsupported {label} format: {ext}. Supported: PDF, DOCX, TXT, MD"
         )
 
-    parser = get_parser(parser_name)
+async def _store_upload(file: UploadFile, stage: str) -> StoredDocument:
+    """Parse an upload through the document store (known bytes are not parsed again)."""
+    data = await file.read()
+    return await within_deadline(asyncio.to_thread(engine.store_document, data, file.filename), stage)
+
+def _stored_document(doc_id: str) -> StoredDocument:
+    """A stored document (404 if the id is unknown)."""
+    document = engine.get_document(doc_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Unknown doc_id: {doc_id}")
+    return document
+
+async def _parse_jd_upload(jd_file: UploadFile) -> str:
+    """Text of an uploaded JD file."""
+    logger.info(f"Received JD file: {jd_file.filename}")
+    _check_extension(jd_file.filename, "JD file")
+    try:
+        return (await _store_upload(jd_file, "parse_jd")).content
+    except DeadlineExceededError:
+        raise
+    except Exception as e:
+        logger.error(f"Error parsing JD file: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
 
-    # 3. Read file content
-    content_bytes = await resume_file.read()
-    
-    # 4. Parse content
+async def _resolve_jd(
+    jd_text: Optional[str],
+    jd_file: Optional[UploadFile],
+    jd_id: Optional[str] = None
+) -> str:
+    """JD text from a registered jd_id, an uploaded file or plain text (in that order)."""
+    if jd_id:
+        return _registered_jd_text(jd_id)
+    if jd_file:
+        return await _parse_jd_upload(jd_file)
+    return jd_text or ""
+
+async def _resolve_resume(resume_file: Optional[UploadFile], doc_id: Optional[str] = None) -> str:
+    """Resume text from a stored doc_id or an uploaded file."""
+    if doc_id:
+        return _stored_document(doc_id).content
+    if not resume_file:
+        raise HTTPException(status_code=400, detail="Resume is required (file or doc_id)")
+
+    logger.info(f"Received file: {resume_file.filename}")
+    _check_extension(resume_file.filename)
     try:
-        resume_text = parser.parse_content(content_bytes, ext)
+        return (await _store_upload(resume_file, "parse_resume")).content
+    except DeadlineExceededError:
+        raise
     except Exception as e:
         logger.error(f"Parsing error: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
 
+async def _load_documents(
+    files: Optional[List[UploadFile]],
+    doc_ids: Optional[List[str]],
+    stage: str
+) -> List[tuple[str, Any]]:
+    """
+    (name, StoredDocument or exception) for each upload, then each doc_id.
+
+    Uploads are parsed concurrently; a failed one does not fail the rest.
+    """
+    async def load(doc_id: str) -> StoredDocument:
+        document = engine.get_document(doc_id)
+        if document is None:
+            raise ValueError(f"Unknown doc_id: {doc_id}")
+        return document
+
+    files, doc_ids = files or [], doc_ids or []
+    if not files and not doc_ids:
+        raise HTTPException(status_code=400, detail="No resumes given (files or doc_ids)")
+
+    loaded = await asyncio.gather(
+        *(_store_upload(file, stage) for file in files),
+        *(load(doc_id) for doc_id in doc_ids),
+        return_exceptions=True
+    )
+    for item in loaded:
+        if isinstance(item, DeadlineExceededError):
+            raise item
+    names = [file.filename for file in files] + list(doc_ids)
+    return list(zip(names, loaded))
+
+async def _process_upload_request(
+    resume_file: Optional[UploadFile],
+    jd_file: Optional[UploadFile],
+    jd_text: Optional[str],
+    jd_id: Optional[str] = None,
+    doc_id: Optional[str] = None
+) -> tuple[str, str]:
+    """Helper to process uploaded files and text."""
+    # 0. Process JD (registered id, Text or File)
+    final_jd_text = await _resolve_jd(jd_text, jd_file, jd_id)
+
+    if not final_jd_text or len(final_jd_text.strip()) == 0:
+            raise HTTPException(status_code=400, detail="Job Description is required (text or file)")
+
+    # 1. Process resume (stored doc_id or File)
+    resume_text = await _resolve_resume(resume_file, doc_id)
+
     if not resume_text or len(resume_text.strip()) == 0:
         raise HTTPException(status_code=400, detail="Parsed resume content is empty")
 
@@ -178,7 +257,7 @@ async def health_check():
         )
     
     try:
-        health = engine.health_check()
+        health = await asyncio.to_thread(engine.health_check)
         status_str = "healthy" if health.get("llm_provider", {}).get("healthy") else "degraded"
         return HealthCheckResponse(
             status=status_str,
@@ -192,12 +271,21 @@ async def health_check():
             version="1.0.0"
         )
 
+@app.get("/metrics")
+async def get_metrics():
+    """Operational counters (hedge rate, extra tokens spent on hedges, ...)."""
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    return engine.get_metrics()
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_resume(
-    resume_file: UploadFile = File(...),
+    resume_file: Optional[UploadFile] = File(default=None),
     jd_text: Optional[str] = Form(default=None),
     jd_file: Optional[UploadFile] = File(default=None),
     persona: str = Form("hrbp"),
+    jd_id: Optional[str] = Form(default=None), # Registered JD (see POST /jds); replaces jd_text/jd_file
+    doc_id: Optional[str] = Form(default=None), # Stored resume (see POST /documents); replaces resume_file
 ):
     """
     Analyze a resume file against a job description.
@@ -205,11 +293,11 @@ async def analyze_resume(
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
-    resume_text, final_jd_text = await _process_upload_request(resume_file, jd_file, jd_text)
+    resume_text, final_jd_text = await _process_upload_request(resume_file, jd_file, jd_text, jd_id, doc_id)
 
     try:
         # 5. Call Engine
-        result = engine.analyze_resume(
+        result = await engine.aanalyze(
             resume_text=resume_text,
             jd_text=final_jd_text,
             persona=persona
@@ -217,7 +305,9 @@ async def analyze_resume(
         
         return result
         
-    except ResumeSniperError as e:
+    except DeadlineExceededError:
+        raise
+    except TalentOSError as e:
         logger.error(f"Analysis error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -226,10 +316,12 @@ async def analyze_resume(
 
 @app.post("/analyze_stream")
 async def analyze_resume_stream(
-    resume_file: UploadFile = File(...),
+    resume_file: Optional[UploadFile] = File(default=None),
     jd_text: Optional[str] = Form(default=None),
     jd_file: Optional[UploadFile] = File(default=None),
     persona: str = Form("hrbp"),
+    jd_id: Optional[str] = Form(default=None),
+    doc_id: Optional[str] = Form(default=None),
 ):
     """
     Analyze a resume file against a job description with streaming response.
@@ -237,16 +329,17 @@ async def analyze_resume_stream(
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
-    resume_text, final_jd_text = await _process_upload_request(resume_file, jd_file, jd_text)
+    resume_text, final_jd_text = await _process_upload_request(resume_file, jd_file, jd_text, jd_id, doc_id)
 
     try:
-        def stream_with_ping(generator):
+        async def stream_with_ping(generator):
             """Yield a space immediately to establish connection."""
             yield " "
-            yield from generator
+            async for chunk in generator:
+                yield chunk
 
         return StreamingResponse(
-            stream_with_ping(engine.analyze_resume_stream(
+            stream_with_ping(engine.aanalyze_resume_stream(
                 resume_text=resume_text,
                 jd_text=final_jd_text,
                 persona=persona,
@@ -255,57 +348,150 @@ async def analyze_resume_stream(
             media_type="text/event-stream"
         )
         
-    except ResumeSniperError as e:
+    except TalentOSError as e:
         logger.error(f"Analysis error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/match_stream")
+async def match_stream(
+    resume_file: Optional[UploadFile] = File(default=None),
+    jd_text: Optional[str] = Form(default=None),
+    jd_file: Optional[UploadFile] = File(default=None),
+    weights: Optional[str] = Form(None), # JSON string: {"skills":30, "experience":30...}
+    jd_id: Optional[str] = Form(default=None),
+    doc_id: Optional[str] = Form(default=None),
+):
+    """
+    Evaluate a resume against a JD, streaming fields as server-sent events.
+
+    Emits "field" events ({"path": "score", "value": 85}, "dimensions.skills",
+    "strengths.0", ...) as soon as each is generated, then one "result" event
+    with the full match dict.
+    """
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+
+    resume_text, final_jd_text = await _process_upload_request(resume_file, jd_file, jd_text, jd_id, doc_id)
+
+    match_weights = None
+    if weights:
+        try:
+            match_weights = json.loads(weights)
+        except:
+            pass # Ignore invalid weights
+
+    async def sse(generator):
+        try:
+            async for event in generator:
+                payload = {k: v for k, v in event.items() if k != "event"}
+                yield f"event: {event['event']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        except TalentOSError as e:
+            logger.error(f"Match stream error: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        sse(engine.aevaluate_match_stream(
+            resume_text=resume_text,
+            jd_text=final_jd_text,
+            weights=match_weights
+        )),
+        media_type="text/event-stream"
+    )
+
 @app.post("/optimize_jd", response_model=AnalysisResponse)
 async def optimize_jd(
     jd_text: Optional[str] = Form(None),
-    jd_file: Optional[UploadFile] = File(None)
+    jd_file: Optional[UploadFile] = File(None),
+    jd_id: Optional[str] = Form(None) # Registered JD; the optimized JD is kept on its record
 ):
     """
-    Optimize a Job Description (Text or File).
+    Optimize a Job Description (Text, File or registered jd_id).
     """
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
-    final_jd_text = ""
-    if jd_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd_file.filename)[1]) as tmp:
-            shutil.copyfileobj(jd_file.file, tmp)
-            tmp_path = tmp.name
+    if jd_id:
+        _registered_jd_text(jd_id)  # 404 if unknown
         try:
-            parser = get_parser_for_file(tmp_path)
-            doc = parser.parse(tmp_path)
-            final_jd_text = doc.content
-        except Exception as e:
-            logger.error(f"Error parsing JD file: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-    elif jd_text:
-        final_jd_text = jd_text
+            return await engine.aoptimize_registered_jd(jd_id)
+        except DeadlineExceededError:
+            raise
+        except TalentOSError as e:
+            logger.error(f"Optimization error: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+
+    final_jd_text = await _resolve_jd(jd_text, jd_file)
     
     if not final_jd_text or len(final_jd_text.strip()) < 10:
          raise HTTPException(status_code=400, detail="Valid JD content is required (min 10 chars)")
 
     try:
-        result = engine.optimize_jd(jd_text=final_jd_text)
+        result = await engine.aoptimize_jd(jd_text=final_jd_text)
         return result
-    except ResumeSniperError as e:
+    except DeadlineExceededError:
+        raise
+    except TalentOSError as e:
         logger.error(f"Optimization error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/jds")
+async def register_jd(
+    jd_text: Optional[str] = Form(None),
+    jd_file: Optional[UploadFile] = File(None)
+):
+    """
+    Register a JD once and get its jd_id.
+
+    The JD is parsed and normalized here; matching endpoints accept the
+    jd_id instead of re-uploading it. The same content always gets the
+    same jd_id.
+    """
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+
+    final_jd_text = await _resolve_jd(jd_text, jd_file)
+    if not final_jd_text or len(final_jd_text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Valid JD content is required (min 10 chars)")
+
+    record = await asyncio.to_thread(engine.register_jd, final_jd_text, jd_file.filename if jd_file else "text")
+    return {**record.summary(), "requirements": record.artifacts.get("requirements", [])}
+
+@app.get("/jds")
+async def list_jds():
+    """Registered JDs (without their text), newest first."""
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    return [record.summary() for record in engine.list_jds()]
+
+@app.get("/jds/{jd_id}")
+async def get_jd(jd_id: str):
+    """A registered JD with its text and derived artifacts."""
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    record = engine.get_jd(jd_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown jd_id: {jd_id}")
+    return record.to_dict()
+
+@app.delete("/jds/{jd_id}")
+async def delete_jd(jd_id: str):
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    if not engine.delete_jd(jd_id):
+        raise HTTPException(status_code=404, detail=f"Unknown jd_id: {jd_id}")
+    return {"deleted": jd_id}
+
 @app.post("/batch_parse_resumes")
-async def batch_parse_resumes(files: List[UploadFile] = File(...)):
+async def batch_parse_resumes(
+    files: Optional[List[UploadFile]] = File(None),
+    doc_ids: Optional[List[str]] = Form(None) # Stored resumes (see POST /documents)
+):
     """
     Batch parse multiple resumes and extract structured data.
     """
@@ -314,70 +500,64 @@ async def batch_parse_resumes(files: List[UploadFile] = File(...)):
     
     results = []
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        for file in files:
-            try:
-                # Save uploaded file
-                temp_path = os.path.join(temp_dir, file.filename)
-                with open(temp_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-                
-                # Parse document text
-                # Note: get_parser_for_file might raise PluginNotFoundError if format not supported
-                parser = get_parser_for_file(temp_path)
-                parsed_doc = parser.parse(temp_path)
-                resume_text = parsed_doc.content
-                
-                # Extract fields using Engine
-                extraction_result = engine.extract_resume_fields(resume_text=resume_text)
-                
-                results.append({
-                    "filename": file.filename,
-                    "status": "success",
-                    "data": extraction_result
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing {file.filename}: {e}")
-                results.append({
-                    "filename": file.filename,
-                    "status": "error",
-                    "error": str(e)
-                })
+    for name, document in await _load_documents(files, doc_ids, "parse_resume"):
+        if isinstance(document, BaseException):
+            logger.error(f"Error processing {name}: {document}")
+            results.append({
+                "filename": name,
+                "status": "error",
+                "error": str(document)
+            })
+            continue
+
+        try:
+            # Extract fields using Engine
+            extraction_result = await engine.aextract_resume_fields(resume_text=document.content)
+            
+            results.append({
+                "filename": document.filename,
+                "doc_id": document.doc_id,
+                "status": "success",
+                "data": extraction_result
+            })
+            
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            logger.error(f"Error processing {name}: {e}")
+            results.append({
+                "filename": document.filename,
+                "doc_id": document.doc_id,
+                "status": "error",
+                "error": str(e)
+            })
                 
     return results
 
 @app.post("/batch_analyze_match")
 async def batch_analyze_match(
-    files: List[UploadFile] = File(...),
+    files: Optional[List[UploadFile]] = File(None),
     jd_text: Optional[str] = Form(None),
     jd_file: Optional[UploadFile] = File(None),
-    weights: Optional[str] = Form(None) # JSON string: {"skills":30, "experience":30...}
+    weights: Optional[str] = Form(None), # JSON string: {"skills":30, "experience":30...}
+    prefilter: Optional[bool] = Form(None), # Lexical prefilter before the LLM (default: config)
+    top_k: Optional[int] = Form(None), # Max resumes sent to the LLM when prefiltering
+    pack: Optional[bool] = Form(None), # Evaluate several resumes per LLM request (default: config)
+    jd_id: Optional[str] = Form(None), # Registered JD (see POST /jds); replaces jd_text/jd_file
+    doc_ids: Optional[List[str]] = Form(None) # Stored resumes (see POST /documents), after the files
 ):
     """
     Batch analyze match between multiple resumes and a JD (Text or File).
+
+    With the prefilter on, resumes are ranked locally against the JD and
+    only the top_k are evaluated by the LLM; the rest come back with
+    status "Prefiltered" and their lexical_score.
     """
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
 
     # 1. Process JD
-    final_jd_text = ""
-    if jd_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd_file.filename)[1]) as tmp:
-            shutil.copyfileobj(jd_file.file, tmp)
-            tmp_path = tmp.name
-        try:
-            parser = get_parser_for_file(tmp_path)
-            doc = parser.parse(tmp_path)
-            final_jd_text = doc.content
-        except Exception as e:
-            logger.error(f"Error parsing JD file: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to parse JD file: {str(e)}")
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-    elif jd_text:
-        final_jd_text = jd_text
+    final_jd_text = await _resolve_jd(jd_text, jd_file, jd_id)
     
     if not final_jd_text or len(final_jd_text.strip()) < 10:
          raise HTTPException(status_code=400, detail="Valid JD content is required")
@@ -390,61 +570,88 @@ async def batch_analyze_match(
         except:
             pass # Ignore invalid weights
 
-    # 3. Process Resumes
+    # 3. Parse Resumes (known uploads come from the document store)
+    documents = await _load_documents(files, doc_ids, "parse_resume")
+
+    # 4. Evaluate parsed resumes concurrently (bounded by the provider's max_concurrency)
+    parsed_indices = [i for i, (_, doc) in enumerate(documents) if not isinstance(doc, BaseException)]
+    analyses = await engine.abatch_evaluate_match(
+        [documents[i][1].content for i in parsed_indices],
+        jd_text=final_jd_text,
+        weights=match_weights,
+        prefilter=prefilter,
+        top_k=top_k,
+        pack=pack
+    )
+    analysis_by_index = dict(zip(parsed_indices, analyses))
+
+    # 5. Assemble results in upload order
     results = []
-    
-    # Process files sequentially (to avoid API rate limits if parallel)
-    # For production, this should be a background task (Celery/Redis Queue)
-    for file in files:
-        # ... (file saving and parsing logic similar to parse_batch)
-        # We reuse logic here for simplicity in this MVP
-        
-        tmp_path = None
-        try:
-            suffix = os.path.splitext(file.filename)[1]
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                shutil.copyfileobj(file.file, tmp)
-                tmp_path = tmp.name
-            
-            # Parse Resume Text
-            parser = get_parser_for_file(tmp_path)
-            doc = parser.parse(tmp_path)
-            resume_text = doc.content
-            
-            # Evaluate Match
-            analysis = engine.evaluate_match(
-                resume_text=resume_text, 
-                jd_text=final_jd_text,
-                weights=match_weights
-            )
-            
-            # Add filename
-            analysis["filename"] = file.filename
-            
-            # Ensure ID
-            if "id" not in analysis:
-                analysis["id"] = os.path.splitext(file.filename)[0] # Fallback ID
-
-            results.append(analysis)
-            
-        except Exception as e:
-            logger.error(f"Error processing file {file.filename}: {e}")
+    for i, (name, document) in enumerate(documents):
+        if isinstance(document, BaseException):
+            logger.error(f"Error processing file {name}: {document}")
             results.append({
-                "filename": file.filename,
+                "filename": name,
                 "status": "Error",
-                "error": str(e),
+                "error": str(document),
                 "score": 0,
                 "reason": "Processing failed"
             })
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except:
-                    pass
-                    
+            continue
+
+        analysis = dict(analysis_by_index[i])
+        if analysis.get("status") == "Error" and "error" in analysis:
+            logger.error(f"Error processing file {document.filename}: {analysis['error']}")
+
+        # Add filename
+        analysis["filename"] = document.filename
+        analysis["doc_id"] = document.doc_id
+
+        # Ensure ID
+        if "id" not in analysis:
+            analysis["id"] = os.path.splitext(document.filename)[0] # Fallback ID
+
+        results.append(analysis)
+
     return results
 
+@app.post("/documents")
+async def upload_document(file: UploadFile = File(...)):
+    """
+    Store a parsed upload and get its doc_id.
+
+    The doc_id is the SHA-256 of the file bytes: re-uploading the same
+    file returns the stored document without parsing it again, and
+    resume endpoints accept the doc_id instead of the file.
+    """
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+
+    _check_extension(file.filename)
+    try:
+        document = await _store_upload(file, "parse_document")
+    except DeadlineExceededError:
+        raise
+    except Exception as e:
+        logger.error(f"Error parsing {file.filename}: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+    return document.summary()
+
+@app.get("/documents/{doc_id}")
+async def get_document(doc_id: str):
+    """A stored document with its text and parser metadata."""
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    return _stored_document(doc_id).to_dict()
+
+@app.delete("/documents/{doc_id}")
+async def delete_document(doc_id: str):
+    if not engine:
+        raise HTTPException(status_code=503, detail="Engine not initialized")
+    if not engine.delete_document(doc_id):
+        raise HTTPException(status_code=404, detail=f"Unknown doc_id: {doc_id}")
+    return {"deleted": doc_id}
+
 class MessageRequest(BaseModel):
     candidates: List[Dict[str, Any]] # List of {name, reason, etc.}
     job_info: Dict[str, Any] # {role: "Java Dev"}
@@ -462,7 +669,7 @@ async def generate_messages(req: MessageRequest):
     generated_messages = []
     for candidate in req.candidates:
         try:
-            msg = engine.generate_message(
+            msg = await engine.agenerate_message(
                 msg_type=req.msg_type,
                 candidate_data=candidate,
                 job_data=req.job_info,
@@ -473,6 +680,8 @@ async def generate_messages(req: MessageRequest):
                 "name": candidate.get("name"),
                 "message": msg
             })
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             logger.error(f"Error generating message for {candidate.get('name')}: {e}")
             generated_messages.append({
@@ -491,8 +700,10 @@ async def translate_text(request: TranslationRequest):
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
     try:
-        translated = engine.translate_text(request.text, request.target_lang)
+        translated = await engine.atranslate_text(request.text, request.target_lang)
         return {"translated_text": translated}
+    except DeadlineExceededError:
+        raise
     except Exception as e:
         logger.error(f"Translation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,248 @@
+"""
+Batch Executor / 批量执行器
+
+Bounded-concurrency execution for batch jobs (e.g. many resumes vs one JD).
+Results are returned in input order with per-item error capture. A
+ConcurrencyLimit can be shared between executors, so concurrent batches
+(sync or async) together stay within one limit.
+"""
+
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Iterable, List, Optional
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one batch item."""
+    index: int
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the item completed without error."""
+        return self.error is None
+
+
+# progress_callback(completed, total, item_result)
+ProgressCallback = Callable[[int, int, BatchItemResult], None]
+
+
+class ConcurrencyLimit:
+    """
+    At most ``limit`` holders at once, shared by threads and event loops.
+
+    Threads use ``with limit:``, coroutines ``async with limit:`` (waiting
+    without blocking their loop). Freed slots go to waiters in arrival
+    order.
+    """
+
+    def __init__(self, limit: int = 4):
+        self._limit = max(1, int(limit or 1))
+        self._in_use = 0
+        self._lock = threading.Lock()
+        # threading.Event (thread) or (loop, future) (coroutine)
+        self._waiters: Deque[Any] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def acquire(self):
+        """Take a slot, blocking the calling thread until one is free."""
+        with self._lock:
+            if self._in_use < self._limit and not self._waiters:
+                self._in_use += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()  # release() hands its slot over
+
+    async def aacquire(self):
+        """Take a slot, waiting without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_use < self._limit and not self._waiters:
+                self._in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            self.release()  # The slot was handed over as we were cancelled
+            raise
+
+    def release(self):
+        """Free a slot, handing it to the longest waiter if any."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                loop, future = waiter
+                try:
+                    loop.call_soon_threadsafe(_grant, future)
+                    return
+                except RuntimeError:
+                    continue  # Its loop is closed
+            self._in_use -= 1
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    async def __aenter__(self):
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+def _grant(future: "asyncio.Future"):
+    if not future.done():
+        future.set_result(None)
+
+
+class BatchExecutor:
+    """
+    Runs a function over many items with at most ``max_concurrency`` in flight.
+
+    - run(): thread pool, for the sync engine API
+    - arun(): coroutines on the running loop, for the async engine API
+
+    Both hold a ConcurrencyLimit slot per item; pass a shared ``limit``
+    to bound several executors together. Exceptions raised for an item
+    are captured in its BatchItemResult and never abort the rest of the
+    batch.
+    """
+
+    def __init__(self, max_concurrency: int = 4, limit: Optional[ConcurrencyLimit] = None):
+        """
+        Initialize batch executor.
+
+        Args:
+            max_concurrency: Maximum number of items processed at once
+            limit: Shared limit (default: a private one of max_concurrency)
+        """
+        self._max_concurrency = max(1, int(max_concurrency or 1))
+        self._limit = limit or ConcurrencyLimit(self._max_concurrency)
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    def run(
+        self,
+        items: Iterable[Any],
+        fn: Callable[[Any], Any],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[BatchItemResult]:
+        """
+        Process items in a thread pool.
+
+        Args:
+            items: Inputs to process
+            fn: Function applied to each item
+            progress_callback: Called after each item completes
+
+        Returns:
+            List of BatchItemResult in input order
+        """
+        items = list(items)
+        total = len(items)
+        results: List[Optional[BatchItemResult]] = [None] * total
+        if not items:
+            return []
+
+        progress = _Progress(total, progress_callback)
+        workers = min(self._max_concurrency, total)
+
+        def run_one(item: Any) -> Any:
+            with self._limit:
+                return fn(item)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talentos-batch") as pool:
+            # Each item runs in a copy of the caller's context (request deadline etc.)
+            futures = {
+                pool.submit(contextvars.copy_context().run, run_one, item): i
+                for i, item in enumerate(items)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    item_result = BatchItemResult(index=index, value=future.result())
+                except Exception as e:
+                    item_result = BatchItemResult(index=index, error=e)
+                results[index] = item_result
+                progress.advance(item_result)
+
+        return results
+
+    async def arun(
+        self,
+        items: Iterable[Any],
+        fn: Callable[[Any], Awaitable[Any]],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[BatchItemResult]:
+        """
+        Process items concurrently on the running event loop.
+
+        Args:
+            items: Inputs to process
+            fn: Coroutine function applied to each item
+            progress_callback: Called after each item completes
+
+        Returns:
+            List of BatchItemResult in input order
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        progress = _Progress(len(items), progress_callback)
+
+        async def run_one(index: int, item: Any) -> BatchItemResult:
+            async with self._limit:
+                try:
+                    item_result = BatchItemResult(index=index, value=await fn(item))
+                except Exception as e:
+                    item_result = BatchItemResult(index=index, error=e)
+            progress.advance(item_result)
+            return item_result
+
+        return list(await asyncio.gather(*(run_one(i, item) for i, item in enumerate(items))))
+
+
+class _Progress:
+    """Thread-safe completion counter driving the progress callback."""
+
+    def __init__(self, total: int, callback: Optional[ProgressCallback]):
+        self._total = total
+        self._callback = callback
+        self._completed = 0
+        self._lock = threading.Lock()
+
+    def advance(self, item_result: BatchItemResult):
+        with self._lock:
+            self._completed += 1
+            completed = self._completed
+        if self._callback:
+            try:
+                self._callback(completed, self._total, item_result)
+            except Exception:
+                pass  # A broken progress hook must not fail the batch
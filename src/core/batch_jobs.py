@@ -0,0 +1,101 @@
+"""
+Batch Jobs / 离线批处理任务
+
+Persisted records for offline provider batch jobs (bulk evaluate_match /
+extract_resume_fields). A job is submitted once, polled until the
+provider finishes, and its results are written back into the engine
+cache. Records are JSON files so a job survives process restarts.
+
+Resume texts are kept only while a job runs (they are needed to rebuild
+each item's cache key); finished records keep the results and a digest
+of each resume.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.interfaces.illm_provider import BatchStatus
+
+
+@dataclass
+class BatchJobItem:
+    """One resume of a batch job."""
+    custom_id: str
+    index: int
+    resume_text: Optional[str]  # Dropped once the job is finished
+    resume_digest: str = ""
+    submitted: bool = True  # False when the result was already cached at submission
+
+
+@dataclass
+class BatchJob:
+    """Persisted state of an offline batch job."""
+    job_id: str
+    kind: str  # "match" or "extract"
+    provider: str
+    status: str
+    items: List[BatchJobItem]
+    provider_batch_id: Optional[str] = None
+    jd_text: Optional[str] = None
+    weights: Optional[Dict[str, int]] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    results: Optional[List[Dict[str, Any]]] = None  # Input order, set on completion
+    failed: int = 0
+    error: Optional[str] = None
+
+    @staticmethod
+    def new_id() -> str:
+        return f"job_{uuid.uuid4().hex[:12]}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "BatchJob":
+        d = {k: v for k, v in d.items() if k in cls.__dataclass_fields__}
+        d["items"] = [BatchJobItem(**item) for item in d.get("items", [])]
+        return cls(**d)
+
+
+class BatchJobStore:
+    """Stores BatchJob records as ``<directory>/<job_id>.json``."""
+
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+
+    def save(self, job: BatchJob):
+        """Write a job record (atomically replaces the previous version)."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        job.updated_at = datetime.now().isoformat()
+        if job.status in BatchStatus.TERMINAL:
+            for item in job.items:
+                item.resume_text = None
+        path = self._path(job.job_id)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load(self, job_id: str) -> Optional[BatchJob]:
+        """Read a job record, or None if unknown."""
+        path = self._path(job_id)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return BatchJob.from_dict(json.load(f))
+
+    def list_jobs(self) -> List[BatchJob]:
+        """All job records, newest first."""
+        if not self._directory.exists():
+            return []
+        jobs = [self.load(path.stem) for path in self._directory.glob("*.json")]
+        return sorted((job for job in jobs if job), key=lambda job: job.created_at, reverse=True)
+
+    def _path(self, job_id: str) -> Path:
+        return self._directory / f"{Path(job_id).name}.json"
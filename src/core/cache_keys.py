@@ -0,0 +1,61 @@
+"""
+Cache Keys / 缓存键
+
+Content-addressed cache keys. Each component (resume, JD, persona,
+weights) is canonicalized (NFKC, line endings, whitespace) and hashed on
+its own with BLAKE2b, then the component digests are combined with the
+request kind. Text that differs only in how a parser laid it out maps to
+the same key, and component digests are memoized, so a JD shared by a
+whole batch is canonicalized and hashed once rather than once per resume.
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from src.core.compaction import normalize_text
+
+# Bump to invalidate every cached result (e.g. when the key layout changes)
+KEY_VERSION = "2"
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SEPARATOR = "\x1f"
+
+
+def canonicalize(text: str) -> str:
+    """Text normalized so layout-only differences disappear."""
+    return _BLANK_LINES.sub("\n\n", normalize_text(text or "")).strip()
+
+
+@lru_cache(maxsize=1024)
+def text_digest(text: str) -> str:
+    """
+    BLAKE2b digest of canonicalized text (memoized).
+
+    A repeated argument is found by its cached str hash, so passing the
+    same JD string for every resume of a batch costs one digest.
+    """
+    return hashlib.blake2b(canonicalize(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def weights_component(weights: Optional[Dict[str, Any]]) -> str:
+    """Canonical form of scoring weights (every dimension, sorted)."""
+    return json.dumps(weights or {}, sort_keys=True, separators=(",", ":"))
+
+
+def cache_key(kind: str, *components: Any) -> str:
+    """
+    Cache key for a request.
+
+    Args:
+        kind: Request kind (e.g. "match"); part of the key
+        *components: Inputs that determine the result (None allowed)
+
+    Returns:
+        Hex key
+    """
+    digests = [text_digest("" if part is None else str(part)) for part in components]
+    content = _SEPARATOR.join([KEY_VERSION, kind, *digests])
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
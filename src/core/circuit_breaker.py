@@ -0,0 +1,163 @@
+"""
+Circuit Breaker / 熔断器
+
+Per-provider circuit breakers so requests skip a degraded provider
+immediately instead of burning through retries and timeouts.
+
+States:
+- closed: calls flow; outcomes are recorded in a sliding window
+- open: calls are rejected until ``open_seconds`` have passed
+- half_open: a few probe calls are let through; success closes the
+  circuit, failure (or a slow call) opens it again
+
+The circuit opens when, over at least ``min_calls`` recent calls, the
+failure rate or the slow-call rate reaches its threshold.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Breaker thresholds (``circuit_breaker`` in a provider's config)."""
+    enabled: bool = True
+    window_size: int = 20
+    min_calls: int = 5
+    failure_rate_threshold: float = 0.5
+    slow_call_ms: float = 60000
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 30
+    half_open_max_calls: int = 1
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict]) -> "CircuitBreakerConfig":
+        """Build from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        config: CircuitBreakerConfig = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self._config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (failed, slow) per call
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=self._config.window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """Whether a call may go through now (reserves a probe slot when half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and self._half_open_calls < self._config.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self, latency_ms: float = 0.0):
+        """Record a successful call; calls slower than ``slow_call_ms`` count as slow."""
+        slow = latency_ms >= self._config.slow_call_ms
+        with self._lock:
+            if self._current_state() == CircuitState.HALF_OPEN:
+                if slow:
+                    self._open()
+                else:
+                    self._close()
+                return
+            self._outcomes.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            if self._current_state() == CircuitState.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append((True, False))
+            self._evaluate()
+
+    def release(self):
+        """Return a probe slot for a call whose outcome says nothing about health (e.g. 429, cancelled)."""
+        with self._lock:
+            if self._current_state() == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        with self._lock:
+            if self._current_state() != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._config.open_seconds - self._clock())
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state and window statistics."""
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": self._current_state().value,
+                "calls": calls,
+                "failure_rate": self._rate(0),
+                "slow_call_rate": self._rate(1),
+                "rejected": self._rejected,
+            }
+
+    # Callers hold self._lock for everything below
+
+    def _current_state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and \
+                self._clock() - self._opened_at >= self._config.open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _evaluate(self):
+        if len(self._outcomes) < self._config.min_calls:
+            return
+        if self._rate(0) >= self._config.failure_rate_threshold or \
+                self._rate(1) >= self._config.slow_call_rate_threshold:
+            self._open()
+
+    def _rate(self, index: int) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for outcome in self._outcomes if outcome[index]) / len(self._outcomes)
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+
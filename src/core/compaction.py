@@ -0,0 +1,215 @@
+"""
+Input Compaction / 输入压缩
+
+Cleans parsed document text before it is sent to the LLM:
+
+1. Normalize: NFKC, drop zero-width/control characters, collapse runs of
+   spaces and blank lines
+2. Drop page markers ("Page 2 of 3", "第2页", "- 2 -", and bare "2/3"
+   when the document numbers its pages that way)
+3. Dedupe repeated page headers/footers (lines that recur at page breaks)
+   and repeated long lines (table text that PDF extraction emits twice);
+   short lines such as "Team lead" may repeat legitimately
+4. Enforce a token budget, keeping the head and tail of the document and
+   marking the omitted middle
+
+Token counts use the local estimator in src.core.tokens.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.tokens import estimate_tokens
+
+_INVISIBLE_PATTERN = re.compile(r"[\u200b-\u200f\u2060\ufeff\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_SPACE_PATTERN = re.compile(r"[ \t\u00a0\u3000]+")
+_PAGE_MARKER_PATTERN = re.compile(
+    r"^(?:"
+    r"page\s*\d+(?:\s*(?:of|/)\s*\d+)?"
+    r"|-\s*\d+\s*-"
+    r"|第\s*\d+\s*页(?:\s*[,，/]?\s*共\s*\d+\s*页)?"
+    r")$",
+    re.IGNORECASE
+)
+# Bare "2/3": a page counter only if the document has several with the same total
+_PAGE_FRACTION_PATTERN = re.compile(r"^(\d{1,3})\s*/\s*(\d{1,3})$")
+
+OMITTED_MARKER = "[... {count} lines omitted ...]"
+
+
+@dataclass
+class CompactionConfig:
+    """Compaction settings (``analysis.compaction`` in config)."""
+    enabled: bool = True
+    dedupe_min_chars: int = 40  # Shorter lines ("Team lead") are deduped only as page headers/footers
+    head_ratio: float = 0.7  # Share of the budget kept from the start when truncating
+    # Max estimated tokens per input kind (0 = only the context window applies)
+    budgets: Dict[str, int] = field(default_factory=lambda: {"resume": 12000, "jd": 4000})
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict]) -> "CompactionConfig":
+        """Build from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class CompactionResult:
+    """Outcome of compacting one input."""
+    text: str
+    original_tokens: int
+    tokens: int
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace, line by line."""
+    text = unicodedata.normalize("NFKC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _INVISIBLE_PATTERN.sub("", text)
+    return "\n".join(_SPACE_PATTERN.sub(" ", line).strip() for line in text.split("\n"))
+
+
+def dedupe_lines(lines: List[str], min_chars: int = 40) -> List[str]:
+    """
+    Drop page markers, repeated headers/footers and long repeated lines,
+    and redundant blank lines.
+
+    A header (footer) is a line that follows (precedes) a page boundary
+    -- a page marker or the start (end) of the document -- at least
+    twice; other lines shorter than ``min_chars`` are never deduped.
+    """
+    markers = _page_marker_indexes(lines)
+    boundaries = _page_boundary_lines(lines, markers)
+
+    seen = set()
+    result: List[str] = []
+    for i, line in enumerate(lines):
+        if not line:
+            if result and result[-1]:
+                result.append(line)
+            continue
+        if i in markers:
+            continue
+        if len(line) >= min_chars or line in boundaries:
+            if line in seen:
+                continue
+            seen.add(line)
+        result.append(line)
+
+    while result and not result[-1]:
+        result.pop()
+    return result
+
+
+def truncate_to_budget(text: str, max_tokens: int, head_ratio: float = 0.7) -> Tuple[str, bool]:
+    """
+    Cut ``text`` to about ``max_tokens``, keeping its head and tail.
+
+    Whole lines are kept where possible; text whose first line alone
+    exceeds the head budget is cut by characters.
+
+    Returns:
+        (text, truncated)
+    """
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text, False
+
+    head_budget = int(max_tokens * head_ratio)
+    tail_budget = max_tokens - head_budget
+    lines = text.split("\n")
+
+    head = _take_lines(lines, head_budget)
+    tail = _take_lines(list(reversed(lines[len(head):])), tail_budget)
+    tail.reverse()
+
+    if not head:
+        return _truncate_chars(text, head_budget, tail_budget), True
+
+    omitted = len(lines) - len(head) - len(tail)
+    return "\n".join(head + [OMITTED_MARKER.format(count=omitted)] + tail), True
+
+
+def compact_text(text: str, max_tokens: int = 0, config: CompactionConfig = None) -> CompactionResult:
+    """
+    Normalize, dedupe and budget a document for an LLM prompt.
+
+    Args:
+        text: Parsed document text
+        max_tokens: Token budget (0 = unlimited)
+        config: Compaction settings
+
+    Returns:
+        CompactionResult with the compacted text and token counts
+    """
+    config = config or CompactionConfig()
+    original_tokens = estimate_tokens(text)
+
+    lines = dedupe_lines(normalize_text(text).split("\n"), config.dedupe_min_chars)
+    compacted, truncated = truncate_to_budget("\n".join(lines), max_tokens, config.head_ratio)
+
+    return CompactionResult(
+        text=compacted,
+        original_tokens=original_tokens,
+        tokens=estimate_tokens(compacted),
+        truncated=truncated
+    )
+
+
+def _page_marker_indexes(lines: List[str]) -> Set[int]:
+    """Indexes of page-marker lines; bare N/M counts only as a repeated page counter."""
+    markers = {i for i, line in enumerate(lines) if line and _PAGE_MARKER_PATTERN.match(line)}
+
+    fractions: Dict[int, List[Tuple[int, int]]] = {}  # total -> [(index, page)]
+    for i, line in enumerate(lines):
+        match = _PAGE_FRACTION_PATTERN.match(line)
+        if match and 0 < int(match.group(1)) <= int(match.group(2)):
+            fractions.setdefault(int(match.group(2)), []).append((i, int(match.group(1))))
+    for entries in fractions.values():
+        if len({page for _, page in entries}) >= 2:
+            markers.update(i for i, _ in entries)
+    return markers
+
+
+def _page_boundary_lines(lines: List[str], markers: Set[int]) -> Set[str]:
+    """Lines that start or end a page more than once (headers/footers)."""
+    edges = set()  # (index, side): the line after (+1) or before (-1) a boundary
+    for i in [-1, *markers, len(lines)]:
+        for step in (-1, 1):
+            j = i + step
+            while 0 <= j < len(lines) and (not lines[j] or j in markers):
+                j += step
+            if 0 <= j < len(lines):
+                edges.add((j, step))
+
+    counts: Dict[Tuple[str, int], int] = {}
+    for j, step in edges:
+        counts[(lines[j], step)] = counts.get((lines[j], step), 0) + 1
+    return {line for (line, _), count in counts.items() if count >= 2}
+
+
+def _take_lines(lines: List[str], budget: int) -> List[str]:
+    """Leading lines of ``lines`` that fit in ``budget`` tokens (one per newline)."""
+    taken = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        taken.append(line)
+        used += cost
+    return taken
+
+
+def _truncate_chars(text: str, head_tokens: int, tail_tokens: int) -> str:
+    """Character-level head/tail cut for text without usable line breaks."""
+    chars_per_token = len(text) / max(1, estimate_tokens(text))
+    head_chars = int(head_tokens * chars_per_token)
+    tail_chars = int(tail_tokens * chars_per_token)
+    return f"{text[:head_chars]}\n[... truncated ...]\n{text[len(text) - tail_chars:] if tail_chars else ''}"
@@ -6,6 +6,7 @@ Supports YAML config file and environment variables.
 """
 
 import os
+import copy
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional, List
@@ -42,6 +43,12 @@ class LLMProviderConfig:
     default_model: str = ""
     timeout: int = 60
     max_retries: int = 3
+    max_concurrency: int = 4
+    requests_per_minute: int = 0  # 0 = unlimited
+    tokens_per_minute: int = 0  # 0 = unlimited
+    prompt_caching: bool = True  # Send provider cache-control hints where supported
+    circuit_breaker: Dict[str, Any] = field(default_factory=dict)  # See CircuitBreakerConfig
+    retry: Dict[str, Any] = field(default_factory=dict)  # See RetryConfig
 
 
 @dataclass
@@ -71,6 +78,7 @@ class AppConfig:
 
     # Plugin configurations
     llm_providers: Dict[str, LLMProviderConfig] = field(default_factory=dict)
+    llm_failover: List[str] = field(default_factory=list)  # Providers tried in order after the current one
     document_parsers: Dict[str, ParserConfig] = field(default_factory=dict)
     storage: StorageConfig = None
 
@@ -129,7 +137,10 @@ class ConfigManager:
                 ],
                 "default_model": "deepseek-chat",
                 "timeout": 60,
-                "max_retries": 3
+                "max_retries": 3,
+                "max_concurrency": 4,
+                "requests_per_minute": 0,
+                "tokens_per_minute": 0
             },
             "openai": {
                 "provider": "openai",
@@ -142,7 +153,10 @@ class ConfigManager:
                 ],
                 "default_model": "gpt-4o",
                 "timeout": 60,
-                "max_retries": 3
+                "max_retries": 3,
+                "max_concurrency": 4,
+                "requests_per_minute": 0,
+                "tokens_per_minute": 0
             },
             "anthropic": {
                 "provider": "anthropic",
@@ -154,9 +168,13 @@ class ConfigManager:
                 ],
                 "default_model": "claude-sonnet-4-20250514",
                 "timeout": 60,
-                "max_retries": 3
+                "max_retries": 3,
+                "max_concurrency": 4,
+                "requests_per_minute": 0,
+                "tokens_per_minute": 0
             }
         },
+        "llm_failover": [],
         "document_parsers": {
             "pdf": {"parser": "pdf", "enabled": True},
             "docx": {"parser": "docx", "enabled": True},
@@ -181,6 +199,59 @@ class ConfigManager:
                     "description": "Friendly, supportive, encouraging",
                     "system_prompt": "You are a supportive career coach..."
                 }
+            },
+            "hedging": {
+                "enabled": False,
+                "secondary_provider": "",
+                "percentile": 0.9,
+                "initial_delay_ms": 15000,
+                "min_delay_ms": 2000,
+                "max_delay_ms": 30000,
+                "min_samples": 20
+            },
+            "compaction": {
+                "enabled": True,
+                "dedupe_min_chars": 40,
+                "head_ratio": 0.7,
+                "budgets": {"resume": 12000, "jd": 4000}
+            },
+            "prefilter": {
+                "enabled": False,
+                "top_k": 50,
+                "min_relative_score": 0.0,
+                "min_batch_size": 20
+            },
+            "packing": {
+                "enabled": False,
+                "max_items": 8,
+                "max_resume_tokens": 2000,
+                "output_tokens_per_item": 600
+            },
+            "structured_output": {
+                "enabled": True,
+                "reask": True
+            },
+            "near_duplicate": {
+                "enabled": False,
+                "threshold": 0.95,
+                "shingle_size": 3,
+                "max_entries": 1000
+            },
+            "resume_profile": {
+                "enabled": False,
+                "tasks": ["match", "analyze", "diagnose"],
+                "sections": ["summary", "experience", "projects"],
+                "max_section_chars": 1500
+            },
+            "deadline": {
+                "default_seconds": 120,
+                "max_seconds": 600,
+                "endpoints": {
+                    "/batch_parse_resumes": 900,
+                    "/batch_analyze_match": 900,
+                    "/analyze_stream": 0,
+                    "/match_stream": 0
+                }
             }
         },
         "paths": {
@@ -203,7 +274,8 @@ class ConfigManager:
 
     def _load_config(self):
         """Load configuration from file or use defaults."""
-        raw_config = self.DEFAULT_CONFIG.copy()
+        # Deep copy: sections such as analysis are mutable dicts on AppConfig
+        raw_config = copy.deepcopy(self.DEFAULT_CONFIG)
 
         # Load from YAML if available
         if self._config_path and Path(self._config_path).exists():
@@ -279,7 +351,13 @@ class ConfigManager:
                 models=models,
                 default_model=cfg.get("default_model", ""),
                 timeout=cfg.get("timeout", 60),
-                max_retries=cfg.get("max_retries", 3)
+                max_retries=cfg.get("max_retries", 3),
+                max_concurrency=cfg.get("max_concurrency", 4),
+                requests_per_minute=cfg.get("requests_per_minute", 0),
+                tokens_per_minute=cfg.get("tokens_per_minute", 0),
+                prompt_caching=cfg.get("prompt_caching", True),
+                circuit_breaker=cfg.get("circuit_breaker", {}),
+                retry=cfg.get("retry", {})
             )
 
         # Convert document parsers
@@ -306,6 +384,7 @@ class ConfigManager:
             debug=d.get("debug", False),
             log_level=d.get("log_level", "INFO"),
             llm_providers=llm_providers,
+            llm_failover=d.get("llm_failover", []),
             document_parsers=parsers,
             storage=storage,
             analysis=d.get("analysis", {}),
@@ -0,0 +1,108 @@
+"""
+Request Deadlines / 请求截止时间
+
+Request-scoped deadline carried in a context variable, so it follows the
+request through the engine, worker threads (asyncio.to_thread, batch and
+hedging pools copy the context) and provider calls without being passed
+explicitly. Work checks the deadline at stage boundaries and provider
+timeouts shrink to the remaining budget.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Iterable, Iterator, Optional
+
+from src.core.exceptions import DeadlineExceededError
+
+# Absolute time.monotonic() value, or None for no deadline
+_deadline: ContextVar[Optional[float]] = ContextVar("talentos_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the enclosed work to ``seconds`` from now.
+
+    Nested scopes can only shorten the deadline; None or <= 0 leaves the
+    current deadline unchanged.
+    """
+    token = None
+    if seconds and seconds > 0:
+        deadline = time.monotonic() + seconds
+        current = _deadline.get()
+        token = _deadline.set(deadline if current is None else min(deadline, current))
+    try:
+        yield
+    finally:
+        if token is not None:
+            _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the deadline (None = no deadline)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(stage: str):
+    """Raise DeadlineExceededError if the deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError(f"Request deadline exceeded before {stage}", stage=stage)
+
+
+def clamp_timeout(timeout: float, stage: str = "llm") -> float:
+    """
+    A timeout no longer than the remaining budget.
+
+    Raises:
+        DeadlineExceededError: If no budget is left
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    check_deadline(stage)
+    return min(timeout, left)
+
+
+async def within_deadline(awaitable: Awaitable[Any], stage: str) -> Any:
+    """Await with the remaining budget as timeout."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        check_deadline(stage)
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceededError(f"Request deadline exceeded during {stage}", stage=stage)
+
+
+def iter_within_deadline(iterable: Iterable[Any], stage: str) -> Iterator[Any]:
+    """Yield from a (streaming) iterable, checking the deadline before each item."""
+    check_deadline(stage)
+    for item in iterable:
+        check_deadline(stage)
+        yield item
+
+
+async def aiter_within_deadline(iterable: AsyncIterable[Any], stage: str) -> AsyncIterator[Any]:
+    """Async variant of iter_within_deadline(); each item waits at most the remaining budget."""
+    iterator = iterable.__aiter__()
+    try:
+        while True:
+            try:
+                item = await within_deadline(iterator.__anext__(), stage)
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
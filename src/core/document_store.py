@@ -0,0 +1,121 @@
+"""
+Document Store / 文档存储
+
+Parsed uploads stored under a content address: the SHA-256 of the raw
+file bytes. Uploading the same file again returns the stored text and
+metadata without parsing it, and clients can reference the ``doc_id``
+instead of re-sending the bytes.
+
+Documents are JSON files (``<directory>/<doc_id>.json``), like JD
+records. There is no in-memory copy; documents can be large and are
+read once per request.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.interfaces.idocument_parser import ParsedDocument
+
+
+def document_id(data: bytes) -> str:
+    """Content address of an upload (SHA-256 hex of its bytes)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class StoredDocument:
+    """A parsed upload."""
+    doc_id: str  # SHA-256 of the raw bytes
+    filename: str  # Name of the first upload
+    file_type: str
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)  # Parser metadata (pages, tables, ...)
+    size: int = 0  # Bytes
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "StoredDocument":
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+    def summary(self) -> Dict[str, Any]:
+        """Document without the content."""
+        return {
+            "doc_id": self.doc_id,
+            "filename": self.filename,
+            "file_type": self.file_type,
+            "size": self.size,
+            "chars": len(self.content),
+            "created_at": self.created_at
+        }
+
+    def to_parsed(self) -> ParsedDocument:
+        """The document as a parser result."""
+        return ParsedDocument(
+            content=self.content,
+            file_path=self.filename,
+            file_type=self.file_type,
+            metadata=dict(self.metadata)
+        )
+
+
+class DocumentStore:
+    """Stores StoredDocuments as ``<directory>/<doc_id>.json``."""
+
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+
+    def get(self, doc_id: str) -> Optional[StoredDocument]:
+        """A document by id, or None if unknown."""
+        path = self._path(doc_id)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return StoredDocument.from_dict(json.load(f))
+
+    def put(self, doc_id: str, parsed: ParsedDocument, filename: str, size: int = 0) -> StoredDocument:
+        """
+        Store a parse result under its content address.
+
+        Args:
+            doc_id: document_id() of the raw bytes
+            parsed: Parser output
+            filename: Uploaded file name
+            size: Raw size in bytes
+
+        Returns:
+            The stored document
+        """
+        document = StoredDocument(
+            doc_id=doc_id,
+            filename=filename,
+            file_type=parsed.file_type,
+            content=parsed.content,
+            metadata=dict(parsed.metadata or {}),
+            size=size
+        )
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(doc_id)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(document.to_dict(), f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+        return document
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a document; False if it did not exist."""
+        path = self._path(doc_id)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+    def _path(self, doc_id: str) -> Path:
+        return self._directory / f"{Path(doc_id).name}.json"
@@ -6,12 +6,14 @@ Plugin-based architecture for AI resume analysis.
 
 import os
 import sys
+import tempfile
+import threading
 import time
-import hashlib
+import asyncio
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
 # Load .env file
@@ -28,13 +30,42 @@ from src.core.exceptions import (
     TalentOSError,
     PluginNotFoundError,
     LLMProviderError,
+    LLMRateLimitError,
+    CircuitOpenError,
+    DeadlineExceededError,
     UnsupportedFormatError,
+    ParseError,
     AnalysisError,
 )
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.core.batch import BatchExecutor, BatchItemResult, ConcurrencyLimit, ProgressCallback
+from src.core.batch_jobs import BatchJob, BatchJobItem, BatchJobStore
+from src.core.cache_keys import cache_key as content_cache_key, text_digest, weights_component
+from src.core.compaction import CompactionConfig, compact_text
+from src.core.deadline import (
+    aiter_within_deadline,
+    check_deadline,
+    iter_within_deadline,
+    remaining as deadline_remaining,
+)
+from src.core.document_store import DocumentStore, StoredDocument, document_id
+from src.core.fingerprint import FingerprintIndex, NearDuplicateConfig, simhash
+from src.core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from src.core.hedging import Hedger, HedgingPolicy
+from src.core.jd_registry import JDRecord, JDRegistry
+from src.core.json_repair import repair_json
+from src.core.json_stream import JsonStreamParser, iter_events
+from src.core.metrics import MetricsRegistry
+from src.core.prefilter import LexicalMatch, PrefilterConfig, lexical_prefilter
+from src.core.rate_limiter import RateLimiter, get_rate_limiter
+from src.core.resume_profile import ResumeProfile, ResumeProfileConfig, split_sections
+from src.core.retry import ErrorClass, RetryPolicy, RetryState, get_retry_policy
+from src.core.schemas import EXTRACTION_SCHEMA, MATCH_SCHEMA, validate
+from src.core.singleflight import SingleFlight
+from src.core.tokens import estimate_message_tokens, estimate_tokens
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse, BatchRequest, BatchResult, BatchStatus
 from src.interfaces.idocument_parser import IDocumentParser, ParsedDocument
 from src.interfaces.istorage import IStorage
-from src.plugins.llm_providers import get_provider as get_llm_provider
+from src.plugins.llm_providers import PROVIDER_REGISTRY, get_provider as get_llm_provider
 from src.plugins.document_parsers import get_parser_for_file
 from src.plugins.storage import get_storage
 
@@ -55,6 +86,28 @@ class AnalysisResult:
             self.metadata = {}
 
 
+@dataclass
+class _LLMTask:
+    """
+    A prepared LLM request shared by the sync and async code paths.
+
+    Built by the per-operation ``_*_task`` methods; executed by
+    ``_run_task`` / ``_arun_task``.
+    """
+    messages: List[Dict]
+    build_result: Callable[[LLMResponse, float], Any]
+    name: str = "chat"  # Task kind, used to bucket latency for hedging
+    model: Optional[str] = None
+    temperature: float = 0.7
+    cache_key: Optional[str] = None
+    from_cache: Callable[[Any, str], Any] = None
+    to_cache: Callable[[Any], Any] = None
+    options: Dict = field(default_factory=dict)
+    input_tokens_saved: int = 0  # Estimated tokens removed by input compaction
+    response_schema: Optional[Dict] = None  # JSON output schema; malformed replies are not cached
+    near_duplicate: Optional[Tuple[str, int]] = None  # (scope, SimHash) for near-duplicate reuse
+
+
 class TalentOSEngine:
     """
     Main engine for TalentOS.
@@ -65,8 +118,16 @@ class TalentOSEngine:
     - Multiple storage backends (Local, Memory)
     - Request caching for cost optimization
     - Automatic retry with exponential backoff
+    - Per-provider circuit breakers with an ordered failover chain
+    - Offline batch jobs via provider batch APIs (``submit_batch_job``)
+    - Async variants (``a*`` methods) for use from an event loop
     """
 
+    # Share of (context window - max output tokens) one input may take
+    CONTEXT_INPUT_SHARE = 0.8
+    # Allowance for the packing instruction and candidate separators
+    PACK_INSTRUCTION_TOKENS = 200
+
     def __init__(self, config: AppConfig = None, **kwargs):
         """
         Initialize the TalentOS engine.
@@ -77,8 +138,42 @@ class TalentOSEngine:
         """
         self._config = config or get_config()
         self._llm_provider: Optional[ILLMProvider] = None
+        # Non-current providers (hedging targets), created on first use
+        self._providers: Dict[str, ILLMProvider] = {}
+        # Per-provider circuit breakers and retry policies, created on first use
+        self._breakers: Dict[str, Optional[CircuitBreaker]] = {}
+        self._retry_policies: Dict[str, RetryPolicy] = {}
+        # Per-provider batch concurrency, shared by all (sync and async) batches
+        self._batch_limits: Dict[str, ConcurrencyLimit] = {}
+        self._batch_limits_lock = threading.Lock()
         self._storage: Optional[IStorage] = None
         self._personas = self._load_personas()
+        # Identical in-flight requests share one LLM call
+        self._inflight = SingleFlight()
+        self._metrics = MetricsRegistry()
+        self._compaction = CompactionConfig.from_dict(self._config.analysis.get("compaction"))
+        self._prefilter = PrefilterConfig.from_dict(self._config.analysis.get("prefilter"))
+        self._packing = self._config.analysis.get("packing") or {}
+        self._structured = self._config.analysis.get("structured_output") or {}
+        # Downstream tasks may read the cached resume profile instead of the raw text
+        self._profile = ResumeProfileConfig.from_dict(self._config.analysis.get("resume_profile"))
+        # Near-duplicate inputs (re-exported/lightly edited resumes) reuse cached results
+        self._near_duplicate = NearDuplicateConfig.from_dict(self._config.analysis.get("near_duplicate"))
+        self._fingerprints = FingerprintIndex(
+            str(Path(self._config.cache_dir) / "fingerprints.jsonl") if self._near_duplicate.enabled else None,
+            self._near_duplicate.max_entries
+        )
+        # Registered JDs (referenced by jd_id), persisted next to the cache
+        self._jds = JDRegistry(str(Path(self._config.cache_dir) / "jds"))
+        # Parsed uploads by content address (re-uploads skip parsing)
+        self._documents = DocumentStore(str(Path(self._config.cache_dir) / "documents"))
+        # Offline provider batch jobs, persisted next to the cache
+        self._batch_jobs = BatchJobStore(str(Path(self._config.cache_dir) / "batch_jobs"))
+        # Slow primary calls are re-sent to a secondary provider
+        self._hedger = Hedger(
+            HedgingPolicy.from_dict(self._config.analysis.get("hedging")),
+            self._metrics
+        )
 
         # Initialize components
         self._setup_llm_provider(kwargs.get('llm_provider'))
@@ -200,78 +295,112 @@ class TalentOSEngine:
         """
         Optimize a Job Description.
         """
-        # Cache Key
-        if use_cache and self._storage:
-            cache_key = self._generate_cache_key(jd_text, "JD_OPTIMIZATION", "headhunter")
-            cached = self._storage.load(cache_key)
-            if cached:
-                 return AnalysisResult(
-                    report=cached["report"],
-                    score=cached.get("score"),
-                    model=cached.get("model", ""),
-                    tokens_used=cached.get("tokens_used", 0),
-                    cached=True,
-                    metadata={"cache_key": cache_key, "type": "jd_optimization"}
-                )
+        return self._run_task(self._optimize_jd_task(jd_text, use_cache, kwargs))
 
-        # Prompt
-        system_prompt = self._get_jd_optimization_prompt()
-        user_prompt = f"Here is the original JD:\n\n{jd_text}\n\nPlease optimize it."
+    async def aoptimize_jd(
+        self,
+        jd_text: str,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AnalysisResult:
+        """Async variant of optimize_jd()."""
+        return await self._arun_task(self._optimize_jd_task(jd_text, use_cache, kwargs))
 
-        # Get model config
-        model = kwargs.pop("model", None)
-        temperature = kwargs.pop("temperature", 0.7)
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                temperature = model_info.temperature
-                model = model_info.name
+    def register_jd(self, jd_text: str, source: str = "text") -> JDRecord:
+        """
+        Store a parsed JD under its content address.
 
-        # Call LLM
-        start_time = time.time()
-        try:
-            response = self._call_llm_with_retry(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model=model,
-                temperature=temperature,
-                **kwargs
-            )
+        Registering the same content again returns the existing record;
+        its ``jd_id`` can be passed instead of the JD text from then on.
+        """
+        return self._jds.register(jd_text, source)
+
+    def get_jd(self, jd_id: str) -> Optional[JDRecord]:
+        """A registered JD, or None if unknown."""
+        return self._jds.get(jd_id)
+
+    def list_jds(self) -> List[JDRecord]:
+        """All registered JDs, newest first."""
+        return self._jds.list_records()
+
+    def delete_jd(self, jd_id: str) -> bool:
+        """Remove a registered JD; False if it was unknown."""
+        return self._jds.delete(jd_id)
+
+    def optimize_registered_jd(self, jd_id: str, use_cache: bool = True, **kwargs) -> AnalysisResult:
+        """optimize_jd() for a registered JD; the result is kept on the record."""
+        record = self._require_jd(jd_id)
+        cached = self._jd_artifact_result(record, use_cache)
+        if cached:
+            return cached
+        return self._store_jd_optimization(record, self.optimize_jd(record.text, use_cache, **kwargs))
+
+    async def aoptimize_registered_jd(self, jd_id: str, use_cache: bool = True, **kwargs) -> AnalysisResult:
+        """Async variant of optimize_registered_jd()."""
+        record = self._require_jd(jd_id)
+        cached = self._jd_artifact_result(record, use_cache)
+        if cached:
+            return cached
+        return self._store_jd_optimization(record, await self.aoptimize_jd(record.text, use_cache, **kwargs))
+
+    def _require_jd(self, jd_id: str) -> JDRecord:
+        record = self._jds.get(jd_id)
+        if record is None:
+            raise AnalysisError(f"JD '{jd_id}' not found")
+        return record
+
+    def _jd_artifact_result(self, record: JDRecord, use_cache: bool) -> Optional[AnalysisResult]:
+        """The optimized JD stored on a record, or None."""
+        optimized = record.artifacts.get("optimized")
+        if not use_cache or not optimized:
+            return None
+        return self._result_from_cache(optimized, f"jd:{record.jd_id}", type="jd_optimization", jd_id=record.jd_id)
+
+    def _store_jd_optimization(self, record: JDRecord, result: AnalysisResult) -> AnalysisResult:
+        self._jds.set_artifact(record.jd_id, "optimized", self._result_to_cache(result))
+        result.metadata["jd_id"] = record.jd_id
+        return result
+
+    def _optimize_jd_task(self, jd_text: str, use_cache: bool, kwargs: Dict) -> _LLMTask:
+        """Prepare the JD optimization request."""
+        jd_text, saved = self._compact_input(jd_text, "jd")
+        system_prompt = self._get_jd_optimization_prompt()
+        user_prompt = f"Here is the original JD:\n\n{jd_text}\n\nPlease optimize it."
+        model, temperature = self._resolve_model_settings(kwargs, 0.7)
 
-            latency_ms = (time.time() - start_time) * 1000
+        def build(response: LLMResponse, latency_ms: float) -> AnalysisResult:
             report = response.content
-            score = self._extract_score(report) # Extract clarity score if possible
-
-            result = AnalysisResult(
+            return AnalysisResult(
                 report=report,
-                score=score,
+                score=self._extract_score(report),  # Extract clarity score if possible
                 model=response.model,
                 tokens_used=response.tokens_used,
                 latency_ms=latency_ms,
                 cached=False,
-                metadata={"type": "jd_optimization", "provider": self._current_provider}
+                metadata={
+                    "type": "jd_optimization",
+                    "provider": response.provider or self._current_provider,
+                    "cached_prompt_tokens": response.cached_tokens
+                }
             )
 
-            # Save to cache
-            if use_cache and self._storage:
-                cache_key = self._generate_cache_key(jd_text, "JD_OPTIMIZATION", "headhunter")
-                self._storage.save(
-                    cache_key,
-                    {
-                        "report": report,
-                        "score": score,
-                        "model": response.model,
-                        "tokens_used": response.tokens_used
-                    },
-                    ttl=self._config.storage.cache_ttl
-                )
-
-            return result
-
-        except LLMProviderError as e:
-                raise AnalysisError(f"LLM provider error: {e}")
+        return _LLMTask(
+            name="optimize_jd",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            model=model,
+            temperature=temperature,
+            cache_key=self._task_cache_key(use_cache, "jd_optimization", jd_text),
+            build_result=build,
+            input_tokens_saved=saved,
+            from_cache=lambda cached, key: self._result_from_cache(
+                cached, key, type="jd_optimization"
+            ),
+            to_cache=self._result_to_cache,
+            options=kwargs
+        )
 
     def _get_extraction_prompt(self) -> str:
         """Get prompt for resume data extraction."""
@@ -302,44 +431,92 @@ class TalentOSEngine:
         """
         Extract structured data from resume.
         """
-        # Cache Key
-        if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text, "EXTRACTION", "parser")
-            cached = self._storage.load(cache_key)
-            if cached:
-                return cached
+        return self._run_task(self._extract_task(resume_text, use_cache, kwargs))
 
-        # Prompt
-        system_prompt = self._get_extraction_prompt()
-        user_prompt = f"Resume Content:\n\n{resume_text}"
+    async def aextract_resume_fields(
+        self,
+        resume_text: str,
+        use_cache: bool = True,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Async variant of extract_resume_fields()."""
+        return await self._arun_task(self._extract_task(resume_text, use_cache, kwargs))
 
-        # Get model config
-        model = kwargs.pop("model", None)
-        temperature = kwargs.pop("temperature", 0.1) # Low temp for extraction
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                model = model_info.name
+    def get_resume_profile(self, resume_text: str, use_cache: bool = True) -> ResumeProfile:
+        """
+        Structured profile of a resume: extracted fields plus evidence sections.
+
+        The fields come from extract_resume_fields, cached under the
+        resume's content key, so a resume is sent to the LLM once however
+        many JDs it is matched against.
+        """
+        return self._build_profile(resume_text, self.extract_resume_fields(resume_text, use_cache))
+
+    async def aget_resume_profile(self, resume_text: str, use_cache: bool = True) -> ResumeProfile:
+        """Async variant of get_resume_profile()."""
+        return self._build_profile(resume_text, await self.aextract_resume_fields(resume_text, use_cache))
+
+    @staticmethod
+    def _build_profile(resume_text: str, fields: Dict[str, Any]) -> ResumeProfile:
+        return ResumeProfile(
+            digest=text_digest(resume_text),
+            fields={k: v for k, v in fields.items() if k != "_metadata"},
+            sections=split_sections(resume_text)
+        )
 
+    def _use_profile(self, kind: str, use_profile: Optional[bool], use_cache: bool = True) -> bool:
+        """
+        Whether a task of this kind should read the resume profile.
+
+        The configured default only applies with use_cache: an uncached
+        profile costs an extra extraction call on every request.
+        """
+        if use_profile is None:
+            return use_cache and self._profile.enabled and kind in self._profile.tasks
+        return use_profile
+
+    def _resume_input(self, resume_text: str, kind: str, use_profile: Optional[bool], use_cache: bool) -> str:
+        """Resume text to prompt with: the rendered profile, or the raw text."""
+        if not resume_text or not self._use_profile(kind, use_profile, use_cache):
+            return resume_text
         try:
-            response = self._call_llm_with_retry(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model=model,
-                temperature=temperature,
-                **kwargs
-            )
+            profile = self.get_resume_profile(resume_text, use_cache)
+        except AnalysisError:
+            profile = None
+        return self._profile_text(resume_text, profile)
+
+    async def _aresume_input(self, resume_text: str, kind: str, use_profile: Optional[bool], use_cache: bool) -> str:
+        """Async variant of _resume_input()."""
+        if not resume_text or not self._use_profile(kind, use_profile, use_cache):
+            return resume_text
+        try:
+            profile = await self.aget_resume_profile(resume_text, use_cache)
+        except AnalysisError:
+            profile = None
+        return self._profile_text(resume_text, profile)
+
+    def _profile_text(self, resume_text: str, profile: Optional[ResumeProfile]) -> str:
+        """Rendered profile, or the raw text if the profile could not be built."""
+        if profile is None or not profile.usable:
+            self._metrics.increment("resume_profile.fallbacks")
+            return resume_text
+        text = profile.render(self._profile.sections, self._profile.max_section_chars)
+        self._metrics.increment("resume_profile.used")
+        self._metrics.increment(
+            "resume_profile.tokens_saved", max(0, estimate_tokens(resume_text) - estimate_tokens(text))
+        )
+        return text
+
+    def _extract_task(self, resume_text: str, use_cache: bool, kwargs: Dict) -> _LLMTask:
+        """Prepare the resume field extraction request."""
+        resume_text, saved = self._compact_input(resume_text, "resume")
+        system_prompt = self._get_extraction_prompt()
+        user_prompt = f"Resume Content:\n\n{resume_text}"
+        # Low temp for extraction; keep it even if the model config says otherwise
+        model, temperature = self._resolve_model_settings(kwargs, 0.1, use_config_temperature=False)
 
-            # Parse JSON
-            content = response.content.strip()
-            # Handle markdown code blocks if present
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
+        def build(response: LLMResponse, latency_ms: float) -> Dict[str, Any]:
+            content = self._strip_json_fence(response.content)
             try:
                 data = json.loads(content)
             except json.JSONDecodeError:
@@ -349,18 +526,28 @@ class TalentOSEngine:
             # Add metadata
             data["_metadata"] = {
                 "model": response.model,
-                "tokens_used": response.tokens_used
+                "tokens_used": response.tokens_used,
+                "cached_prompt_tokens": response.cached_tokens
             }
-
-            # Save to cache
-            if use_cache and self._storage:
-                cache_key = self._generate_cache_key(resume_text, "EXTRACTION", "parser")
-                self._storage.save(cache_key, data, ttl=self._config.storage.cache_ttl)
-
             return data
 
-        except LLMProviderError as e:
-            raise AnalysisError(f"LLM provider error: {e}")
+        cache_key = self._task_cache_key(use_cache, "extraction", resume_text)
+        return _LLMTask(
+            name="extract",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            model=model,
+            temperature=temperature,
+            cache_key=cache_key,
+            # No near-duplicate reuse: the fingerprint ignores contact
+            # details, which are exactly what extraction returns
+            build_result=build,
+            response_schema=EXTRACTION_SCHEMA,
+            input_tokens_saved=saved,
+            options=kwargs
+        )
 
     def _get_match_prompt(self) -> str:
         """Get prompt for candidate-job matching."""
@@ -395,29 +582,59 @@ class TalentOSEngine:
         jd_text: str,
         use_cache: bool = True,
         weights: Dict[str, int] = None,
+        use_profile: Optional[bool] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Evaluate candidate match against JD.
+
+        With use_profile (None = ``analysis.resume_profile``), the resume
+        is sent as its cached profile (see get_resume_profile).
         """
         if not jd_text or len(jd_text.strip()) < 10:
-             # Fallback if no JD: just extract
-             return self.extract_resume_fields(resume_text, use_cache, **kwargs)
+            # Fallback if no JD: just extract
+            return self.extract_resume_fields(resume_text, use_cache, **kwargs)
+
+        resume_text = self._resume_input(resume_text, "match", use_profile, use_cache)
+        return self._run_task(self._match_task(resume_text, jd_text, use_cache, weights, kwargs))
+
+    async def aevaluate_match(
+        self,
+        resume_text: str,
+        jd_text: str,
+        use_cache: bool = True,
+        weights: Dict[str, int] = None,
+        use_profile: Optional[bool] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Async variant of evaluate_match()."""
+        if not jd_text or len(jd_text.strip()) < 10:
+            return await self.aextract_resume_fields(resume_text, use_cache, **kwargs)
+
+        resume_text = await self._aresume_input(resume_text, "match", use_profile, use_cache)
+        return await self._arun_task(self._match_task(resume_text, jd_text, use_cache, weights, kwargs))
+
+    def _match_task(
+        self,
+        resume_text: str,
+        jd_text: str,
+        use_cache: bool,
+        weights: Optional[Dict[str, int]],
+        kwargs: Dict
+    ) -> _LLMTask:
+        """Prepare the candidate-JD match request."""
+        resume_text, resume_saved = self._compact_input(resume_text, "resume")
+        jd_text, jd_saved = self._compact_input(jd_text, "jd")
 
         # Default weights if not provided
         if not weights:
             weights = {"skills": 30, "experience": 30, "education": 20, "soft_skills": 20}
 
-        # Cache Key (include weights in key to avoid stale cache on weight change)
-        weight_str = f"{weights.get('skills')}-{weights.get('experience')}-{weights.get('education')}"
-        if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text + jd_text + weight_str, "MATCH_EVAL_CN_V2", "recruiter")
-            cached = self._storage.load(cache_key)
-            if cached:
-                return cached
+        # Weights are part of the key to avoid stale cache on weight change
+        weight_key = weights_component(weights)
 
         system_prompt = self._get_match_prompt()
-        
+
         # Add weights to user prompt
         weight_instruction = f"""
         SCORING WEIGHTS PREFERENCE:
@@ -428,38 +645,33 @@ class TalentOSEngine:
         
         Please calculate the overall score based on these weights.
         """
-        
-        user_prompt = f"JOB DESCRIPTION:\n{jd_text}\n\nSCORING WEIGHTS:\n{weight_instruction}\n\nCANDIDATE RESUME:\n{resume_text}"
 
-        try:
-            response = self._call_llm_with_retry(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.2, # Low temp for consistent scoring
-                **kwargs
-            )
+        # JD + weights form the shared prefix; the resume goes last
+        messages = self._prefix_cached_messages(
+            static=system_prompt,
+            shared=f"JOB DESCRIPTION:\n{jd_text}\n\nSCORING WEIGHTS:\n{weight_instruction}",
+            variable=f"CANDIDATE RESUME:\n{resume_text}"
+        )
 
-            content = response.content.strip()
-            # Cleanup JSON
-            if content.startswith("```json"): content = content[7:]
-            if content.endswith("```"): content = content[:-3]
-            
+        def build(response: LLMResponse, latency_ms: float) -> Dict[str, Any]:
+            content = self._strip_json_fence(response.content)
             try:
-                data = json.loads(content)
-            except:
-                data = {"score": 0, "status": "Error", "reason": "Failed to parse analysis", "raw": content}
-
-            # Save to cache
-            if use_cache and self._storage:
-                cache_key = self._generate_cache_key(resume_text + jd_text + weight_str, "MATCH_EVAL_CN_V2", "recruiter")
-                self._storage.save(cache_key, data, ttl=self._config.storage.cache_ttl)
-
-            return data
-
-        except LLMProviderError as e:
-            raise AnalysisError(f"LLM provider error: {e}")
+                return json.loads(content)
+            except json.JSONDecodeError:
+                return {"score": 0, "status": "Error", "reason": "Failed to parse analysis", "raw": content}
+
+        cache_key = self._task_cache_key(use_cache, "match_eval_cn_v2", resume_text, jd_text, weight_key)
+        return _LLMTask(
+            name="match",
+            messages=messages,
+            temperature=0.2,  # Low temp for consistent scoring
+            cache_key=cache_key,
+            near_duplicate=self._near_duplicate_key(cache_key, resume_text, "match_eval_cn_v2", jd_text, weight_key),
+            build_result=build,
+            input_tokens_saved=resume_saved + jd_saved,
+            response_schema=MATCH_SCHEMA,
+            options=kwargs
+        )
 
     def generate_message(
         self,
@@ -471,13 +683,49 @@ class TalentOSEngine:
         """
         Generate HR communication message (Reject/Invite).
         """
+        prompt = self._message_prompt(msg_type, candidate_data, job_data, options)
+        if prompt is None:
+            return "Invalid message type."
+
+        response = self._call_llm_with_retry(
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7
+        )
+        return response.content
+
+    async def agenerate_message(
+        self,
+        msg_type: str,
+        candidate_data: Dict,
+        job_data: Dict,
+        options: Dict
+    ) -> str:
+        """Async variant of generate_message()."""
+        prompt = self._message_prompt(msg_type, candidate_data, job_data, options)
+        if prompt is None:
+            return "Invalid message type."
+
+        response = await self._acall_llm_with_retry(
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7
+        )
+        return response.content
+
+    def _message_prompt(
+        self,
+        msg_type: str,
+        candidate_data: Dict,
+        job_data: Dict,
+        options: Dict
+    ) -> Optional[str]:
+        """Build the prompt for an HR message, or None for unknown types."""
         name = candidate_data.get("name", "候选人")
         role = job_data.get("role", "该职位")
         
         if msg_type == "reject":
             style = options.get("style", "Professional")
             reason = candidate_data.get("reason", "暂时不匹配")
-            prompt = f"""
+            return f"""
             Write a {style} rejection email for {name} applying for {role}.
             Context: {reason}.
             Keep it polite, professional, and concise.
@@ -487,7 +735,7 @@ class TalentOSEngine:
             time_slot = options.get("time", "待定")
             interviewer = options.get("interviewer", "")
             tips = options.get("tips", "")
-            prompt = f"""
+            return f"""
             Write an interview invitation email for {name} applying for {role}.
             Details:
             - Time: {time_slot}
@@ -496,26 +744,26 @@ class TalentOSEngine:
             Keep it professional and encouraging.
             LANGUAGE: CHINESE (Simplified).
             """
-        else:
-            return "Invalid message type."
+        return None
 
+    def translate_text(self, text: str, target_lang: str = "Chinese") -> str:
+        """Translate text to target language."""
+        prompt = f"Translate the following text to {target_lang}. Maintain professional tone.\n\n{text}"
         response = self._call_llm_with_retry(
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.7
+            temperature=0.3
         )
         return response.content
 
-    def translate_text(self, text: str, target_lang: str = "Chinese") -> str:
-        """Translate text to target language."""
+    async def atranslate_text(self, text: str, target_lang: str = "Chinese") -> str:
+        """Async variant of translate_text()."""
         prompt = f"Translate the following text to {target_lang}. Maintain professional tone.\n\n{text}"
-        response = self._call_llm_with_retry(
+        response = await self._acall_llm_with_retry(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3
         )
         return response.content
 
-
-
     def _setup_llm_provider(self, provider_name: str = None):
         """Initialize the LLM provider."""
         provider = provider_name or self._get_default_provider()
@@ -557,9 +805,10 @@ class TalentOSEngine:
             return
 
         try:
+            # Backend parameters come from storage.options; the directory from paths.cache_dir
             self._storage = get_storage(
                 self._config.storage.backend,
-                cache_dir=self._config.cache_dir
+                **{**(self._config.storage.options or {}), "cache_dir": self._config.cache_dir}
             )
         except Exception as e:
             print(f"Warning: Failed to initialize storage: {e}")
@@ -580,6 +829,7 @@ class TalentOSEngine:
         jd_text: str,
         persona: str = "hrbp",
         use_cache: bool = True,
+        use_profile: Optional[bool] = None,
         **kwargs
     ) -> AnalysisResult:
         """
@@ -590,88 +840,84 @@ class TalentOSEngine:
             jd_text: Job description content as text
             persona: Analysis persona ("hrbp" or "coach")
             use_cache: Whether to use cached results
+            use_profile: Send the cached resume profile instead of the raw
+                text (None = ``analysis.resume_profile``)
             **kwargs: Additional parameters (temperature, model, etc.)
 
         Returns:
             AnalysisResult object with report and metadata
         """
-        # Check cache first
-        if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text, jd_text, persona)
-            cached = self._storage.load(cache_key)
-            if cached:
-                return AnalysisResult(
-                    report=cached["report"],
-                    score=cached.get("score"),
-                    model=cached.get("model", ""),
-                    tokens_used=cached.get("tokens_used", 0),
-                    cached=True,
-                    metadata={"cache_key": cache_key}
-                )
+        resume_text = self._resume_input(resume_text, "analyze", use_profile, use_cache)
+        return self._run_task(self._analyze_task(resume_text, jd_text, persona, use_cache, kwargs))
+
+    async def aanalyze(
+        self,
+        resume_text: str,
+        jd_text: str,
+        persona: str = "hrbp",
+        use_cache: bool = True,
+        use_profile: Optional[bool] = None,
+        **kwargs
+    ) -> AnalysisResult:
+        """Async variant of analyze()."""
+        resume_text = await self._aresume_input(resume_text, "analyze", use_profile, use_cache)
+        return await self._arun_task(self._analyze_task(resume_text, jd_text, persona, use_cache, kwargs))
+
+    def _analyze_task(
+        self,
+        resume_text: str,
+        jd_text: str,
+        persona: str,
+        use_cache: bool,
+        kwargs: Dict
+    ) -> _LLMTask:
+        """Prepare the resume-vs-JD analysis request."""
+        resume_text, resume_saved = self._compact_input(resume_text, "resume")
+        jd_text, jd_saved = self._compact_input(jd_text, "jd")
+
+        # Cache key uses the requested persona, before fallback
+        cache_key = self._task_cache_key(use_cache, "analyze", resume_text, jd_text, persona)
 
         # Get persona
         if persona not in self._personas:
             persona = "hrbp"
         persona_data = self._personas[persona]
 
-        # Construct prompt
-        prompt = self._construct_prompt(resume_text, jd_text, persona_data)
+        # Construct messages
+        messages = self._construct_messages(resume_text, jd_text, persona_data)
 
         # Get model and temperature from kwargs or config
-        model = kwargs.pop("model", None)
-        temperature = kwargs.pop("temperature", 0.7)
-
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                temperature = model_info.temperature
-                model = model_info.name
-
-        # Call LLM with retry
-        start_time = time.time()
-        try:
-            response = self._call_llm_with_retry(
-                messages=[
-                    {"role": "system", "content": persona_data["system_prompt"]},
-                    {"role": "user", "content": prompt}
-                ],
-                model=model,
-                temperature=temperature,
-                **kwargs
-            )
+        model, temperature = self._resolve_model_settings(kwargs, 0.7)
 
-            latency_ms = (time.time() - start_time) * 1000
+        def build(response: LLMResponse, latency_ms: float) -> AnalysisResult:
             report = response.content
-            score = self._extract_score(report)
-
-            result = AnalysisResult(
+            return AnalysisResult(
                 report=report,
-                score=score,
+                score=self._extract_score(report),
                 model=response.model,
                 tokens_used=response.tokens_used,
                 latency_ms=latency_ms,
                 cached=False,
-                metadata={"persona": persona, "provider": self._current_provider}
+                metadata={
+                    "persona": persona,
+                    "provider": response.provider or self._current_provider,
+                    "cached_prompt_tokens": response.cached_tokens
+                }
             )
 
-            # Save to cache
-            if use_cache and self._storage:
-                cache_key = self._generate_cache_key(resume_text, jd_text, persona)
-                self._storage.save(
-                    cache_key,
-                    {
-                        "report": report,
-                        "score": score,
-                        "model": response.model,
-                        "tokens_used": response.tokens_used
-                    },
-                    ttl=self._config.storage.cache_ttl
-                )
-
-            return result
-
-        except LLMProviderError as e:
-            raise AnalysisError(f"LLM provider error: {e}")
+        return _LLMTask(
+            name="analyze",
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            cache_key=cache_key,
+            near_duplicate=self._near_duplicate_key(cache_key, resume_text, "analyze", jd_text, persona),
+            build_result=build,
+            input_tokens_saved=resume_saved + jd_saved,
+            from_cache=lambda cached, key: self._result_from_cache(cached, key),
+            to_cache=self._result_to_cache,
+            options=kwargs
+        )
 
     def analyze_resume_stream(
         self,
@@ -686,47 +932,33 @@ class TalentOSEngine:
         Yields chunks of text.
         """
         # Check if cache exists
-        if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text, jd_text, persona)
-            cached = self._storage.load(cache_key)
+        task = self._analyze_task(resume_text, jd_text, persona, use_cache, kwargs)
+        if task.cache_key:
+            cached = self._storage.load(task.cache_key)
             if cached:
                 yield cached["report"]
                 return
 
-        # Get persona
-        if persona not in self._personas:
-            persona = "hrbp"
-        persona_data = self._personas[persona]
-
-        # Construct prompt
-        prompt = self._construct_prompt(resume_text, jd_text, persona_data)
-
-        # Get model config
-        model = kwargs.pop("model", None)
-        temperature = kwargs.pop("temperature", 0.7)
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                temperature = model_info.temperature
-                model = model_info.name
-
         # Stream response
         full_report = []
         try:
+            limiter = self._rate_limiter()
+            if limiter:
+                limiter.acquire(estimate_message_tokens(task.messages))
+            check_deadline("llm")
             stream = self._llm_provider.chat_stream(
-                messages=[
-                    {"role": "system", "content": persona_data["system_prompt"]},
-                    {"role": "user", "content": prompt}
-                ],
-                model=model,
-                temperature=temperature,
-                **kwargs
+                messages=task.messages,
+                model=task.model,
+                temperature=task.temperature,
+                **task.options
             )
 
-            for chunk in stream:
+            for chunk in iter_within_deadline(stream, "llm_stream"):
                 full_report.append(chunk)
                 yield chunk
 
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             # If streaming fails mid-way, we might yield an error message or raise
             # But the client might have already received partial data.
@@ -735,159 +967,1070 @@ class TalentOSEngine:
             raise AnalysisError(f"Streaming failed: {e}")
 
         # Save to cache after complete
-        if use_cache and self._storage:
-            report = "".join(full_report)
-            score = self._extract_score(report)
-            cache_key = self._generate_cache_key(resume_text, jd_text, persona)
-            self._storage.save(
-                cache_key,
-                {
-                    "report": report,
-                    "score": score,
-                    "model": model,
-                    "tokens_used": 0 # Estimate or skip
-                },
-                ttl=self._config.storage.cache_ttl
-            )
+        self._save_stream_report(task, "".join(full_report))
 
-    def diagnose_resume(
+    async def aanalyze_resume_stream(
         self,
         resume_text: str,
+        jd_text: str = None,
         persona: str = "hrbp",
         use_cache: bool = True,
         **kwargs
-    ) -> AnalysisResult:
-        """
-        Perform a deep diagnostic of the resume (No JD required).
-        """
-        # Diagnostic Prompt
-        system_prompt = self._get_diagnostic_prompt()
-        user_prompt = f"Here is the candidate's resume:\n\n{resume_text}\n\nPlease perform the Deep Diagnostic."
-
-        # Cache Key (Use "DIAGNOSTIC" as jd_text placeholder)
-        if use_cache and self._storage:
-            cache_key = self._generate_cache_key(resume_text, "DIAGNOSTIC", persona)
-            cached = self._storage.load(cache_key)
+    ):
+        """Async variant of analyze_resume_stream(); storage I/O runs in a worker thread."""
+        task = self._analyze_task(resume_text, jd_text, persona, use_cache, kwargs)
+        if task.cache_key:
+            cached = await asyncio.to_thread(self._storage.load, task.cache_key)
             if cached:
-                return AnalysisResult(
-                    report=cached["report"],
-                    score=None, # Diagnostic usually doesn't have a score
-                    model=cached.get("model", ""),
-                    tokens_used=cached.get("tokens_used", 0),
-                    cached=True,
-                    metadata={"cache_key": cache_key, "type": "diagnostic"}
-                )
-
-        # Get model config (pop to avoid passing to LLM twice)
-        model = kwargs.pop("model", None)
-        temperature = kwargs.pop("temperature", 0.7)
-        if self._config.get_model_config(self._current_provider):
-            model_info = self._config.get_model_config(self._current_provider, model)
-            if model_info:
-                temperature = model_info.temperature
-                model = model_info.name
+                yield cached["report"]
+                return
 
-        # Call LLM
-        start_time = time.time()
+        full_report = []
         try:
-            response = self._call_llm_with_retry(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model=model,
-                temperature=temperature,
-                **kwargs
+            limiter = self._rate_limiter()
+            if limiter:
+                await limiter.aacquire(estimate_message_tokens(task.messages))
+            check_deadline("llm")
+            stream = self._llm_provider.achat_stream(
+                messages=task.messages,
+                model=task.model,
+                temperature=task.temperature,
+                **task.options
             )
 
-            latency_ms = (time.time() - start_time) * 1000
-            report = response.content
-            
-            result = AnalysisResult(
-                report=report,
-                score=None,
-                model=response.model,
-                tokens_used=response.tokens_used,
-                latency_ms=latency_ms,
-                cached=False,
-                metadata={"persona": persona, "provider": self._current_provider, "type": "diagnostic"}
-            )
+            async for chunk in aiter_within_deadline(stream, "llm_stream"):
+                full_report.append(chunk)
+                yield chunk
 
-            # Save to cache
-            if use_cache and self._storage:
-                cache_key = self._generate_cache_key(resume_text, "DIAGNOSTIC", persona)
-                self._storage.save(
-                    cache_key,
-                    {
-                        "report": report,
-                        "score": None,
-                        "model": response.model,
-                        "tokens_used": response.tokens_used
-                    },
-                    ttl=self._config.storage.cache_ttl
-                )
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"Streaming Error: {e}")
+            raise AnalysisError(f"Streaming failed: {e}")
 
-            return result
+        await asyncio.to_thread(self._save_stream_report, task, "".join(full_report))
 
-        except LLMProviderError as e:
-            raise AnalysisError(f"LLM provider error: {e}")
+    def _save_stream_report(self, task: _LLMTask, report: str):
+        """Cache a completed streamed report."""
+        if not task.cache_key:
+            return
+        self._storage.save(
+            task.cache_key,
+            {
+                "report": report,
+                "score": self._extract_score(report),
+                "model": task.model,
+                "tokens_used": 0  # Estimate or skip
+            },
+            ttl=self._config.storage.cache_ttl
+        )
 
-    def _call_llm_with_retry(
+    def evaluate_match_stream(
         self,
-        messages: List[Dict],
-        model: str = None,
-        temperature: float = 0.7,
+        resume_text: str,
+        jd_text: str,
+        use_cache: bool = True,
+        weights: Dict[str, int] = None,
         **kwargs
-    ) -> LLMResponse:
+    ):
         """
-        Call LLM with automatic retry on failure.
-
-        Implements exponential backoff for rate limits.
+        Streaming variant of evaluate_match().
+
+        Yields event dicts while the JSON answer is generated:
+        - {"event": "field", "path": "score", "value": 85} as soon as a
+          top-level field or an entry of one ("dimensions.skills",
+          "strengths.0", ...) is complete
+        - {"event": "result", "value": {...}} last, with the full match
+          dict (cached like evaluate_match results)
         """
-        # Safety: Remove any remaining duplicate args
-        kwargs.pop('model', None)
-        kwargs.pop('temperature', None)
-
-        provider_config = self._config.get_llm_provider_config(self._current_provider)
-        max_retries = provider_config.max_retries if provider_config else 3
+        task = self._match_stream_task(resume_text, jd_text, use_cache, weights, kwargs)
+        cached = self._load_cached(task)
+        if cached is not None:
+            yield from self._replay_json_events(cached)
+            return
 
-        last_error = None
-        for attempt in range(max_retries):
+        parser = JsonStreamParser()
+        chunks = []
+        start_time = time.time()
+        try:
+            limiter = self._rate_limiter()
+            if limiter:
+                limiter.acquire(estimate_message_tokens(task.messages))
+            check_deadline("llm")
+            stream = self._llm_provider.chat_stream(
+                messages=task.messages,
+                model=task.model,
+                temperature=task.temperature,
+                **task.options
+            )
+
+            for chunk in iter_within_deadline(stream, "llm_stream"):
+                chunks.append(chunk)
+                parser, events = self._feed_json_stream(parser, chunk)
+                yield from events
+
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"Streaming Error: {e}")
+            raise AnalysisError(f"Streaming failed: {e}")
+
+        yield self._finish_json_stream(task, "".join(chunks), start_time)
+
+    async def aevaluate_match_stream(
+        self,
+        resume_text: str,
+        jd_text: str,
+        use_cache: bool = True,
+        weights: Dict[str, int] = None,
+        **kwargs
+    ):
+        """Async variant of evaluate_match_stream(); storage I/O runs in a worker thread."""
+        task = self._match_stream_task(resume_text, jd_text, use_cache, weights, kwargs)
+        cached = await asyncio.to_thread(self._load_cached, task)
+        if cached is not None:
+            for event in self._replay_json_events(cached):
+                yield event
+            return
+
+        parser = JsonStreamParser()
+        chunks = []
+        start_time = time.time()
+        try:
+            limiter = self._rate_limiter()
+            if limiter:
+                await limiter.aacquire(estimate_message_tokens(task.messages))
+            check_deadline("llm")
+            stream = self._llm_provider.achat_stream(
+                messages=task.messages,
+                model=task.model,
+                temperature=task.temperature,
+                **task.options
+            )
+
+            async for chunk in aiter_within_deadline(stream, "llm_stream"):
+                chunks.append(chunk)
+                parser, events = self._feed_json_stream(parser, chunk)
+                for event in events:
+                    yield event
+
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"Streaming Error: {e}")
+            raise AnalysisError(f"Streaming failed: {e}")
+
+        yield await asyncio.to_thread(self._finish_json_stream, task, "".join(chunks), start_time)
+
+    def _match_stream_task(
+        self,
+        resume_text: str,
+        jd_text: str,
+        use_cache: bool,
+        weights: Optional[Dict[str, int]],
+        kwargs: Dict
+    ) -> _LLMTask:
+        """Match task for streaming; field extraction when there is no usable JD."""
+        if not jd_text or len(jd_text.strip()) < 10:
+            return self._extract_task(resume_text, use_cache, kwargs)
+        return self._match_task(resume_text, jd_text, use_cache, weights, kwargs)
+
+    @staticmethod
+    def _feed_json_stream(
+        parser: Optional[JsonStreamParser],
+        chunk: str
+    ) -> Tuple[Optional[JsonStreamParser], List[Dict[str, Any]]]:
+        """
+        Feed one chunk; returns the parser (None once the output turned out
+        not to be valid JSON) and the field events completed by the chunk.
+        """
+        if parser is None:
+            return None, []
+        try:
+            events = parser.feed(chunk)
+        except ValueError:
+            # Keep collecting; the final result falls back to the regular parser
+            return None, []
+        return parser, [{"event": "field", "path": e.key, "value": e.value} for e in events]
+
+    def _finish_json_stream(self, task: _LLMTask, content: str, start_time: float) -> Dict[str, Any]:
+        """Build and cache the result of a streamed task; returns the result event."""
+        response = LLMResponse(
+            content=content,
+            model=task.model or "",
+            tokens_used=estimate_message_tokens(task.messages) + estimate_tokens(content),
+            latency_ms=(time.time() - start_time) * 1000
+        )
+        return {"event": "result", "value": self._finish_task(task, response, start_time)}
+
+    @staticmethod
+    def _replay_json_events(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Field and result events for an already complete (cached) result."""
+        fields = {k: v for k, v in result.items() if k != "_metadata"}
+        events = [{"event": "field", "path": e.key, "value": e.value} for e in iter_events(fields)]
+        events.append({"event": "result", "value": result})
+        return events
+
+    def diagnose_resume(
+        self,
+        resume_text: str,
+        persona: str = "hrbp",
+        use_cache: bool = True,
+        use_profile: Optional[bool] = None,
+        **kwargs
+    ) -> AnalysisResult:
+        """
+        Perform a deep diagnostic of the resume (No JD required).
+        """
+        resume_text = self._resume_input(resume_text, "diagnose", use_profile, use_cache)
+        return self._run_task(self._diagnose_task(resume_text, persona, use_cache, kwargs))
+
+    async def adiagnose_resume(
+        self,
+        resume_text: str,
+        persona: str = "hrbp",
+        use_cache: bool = True,
+        use_profile: Optional[bool] = None,
+        **kwargs
+    ) -> AnalysisResult:
+        """Async variant of diagnose_resume()."""
+        resume_text = await self._aresume_input(resume_text, "diagnose", use_profile, use_cache)
+        return await self._arun_task(self._diagnose_task(resume_text, persona, use_cache, kwargs))
+
+    def _diagnose_task(
+        self,
+        resume_text: str,
+        persona: str,
+        use_cache: bool,
+        kwargs: Dict
+    ) -> _LLMTask:
+        """Prepare the deep diagnostic request."""
+        resume_text, saved = self._compact_input(resume_text, "resume")
+
+        # Diagnostic Prompt
+        system_prompt = self._get_diagnostic_prompt()
+        user_prompt = f"Here is the candidate's resume:\n\n{resume_text}\n\nPlease perform the Deep Diagnostic."
+
+        # Get model config (pop to avoid passing to LLM twice)
+        model, temperature = self._resolve_model_settings(kwargs, 0.7)
+
+        def build(response: LLMResponse, latency_ms: float) -> AnalysisResult:
+            return AnalysisResult(
+                report=response.content,
+                score=None,
+                model=response.model,
+                tokens_used=response.tokens_used,
+                latency_ms=latency_ms,
+                cached=False,
+                metadata={
+                    "persona": persona,
+                    "provider": response.provider or self._current_provider,
+                    "type": "diagnostic",
+                    "cached_prompt_tokens": response.cached_tokens
+                }
+            )
+
+        def from_cache(cached: Dict, key: str) -> AnalysisResult:
+            result = self._result_from_cache(cached, key, type="diagnostic")
+            result.score = None  # Diagnostic usually doesn't have a score
+            return result
+
+        return _LLMTask(
+            name="diagnose",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            model=model,
+            temperature=temperature,
+            cache_key=self._task_cache_key(use_cache, "diagnostic", resume_text, persona),
+            build_result=build,
+            input_tokens_saved=saved,
+            from_cache=from_cache,
+            to_cache=self._result_to_cache,
+            options=kwargs
+        )
+
+    def _run_task(self, task: _LLMTask) -> Any:
+        """
+        Execute a prepared task: cache lookup, LLM call, cache write-back.
+
+        Concurrent identical requests (same cache key) are coalesced into a
+        single LLM call; followers get the leader's result marked as coalesced.
+        """
+        check_deadline("cache")
+        cached = self._load_cached(task)
+        if cached is not None:
+            return cached
+
+        if not task.cache_key:
+            return self._execute_task(task)
+
+        result, shared = self._inflight.do(
+            task.cache_key,
+            lambda: self._load_cached(task) or self._execute_task(task)
+        )
+        return self._mark_coalesced(result) if shared else result
+
+    async def _arun_task(self, task: _LLMTask) -> Any:
+        """
+        Async variant of _run_task().
+
+        Storage reads and writes run in a worker thread: disk backends
+        would otherwise block the event loop on I/O and unpickling.
+        """
+        check_deadline("cache")
+        cached = await asyncio.to_thread(self._load_cached, task)
+        if cached is not None:
+            return cached
+
+        if not task.cache_key:
+            return await self._aexecute_task(task)
+
+        async def lead():
+            return await asyncio.to_thread(self._load_cached, task) or await self._aexecute_task(task)
+
+        result, shared = await self._inflight.ado(task.cache_key, lead)
+        return self._mark_coalesced(result) if shared else result
+
+    def _execute_task(self, task: _LLMTask) -> Any:
+        """Call the LLM for a task and build/cache its result."""
+        start_time = time.time()
+        try:
+            response = self._call_llm_with_retry(**self._task_call(task))
+        except LLMProviderError as e:
+            raise AnalysisError(f"LLM provider error: {e}")
+
+        return self._finish_task(task, self._reask_if_malformed(task, response), start_time)
+
+    async def _aexecute_task(self, task: _LLMTask) -> Any:
+        """Async variant of _execute_task()."""
+        start_time = time.time()
+        try:
+            response = await self._acall_llm_with_retry(**self._task_call(task))
+        except LLMProviderError as e:
+            raise AnalysisError(f"LLM provider error: {e}")
+
+        response = await self._areask_if_malformed(task, response)
+        return await asyncio.to_thread(self._finish_task, task, response, start_time)
+
+    def _task_call(self, task: _LLMTask, messages: List[Dict] = None) -> Dict[str, Any]:
+        """Keyword arguments for _call_llm_with_retry() for a task."""
+        call = {
+            "messages": messages or task.messages,
+            "model": task.model,
+            "temperature": task.temperature,
+            "task_name": task.name,
+            **task.options
+        }
+        # Ask the provider for JSON mode / schema-constrained output
+        if task.response_schema and self._structured.get("enabled", True):
+            call["response_schema"] = task.response_schema
+        return call
+
+    def _reask_if_malformed(self, task: _LLMTask, response: LLMResponse) -> LLMResponse:
+        """
+        Re-ask once, with the validation errors, when a structured reply
+        cannot be repaired locally. Returns the original response if the
+        re-ask fails.
+        """
+        reask = self._reask_messages(task, response)
+        if not reask:
+            return response
+        try:
+            retry = self._call_llm_with_retry(**self._task_call(task, reask))
+        except LLMProviderError:
+            return response
+        return replace(retry, tokens_used=response.tokens_used + retry.tokens_used)
+
+    async def _areask_if_malformed(self, task: _LLMTask, response: LLMResponse) -> LLMResponse:
+        """Async variant of _reask_if_malformed()."""
+        reask = self._reask_messages(task, response)
+        if not reask:
+            return response
+        try:
+            retry = await self._acall_llm_with_retry(**self._task_call(task, reask))
+        except LLMProviderError:
+            return response
+        return replace(retry, tokens_used=response.tokens_used + retry.tokens_used)
+
+    def _reask_messages(self, task: _LLMTask, response: LLMResponse) -> Optional[List[Dict]]:
+        """Follow-up conversation asking for corrected JSON, or None if not needed."""
+        _, errors = self._repair_structured(task, response)
+        if not errors or not self._structured.get("reask", True):
+            return None
+        self._metrics.increment("structured.reasks")
+        return task.messages + [
+            {"role": "assistant", "content": response.content},
+            {"role": "user", "content": (
+                "Your previous reply could not be used: " + "; ".join(errors[:5]) + ". "
+                "Reply again with only the complete, corrected JSON object, "
+                "without markdown or commentary."
+            )}
+        ]
+
+    def _repair_structured(self, task: _LLMTask, response: LLMResponse) -> Tuple[LLMResponse, List[str]]:
+        """
+        Locally repair a structured reply (fences, prose, trailing commas)
+        and validate it against the task schema. A reply that could only
+        be recovered by closing truncated output is reported as an error.
+
+        Returns:
+            (response with canonical JSON content, validation errors)
+        """
+        if not task.response_schema:
+            return response, []
+        data, truncated = repair_json(response.content or "")
+        if data is None:
+            return response, ["reply is not valid JSON"]
+        # A truncated reply can repair into a valid-looking subset of the fields
+        errors = (["reply was truncated"] if truncated else []) + validate(data, task.response_schema)
+        if errors:
+            return response, errors
+        return replace(response, content=json.dumps(data, ensure_ascii=False)), []
+
+    @staticmethod
+    def _mark_coalesced(result: Any) -> Any:
+        """Copy of a shared result flagged as coalesced."""
+        if isinstance(result, AnalysisResult):
+            return replace(result, metadata={**result.metadata, "coalesced": True})
+        if isinstance(result, dict):
+            return {**result, "_metadata": {**result.get("_metadata", {}), "coalesced": True}}
+        return result
+
+    def _load_cached(self, task: _LLMTask) -> Optional[Any]:
+        """Return the cached result for a task, or None on miss."""
+        if not task.cache_key:
+            return None
+        cached = self._storage.load(task.cache_key)
+        if not cached:
+            return self._load_near_duplicate(task)
+        if task.from_cache:
+            return task.from_cache(cached, task.cache_key)
+        return cached
+
+    def _load_near_duplicate(self, task: _LLMTask) -> Optional[Any]:
+        """Result cached for a near-identical input in the same scope, or None."""
+        if not task.near_duplicate:
+            return None
+        scope, fingerprint = task.near_duplicate
+        self._metrics.increment("near_duplicate.lookups")
+        for score, key in self._fingerprints.find(scope, fingerprint, self._near_duplicate.threshold):
+            if key == task.cache_key:
+                continue
+            cached = self._storage.load(key)
+            if not cached:
+                self._fingerprints.discard(scope, key)  # Expired; try the next candidate
+                continue
+            self._metrics.increment("near_duplicate.hits")
+            result = task.from_cache(cached, key) if task.from_cache else cached
+            return self._mark_near_duplicate(result, key, score)
+        return None
+
+    @staticmethod
+    def _mark_near_duplicate(result: Any, cache_key: str, score: float) -> Any:
+        """Copy of a cached result flagged as reused for a near-duplicate input."""
+        info = {"cache_key": cache_key, "similarity": round(score, 4)}
+        if isinstance(result, AnalysisResult):
+            return replace(result, metadata={**result.metadata, "near_duplicate": info})
+        if isinstance(result, dict):
+            return {**result, "_metadata": {**result.get("_metadata", {}), "near_duplicate": info}}
+        return result
+
+    def _finish_task(self, task: _LLMTask, response: LLMResponse, start_time: float) -> Any:
+        """Build the task result from the LLM response and cache it (unless malformed)."""
+        return self._complete_task(task, response, start_time)[0]
+
+    def _complete_task(self, task: _LLMTask, response: LLMResponse, start_time: float) -> Tuple[Any, List[str]]:
+        """_finish_task() that also returns the reply's validation errors."""
+        latency_ms = (time.time() - start_time) * 1000
+        repaired, errors = self._repair_structured(task, response)
+        if repaired is not response and not self._is_plain_json(response.content):
+            self._metrics.increment("structured.repaired")
+        result = task.build_result(repaired, latency_ms)
+
+        # Report compaction savings for this call
+        if isinstance(result, AnalysisResult):
+            result.metadata["input_tokens_saved"] = task.input_tokens_saved
+        elif isinstance(result, dict):
+            result.setdefault("_metadata", {})["input_tokens_saved"] = task.input_tokens_saved
+        self._metrics.increment("compaction.tokens_saved", task.input_tokens_saved)
+
+        # Save to cache; malformed results would only be served again
+        if errors:
+            self._metrics.increment("structured.failures")
+        elif task.cache_key:
+            value = task.to_cache(result) if task.to_cache else result
+            self._storage.save(task.cache_key, value, ttl=self._config.storage.cache_ttl)
+            if task.near_duplicate:
+                self._fingerprints.add(*task.near_duplicate, task.cache_key)
+
+        return result, errors
+
+    def _compact_input(self, text: Optional[str], kind: str) -> Tuple[Optional[str], int]:
+        """
+        Normalize, dedupe and budget one prompt input.
+
+        Args:
+            text: Raw input (resume or JD text)
+            kind: Input kind, selects the budget in ``analysis.compaction.budgets``
+
+        Returns:
+            (compacted text, estimated tokens saved)
+        """
+        if not text or not self._compaction.enabled:
+            return text, 0
+        result = compact_text(text, self._input_budget(kind), self._compaction)
+        return result.text, result.tokens_saved
+
+    def _input_budget(self, kind: str) -> int:
+        """
+        Token budget for an input kind.
+
+        The configured budget is capped by the current model's context window
+        minus its output allowance, keeping a share free for instructions.
+        """
+        budget = self._compaction.budgets.get(kind, 0)
+        model_info = self._config.get_model_config(self._current_provider)
+        if model_info and model_info.context_window:
+            cap = int((model_info.context_window - model_info.max_tokens) * self.CONTEXT_INPUT_SHARE)
+            if cap > 0:
+                budget = min(budget, cap) if budget else cap
+        return budget
+
+    def _task_cache_key(self, use_cache: bool, kind: str, *components: Any) -> Optional[str]:
+        """
+        Content-addressed cache key for a task, or None when caching is off.
+
+        Args:
+            use_cache: Caller's cache switch
+            kind: Task kind and prompt version
+            *components: Inputs that determine the result (texts, persona, weights)
+        """
+        if not use_cache or not self._storage:
+            return None
+        return content_cache_key(kind, *components)
+
+    def _near_duplicate_key(self, cache_key: Optional[str], resume_text: str, *scope: Any) -> Optional[Tuple[str, int]]:
+        """
+        (scope, fingerprint) of a resume for near-duplicate reuse, or None when off.
+
+        The scope covers everything except the resume (JD, persona, weights,
+        prompt version), so only results for the same request are reused.
+        """
+        if not cache_key or not self._near_duplicate.enabled:
+            return None
+        scope_key = content_cache_key("near_duplicate", *scope)
+        return scope_key, simhash(resume_text, self._near_duplicate.shingle_size)
+
+    def _result_from_cache(self, cached: Dict, cache_key: str, **metadata) -> AnalysisResult:
+        """Rebuild an AnalysisResult from a cached report."""
+        return AnalysisResult(
+            report=cached["report"],
+            score=cached.get("score"),
+            model=cached.get("model", ""),
+            tokens_used=cached.get("tokens_used", 0),
+            cached=True,
+            metadata={"cache_key": cache_key, **metadata}
+        )
+
+    def _result_to_cache(self, result: AnalysisResult) -> Dict:
+        """Serialize an AnalysisResult for the cache."""
+        return {
+            "report": result.report,
+            "score": result.score,
+            "model": result.model,
+            "tokens_used": result.tokens_used
+        }
+
+    def _resolve_model_settings(
+        self,
+        kwargs: Dict,
+        temperature: float,
+        use_config_temperature: bool = True
+    ) -> Tuple[Optional[str], float]:
+        """
+        Pop model/temperature from kwargs and resolve them against the provider config.
+
+        Args:
+            kwargs: Caller kwargs (model/temperature are removed)
+            temperature: Default temperature for the task
+            use_config_temperature: Let the model config override the temperature
+
+        Returns:
+            (model, temperature) tuple
+        """
+        model = kwargs.pop("model", None)
+        temperature = kwargs.pop("temperature", temperature)
+
+        if self._config.get_model_config(self._current_provider):
+            model_info = self._config.get_model_config(self._current_provider, model)
+            if model_info:
+                if use_config_temperature:
+                    temperature = model_info.temperature
+                model = model_info.name
+
+        return model, temperature
+
+    @staticmethod
+    def _strip_json_fence(content: str) -> str:
+        """Handle markdown code blocks around JSON output."""
+        content = content.strip()
+        if content.startswith("```json"):
+            content = content[7:]
+        if content.endswith("```"):
+            content = content[:-3]
+        return content
+
+    @classmethod
+    def _is_plain_json(cls, content: str) -> bool:
+        """True if content parses as JSON once a code fence is stripped."""
+        try:
+            json.loads(cls._strip_json_fence(content))
+            return True
+        except json.JSONDecodeError:
+            return False
+
+    def _call_llm_with_retry(
+        self,
+        messages: List[Dict],
+        model: str = None,
+        temperature: float = 0.7,
+        task_name: str = "chat",
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Call LLM with automatic retry on failure.
+
+        The current provider is tried first, then each provider of the
+        ``llm_failover`` chain; providers whose circuit is open are skipped.
+        When hedging is enabled and this is slower than the observed latency
+        percentile for ``task_name``, the request is also sent to a
+        secondary provider and the first answer wins.
+        """
+        # Safety: Remove any remaining duplicate args
+        kwargs.pop('model', None)
+        kwargs.pop('temperature', None)
+
+        secondary = self._hedge_target()
+        if not secondary:
+            return self._call_with_failover(messages, model, temperature, **kwargs)
+
+        return self._hedger.call(
+            task_name,
+            lambda: self._call_with_failover(messages, model, temperature, **kwargs),
+            # The secondary uses its own default model
+            lambda: self._call_provider_with_retry(secondary, messages, None, temperature, **kwargs),
+            estimated_tokens=estimate_message_tokens(messages)
+        )
+
+    async def _acall_llm_with_retry(
+        self,
+        messages: List[Dict],
+        model: str = None,
+        temperature: float = 0.7,
+        task_name: str = "chat",
+        **kwargs
+    ) -> LLMResponse:
+        """Async variant of _call_llm_with_retry(); the losing hedge is cancelled."""
+        kwargs.pop('model', None)
+        kwargs.pop('temperature', None)
+
+        secondary = self._hedge_target()
+        if not secondary:
+            return await self._acall_with_failover(messages, model, temperature, **kwargs)
+
+        return await self._hedger.acall(
+            task_name,
+            lambda: self._acall_with_failover(messages, model, temperature, **kwargs),
+            lambda: self._acall_provider_with_retry(secondary, messages, None, temperature, **kwargs),
+            estimated_tokens=estimate_message_tokens(messages)
+        )
+
+    def _call_with_failover(
+        self,
+        messages: List[Dict],
+        model: Optional[str],
+        temperature: float,
+        **kwargs
+    ) -> LLMResponse:
+        """Try each provider of the failover chain in order; raise the last error."""
+        last_error = None
+        for index, provider_name in enumerate(self._failover_chain()):
+            if index:
+                self._metrics.increment("failover.attempts")
             try:
-                return self._llm_provider.chat(
+                # Failover providers use their own default model
+                return self._call_provider_with_retry(
+                    provider_name, messages, model if index == 0 else None, temperature, **kwargs
+                )
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    async def _acall_with_failover(
+        self,
+        messages: List[Dict],
+        model: Optional[str],
+        temperature: float,
+        **kwargs
+    ) -> LLMResponse:
+        """Async variant of _call_with_failover()."""
+        last_error = None
+        for index, provider_name in enumerate(self._failover_chain()):
+            if index:
+                self._metrics.increment("failover.attempts")
+            try:
+                return await self._acall_provider_with_retry(
+                    provider_name, messages, model if index == 0 else None, temperature, **kwargs
+                )
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _call_provider_with_retry(
+        self,
+        provider_name: str,
+        messages: List[Dict],
+        model: Optional[str],
+        temperature: float,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Call one provider with retries.
+
+        Acquires the provider's rate limiter before each attempt. Failures
+        are classified by the provider's retry policy: non-retryable errors
+        are raised at once, others are retried with the policy's backoff
+        (honoring retry-after on rate limits) within its deadline budget.
+        Each attempt is reported to the provider's circuit breaker; once the
+        circuit is open, remaining attempts are abandoned with CircuitOpenError.
+        """
+        provider = self._get_provider(provider_name)
+        max_retries = self._max_retries(provider_name)
+        limiter = self._rate_limiter(provider_name)
+        breaker = self._circuit_breaker(provider_name)
+        policy = self._retry_policy(provider_name)
+        retry_state = policy.start()
+        estimated_tokens = estimate_message_tokens(messages)
+
+        last_error = None
+        for attempt in range(max_retries):
+            check_deadline("llm")
+            self._check_circuit(provider_name, breaker, last_error)
+            try:
+                if limiter:
+                    limiter.acquire(estimated_tokens)
+                call_start = time.time()
+                response = provider.chat(
                     messages=messages,
                     model=model,
                     temperature=temperature,
                     **kwargs
                 )
+                if breaker:
+                    breaker.record_success((time.time() - call_start) * 1000)
+                if limiter:
+                    limiter.record_usage(estimated_tokens, response.tokens_used)
+                response.provider = provider_name
+                return response
+            except DeadlineExceededError:
+                # Our own budget ran out: says nothing about provider health
+                if breaker:
+                    breaker.release()
+                raise
             except Exception as e:
                 last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = (2 ** attempt)  # Exponential backoff
+                self._record_circuit_failure(breaker, e)
+                wait_time = self._retry_delay(policy, retry_state, e, attempt, max_retries, limiter)
+                if wait_time is None:
+                    break
+                if wait_time > 0:
                     time.sleep(wait_time)
 
         raise last_error
 
-    def _construct_prompt(
+    async def _acall_provider_with_retry(
+        self,
+        provider_name: str,
+        messages: List[Dict],
+        model: Optional[str],
+        temperature: float,
+        **kwargs
+    ) -> LLMResponse:
+        """Async variant of _call_provider_with_retry(); backs off without blocking the loop."""
+        provider = self._get_provider(provider_name)
+        max_retries = self._max_retries(provider_name)
+        limiter = self._rate_limiter(provider_name)
+        breaker = self._circuit_breaker(provider_name)
+        policy = self._retry_policy(provider_name)
+        retry_state = policy.start()
+        estimated_tokens = estimate_message_tokens(messages)
+
+        last_error = None
+        for attempt in range(max_retries):
+            check_deadline("llm")
+            self._check_circuit(provider_name, breaker, last_error)
+            try:
+                if limiter:
+                    await limiter.aacquire(estimated_tokens)
+                call_start = time.time()
+                response = await provider.achat(
+                    messages=messages,
+                    model=model,
+                    temperature=temperature,
+                    **kwargs
+                )
+                if breaker:
+                    breaker.record_success((time.time() - call_start) * 1000)
+                if limiter:
+                    limiter.record_usage(estimated_tokens, response.tokens_used)
+                response.provider = provider_name
+                return response
+            except asyncio.CancelledError:
+                # e.g. the losing leg of a hedge: says nothing about provider health
+                if breaker:
+                    breaker.release()
+                raise
+            except DeadlineExceededError:
+                if breaker:
+                    breaker.release()
+                raise
+            except Exception as e:
+                last_error = e
+                self._record_circuit_failure(breaker, e)
+                wait_time = self._retry_delay(policy, retry_state, e, attempt, max_retries, limiter)
+                if wait_time is None:
+                    break
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+
+        raise last_error
+
+    def _retry_delay(
+        self,
+        policy: RetryPolicy,
+        state: RetryState,
+        error: Exception,
+        attempt: int,
+        max_retries: int,
+        limiter: Optional[RateLimiter]
+    ) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to give up.
+
+        Gives up on non-retryable errors, after the last attempt, and when
+        the wait would overrun the policy's deadline budget; raises
+        DeadlineExceededError when it would overrun the request deadline.
+        A provider retry-after pauses the shared limiter (the next acquire
+        waits it out), or is slept directly when no limiter is configured.
+        Other failures use the policy's backoff.
+        """
+        error_class = policy.classify(error)
+        if error_class == ErrorClass.FATAL:
+            self._metrics.increment("retry.fatal")
+            return None
+        if attempt >= max_retries - 1:
+            self._metrics.increment("retry.exhausted")
+            return None
+
+        retry_after = getattr(error, "retry_after", None) if error_class == ErrorClass.RATE_LIMITED else None
+        if retry_after:
+            delay = float(retry_after)
+        else:
+            delay = policy.backoff(attempt, state)
+            state.last_delay = delay
+
+        remaining = state.remaining()
+        if remaining is not None and delay >= remaining:
+            self._metrics.increment("retry.deadline_exceeded")
+            return None
+        request_remaining = deadline_remaining()
+        if request_remaining is not None and delay >= request_remaining:
+            self._metrics.increment("retry.deadline_exceeded")
+            raise DeadlineExceededError(
+                f"Request deadline leaves no time to retry: {error}", stage="llm_retry"
+            ) from error
+
+        self._metrics.increment("retry.attempts")
+        self._metrics.increment("retry.backoff_ms", delay * 1000)
+        if retry_after and limiter:
+            limiter.pause(retry_after)
+            return 0.0
+        return delay
+
+    def _rate_limiter(self, provider_name: str = None) -> Optional[RateLimiter]:
+        """Shared rate limiter for a provider (default: current), if limits are configured."""
+        provider_name = provider_name or self._current_provider
+        return get_rate_limiter(
+            provider_name,
+            self._config.get_llm_provider_config(provider_name)
+        )
+
+    def _max_retries(self, provider_name: str = None) -> int:
+        """Max attempts for a provider (default: current)."""
+        provider_config = self._config.get_llm_provider_config(provider_name or self._current_provider)
+        return provider_config.max_retries if provider_config else 3
+
+    def _retry_policy(self, provider_name: str) -> RetryPolicy:
+        """Retry policy for a provider, from its ``retry`` config."""
+        if provider_name not in self._retry_policies:
+            provider_config = self._config.get_llm_provider_config(provider_name)
+            self._retry_policies[provider_name] = get_retry_policy(
+                provider_config.retry if provider_config else None
+            )
+        return self._retry_policies[provider_name]
+
+    def _circuit_breaker(self, provider_name: str) -> Optional[CircuitBreaker]:
+        """Circuit breaker for a provider, or None if disabled in its config."""
+        if provider_name not in self._breakers:
+            provider_config = self._config.get_llm_provider_config(provider_name)
+            breaker_config = CircuitBreakerConfig.from_dict(
+                provider_config.circuit_breaker if provider_config else None
+            )
+            self._breakers[provider_name] = CircuitBreaker(provider_name, breaker_config) \
+                if breaker_config.enabled else None
+        return self._breakers[provider_name]
+
+    def _check_circuit(
+        self,
+        provider_name: str,
+        breaker: Optional[CircuitBreaker],
+        last_error: Optional[Exception]
+    ):
+        """Raise CircuitOpenError if the provider's circuit rejects the call."""
+        if breaker is None or breaker.allow_request():
+            return
+        self._metrics.increment("circuit.rejected")
+        raise CircuitOpenError(
+            f"Circuit open for LLM provider '{provider_name}'",
+            provider=provider_name,
+            retry_after=breaker.retry_in()
+        ) from last_error
+
+    @staticmethod
+    def _record_circuit_failure(breaker: Optional[CircuitBreaker], error: Exception):
+        """
+        Report a failed attempt.
+
+        Rate limiting and our own request deadline (including a timeout
+        clamped to a spent deadline budget) are not health signals: the
+        attempt is released instead of counted.
+        """
+        if breaker is None:
+            return
+        left = deadline_remaining()
+        if isinstance(error, (LLMRateLimitError, DeadlineExceededError)) or (left is not None and left <= 0):
+            breaker.release()
+        else:
+            breaker.record_failure()
+
+    def _failover_chain(self) -> List[str]:
+        """The current provider followed by the usable ``llm_failover`` providers."""
+        chain = [self._current_provider]
+        for name in self._config.llm_failover:
+            if name not in chain and self._provider_usable(name):
+                chain.append(name)
+        return chain
+
+    def _provider_usable(self, provider_name: str) -> bool:
+        """Whether a provider is registered, enabled and configured with credentials."""
+        if provider_name not in PROVIDER_REGISTRY:
+            return False
+        provider_config = self._config.get_llm_provider_config(provider_name)
+        if not provider_config or not provider_config.enabled:
+            return False
+        try:
+            return self._get_provider(provider_name).is_available()
+        except Exception:
+            return False
+
+    def _get_provider(self, provider_name: str) -> ILLMProvider:
+        """Provider instance by name; non-current providers are created lazily."""
+        if provider_name == self._current_provider:
+            return self._llm_provider
+        provider = self._providers.get(provider_name)
+        if provider is None:
+            provider = get_llm_provider(
+                provider_name,
+                config=self._config.get_llm_provider_config(provider_name)
+            )
+            self._providers[provider_name] = provider
+        return provider
+
+    def _hedge_target(self) -> Optional[str]:
+        """
+        Secondary provider for hedged requests, or None if hedging is off.
+
+        Uses ``analysis.hedging.secondary_provider`` if set, otherwise the
+        first other enabled provider that is available; providers with an
+        open circuit are skipped.
+        """
+        if not self._hedger.enabled:
+            return None
+
+        policy = self._hedger.policy
+        candidates = [policy.secondary_provider] if policy.secondary_provider \
+            else self._config.get_enabled_providers()
+        for name in candidates:
+            if name == self._current_provider or not self._provider_usable(name):
+                continue
+            breaker = self._circuit_breaker(name)
+            if breaker and breaker.state == CircuitState.OPEN:
+                continue
+            return name
+        return None
+
+    def _construct_messages(
         self,
         resume_text: str,
         jd_text: str,
         persona_data: Dict
-    ) -> str:
-        """Construct the analysis prompt."""
+    ) -> List[Dict]:
+        """
+        Construct the analysis messages.
+
+        Persona, task instructions and output spec come first, then the JD,
+        then the resume, so every resume screened against the same JD
+        shares a byte-identical prefix that providers can cache.
+        """
         # Check if this is a Headhunter persona
         if persona_data.get("name") == "B-Side Headhunter":
-            return self._construct_headhunter_prompt(resume_text, jd_text)
+            instructions = self._get_headhunter_instructions()
+        else:
+            instructions = self._get_analysis_instructions()
 
-        prompt = f"""
-TASK:
-Analyze the following Candidate Resume against the Target Job Description (JD).
+        return self._prefix_cached_messages(
+            static=f"{persona_data['system_prompt']}\n{instructions}",
+            shared=f"TARGET JD:\n{jd_text}",
+            variable=f"CANDIDATE RESUME:\n{resume_text}"
+        )
 
-TARGET JD:
-{jd_text}
+    @staticmethod
+    def _prefix_cached_messages(static: str, shared: Optional[str], variable: str) -> List[Dict]:
+        """
+        Lay out a request as static -> shared -> variable parts.
 
-CANDIDATE RESUME:
-{resume_text}
+        ``static`` (instructions) and ``shared`` (e.g. the JD, same across a
+        batch) go in system messages ahead of the per-request ``variable``
+        content, forming a stable prefix for provider-side prompt caching.
+        """
+        messages = [{"role": "system", "content": static}]
+        if shared:
+            messages.append({"role": "system", "content": shared})
+        messages.append({"role": "user", "content": variable})
+        return messages
+
+    def _get_analysis_instructions(self) -> str:
+        """Task instructions and output spec for the resume-vs-JD analysis."""
+        return """
+TASK:
+Analyze the Candidate Resume against the Target Job Description (JD).
+The TARGET JD and the CANDIDATE RESUME are provided in the following messages.
 
 OUTPUT REQUIREMENTS (Markdown Format):
 
@@ -913,31 +2056,21 @@ OUTPUT REQUIREMENTS (Markdown Format):
 ## 5. Skill Radar (JSON)
 Output a JSON block for radar chart visualization with exactly 6 dimensions:
 ```json
-{{"radar": {{"专业技能": 0-100, "项目经验": 0-100, "学历背景": 0-100, "行业匹配": 0-100, "软技能": 0-100, "成长潜力": 0-100}}}}
+{"radar": {"专业技能": 0-100, "项目经验": 0-100, "学历背景": 0-100, "行业匹配": 0-100, "软技能": 0-100, "成长潜力": 0-100}}
 ```
 Replace the values (0-100) with your actual assessment scores.
 
 TONE: Professional but critical. No fluff. No "Good job". Focus on GAP analysis.
 LANGUAGE: 全部使用中文输出 (All output must be in Simplified Chinese).
         """
-        return prompt
 
-    def _construct_headhunter_prompt(
-        self,
-        resume_text: str,
-        jd_text: str
-    ) -> str:
-        """Construct the prompt specifically for Headhunters (B-Side)."""
-        prompt = f"""
+    def _get_headhunter_instructions(self) -> str:
+        """Task instructions and output spec for Headhunters (B-Side)."""
+        return """
 TASK:
 You are preparing a Candidate Presentation for your Client (Hiring Manager).
 Analyze the candidate's resume against the Job Description (JD).
-
-TARGET JD:
-{jd_text}
-
-CANDIDATE RESUME:
-{resume_text}
+The TARGET JD and the CANDIDATE RESUME are provided in the following messages.
 
 OUTPUT REQUIREMENTS (Markdown Format):
 
@@ -960,24 +2093,13 @@ OUTPUT REQUIREMENTS (Markdown Format):
 ## 5. Skill Radar (JSON)
 Output a JSON block for radar chart visualization with exactly 6 dimensions:
 ```json
-{{"radar": {{"专业技能": 0-100, "项目经验": 0-100, "学历背景": 0-100, "行业匹配": 0-100, "稳定性": 0-100, "性价比": 0-100}}}}
+{"radar": {"专业技能": 0-100, "项目经验": 0-100, "学历背景": 0-100, "行业匹配": 0-100, "稳定性": 0-100, "性价比": 0-100}}
 ```
 (Note: "稳定性" and "性价比" are key for Headhunters).
 
 TONE: Professional, Objective, Sales-driven.
 LANGUAGE: Chinese (Simplified).
         """
-        return prompt
-
-    def _generate_cache_key(
-        self,
-        resume_text: str,
-        jd_text: str,
-        persona: str
-    ) -> str:
-        """Generate a cache key for the analysis request."""
-        content = f"{resume_text}:{jd_text}:{persona}"
-        return hashlib.md5(content.encode()).hexdigest()
 
     def _extract_score(self, report: str) -> Optional[int]:
         """Extract match score from the report."""
@@ -1016,7 +2138,60 @@ LANGUAGE: Chinese (Simplified).
         except UnsupportedFormatError:
             raise
         except Exception as e:
-            raise ResumeSniperError(f"Failed to parse document: {e}")
+            raise ParseError(f"Failed to parse document: {e}")
+
+    def store_document(self, data: bytes, filename: str) -> StoredDocument:
+        """
+        Parse an uploaded file once per content.
+
+        Documents are addressed by the SHA-256 of their bytes: uploading
+        the same bytes again returns the stored document without parsing,
+        and its ``doc_id`` can be passed instead of the file from then on.
+
+        Args:
+            data: Raw file bytes
+            filename: Uploaded file name (its extension selects the parser)
+
+        Returns:
+            The new or existing StoredDocument
+        """
+        doc_id = document_id(data)
+        document = self._documents.get(doc_id)
+        if document:
+            self._metrics.increment("documents.reused")
+            return document
+
+        def parse() -> StoredDocument:
+            existing = self._documents.get(doc_id)
+            if existing:
+                return existing
+            parsed = self._parse_bytes(data, filename)
+            self._metrics.increment("documents.parsed")
+            return self._documents.put(doc_id, parsed, os.path.basename(filename), len(data))
+
+        document, _ = self._inflight.do(f"document:{doc_id}", parse)
+        return document
+
+    def get_document(self, doc_id: str) -> Optional[StoredDocument]:
+        """A stored document, or None if unknown."""
+        return self._documents.get(doc_id)
+
+    def delete_document(self, doc_id: str) -> bool:
+        """Remove a stored document; False if it was unknown."""
+        return self._documents.delete(doc_id)
+
+    def _parse_bytes(self, data: bytes, filename: str) -> ParsedDocument:
+        """parse_document() for in-memory bytes (parsers read from a path)."""
+        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1].lower())
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return self.parse_document(tmp_path)
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
     def batch_analyze(
         self,
@@ -1024,44 +2199,639 @@ LANGUAGE: Chinese (Simplified).
         jd_text: str,
         persona: str = "hrbp",
         use_cache: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> List[AnalysisResult]:
         """
         Analyze multiple resumes against a single JD.
 
+        Resumes are processed concurrently, bounded by the provider's
+        ``max_concurrency``.
+
         Args:
             resumes: List of resume texts
             jd_text: Job description text
             persona: Analysis persona
             use_cache: Whether to use cached results
             show_progress: Show progress bar
+            progress_callback: Called as (completed, total, item_result)
 
         Returns:
-            List of AnalysisResult objects
+            List of AnalysisResult objects, in input order
         """
+        items = self._batch_executor().run(
+            resumes,
+            lambda resume: self.analyze(
+                resume_text=resume,
+                jd_text=jd_text,
+                persona=persona,
+                use_cache=use_cache
+            ),
+            self._batch_progress(show_progress, progress_callback)
+        )
+        return [self._analysis_item(item) for item in items]
+
+    async def abatch_analyze(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        persona: str = "hrbp",
+        use_cache: bool = True,
+        show_progress: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[AnalysisResult]:
+        """Async variant of batch_analyze()."""
+        items = await self._batch_executor().arun(
+            resumes,
+            lambda resume: self.aanalyze(
+                resume_text=resume,
+                jd_text=jd_text,
+                persona=persona,
+                use_cache=use_cache
+            ),
+            self._batch_progress(show_progress, progress_callback)
+        )
+        return [self._analysis_item(item) for item in items]
+
+    def batch_evaluate_match(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        weights: Dict[str, int] = None,
+        use_cache: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        prefilter: Optional[bool] = None,
+        top_k: Optional[int] = None,
+        pack: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate many resumes against one JD concurrently.
+
+        With the lexical prefilter on, resumes are first ranked locally
+        against the JD (BM25) and only the top candidates are sent to the
+        LLM; the rest get status "Prefiltered" and their ``lexical_score``.
+
+        With packing on, several short resumes share one LLM request (see
+        ``analysis.packing``); candidates whose packed result fails
+        validation are re-evaluated one by one.
+
+        Args:
+            resumes: List of resume texts
+            jd_text: Job description text
+            weights: Scoring weights (see evaluate_match)
+            use_cache: Whether to use cached results
+            progress_callback: Called as (completed, total, item_result)
+                for the resumes sent to the LLM (per request when packing)
+            prefilter: Run the lexical prefilter (None = ``analysis.prefilter.enabled``)
+            top_k: Max resumes sent to the LLM (None = ``analysis.prefilter.top_k``)
+            pack: Pack several resumes per request (None = ``analysis.packing.enabled``)
+
+        Returns:
+            List of match dicts in input order; failed items carry
+            status "Error" and the error message.
+        """
+        screened = self._lexical_prefilter(resumes, jd_text, prefilter, top_k)
+        selected = [m.index for m in screened if m.selected] if screened else range(len(resumes))
+
+        if self._packing_enabled(pack):
+            matches = self._packed_evaluate_match(
+                [resumes[i] for i in selected], jd_text, weights, use_cache, progress_callback
+            )
+            return self._merge_prefiltered(screened, matches)
+
+        items = self._batch_executor().run(
+            [resumes[i] for i in selected],
+            lambda resume: self.evaluate_match(
+                resume_text=resume,
+                jd_text=jd_text,
+                use_cache=use_cache,
+                weights=weights
+            ),
+            progress_callback
+        )
+        return self._merge_prefiltered(screened, [self._match_item(item) for item in items])
+
+    async def abatch_evaluate_match(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        weights: Dict[str, int] = None,
+        use_cache: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        prefilter: Optional[bool] = None,
+        top_k: Optional[int] = None,
+        pack: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of batch_evaluate_match()."""
+        screened = self._lexical_prefilter(resumes, jd_text, prefilter, top_k)
+        selected = [m.index for m in screened if m.selected] if screened else range(len(resumes))
+
+        if self._packing_enabled(pack):
+            matches = await self._apacked_evaluate_match(
+                [resumes[i] for i in selected], jd_text, weights, use_cache, progress_callback
+            )
+            return self._merge_prefiltered(screened, matches)
+
+        items = await self._batch_executor().arun(
+            [resumes[i] for i in selected],
+            lambda resume: self.aevaluate_match(
+                resume_text=resume,
+                jd_text=jd_text,
+                use_cache=use_cache,
+                weights=weights
+            ),
+            progress_callback
+        )
+        return self._merge_prefiltered(screened, [self._match_item(item) for item in items])
+
+    def _lexical_prefilter(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        enabled: Optional[bool],
+        top_k: Optional[int]
+    ) -> Optional[List[LexicalMatch]]:
+        """Rank resumes against the JD locally, or None if the prefilter does not apply."""
+        config = self._prefilter
+        if enabled is None:
+            enabled = config.enabled and len(resumes) >= config.min_batch_size
+        if not enabled or not resumes:
+            return None
+
+        screened = lexical_prefilter(
+            resumes,
+            jd_text,
+            top_k=config.top_k if top_k is None else top_k,
+            min_relative_score=config.min_relative_score,
+            k1=config.k1,
+            b=config.b
+        )
+        self._metrics.increment("prefilter.skipped", sum(1 for m in screened if not m.selected))
+        return screened
+
+    @staticmethod
+    def _merge_prefiltered(
+        screened: Optional[List[LexicalMatch]],
+        matches: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Put LLM results for selected resumes back among the prefiltered ones, in input order."""
+        if screened is None:
+            return matches
+
+        evaluated = iter(matches)
         results = []
-        total = len(resumes)
+        for m in screened:
+            if m.selected:
+                results.append({**next(evaluated), "lexical_score": m.score})
+            else:
+                results.append({
+                    "score": 0,
+                    "status": "Prefiltered",
+                    "reason": f"Low keyword overlap with the JD (rank {m.rank}); not sent for LLM evaluation",
+                    "lexical_score": m.score
+                })
+        return results
+
+    def _packing_enabled(self, pack: Optional[bool]) -> bool:
+        """Whether batch matching should pack several resumes per request."""
+        return self._packing.get("enabled", False) if pack is None else pack
+
+    def _packed_evaluate_match(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        weights: Optional[Dict[str, int]],
+        use_cache: bool,
+        progress_callback: Optional[ProgressCallback]
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate resumes against one JD, several per LLM request.
+
+        Each resume keeps the cache key of a single evaluate_match call, so
+        packed and unpacked runs share cached results.
+        """
+        if self._use_profile("match", None, use_cache):
+            items = self._batch_executor().run(
+                resumes, lambda resume: self._resume_input(resume, "match", True, use_cache)
+            )
+            resumes = [item.value if item.ok else resume for item, resume in zip(items, resumes)]
+        tasks = [self._match_task(resume, jd_text, use_cache, weights, {}) for resume in resumes]
+        results: List[Optional[Dict[str, Any]]] = [self._load_cached(task) for task in tasks]
+        units = self._plan_packs(tasks, [i for i, r in enumerate(results) if r is None])
+
+        def run_unit(indices: List[int]) -> List[Dict[str, Any]]:
+            if len(indices) == 1:
+                return [self._run_task(tasks[indices[0]])]
+            return self._run_pack([tasks[i] for i in indices])
+
+        items = self._batch_executor().run(units, run_unit, progress_callback)
+        return self._collect_packed(results, units, items)
+
+    async def _apacked_evaluate_match(
+        self,
+        resumes: List[str],
+        jd_text: str,
+        weights: Optional[Dict[str, int]],
+        use_cache: bool,
+        progress_callback: Optional[ProgressCallback]
+    ) -> List[Dict[str, Any]]:
+        """Async variant of _packed_evaluate_match()."""
+        if self._use_profile("match", None, use_cache):
+            items = await self._batch_executor().arun(
+                resumes, lambda resume: self._aresume_input(resume, "match", True, use_cache)
+            )
+            resumes = [item.value if item.ok else resume for item, resume in zip(items, resumes)]
+        tasks = [self._match_task(resume, jd_text, use_cache, weights, {}) for resume in resumes]
+        results: List[Optional[Dict[str, Any]]] = await asyncio.to_thread(
+            lambda: [self._load_cached(task) for task in tasks]
+        )
+        units = self._plan_packs(tasks, [i for i, r in enumerate(results) if r is None])
+
+        async def run_unit(indices: List[int]) -> List[Dict[str, Any]]:
+            if len(indices) == 1:
+                return [await self._arun_task(tasks[indices[0]])]
+            return await self._arun_pack([tasks[i] for i in indices])
 
-        for i, resume in enumerate(resumes):
-            if show_progress:
-                print(f"Processing {i + 1}/{total}...")
+        items = await self._batch_executor().arun(units, run_unit, progress_callback)
+        return self._collect_packed(results, units, items)
 
+    def _plan_packs(self, tasks: List[_LLMTask], pending: List[int]) -> List[List[int]]:
+        """
+        Group pending match tasks into packs that fit the model's context window.
+
+        Pack size is capped by ``analysis.packing.max_items`` and by how many
+        per-candidate answers fit in the model's output allowance. Resumes
+        over ``max_resume_tokens`` are evaluated on their own.
+        """
+        if not pending:
+            return []
+
+        max_items = self._packing.get("max_items", 8)
+        max_resume_tokens = self._packing.get("max_resume_tokens", 2000)
+        output_per_item = self._packing.get("output_tokens_per_item", 600)
+
+        model_info = self._config.get_model_config(self._current_provider)
+        context_window = model_info.context_window if model_info else 65536
+        max_output = model_info.max_tokens if model_info else 4096
+        prefix_tokens = estimate_message_tokens(tasks[pending[0]].messages[:-1]) + self.PACK_INSTRUCTION_TOKENS
+
+        input_budget = context_window - max_output - prefix_tokens
+        pack_limit = max(1, min(max_items, max_output // max(1, output_per_item)))
+
+        units: List[List[int]] = []
+        pack: List[int] = []
+        used = 0
+        for i in pending:
+            tokens = estimate_tokens(tasks[i].messages[-1]["content"])
+            if tokens > max_resume_tokens:
+                units.append([i])
+                continue
+            if pack and (len(pack) >= pack_limit or used + tokens > input_budget):
+                units.append(pack)
+                pack, used = [], 0
+            pack.append(i)
+            used += tokens
+        if pack:
+            units.append(pack)
+        return units
+
+    def _packed_match_messages(self, tasks: List[_LLMTask]) -> List[Dict]:
+        """One request for several candidates; keeps the single-call instruction/JD prefix."""
+        sections = [
+            f"=== CANDIDATE {n} ===\n{task.messages[-1]['content']}"
+            for n, task in enumerate(tasks, start=1)
+        ]
+        instruction = (
+            f"Evaluate each of the {len(tasks)} candidates below against the JD independently, "
+            f"with the same criteria.\n"
+            f"Output strictly valid JSON: an array of exactly {len(tasks)} objects in candidate order. "
+            f"Each object has \"candidate\": <candidate number> plus every field of the JSON format above."
+        )
+        return tasks[0].messages[:-1] + [
+            {"role": "user", "content": instruction + "\n\n" + "\n\n".join(sections)}
+        ]
+
+    def _run_pack(self, tasks: List[_LLMTask]) -> List[Dict[str, Any]]:
+        """Evaluate a pack in one LLM call; failed candidates fall back to single calls."""
+        start_time = time.time()
+        try:
+            response = self._call_llm_with_retry(
+                messages=self._packed_match_messages(tasks),
+                temperature=tasks[0].temperature,
+                task_name="match_pack"
+            )
+        except Exception:
+            self._metrics.increment("packing.fallbacks", len(tasks))
+            return [self._run_task(task) for task in tasks]
+
+        results = self._split_pack(tasks, response, start_time)
+        return [result if result is not None else self._run_task(task)
+                for task, result in zip(tasks, results)]
+
+    async def _arun_pack(self, tasks: List[_LLMTask]) -> List[Dict[str, Any]]:
+        """Async variant of _run_pack(); fallbacks run concurrently."""
+        start_time = time.time()
+        try:
+            response = await self._acall_llm_with_retry(
+                messages=self._packed_match_messages(tasks),
+                temperature=tasks[0].temperature,
+                task_name="match_pack"
+            )
+            results = await asyncio.to_thread(self._split_pack, tasks, response, start_time)
+        except Exception:
+            self._metrics.increment("packing.fallbacks", len(tasks))
+            results = [None] * len(tasks)
+
+        fallbacks = await asyncio.gather(*(
+            self._arun_task(task) for task, result in zip(tasks, results) if result is None
+        ))
+        fallback_iter = iter(fallbacks)
+        return [result if result is not None else next(fallback_iter) for result in results]
+
+    def _split_pack(
+        self,
+        tasks: List[_LLMTask],
+        response: LLMResponse,
+        start_time: float
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Turn a packed response into per-candidate results (cached per candidate).
+
+        Candidates whose entry is missing or invalid come back as None.
+        """
+        entries = self._parse_packed_matches(response.content, len(tasks))
+        self._metrics.increment("packing.requests")
+        self._metrics.increment("packing.fallbacks", len(tasks) - len(entries))
+
+        size = len(tasks)
+        results: List[Optional[Dict[str, Any]]] = []
+        for n, task in enumerate(tasks):
+            entry = entries.get(n)
+            if entry is None:
+                results.append(None)
+                continue
+            item_response = replace(
+                response,
+                content=json.dumps(entry, ensure_ascii=False),
+                tokens_used=response.tokens_used // size,
+                cached_tokens=response.cached_tokens // size
+            )
+            result = self._finish_task(task, item_response, start_time)
+            results.append({**result, "_metadata": {**result.get("_metadata", {}), "packed": True, "pack_size": size}})
+        return results
+
+    def _parse_packed_matches(self, content: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """Valid entries of a packed response, keyed by 0-based candidate position."""
+        try:
+            data = json.loads(self._strip_json_fence(content))
+        except json.JSONDecodeError:
+            return {}
+        if isinstance(data, dict):
+            data = data.get("results") or data.get("candidates") or []
+        if not isinstance(data, list):
+            return {}
+
+        entries: Dict[int, Dict[str, Any]] = {}
+        for position, entry in enumerate(data):
+            if not isinstance(entry, dict):
+                continue
+            entry = dict(entry)
             try:
-                result = self.analyze(
-                    resume_text=resume,
-                    jd_text=jd_text,
-                    persona=persona,
-                    use_cache=use_cache
-                )
-                results.append(result)
-            except Exception as e:
-                results.append(AnalysisResult(
-                    report=f"Analysis failed: {e}",
-                    score=None,
-                    metadata={"error": str(e)}
+                index = int(entry.pop("candidate", position + 1)) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < count and index not in entries and self._valid_match_result(entry):
+                entries[index] = entry
+        return entries
+
+    @staticmethod
+    def _valid_match_result(entry: Dict[str, Any]) -> bool:
+        """Schema check for one evaluate_match result."""
+        return not validate(entry, MATCH_SCHEMA)
+
+    def _collect_packed(
+        self,
+        results: List[Optional[Dict[str, Any]]],
+        units: List[List[int]],
+        items: List[BatchItemResult]
+    ) -> List[Dict[str, Any]]:
+        """Fill per-resume results from executed units, keeping failures in place."""
+        for indices, item in zip(units, items):
+            if item.ok:
+                for i, value in zip(indices, item.value):
+                    results[i] = value
+            else:
+                for i in indices:
+                    results[i] = self._match_item(item)
+        return results
+
+    def _batch_executor(self) -> BatchExecutor:
+        """
+        Batch executor bounded by the current provider's concurrency limit.
+
+        The limit is shared by every batch running on this engine, so
+        concurrent batch requests together stay within ``max_concurrency``.
+        """
+        provider_config = self._config.get_llm_provider_config(self._current_provider)
+        max_concurrency = provider_config.max_concurrency if provider_config else 4
+        with self._batch_limits_lock:
+            limit = self._batch_limits.get(self._current_provider)
+            if limit is None:
+                limit = self._batch_limits[self._current_provider] = ConcurrencyLimit(max_concurrency)
+        return BatchExecutor(max_concurrency=max_concurrency, limit=limit)
+
+    def _batch_progress(
+        self,
+        show_progress: bool,
+        progress_callback: Optional[ProgressCallback]
+    ) -> Optional[ProgressCallback]:
+        """Combine console progress output with a user callback."""
+        if not show_progress:
+            return progress_callback
+
+        def report(completed: int, total: int, item: BatchItemResult):
+            print(f"Processed {completed}/{total}...")
+            if progress_callback:
+                progress_callback(completed, total, item)
+
+        return report
+
+    def _analysis_item(self, item: BatchItemResult) -> AnalysisResult:
+        """Convert a batch item into an AnalysisResult, keeping failures in place."""
+        if item.ok:
+            return item.value
+        return AnalysisResult(
+            report=f"Analysis failed: {item.error}",
+            score=None,
+            metadata={"error": str(item.error)}
+        )
+
+    def _match_item(self, item: BatchItemResult) -> Dict[str, Any]:
+        """Convert a batch item into a match dict, keeping failures in place."""
+        if item.ok:
+            return item.value
+        return {
+            "status": "Error",
+            "error": str(item.error),
+            "score": 0,
+            "reason": "Processing failed"
+        }
+
+    def submit_batch_job(
+        self,
+        resumes: List[str],
+        jd_text: str = None,
+        weights: Dict[str, int] = None
+    ) -> BatchJob:
+        """
+        Submit a bulk evaluate_match (or extract_resume_fields, without a JD)
+        run as one offline provider batch job.
+
+        Resumes whose result is already cached are not sent. Poll the job
+        with poll_batch_job(); on completion every result is written back
+        into the cache, so later evaluate_match calls are cache hits.
+
+        Args:
+            resumes: List of resume texts
+            jd_text: Job description text (None/short = field extraction)
+            weights: Scoring weights (see evaluate_match)
+
+        Returns:
+            The persisted BatchJob record
+
+        Raises:
+            LLMProviderError: If the current provider has no batch API
+        """
+        if not self._llm_provider.supports_batch:
+            raise LLMProviderError(f"Provider '{self._current_provider}' does not support batch jobs")
+
+        kind = "match" if jd_text and len(jd_text.strip()) >= 10 else "extract"
+        job = BatchJob(
+            job_id=BatchJob.new_id(),
+            kind=kind,
+            provider=self._current_provider,
+            status=BatchStatus.IN_PROGRESS,
+            items=[],
+            jd_text=jd_text if kind == "match" else None,
+            weights=weights
+        )
+
+        requests = []
+        for index, resume in enumerate(resumes):
+            item = BatchJobItem(
+                custom_id=f"item-{index}", index=index, resume_text=resume, resume_digest=text_digest(resume)
+            )
+            task = self._batch_job_task(job, item)
+            if self._load_cached(task) is not None:
+                item.submitted = False
+            else:
+                call = self._task_call(task)
+                requests.append(BatchRequest(
+                    custom_id=item.custom_id,
+                    messages=call["messages"],
+                    model=call["model"],
+                    temperature=call["temperature"],
+                    response_schema=call.get("response_schema")
                 ))
+            job.items.append(item)
 
-        return results
+        if requests:
+            job.provider_batch_id = self._llm_provider.submit_batch(requests)
+            self._metrics.increment("batch_jobs.requests", len(requests))
+        else:
+            self._collect_batch_job(job, [])
+            job.status = BatchStatus.COMPLETED
+
+        self._metrics.increment("batch_jobs.submitted")
+        self._batch_jobs.save(job)
+        return job
+
+    def poll_batch_job(self, job_id: str) -> BatchJob:
+        """
+        Refresh a batch job's status; collect and cache its results once
+        the provider has finished.
+
+        Args:
+            job_id: Id returned by submit_batch_job()
+
+        Returns:
+            The updated BatchJob record
+        """
+        job = self._batch_jobs.load(job_id)
+        if job is None:
+            raise AnalysisError(f"Batch job '{job_id}' not found")
+        if job.status in BatchStatus.TERMINAL:
+            return job
+
+        provider = self._get_provider(job.provider)
+        status = provider.get_batch_status(job.provider_batch_id)
+        if status == BatchStatus.COMPLETED:
+            self._collect_batch_job(job, provider.get_batch_results(job.provider_batch_id))
+        elif status in BatchStatus.TERMINAL:
+            job.error = f"Provider batch {job.provider_batch_id} {status}"
+        job.status = status
+
+        self._batch_jobs.save(job)
+        return job
+
+    def get_batch_job_results(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Results of a batch job in input order, or None while it is running."""
+        return self.poll_batch_job(job_id).results
+
+    def list_batch_jobs(self) -> List[BatchJob]:
+        """All persisted batch jobs, newest first."""
+        return self._batch_jobs.list_jobs()
+
+    def _batch_job_task(self, job: BatchJob, item: BatchJobItem) -> _LLMTask:
+        """Rebuild the task of one batch job item (same messages and cache key)."""
+        if job.kind == "match":
+            return self._match_task(item.resume_text, job.jd_text, True, job.weights, {})
+        return self._extract_task(item.resume_text, True, {})
+
+    def _collect_batch_job(self, job: BatchJob, batch_results: List[BatchResult]):
+        """Build, cache and store the results of a finished batch job."""
+        by_id = {r.custom_id: r for r in batch_results}
+        results = []
+        job.failed = 0
+        for item in job.items:
+            task = self._batch_job_task(job, item)
+            if item.submitted:
+                outcome = by_id.get(item.custom_id)
+                if outcome and outcome.response:
+                    result, errors = self._complete_task(task, outcome.response, time.time())
+                    result["_metadata"]["batch_job"] = job.job_id
+                    if errors:
+                        result = None
+                        error = "Malformed reply: " + "; ".join(errors[:5])
+                else:
+                    result = None
+                    error = outcome.error if outcome and outcome.error else "No result returned"
+            else:
+                result = self._load_cached(task)
+                error = "Cached result expired before the job finished"
+
+            if result is None:
+                job.failed += 1
+                if job.kind == "match":
+                    result = self._match_item(BatchItemResult(index=item.index, error=AnalysisError(error)))
+                else:
+                    result = {"error": error}  # Shaped like a failed extract_resume_fields()
+            results.append(result)
+
+        job.results = results
+        self._metrics.increment("batch_jobs.failed", job.failed)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Operational counters (hedging, ...).
+
+        Returns:
+            Counter snapshot plus derived ``hedge.rate`` (fired / eligible)
+        """
+        metrics = self._metrics.snapshot()
+        requests = metrics.get("hedge.requests", 0)
+        metrics["hedge.rate"] = metrics.get("hedge.fired", 0) / requests if requests else 0.0
+        return metrics
 
     def get_provider_info(self) -> Dict:
         """Get information about the current LLM provider."""
@@ -1086,6 +2856,10 @@ LANGUAGE: Chinese (Simplified).
                 "enabled": self._storage is not None,
                 "healthy": False,
                 "error": None
+            },
+            "circuit_breakers": {
+                name: breaker.stats()
+                for name, breaker in self._breakers.items() if breaker
             }
         }
 
@@ -1110,6 +2884,12 @@ LANGUAGE: Chinese (Simplified).
 
         return status
 
+    def close(self):
+        """Flush queued storage writes (write-behind) and close the storage backend."""
+        close = getattr(self._storage, "close", None)
+        if close is not None:
+            close()
+
 
 def create_engine(config_path: str = None, **kwargs) -> TalentOSEngine:
     """
@@ -53,11 +53,19 @@ class LLMAuthenticationError(LLMProviderError):
 
 class LLMRateLimitError(LLMProviderError):
     """Raised when API rate limit is exceeded."""
-    def __init__(self, message: str, retry_after: Optional[int] = None):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
         super().__init__(message)
         self.retry_after = retry_after
 
 
+class CircuitOpenError(LLMProviderError):
+    """Raised when a provider's circuit breaker is open and the call is skipped."""
+    def __init__(self, message: str, provider: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.retry_after = retry_after
+
+
 class DocumentParserError(PluginError):
     """Base exception for document parser errors."""
     pass
@@ -91,3 +99,10 @@ class ConfigurationError(TalentOSError):
 class AnalysisError(TalentOSError):
     """Raised when resume analysis fails."""
     pass
+
+
+class DeadlineExceededError(TalentOSError):
+    """Raised when a request runs past its deadline."""
+    def __init__(self, message: str, stage: str = ""):
+        super().__init__(message)
+        self.stage = stage
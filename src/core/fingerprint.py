@@ -0,0 +1,250 @@
+"""
+Near-Duplicate Fingerprints / 近似重复指纹
+
+SimHash fingerprints over normalized term shingles (contact details
+removed), so a resume that was re-exported (PDF vs DOCX) or lightly
+edited (new phone number) maps to the same or almost the same 64-bit
+value. The index remembers which cache entry each fingerprint produced,
+per scope (JD + persona + task), and finds the most similar earlier
+input above a threshold.
+
+Entries are appended to a JSONL file next to the cache so they survive
+restarts and reach other worker processes, which pick up new lines on
+their next lookup. Entries whose cache value has expired are dropped
+when a lookup misses on them, and the file is rewritten with only the
+retained entries on load and whenever it holds twice as many lines.
+Appends and rewrites hold an exclusive lock on ``<file>.lock``, so a
+rewrite in one worker never drops another worker's append.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.core.compaction import normalize_text
+from src.core.prefilter import tokenize
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows: single-process use only
+    HAS_FCNTL = False
+
+FINGERPRINT_BITS = 64
+
+# Contact details say nothing about fit and change between uploads
+_CONTACT_PATTERN = re.compile(
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"  # Email
+    r"|https?://\S+|www\.\S+"  # Links
+    r"|(?<!\d)(?:\+\d{1,3}[\s-]?)?(?:\d[\s-]?){9,13}\d(?!\d)"  # Phone numbers (10+ digits)
+)
+
+
+@dataclass
+class NearDuplicateConfig:
+    """Near-duplicate reuse settings (``analysis.near_duplicate`` in config)."""
+    enabled: bool = False
+    threshold: float = 0.95  # Minimum similarity (1 - hamming distance / 64)
+    shingle_size: int = 3  # Terms per shingle
+    max_entries: int = 1000  # Remembered inputs per scope (oldest dropped first)
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> "NearDuplicateConfig":
+        """Build from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Overlapping runs of ``size`` terms of the normalized text, contact details removed."""
+    terms = tokenize(_CONTACT_PATTERN.sub(" ", normalize_text(text or "")))
+    if len(terms) <= size:
+        return [" ".join(terms)] if terms else []
+    return [" ".join(terms[i:i + size]) for i in range(len(terms) - size + 1)]
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash of text.
+
+    Each shingle votes on every bit with its (stable, unsalted) hash,
+    weighted by how often it occurs; similar texts share most bits.
+    """
+    votes = [0] * FINGERPRINT_BITS
+    for shingle, weight in Counter(shingles(text, shingle_size)).items():
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            votes[bit] += weight if digest >> bit & 1 else -weight
+    return sum(1 << bit for bit, vote in enumerate(votes) if vote > 0)
+
+
+def similarity(a: int, b: int) -> float:
+    """Share of equal bits between two fingerprints (1.0 = identical)."""
+    return 1 - bin(a ^ b).count("1") / FINGERPRINT_BITS
+
+
+class FingerprintIndex:
+    """
+    Fingerprint -> cache key entries, grouped by scope.
+
+    Lookups scan one scope (all inputs evaluated against one JD with the
+    same settings), which stays small enough for a linear XOR/popcount scan.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1000):
+        """
+        Initialize the index.
+
+        Args:
+            path: JSONL file for persistence (None = in memory only)
+            max_entries: Entries kept per scope
+        """
+        self._path = Path(path) if path else None
+        self._max_entries = max(1, int(max_entries))
+        self._scopes: Dict[str, Deque[Tuple[int, str]]] = defaultdict(
+            lambda: deque(maxlen=self._max_entries)
+        )
+        self._lock = threading.Lock()
+        # Read position in the file, and the file it belongs to
+        self._offset = 0
+        self._inode = None
+        self._lines = 0
+        with self._lock, self._file_lock():
+            self._sync()
+            if self._lines > self._count():
+                self._rewrite()
+
+    def add(self, scope: str, fingerprint: int, cache_key: str):
+        """Remember that ``cache_key`` holds the result for an input."""
+        with self._lock:
+            self._sync()
+            if self._remember(scope, fingerprint, cache_key):
+                self._append({"scope": scope, "fp": fingerprint, "key": cache_key})
+
+    def discard(self, scope: str, cache_key: str):
+        """Forget ``cache_key`` in ``scope`` (its cached value is gone)."""
+        with self._lock:
+            if self._forget(scope, cache_key):
+                self._append({"scope": scope, "key": cache_key, "deleted": True})
+
+    def find(self, scope: str, fingerprint: int, threshold: float) -> List[Tuple[float, str]]:
+        """
+        Earlier inputs in ``scope`` at least ``threshold`` similar.
+
+        Returns:
+            (similarity, cache key) pairs, most similar first
+        """
+        with self._lock:
+            self._sync()
+            entries = list(self._scopes.get(scope, ()))
+        matches = {}
+        for fp, key in entries:
+            score = similarity(fingerprint, fp)
+            if score >= threshold and score > matches.get(key, -1):
+                matches[key] = score
+        return sorted(((score, key) for key, score in matches.items()), reverse=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return sum(len(entries) for entries in self._scopes.values())
+
+    def _remember(self, scope: str, fingerprint: int, cache_key: str) -> bool:
+        entries = self._scopes[scope]
+        if (fingerprint, cache_key) in entries:
+            return False
+        entries.append((fingerprint, cache_key))
+        return True
+
+    def _forget(self, scope: str, cache_key: str) -> bool:
+        entries = self._scopes.get(scope)
+        if not entries:
+            return False
+        kept = [entry for entry in entries if entry[1] != cache_key]
+        if len(kept) == len(entries):
+            return False
+        if kept:
+            entries.clear()
+            entries.extend(kept)
+        else:
+            del self._scopes[scope]
+        return True
+
+    def _append(self, entry: Dict[str, Any]):
+        """Append one line; compact the file once it is mostly stale lines."""
+        if not self._path:
+            return
+        with self._file_lock():
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._sync()
+            if self._lines > 2 * max(self._count(), self._max_entries):
+                self._rewrite()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared with other processes using the same file."""
+        if not self._path:
+            yield
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._path.with_name(self._path.name + ".lock"), "a") as lock_file:
+            if HAS_FCNTL:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if HAS_FCNTL:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Replay lines added since the last read (by this or another process)."""
+        if not self._path:
+            return
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # First read, or another process rewrote the file
+            self._scopes.clear()
+            self._inode, self._offset, self._lines = stat.st_ino, 0, 0
+        if stat.st_size == self._offset:
+            return
+        with open(self._path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # A partly written last line is read next time
+        self._offset += end
+        for line in data[:end].splitlines():
+            self._lines += 1
+            try:
+                entry = json.loads(line)
+                if entry.get("deleted"):
+                    self._forget(entry["scope"], entry["key"])
+                else:
+                    self._remember(entry["scope"], int(entry["fp"]), entry["key"])
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue  # Damaged line
+
+    def _rewrite(self):
+        """Replace the file with the retained entries only (call with _file_lock held, after _sync)."""
+        if not self._path:
+            return
+        tmp = self._path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for scope, entries in self._scopes.items():
+                for fp, key in entries:
+                    f.write(json.dumps({"scope": scope, "fp": fp, "key": key}) + "\n")
+        os.replace(tmp, self._path)
+        stat = self._path.stat()
+        self._inode, self._offset, self._lines = stat.st_ino, stat.st_size, self._count()
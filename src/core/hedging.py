@@ -0,0 +1,235 @@
+"""
+Hedged Requests / 对冲请求
+
+Tail-latency control: if the primary provider has not answered within an
+adaptive delay (a percentile of its recently observed latency for the same
+task), the same request is sent to a secondary provider and whichever
+finishes first wins.
+
+Metrics (recorded in a MetricsRegistry):
+- hedge.requests: calls eligible for hedging
+- hedge.fired: calls where the secondary request was sent
+- hedge.secondary_wins: hedged calls answered by the secondary
+- hedge.extra_tokens: tokens spent on the losing request (actual if it
+  completed, estimated prompt tokens if it was cancelled)
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from src.core.metrics import MetricsRegistry
+from src.interfaces.illm_provider import LLMResponse
+
+
+@dataclass
+class HedgingPolicy:
+    """Hedging settings (``analysis.hedging`` in config)."""
+    enabled: bool = False
+    secondary_provider: str = ""  # Empty = next enabled provider
+    percentile: float = 0.9
+    initial_delay_ms: float = 15000  # Used until min_samples latencies are observed
+    min_delay_ms: float = 2000
+    max_delay_ms: float = 30000
+    min_samples: int = 20
+    window: int = 200
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict]) -> "HedgingPolicy":
+        """Build a policy from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies per key."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency_ms: float):
+        with self._lock:
+            self._samples[key].append(latency_ms)
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """The q-th percentile (0-1) of recorded latencies, or None if empty."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[index]
+
+
+class Hedger:
+    """
+    Runs a primary call and, after an adaptive delay, a hedged secondary call.
+
+    call() uses a thread pool (the losing thread runs to completion and
+    its result is discarded); acall() cancels the losing task.
+    """
+
+    MAX_WORKERS = 64
+
+    def __init__(self, policy: HedgingPolicy, metrics: MetricsRegistry):
+        self._policy = policy
+        self._metrics = metrics
+        self._latencies = LatencyTracker(policy.window)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def policy(self) -> HedgingPolicy:
+        return self._policy
+
+    @property
+    def enabled(self) -> bool:
+        return self._policy.enabled
+
+    def delay_for(self, key: str) -> float:
+        """Seconds to wait for the primary before hedging."""
+        policy = self._policy
+        observed = None
+        if self._latencies.count(key) >= policy.min_samples:
+            observed = self._latencies.percentile(key, policy.percentile)
+        delay_ms = observed if observed is not None else policy.initial_delay_ms
+        return min(policy.max_delay_ms, max(policy.min_delay_ms, delay_ms)) / 1000.0
+
+    def call(
+        self,
+        key: str,
+        primary: Callable[[], LLMResponse],
+        secondary: Callable[[], LLMResponse],
+        estimated_tokens: int = 0
+    ) -> LLMResponse:
+        """
+        Run ``primary``; hedge with ``secondary`` if it is slow.
+
+        Args:
+            key: Latency bucket (e.g. the task name)
+            primary: Call against the primary provider
+            secondary: Call against the secondary provider
+            estimated_tokens: Prompt size, charged as extra spend if the
+                losing request's real usage is unknown
+
+        Returns:
+            The first successful response
+        """
+        self._metrics.increment("hedge.requests")
+        pool = self._get_pool()
+
+        # Legs run in the caller's context (request deadline etc.)
+        primary_future = pool.submit(contextvars.copy_context().run, self._timed, key, primary)
+        done, _ = wait([primary_future], timeout=self.delay_for(key))
+        if done:
+            return primary_future.result()
+
+        self._metrics.increment("hedge.fired")
+        secondary_future = pool.submit(contextvars.copy_context().run, secondary)
+        legs = {primary_future: "primary", secondary_future: "secondary"}
+        pending = set(legs)
+        first_error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    first_error = first_error or future.exception()
+                    continue
+                if legs[future] == "secondary":
+                    self._metrics.increment("hedge.secondary_wins")
+                for loser in pending:
+                    loser.add_done_callback(self._charge_loser)
+                return future.result()
+
+        raise first_error
+
+    async def acall(
+        self,
+        key: str,
+        primary: Callable[[], Awaitable[LLMResponse]],
+        secondary: Callable[[], Awaitable[LLMResponse]],
+        estimated_tokens: int = 0
+    ) -> LLMResponse:
+        """Async variant of call(); the losing request is cancelled."""
+        self._metrics.increment("hedge.requests")
+
+        primary_task = asyncio.ensure_future(self._atimed(key, primary))
+        legs = {primary_task: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self.delay_for(key))
+            if done:
+                return primary_task.result()
+
+            self._metrics.increment("hedge.fired")
+            secondary_task = asyncio.ensure_future(secondary())
+            legs[secondary_task] = "secondary"
+            pending = set(legs)
+            first_error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        first_error = first_error or task.exception()
+                        continue
+                    if legs[task] == "secondary":
+                        self._metrics.increment("hedge.secondary_wins")
+                    if pending:
+                        # Cancelled mid-flight: the prompt was most likely billed
+                        self._metrics.increment("hedge.extra_tokens", estimated_tokens * len(pending))
+                    return task.result()
+
+            raise first_error
+        finally:
+            for task in legs:
+                if not task.done():
+                    task.cancel()
+
+    def _timed(self, key: str, fn: Callable[[], LLMResponse]) -> LLMResponse:
+        """Run the primary call and record its latency on success."""
+        response = fn()
+        self._latencies.record(key, response.latency_ms)
+        return response
+
+    async def _atimed(self, key: str, fn: Callable[[], Awaitable[LLMResponse]]) -> LLMResponse:
+        """
+        Async variant of _timed().
+
+        A primary cancelled after losing to the hedge records how long it
+        ran (a lower bound on its latency); skipping it would leave only
+        fast calls in the window and keep lowering the hedge delay.
+        """
+        start = time.monotonic()
+        try:
+            response = await fn()
+        except asyncio.CancelledError:
+            self._latencies.record(key, (time.monotonic() - start) * 1000)
+            raise
+        self._latencies.record(key, response.latency_ms)
+        return response
+
+    def _charge_loser(self, future):
+        """Record the tokens a losing (completed) request consumed."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._metrics.increment("hedge.extra_tokens", future.result().tokens_used)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.MAX_WORKERS,
+                    thread_name_prefix="talentos-hedge"
+                )
+            return self._pool
@@ -0,0 +1,184 @@
+"""
+JD Registry / 职位描述注册表
+
+Parsed job descriptions stored once under a content address. A client
+registers a JD (text or file) and gets a ``jd_id`` back; later requests
+reference the JD by id instead of re-uploading and re-parsing it.
+Derived artifacts (requirement list, optimized JD) are kept on the
+record so they are computed once per JD.
+
+Records are JSON files (``<directory>/<jd_id>.json``), like batch jobs.
+The in-memory copies are checked against the file on every read, so a
+JD deleted or re-registered by another worker process is seen at once.
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.cache_keys import canonicalize, text_digest
+
+_HEADING_MARKUP = re.compile(r"^[#>*_【\[\s]+|[*_】\]:：\s]+$")
+_BULLET = re.compile(r"^(?:[-*•·]|\d+[.)、]|[(（]\d+[)）])\s*")
+_REQUIREMENT_HEADINGS = (
+    "requirement", "qualification", "must have", "nice to have", "what you bring",
+    "任职要求", "岗位要求", "任职资格", "技能要求", "职位要求",
+)
+_MAX_HEADING_CHARS = 30
+_MAX_TITLE_CHARS = 80
+
+
+def _heading(line: str) -> Optional[str]:
+    """Lowercased heading text if the line looks like a section heading."""
+    stripped = line.strip()
+    text = _HEADING_MARKUP.sub("", stripped).lower()
+    if not text or len(text) > _MAX_HEADING_CHARS:
+        return None
+    if stripped[:1] in ("#", "【", "[") or stripped.startswith("**") or stripped[-1:] in (":", "："):
+        return text
+    return None
+
+
+def extract_requirements(text: str) -> List[str]:
+    """
+    Requirement items of a JD: the lines under its requirement headings
+    ("Requirements", "任职要求", ...), without bullet markers.
+    """
+    requirements: List[str] = []
+    in_requirements = False
+    for line in canonicalize(text).split("\n"):
+        heading = _heading(line)
+        if heading is not None:
+            in_requirements = any(alias in heading for alias in _REQUIREMENT_HEADINGS)
+            continue
+        item = _BULLET.sub("", line.strip())
+        if in_requirements and item:
+            requirements.append(item)
+    return requirements
+
+
+@dataclass
+class JDRecord:
+    """A registered job description."""
+    jd_id: str  # Content digest of the canonical text
+    text: str  # Canonical text
+    title: str
+    source: str = "text"  # "text" or the uploaded file name
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    artifacts: Dict[str, Any] = field(default_factory=dict)  # Derived data, by name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "JDRecord":
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+    def summary(self) -> Dict[str, Any]:
+        """Record without the text, for listings."""
+        return {
+            "jd_id": self.jd_id,
+            "title": self.title,
+            "source": self.source,
+            "created_at": self.created_at,
+            "chars": len(self.text),
+            "artifacts": sorted(self.artifacts)
+        }
+
+
+class JDRegistry:
+    """Stores JDRecords as ``<directory>/<jd_id>.json`` with an in-memory copy."""
+
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+        # jd_id -> (file (mtime_ns, size) the copy was read from, record)
+        self._records: Dict[str, Tuple[Tuple[int, int], JDRecord]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, text: str, source: str = "text") -> JDRecord:
+        """
+        Store a JD (idempotent: the same content returns the same record).
+
+        Returns:
+            The new or existing record
+        """
+        jd_id = text_digest(text)
+        existing = self.get(jd_id)
+        if existing:
+            return existing
+
+        canonical = canonicalize(text)
+        title = next((line for line in canonical.split("\n") if line), "")[:_MAX_TITLE_CHARS]
+        record = JDRecord(jd_id=jd_id, text=canonical, title=title, source=source)
+        record.artifacts["requirements"] = extract_requirements(canonical)
+        self._save(record)
+        return record
+
+    def get(self, jd_id: str) -> Optional[JDRecord]:
+        """A record by id, or None if unknown."""
+        path = self._path(jd_id)
+        try:
+            version = self._version(path)
+            with self._lock:
+                cached = self._records.get(jd_id)
+            if cached and cached[0] == version:
+                return cached[1]
+            with open(path, 'r', encoding='utf-8') as f:
+                record = JDRecord.from_dict(json.load(f))
+        except FileNotFoundError:
+            with self._lock:
+                self._records.pop(jd_id, None)  # Deleted, possibly by another worker
+            return None
+        with self._lock:
+            self._records[jd_id] = (version, record)
+        return record
+
+    def list_records(self) -> List[JDRecord]:
+        """All records, newest first."""
+        if not self._directory.exists():
+            return []
+        records = [self.get(path.stem) for path in self._directory.glob("*.json")]
+        return sorted((r for r in records if r), key=lambda r: r.created_at, reverse=True)
+
+    def delete(self, jd_id: str) -> bool:
+        """Remove a record; False if it did not exist."""
+        with self._lock:
+            self._records.pop(jd_id, None)
+        path = self._path(jd_id)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+    def set_artifact(self, jd_id: str, name: str, value: Any):
+        """Attach derived data to a record."""
+        record = self.get(jd_id)
+        if record is None:
+            raise KeyError(jd_id)
+        record.artifacts[name] = value
+        self._save(record)
+
+    def _save(self, record: JDRecord):
+        """Write a record (atomically replaces the previous version)."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(record.jd_id)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(record.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+        with self._lock:
+            self._records[record.jd_id] = (self._version(path), record)
+
+    def _path(self, jd_id: str) -> Path:
+        return self._directory / f"{Path(jd_id).name}.json"
+
+    @staticmethod
+    def _version(path: Path) -> Tuple[int, int]:
+        """(mtime_ns, size) of a record file; raises FileNotFoundError if it is gone."""
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
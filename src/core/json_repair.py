@@ -0,0 +1,147 @@
+"""
+JSON Repair / JSON修复
+
+Local repair pass for model-generated JSON: strips markdown fences and
+surrounding prose, removes trailing commas and closes output that was
+cut off mid-generation. Cheaper than re-asking the model.
+
+A value recovered from truncated output is only a prefix of what the
+model meant to send, so repair_json() reports it as truncated; callers
+that cache results should treat it as malformed.
+"""
+
+import json
+from typing import Any, List, Tuple
+
+_MISSING = object()
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the first JSON object/array in text, repairing it if needed.
+
+    Returns:
+        The parsed value, or None if nothing usable could be recovered
+    """
+    return repair_json(text)[0]
+
+
+def repair_json(text: str) -> Tuple[Any, bool]:
+    """
+    extract_json() that also reports whether the value had to be
+    recovered from truncated output.
+
+    Returns:
+        (parsed value or None, truncated)
+    """
+    start = _first_container(text or "")
+    if start < 0:
+        return None, False
+    candidate = text[start:]
+
+    value = _decode_prefix(candidate)
+    if value is not _MISSING:
+        return value, False
+
+    candidate = _remove_trailing_commas(candidate)
+    value = _decode_prefix(candidate)
+    if value is not _MISSING:
+        return value, False
+
+    value = _close_truncated(candidate)
+    return (None, False) if value is _MISSING else (value, True)
+
+
+def _first_container(text: str) -> int:
+    """Index of the first '{' or '[' (-1 if none)."""
+    positions = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    return min(positions) if positions else -1
+
+
+def _decode_prefix(text: str) -> Any:
+    """Decode a JSON value at the start of text, ignoring anything after it."""
+    try:
+        return json.JSONDecoder().raw_decode(text)[0]
+    except json.JSONDecodeError:
+        return _MISSING
+
+
+def _scan(text: str) -> Tuple[List[str], bool, List[int]]:
+    """
+    Walk text outside of strings.
+
+    Returns:
+        (open containers as closing chars, still inside a string,
+         positions where the text may be cut to drop an incomplete member)
+    """
+    stack: List[str] = []
+    cuts: List[int] = []
+    in_string = False
+    escape = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            cuts.append(i + 1)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            cuts.append(i + 1)
+        elif char == ",":
+            cuts.append(i)
+    return stack, in_string, cuts
+
+
+def _remove_trailing_commas(text: str) -> str:
+    """Drop commas directly followed by a closing bracket (outside strings)."""
+    out: List[str] = []
+    in_string = False
+    escape = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            rest = text[i + 1:].lstrip()
+            if rest[:1] in ("}", "]"):
+                continue
+        out.append(char)
+    return "".join(out)
+
+
+def _close_truncated(text: str, max_attempts: int = 50) -> Any:
+    """
+    Recover a value from output cut off mid-generation by closing the open
+    containers. A member whose value may itself be cut short (open string,
+    bare number or literal) is dropped rather than kept half-written.
+    """
+    stack, in_string, cuts = _scan(text)
+    if not in_string and text.rstrip()[-1:] in ('"', "}", "]"):
+        value = _decode_prefix(text + "".join(reversed(stack)))
+        if value is not _MISSING:
+            return value
+
+    for cut in reversed(cuts[-max_attempts:]):
+        prefix = text[:cut]
+        stack, in_string, _ = _scan(prefix)
+        if in_string:
+            continue
+        value = _decode_prefix(prefix + "".join(reversed(stack)))
+        if value is not _MISSING:
+            return value
+    return _MISSING
@@ -0,0 +1,217 @@
+"""
+Streaming JSON Parser / 流式JSON解析器
+
+Incremental parser for JSON generated token by token. Text before the
+first ``{``/``[`` (e.g. a ```json fence) and after the root value is
+ignored. Each time a value completes at a depth up to ``emit_depth`` a
+JsonEvent is produced, so ``score`` and ``status`` are available long
+before the last dimension comment has been generated.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+PathPart = Union[str, int]
+
+_WHITESPACE = " \t\r\n"
+_LITERAL_CHARS = set("0123456789+-.eEtruefalsn")
+
+
+@dataclass
+class JsonEvent:
+    """A completed value: path from the root (keys / list indices) and value."""
+    path: Tuple[PathPart, ...]
+    value: Any
+
+    @property
+    def key(self) -> str:
+        """Dotted path, e.g. ``dimensions.skills`` or ``strengths.0``."""
+        return ".".join(str(part) for part in self.path)
+
+
+class _Frame:
+    """An open object or array."""
+
+    __slots__ = ("value", "path", "key", "expect_key")
+
+    def __init__(self, value, path: Tuple[PathPart, ...]):
+        self.value = value
+        self.path = path
+        self.key: Optional[str] = None
+        self.expect_key = isinstance(value, dict)
+
+    def child_path(self) -> Tuple[PathPart, ...]:
+        if isinstance(self.value, dict):
+            return self.path + (self.key,)
+        return self.path + (len(self.value),)
+
+
+class JsonStreamParser:
+    """
+    Feed chunks, get events.
+
+    Usage:
+        parser = JsonStreamParser()
+        for chunk in stream:
+            for event in parser.feed(chunk):
+                ...
+        result = parser.close()
+    """
+
+    def __init__(self, emit_depth: int = 2):
+        """
+        Initialize parser.
+
+        Args:
+            emit_depth: Emit events for values at most this deep
+                (1 = top-level fields, 2 = also their entries)
+        """
+        self._emit_depth = emit_depth
+        self._stack: List[_Frame] = []
+        self._string: Optional[List[str]] = None  # Raw chars of the open string
+        self._escape = False
+        self._literal: List[str] = []
+        self._started = False
+        self._done = False
+        self._result: Any = None
+
+    @property
+    def done(self) -> bool:
+        """True once the root value is complete."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[JsonEvent]:
+        """
+        Consume a chunk of text.
+
+        Returns:
+            Events for the values completed by this chunk
+
+        Raises:
+            ValueError: On malformed JSON
+        """
+        events: List[JsonEvent] = []
+        for char in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if char in "{[":
+                    self._started = True
+                    self._open(char, events)
+                continue
+            if self._string is not None:
+                self._string_char(char, events)
+                continue
+            if self._literal and char not in _LITERAL_CHARS:
+                self._finish_literal(events)
+                if self._done:
+                    break
+            self._structural(char, events)
+        return events
+
+    def close(self) -> Any:
+        """
+        Finish parsing and return the root value.
+
+        Raises:
+            ValueError: If no complete JSON value was seen
+        """
+        if not self._done:
+            raise ValueError("Incomplete JSON stream")
+        return self._result
+
+    def _structural(self, char: str, events: List[JsonEvent]):
+        top = self._stack[-1]
+        if char in _WHITESPACE:
+            return
+        if char == '"':
+            self._string = []
+        elif char in "{[":
+            self._open(char, events)
+        elif char in "}]":
+            if (char == "}") != isinstance(top.value, dict):
+                raise ValueError(f"Unexpected '{char}' in JSON stream")
+            self._stack.pop()
+            self._complete(top.value, events, top.path)
+        elif char == ":":
+            if not isinstance(top.value, dict) or top.key is None:
+                raise ValueError("Unexpected ':' in JSON stream")
+        elif char == ",":
+            top.expect_key = isinstance(top.value, dict)
+        elif char in _LITERAL_CHARS:
+            self._literal.append(char)
+        else:
+            raise ValueError(f"Unexpected character {char!r} in JSON stream")
+
+    def _string_char(self, char: str, events: List[JsonEvent]):
+        if self._escape:
+            self._escape = False
+            self._string.append(char)
+        elif char == "\\":
+            self._escape = True
+            self._string.append(char)
+        elif char == '"':
+            text = json.loads('"' + "".join(self._string) + '"')
+            self._string = None
+            top = self._stack[-1]
+            if top.expect_key:
+                top.key = text
+                top.expect_key = False
+            else:
+                self._add_value(text, events)
+        else:
+            self._string.append(char)
+
+    def _finish_literal(self, events: List[JsonEvent]):
+        token = "".join(self._literal)
+        self._literal = []
+        try:
+            value = json.loads(token)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON literal {token!r}")
+        self._add_value(value, events)
+
+    def _open(self, char: str, events: List[JsonEvent]):
+        path = self._stack[-1].child_path() if self._stack else ()
+        self._stack.append(_Frame({} if char == "{" else [], path))
+
+    def _add_value(self, value: Any, events: List[JsonEvent]):
+        """Attach a completed scalar to the open container."""
+        self._complete(value, events, self._stack[-1].child_path())
+
+    def _complete(self, value: Any, events: List[JsonEvent], path: Tuple[PathPart, ...]):
+        """Record a completed value and emit it if shallow enough."""
+        if not self._stack:
+            self._result = value
+            self._done = True
+            return
+
+        top = self._stack[-1]
+        if isinstance(top.value, dict):
+            top.value[top.key] = value
+            top.key = None
+        else:
+            top.value.append(value)
+
+        if len(path) <= self._emit_depth:
+            events.append(JsonEvent(path=path, value=value))
+
+
+def iter_events(value: Any, emit_depth: int = 2, path: Tuple[PathPart, ...] = ()) -> Iterator[JsonEvent]:
+    """
+    Events for an already-parsed value, in the order the parser would
+    emit them (children before their container).
+    """
+    if len(path) >= emit_depth:
+        return
+    if isinstance(value, dict):
+        children = value.items()
+    elif isinstance(value, list):
+        children = enumerate(value)
+    else:
+        return
+    for key, child in children:
+        child_path = path + (key,)
+        yield from iter_events(child, emit_depth, child_path)
+        yield JsonEvent(path=child_path, value=child)
@@ -0,0 +1,38 @@
+"""
+Metrics / 运行指标
+
+Minimal thread-safe counter registry for engine-level operational metrics
+(hedging, retries, ...). Exposed through TalentOSEngine.get_metrics().
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class MetricsRegistry:
+    """Named numeric counters, safe to update from threads and coroutines."""
+
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1):
+        """Add ``value`` to counter ``name``."""
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> float:
+        """Current value of a counter (0 if never set)."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Copy of all counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self._counters.clear()
@@ -0,0 +1,137 @@
+"""
+Lexical Prefilter / 词法预筛选
+
+Cheap local first stage for batch screening: every resume is scored
+against the JD with BM25 (English words plus Chinese character bigrams),
+and only the best candidates are sent to the LLM. The others get a
+"Prefiltered" result carrying their lexical score.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Latin terms keep inner symbols so "c++", "c#", "node.js" survive; CJK runs become bigrams
+_TERM_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]|[\u4e00-\u9fff]+")
+_CJK_RUN = re.compile(r"^[\u4e00-\u9fff]+$")
+
+_STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in is it of on or our
+the their this to we will with you your who what which than that
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into matching terms.
+
+    English: lowercased words without stopwords. Chinese: overlapping
+    character bigrams (single characters stay unigrams).
+    """
+    terms: List[str] = []
+    for term in _TERM_PATTERN.findall((text or "").lower()):
+        if _CJK_RUN.match(term):
+            if len(term) == 1:
+                terms.append(term)
+            else:
+                terms.extend(term[i:i + 2] for i in range(len(term) - 1))
+        elif term not in _STOPWORDS:
+            terms.append(term)
+    return terms
+
+
+class BM25:
+    """Okapi BM25 over a fixed set of tokenized documents."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(doc) for doc in documents]
+        self._lengths = [len(doc) for doc in documents]
+        self._avg_length = (sum(self._lengths) / len(documents)) if documents else 0.0
+
+        doc_freqs: Counter = Counter()
+        for freqs in self._term_freqs:
+            doc_freqs.update(freqs.keys())
+        n = len(documents)
+        self._idf = {
+            term: math.log((n - df + 0.5) / (df + 0.5) + 1)
+            for term, df in doc_freqs.items()
+        }
+
+    def score(self, query: List[str], index: int) -> float:
+        """BM25 score of document ``index`` for the query terms."""
+        freqs = self._term_freqs[index]
+        norm = 1 - self.b + self.b * (self._lengths[index] / self._avg_length if self._avg_length else 0)
+        total = 0.0
+        for term in query:
+            tf = freqs.get(term)
+            if tf:
+                total += self._idf[term] * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return total
+
+
+@dataclass
+class PrefilterConfig:
+    """Prefilter settings (``analysis.prefilter`` in config)."""
+    enabled: bool = False
+    top_k: int = 50  # Max candidates sent to the LLM (0 = no cap)
+    min_relative_score: float = 0.0  # Also drop candidates below this fraction of the best score
+    min_batch_size: int = 20  # Smaller batches skip the prefilter
+    k1: float = 1.5
+    b: float = 0.75
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict]) -> "PrefilterConfig":
+        """Build from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class LexicalMatch:
+    """Prefilter outcome for one resume."""
+    index: int
+    score: float
+    rank: int
+    selected: bool
+
+
+def lexical_prefilter(
+    resumes: List[str],
+    jd_text: str,
+    top_k: int = 50,
+    min_relative_score: float = 0.0,
+    k1: float = 1.5,
+    b: float = 0.75
+) -> List[LexicalMatch]:
+    """
+    Score resumes against a JD and select the candidates worth an LLM call.
+
+    Args:
+        resumes: Resume texts
+        jd_text: Job description text (its unique terms form the query)
+        top_k: Keep at most this many (0 = no cap)
+        min_relative_score: Keep only scores >= this fraction of the best
+        k1, b: BM25 parameters
+
+    Returns:
+        One LexicalMatch per resume, in input order. At least one
+        candidate is always selected.
+    """
+    query = list(dict.fromkeys(tokenize(jd_text)))
+    bm25 = BM25([tokenize(resume) for resume in resumes], k1=k1, b=b)
+    scores = [bm25.score(query, i) for i in range(len(resumes))]
+
+    order = sorted(range(len(resumes)), key=lambda i: scores[i], reverse=True)
+    best = scores[order[0]] if order else 0.0
+
+    matches: List[Optional[LexicalMatch]] = [None] * len(resumes)
+    for rank, i in enumerate(order):
+        selected = rank == 0 or (
+            (not top_k or rank < top_k) and scores[i] >= best * min_relative_score
+        )
+        matches[i] = LexicalMatch(index=i, score=round(scores[i], 4), rank=rank + 1, selected=selected)
+    return matches
@@ -0,0 +1,208 @@
+"""
+Rate Limiter / 速率限制器
+
+Per-provider token buckets for requests/min and tokens/min.
+
+Callers reserve capacity before each chat/chat_stream call and sleep for
+the returned delay, so concurrent workers queue up locally instead of
+hammering the provider into 429s. A provider's retry-after hint pauses
+the whole bucket for every caller. A wait longer than the request
+deadline gives the reservation back and fails at once.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from src.core.config import LLMProviderConfig
+from src.core.deadline import remaining as deadline_remaining
+from src.core.exceptions import DeadlineExceededError
+
+
+class _Bucket:
+    """A single token bucket refilled continuously at ``per_minute / 60`` per second."""
+
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.level = min(self.capacity, self.level + elapsed * self.rate)
+            self.updated = now
+
+    def give_back(self, amount: float):
+        self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+    def take(self, amount: float) -> float:
+        """Consume ``amount`` (may go negative) and return seconds until it is covered."""
+        self.level -= min(amount, self.capacity)
+        if self.level >= 0:
+            return 0.0
+        return -self.level / self.rate
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter for one LLM provider.
+
+    Thread-safe and asyncio-safe: reservations are made under a lock and
+    the resulting wait happens outside it (time.sleep or asyncio.sleep).
+    A limit of 0 disables that dimension.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Max requests per minute (0 = unlimited)
+            tokens_per_minute: Max tokens per minute (0 = unlimited)
+        """
+        now = time.monotonic()
+        self._requests = _Bucket(requests_per_minute, now) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._requests is not None or self._tokens is not None
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve capacity for one request.
+
+        Args:
+            tokens: Estimated tokens for the request
+
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._requests:
+                self._requests.refill(now)
+                wait = max(wait, self._requests.take(1))
+            if self._tokens and tokens > 0:
+                self._tokens.refill(now)
+                wait = max(wait, self._tokens.take(tokens))
+            return wait
+
+    def release(self, tokens: int = 0):
+        """Give back a reservation whose request was never sent."""
+        with self._lock:
+            now = time.monotonic()
+            if self._requests:
+                self._requests.refill(now)
+                self._requests.give_back(1)
+            if self._tokens and tokens > 0:
+                self._tokens.refill(now)
+                self._tokens.give_back(tokens)
+
+    def acquire(self, tokens: int = 0):
+        """
+        Block until a request of ``tokens`` may be sent.
+
+        Raises:
+            DeadlineExceededError: If the wait would outlast the request deadline
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._check_deadline(wait, tokens)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._check_deadline(wait, tokens)
+            await asyncio.sleep(wait)
+
+    def _check_deadline(self, wait: float, tokens: int):
+        """Release the reservation and raise if ``wait`` outlasts the request deadline."""
+        left = deadline_remaining()
+        if left is not None and wait > left:
+            self.release(tokens)
+            raise DeadlineExceededError(
+                f"Rate limit wait of {wait:.1f}s exceeds the request deadline", stage="rate_limit"
+            )
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Charge (or refund) the difference between estimated and actual usage."""
+        if not self._tokens or not actual_tokens:
+            return
+        with self._lock:
+            self._tokens.refill(time.monotonic())
+            self._tokens.level = min(
+                self._tokens.capacity,
+                self._tokens.level - (actual_tokens - estimated_tokens)
+            )
+
+    def pause(self, seconds: float):
+        """Pause the whole bucket, e.g. when the provider returns retry-after."""
+        if not seconds or seconds <= 0:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+# Shared limiters, one per provider, across all engine instances in the process
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider_name: str, config: Optional[LLMProviderConfig]) -> Optional[RateLimiter]:
+    """
+    Get the shared rate limiter for a provider.
+
+    Args:
+        provider_name: Provider identifier
+        config: Provider configuration (limits are read from it)
+
+    Returns:
+        RateLimiter, or None if the provider has no limits configured
+    """
+    if not config or not (config.requests_per_minute or config.tokens_per_minute):
+        return None
+
+    with _limiters_lock:
+        limiter = _limiters.get(provider_name)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=config.requests_per_minute,
+                tokens_per_minute=config.tokens_per_minute
+            )
+            _limiters[provider_name] = limiter
+        return limiter
+
+
+def retry_after_from_error(error: Exception) -> Optional[float]:
+    """
+    Extract a retry-after hint (seconds) from an SDK exception, if present.
+
+    Checks a ``retry_after`` attribute first, then the ``retry-after`` /
+    ``retry-after-ms`` response headers.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return retry_after
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
@@ -0,0 +1,149 @@
+"""
+Resume Profile / 简历画像
+
+A compact, reusable view of a resume: the structured fields from
+extract_resume_fields plus the free-text sections that carry evidence
+(summary, experience, projects), split locally by their headings. The
+profile is derived from the cached extraction result, so each resume is
+understood by the LLM once and then matched against many JDs using the
+rendered profile instead of the raw text.
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.compaction import normalize_text
+
+# Checked in order: "Project Experience" is a projects heading, not experience
+_SECTION_ALIASES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("projects", ("project", "项目经历", "项目经验")),
+    ("summary", ("summary", "profile", "objective", "about me", "个人简介", "自我评价", "个人总结", "求职意向")),
+    ("experience", ("experience", "employment", "work history", "工作经历", "工作经验", "职业经历")),
+    ("education", ("education", "教育背景", "教育经历", "学历")),
+    ("skills", ("skills", "技能", "技术栈")),
+    ("certifications", ("certification", "certificate", "证书", "资格认证")),
+]
+_HEADING_MARKUP = re.compile(r"^[#>*_\s]+|[*_:：\s]+$")
+_MAX_HEADING_CHARS = 30
+_MAX_HEADING_WORDS = 4
+
+# Fields rendered first, with their labels
+_FIELD_LABELS = [
+    ("current_position", "Current position"),
+    ("current_company", "Current company"),
+    ("years_of_experience", "Years of experience"),
+]
+
+
+@dataclass
+class ResumeProfileConfig:
+    """Resume profile settings (``analysis.resume_profile`` in config)."""
+    enabled: bool = False
+    tasks: List[str] = field(default_factory=lambda: ["match", "analyze", "diagnose"])  # Tasks fed the profile
+    sections: List[str] = field(default_factory=lambda: ["summary", "experience", "projects"])
+    max_section_chars: int = 1500  # Per rendered section
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> "ResumeProfileConfig":
+        """Build from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+def _section_name(line: str) -> Optional[str]:
+    """Section a heading line opens, or None if the line is not a heading."""
+    text = _HEADING_MARKUP.sub("", line).lower()
+    if not text or len(text) > _MAX_HEADING_CHARS or len(text.split()) > _MAX_HEADING_WORDS:
+        return None
+    for name, aliases in _SECTION_ALIASES:
+        if any(alias in text for alias in aliases):
+            return name
+    return None
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Split resume text into sections by recognized headings.
+
+    Text before the first heading (name, contacts) is returned as
+    "header"; repeated headings of one kind are merged.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = "header"
+    for line in normalize_text(text or "").split("\n"):
+        name = _section_name(line)
+        if name:
+            current = name
+            continue
+        if line or sections.get(current):
+            sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "".join(lines).strip()}
+
+
+@dataclass
+class ResumeProfile:
+    """Structured fields plus evidence sections of one resume."""
+    digest: str  # Content digest of the canonical resume text
+    fields: Dict[str, Any]
+    sections: Dict[str, str]
+
+    @property
+    def usable(self) -> bool:
+        """False when extraction failed and the raw text should be used instead."""
+        return bool(self.fields) and "error" not in self.fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ResumeProfile":
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+    def render(self, sections: List[str] = None, max_section_chars: int = 1500) -> str:
+        """
+        Compact text form for prompts.
+
+        Args:
+            sections: Section names to include, in order (None = all)
+            max_section_chars: Longer sections are cut at a line boundary
+
+        Returns:
+            Profile text
+        """
+        lines = ["CANDIDATE PROFILE (structured from the resume)"]
+        if self.fields.get("name"):
+            lines.append(f"Name: {self.fields['name']}")
+        for key, label in _FIELD_LABELS:
+            if self.fields.get(key) not in (None, ""):
+                lines.append(f"{label}: {self.fields[key]}")
+        if self.fields.get("skills"):
+            lines.append("Skills: " + ", ".join(_flat(skill) for skill in self.fields["skills"]))
+        for key, label in (("education", "Education"), ("experience", "Experience")):
+            entries = [_flat(entry) for entry in self.fields.get(key) or []]
+            if entries:
+                lines.append(f"{label}:")
+                lines.extend(f"- {entry}" for entry in entries if entry)
+
+        for name in sections if sections is not None else list(self.sections):
+            body = self.sections.get(name)
+            if body:
+                lines.append(f"\n## {name.title()}\n{_cut(body, max_section_chars)}")
+        return "\n".join(lines)
+
+
+def _flat(value: Any) -> str:
+    """One-line form of an extracted value (dict entries as "key: value; ...")."""
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {_flat(v)}" for k, v in value.items() if v not in (None, "", [], {}))
+    if isinstance(value, list):
+        return ", ".join(_flat(v) for v in value)
+    return str(value)
+
+
+def _cut(text: str, max_chars: int) -> str:
+    """Text cut to max_chars at a line boundary."""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip() + "\n[...]"
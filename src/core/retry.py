@@ -0,0 +1,175 @@
+"""
+Retry Policy / 重试策略
+
+Per-provider retry policies for LLM calls. Errors are classified first:
+authentication/configuration failures, client errors (4xx) and open
+circuits are never retried; rate limits honor retry-after; everything
+else is retried with backoff. The default backoff is decorrelated jitter,
+so workers that failed together do not retry together, and the whole
+call (attempts plus backoff) is bounded by a deadline budget.
+"""
+
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from src.core.exceptions import (
+    TalentOSError,
+    PluginError,
+    ConfigurationError,
+    LLMProviderError,
+    LLMAPIError,
+    LLMAuthenticationError,
+    LLMRateLimitError,
+    CircuitOpenError,
+)
+
+# 4xx codes that can succeed on a later attempt
+_RETRYABLE_CLIENT_CODES = frozenset({408, 409, 429})
+
+
+class ErrorClass(str, Enum):
+    """How a failed attempt is handled."""
+    RETRYABLE = "retryable"
+    RATE_LIMITED = "rate_limited"
+    FATAL = "fatal"
+
+
+def classify_error(error: Exception) -> ErrorClass:
+    """Classify an exception raised by a provider call."""
+    if isinstance(error, LLMRateLimitError):
+        return ErrorClass.RATE_LIMITED
+    if isinstance(error, (LLMAuthenticationError, CircuitOpenError, ConfigurationError)):
+        return ErrorClass.FATAL
+    if isinstance(error, LLMAPIError):
+        code = error.status_code
+        if code and 400 <= code < 500 and code not in _RETRYABLE_CLIENT_CODES:
+            return ErrorClass.FATAL
+        return ErrorClass.RETRYABLE
+    if isinstance(error, LLMProviderError):
+        return ErrorClass.RETRYABLE
+    if isinstance(error, (PluginError, TalentOSError)):
+        return ErrorClass.FATAL
+    # Programming errors do not fix themselves
+    if isinstance(error, (TypeError, ValueError, KeyError, AttributeError)):
+        return ErrorClass.FATAL
+    # Unknown (network, SDK) errors are assumed transient
+    return ErrorClass.RETRYABLE
+
+
+@dataclass
+class RetryConfig:
+    """Retry settings (``llm_providers.<name>.retry`` in config)."""
+    policy: str = "decorrelated_jitter"  # See RETRY_POLICY_REGISTRY
+    base_delay: float = 1.0  # Seconds
+    max_delay: float = 30.0  # Cap for a single backoff
+    deadline_seconds: float = 0.0  # Budget for all attempts and backoff (0 = none)
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> "RetryConfig":
+        """Build from a config dict, ignoring unknown keys."""
+        d = d or {}
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+
+class RetryState:
+    """Progress of one retried call: last backoff and deadline."""
+
+    def __init__(self, deadline: Optional[float], clock=time.monotonic):
+        self.deadline = deadline  # Absolute clock time, or None
+        self.last_delay = 0.0
+        self._clock = clock
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the budget (None = unbounded)."""
+        if self.deadline is None:
+            return None
+        return self.deadline - self._clock()
+
+
+class RetryPolicy(ABC):
+    """
+    Base policy: error classification plus a backoff schedule.
+
+    Subclasses implement backoff(); classify() can be overridden to
+    change which errors are retried.
+    """
+
+    def __init__(self, config: RetryConfig = None, rng: random.Random = None, clock=time.monotonic):
+        self.config = config or RetryConfig()
+        self._rng = rng or random.Random()
+        self._clock = clock
+
+    def classify(self, error: Exception) -> ErrorClass:
+        return classify_error(error)
+
+    @abstractmethod
+    def backoff(self, attempt: int, state: RetryState) -> float:
+        """Seconds to wait after failed attempt ``attempt`` (0-based)."""
+        pass
+
+    def start(self) -> RetryState:
+        """State for a new call."""
+        deadline = self.config.deadline_seconds
+        return RetryState(self._clock() + deadline if deadline else None, self._clock)
+
+
+class ExponentialBackoffPolicy(RetryPolicy):
+    """base * 2^attempt, capped; no jitter."""
+
+    def backoff(self, attempt: int, state: RetryState) -> float:
+        return min(self.config.max_delay, self.config.base_delay * (2 ** attempt))
+
+
+class DecorrelatedJitterPolicy(RetryPolicy):
+    """
+    Decorrelated jitter: uniform(base, 3 * previous delay), capped.
+
+    Spreads retries of concurrent failures while still growing roughly
+    exponentially.
+    """
+
+    def backoff(self, attempt: int, state: RetryState) -> float:
+        base = self.config.base_delay
+        upper = max(base, (state.last_delay or base) * 3)
+        return min(self.config.max_delay, self._rng.uniform(base, upper))
+
+
+class NoRetryPolicy(RetryPolicy):
+    """Single attempt; failures are returned immediately."""
+
+    def classify(self, error: Exception) -> ErrorClass:
+        return ErrorClass.FATAL
+
+    def backoff(self, attempt: int, state: RetryState) -> float:
+        return 0.0
+
+
+RETRY_POLICY_REGISTRY = {
+    "decorrelated_jitter": DecorrelatedJitterPolicy,
+    "exponential": ExponentialBackoffPolicy,
+    "none": NoRetryPolicy,
+}
+
+
+def get_retry_policy(config: Optional[Dict[str, Any]] = None, **kwargs) -> RetryPolicy:
+    """
+    Factory function to get a retry policy.
+
+    Args:
+        config: Retry config dict (see RetryConfig)
+        **kwargs: Passed to the policy (rng, clock)
+
+    Returns:
+        RetryPolicy instance
+    """
+    retry_config = RetryConfig.from_dict(config)
+    if retry_config.policy not in RETRY_POLICY_REGISTRY:
+        raise ConfigurationError(
+            f"Retry policy '{retry_config.policy}' not found. "
+            f"Available: {list(RETRY_POLICY_REGISTRY.keys())}"
+        )
+    return RETRY_POLICY_REGISTRY[retry_config.policy](retry_config, **kwargs)
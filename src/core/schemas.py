@@ -0,0 +1,102 @@
+"""
+Output Schemas / 输出结构定义
+
+JSON Schemas for the engine's structured LLM outputs. They are sent to
+providers for JSON mode / schema-constrained output and used locally to
+decide whether a reply is well-formed (and therefore cacheable).
+"""
+
+from typing import Any, Dict, List
+
+_DIMENSION = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number", "minimum": 0, "maximum": 100},
+        "comment": {"type": "string"}
+    },
+    "required": ["score"]
+}
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+MATCH_SCHEMA: Dict[str, Any] = {
+    "title": "match_result",
+    "type": "object",
+    "properties": {
+        "score": {"type": "number", "minimum": 0, "maximum": 100},
+        "status": {"type": "string"},
+        "dimensions": {
+            "type": "object",
+            "properties": {
+                "skills": _DIMENSION,
+                "experience": _DIMENSION,
+                "education": _DIMENSION,
+                "soft_skills": _DIMENSION
+            }
+        },
+        "reason": {"type": "string"},
+        "strengths": _STRING_LIST,
+        "missing": _STRING_LIST,
+        "recommendation": {"type": "string"}
+    },
+    "required": ["score"]
+}
+
+EXTRACTION_SCHEMA: Dict[str, Any] = {
+    "title": "resume_fields",
+    "type": "object",
+    "properties": {
+        "name": {"type": ["string", "null"]},
+        "email": {"type": ["string", "null"]},
+        "phone": {"type": ["string", "null"]},
+        "education": {"type": "array", "items": {"type": "object"}},
+        "experience": {"type": "array", "items": {"type": "object"}},
+        "skills": {"type": "array"},
+        "years_of_experience": {"type": ["number", "string", "null"]},
+        "current_company": {"type": ["string", "null"]},
+        "current_position": {"type": ["string", "null"]}
+    }
+}
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Check a value against the subset of JSON Schema used here
+    (type, properties, required, items, minimum, maximum).
+
+    Returns:
+        Error messages; empty if the value conforms
+    """
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_TYPE_CHECKS[t](value) for t in types):
+            return [f"{path}: expected {' or '.join(types)}"]
+
+    errors: List[str] = []
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: missing")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate(value[key], sub_schema, f"{path}.{key}"))
+    elif isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    elif _TYPE_CHECKS["number"](value):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: below {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: above {schema['maximum']}")
+    return errors
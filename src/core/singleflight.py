@@ -0,0 +1,146 @@
+"""
+Single Flight / 请求合并
+
+In-flight request deduplication: concurrent calls with the same key share
+one execution. The first caller (leader) runs the work; callers arriving
+while it is in flight (followers) wait for the leader's result. A leader
+that is cancelled or runs out of its own deadline hands the work to a
+waiting follower instead of failing it.
+
+Works across threads and event loops: the shared handle is a
+concurrent.futures.Future, which async followers await via
+asyncio.wrap_future.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from src.core.deadline import remaining as deadline_remaining
+from src.core.exceptions import DeadlineExceededError
+
+
+class _LeaderAbandoned(Exception):
+    """Set on the shared future when the leader's failure is its own (followers retry)."""
+
+
+def _is_shared_failure(error: BaseException) -> bool:
+    """
+    Whether followers should receive the leader's exception.
+
+    Cancellation (client disconnect), the leader's own deadline and
+    interpreter exits say nothing about the work, so they are not shared.
+    """
+    return isinstance(error, Exception) and not isinstance(error, DeadlineExceededError)
+
+
+def _follower_timeout() -> Any:
+    """How long a follower may wait: its own remaining budget (None = no deadline)."""
+    left = deadline_remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded before singleflight", stage="singleflight")
+    return left
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent executions by key.
+
+    do()/ado() return ``(value, shared)`` where ``shared`` is True for
+    followers that received the leader's result. Ordinary exceptions
+    raised by the leader propagate to every follower; if the leader is
+    cancelled or runs out of its own deadline, a waiting follower takes
+    over instead. Followers wait no longer than their own deadline.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Return (future, is_leader) for a key."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def _settle(self, key: str, future: Future, error: BaseException = None, value: Any = None):
+        """Publish the leader's outcome and release the key."""
+        # Forget first: followers woken by _LeaderAbandoned must find the key free
+        self._forget(key, future)
+        if error is None:
+            future.set_result(value)
+        elif _is_shared_failure(error):
+            future.set_exception(error)
+        else:
+            future.set_exception(_LeaderAbandoned())
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Deduplication key
+            fn: Work to run if no call for ``key`` is in flight
+
+        Returns:
+            (value, shared) tuple
+
+        Raises:
+            DeadlineExceededError: If a follower's deadline passes while waiting
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result(timeout=_follower_timeout()), True
+            except _LeaderAbandoned:
+                continue
+            except FutureTimeoutError:
+                raise DeadlineExceededError("Request deadline exceeded during singleflight", stage="singleflight")
+
+        try:
+            value = fn()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, value=value)
+        return value, False
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Async variant of do(); ``fn`` is a coroutine function."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            # Shielded: a follower giving up must not cancel the shared future
+            waiter = asyncio.shield(asyncio.wrap_future(future))
+            try:
+                return await asyncio.wait_for(waiter, timeout=_follower_timeout()), True
+            except _LeaderAbandoned:
+                continue
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("Request deadline exceeded during singleflight", stage="singleflight")
+
+        try:
+            value = await fn()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, value=value)
+        return value, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
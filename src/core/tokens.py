@@ -0,0 +1,43 @@
+"""
+Token Estimation / Token 估算
+
+Cheap local token estimates for budgeting LLM calls, without a tokenizer
+dependency. Chinese/Japanese/Korean characters count roughly one token
+each; other text averages about four characters per token.
+"""
+
+import re
+from typing import Dict, List
+
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+# Per-message overhead for role markers and separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Approximate number of tokens
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    other = len(text) - cjk
+    return cjk + (other + 3) // 4
+
+
+def estimate_message_tokens(messages: List[Dict]) -> int:
+    """Estimate the prompt tokens of a chat message list."""
+    total = 0
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        total += estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+    return total
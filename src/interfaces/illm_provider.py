@@ -4,10 +4,13 @@ ILLMProvider Interface / LLM提供商接口
 Abstract base class for LLM provider plugins.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from src.core.exceptions import LLMProviderError
+
 
 @dataclass
 class LLMResponse:
@@ -17,6 +20,38 @@ class LLMResponse:
     tokens_used: int
     latency_ms: float
     raw_response: Optional[Any] = None
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prefix cache
+    provider: str = ""  # Provider that served the request (set by the engine)
+
+
+@dataclass
+class BatchRequest:
+    """One chat request inside a provider batch job."""
+    custom_id: str
+    messages: List[Dict]
+    model: Optional[str] = None
+    temperature: float = 0.7
+    max_tokens: int = 4096
+    response_schema: Optional[Dict] = None  # JSON Schema for structured output (as in chat())
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch request: a response or an error message."""
+    custom_id: str
+    response: Optional[LLMResponse] = None
+    error: Optional[str] = None
+
+
+class BatchStatus:
+    """Normalized batch job states."""
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
+
+    TERMINAL = (COMPLETED, FAILED, EXPIRED, CANCELLED)
 
 
 class ILLMProvider(ABC):
@@ -27,6 +62,13 @@ class ILLMProvider(ABC):
     - chat(): Send a chat completion request
     - get_model_info(): Get model configuration
     - health_check(): Verify API connectivity
+
+    Async variants (achat/achat_stream) default to running the sync
+    methods in a worker thread; providers with a native async client
+    should override them.
+
+    Providers with an offline batch API override supports_batch and
+    submit_batch/get_batch_status/get_batch_results.
     """
 
     @property
@@ -58,7 +100,9 @@ class ILLMProvider(ABC):
             model: Model name (uses default if None)
             temperature: Response creativity (0.0-1.0)
             max_tokens: Maximum response tokens
-            **kwargs: Additional provider-specific parameters
+            **kwargs: Additional provider-specific parameters. Built-in
+                providers accept ``response_schema`` (a JSON Schema dict) and
+                map it to JSON mode, response_format or a forced tool call.
 
         Returns:
             LLMResponse object with content and metadata
@@ -82,6 +126,64 @@ class ILLMProvider(ABC):
         """
         pass
 
+    async def achat(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Send a chat completion request without blocking the event loop.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: Model name (uses default if None)
+            temperature: Response creativity (0.0-1.0)
+            max_tokens: Maximum response tokens
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            LLMResponse object with content and metadata
+        """
+        return await asyncio.to_thread(
+            self.chat,
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+
+    async def achat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ):
+        """
+        Send a streaming chat completion request without blocking the event loop.
+
+        Yields:
+            Chunks of the response content.
+        """
+        iterator = iter(self.chat_stream(
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        ))
+        done = object()
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, done)
+            if chunk is done:
+                break
+            yield chunk
+
     @abstractmethod
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
@@ -96,3 +198,39 @@ class ILLMProvider(ABC):
     def is_available(self) -> bool:
         """Check if provider is properly configured and ready."""
         pass
+
+    @property
+    def supports_batch(self) -> bool:
+        """
+        Whether this provider implements the offline batch API.
+
+        Providers returning True override submit_batch, get_batch_status
+        and get_batch_results; the engine checks this before submitting.
+        """
+        return False
+
+    def _batch_unsupported(self) -> LLMProviderError:
+        return LLMProviderError(f"{self.provider_name} does not support batch jobs")
+
+    def submit_batch(self, requests: List[BatchRequest]) -> str:
+        """
+        Submit requests as one offline batch job.
+
+        Args:
+            requests: Chat requests, each with a unique custom_id
+
+        Returns:
+            Provider batch id
+
+        Raises:
+            LLMProviderError: If the provider has no batch API
+        """
+        raise self._batch_unsupported()
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """Current state of a batch job (a BatchStatus value)."""
+        raise self._batch_unsupported()
+
+    def get_batch_results(self, batch_id: str) -> List[BatchResult]:
+        """Results of a completed batch job, one per request."""
+        raise self._batch_unsupported()
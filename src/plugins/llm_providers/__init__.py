@@ -7,10 +7,12 @@ Plugin implementations for various LLM services.
 from .deepseek import DeepSeekProvider
 from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
+from .local_batch import LocalBatchProvider
 
-__all__ = ['DeepSeekProvider', 'OpenAIProvider', 'AnthropicProvider']
+__all__ = ['DeepSeekProvider', 'OpenAIProvider', 'AnthropicProvider', 'LocalBatchProvider']
 
-# Provider registry for dynamic loading
+# Provider registry for dynamic loading (LocalBatchProvider wraps another
+# provider and is constructed directly)
 PROVIDER_REGISTRY = {
     'deepseek': DeepSeekProvider,
     'openai': OpenAIProvider,
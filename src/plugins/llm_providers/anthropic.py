@@ -5,18 +5,28 @@ LLM provider implementation for Claude API.
 """
 
 import os
+import json
 import time
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 
 try:
-    from anthropic import Anthropic, APIError, RateLimitError, AuthenticationError
+    from anthropic import Anthropic, AsyncAnthropic, APIError, RateLimitError, AuthenticationError, NOT_GIVEN
     HAS_ANTHROPIC = True
 except ImportError:
     HAS_ANTHROPIC = False
 
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.interfaces.illm_provider import (
+    ILLMProvider,
+    LLMResponse,
+    BatchRequest,
+    BatchResult,
+    BatchStatus
+)
 from src.core.config import get_config, LLMProviderConfig
+from src.core.deadline import clamp_timeout
+from src.core.rate_limiter import retry_after_from_error
 from src.core.exceptions import (
+    LLMProviderError,
     LLMAuthenticationError,
     LLMRateLimitError,
     LLMAPIError,
@@ -38,6 +48,9 @@ class AnthropicProvider(ILLMProvider):
         "claude-haiku-3-20250514"
     ]
 
+    # Anthropic allows at most 4 cache_control breakpoints per request
+    MAX_CACHE_BREAKPOINTS = 4
+
     # OpenAI-compatible model name mapping
     MODEL_NAME_MAP = {
         "claude-sonnet-4-20250514": "sonnet-4",
@@ -65,6 +78,7 @@ class AnthropicProvider(ILLMProvider):
         self._api_key = api_key
         self._base_url = base_url
         self._client: Optional[Anthropic] = None
+        self._async_client: Optional[AsyncAnthropic] = None
         self._setup_client()
 
     def _setup_client(self):
@@ -91,11 +105,17 @@ class AnthropicProvider(ILLMProvider):
         else:
             base_url = os.getenv("ANTHROPIC_BASE_URL", None)
 
-        # Initialize client
+        # Initialize clients
+        timeout = self._config.timeout if self._config else 60
         self._client = Anthropic(
             api_key=api_key,
             base_url=base_url,
-            timeout=self._config.timeout if self._config else 60
+            timeout=timeout
+        )
+        self._async_client = AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout
         )
         self._api_key = api_key
 
@@ -113,6 +133,7 @@ class AnthropicProvider(ILLMProvider):
         model: str = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        response_schema: Dict = None,
         **kwargs
     ) -> LLMResponse:
         """
@@ -123,43 +144,19 @@ class AnthropicProvider(ILLMProvider):
             model: Model name
             temperature: Response creativity
             max_tokens: Maximum response tokens
+            response_schema: JSON Schema the reply must follow (optional)
             **kwargs: Additional parameters
 
         Returns:
             LLMResponse object
         """
-        if not self.is_available():
-            raise LLMAuthenticationError(
-                "Anthropic API key not configured."
-            )
-
-        # Use default model if not specified
-        if model is None:
-            if self._config and self._config.default_model:
-                model = self._config.default_model
-            else:
-                model = "claude-sonnet-4-20250514"
-
-        # Get max tokens from config
-        if self._config:
-            model_cfg = self.get_model_info(model)
-            if model_cfg:
-                max_tokens = model_cfg.get("max_tokens", max_tokens)
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
+        system_message, user_messages = self._split_messages(messages)
 
+        timeout = self._request_timeout()
         start_time = time.time()
-        tokens_used = 0
-
-        # Convert messages format (Anthropic uses different format)
-        # Anthropic expects: [{"role": "user", "content": "..."}]
-        # System messages should be separate
-        system_message = None
-        user_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                system_message = msg.get("content")
-            else:
-                user_messages.append(msg)
-
         try:
             # Claude API call
             response = self._client.messages.create(
@@ -168,33 +165,47 @@ class AnthropicProvider(ILLMProvider):
                 system=system_message,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                **self._structured_params(response_schema),
+                timeout=timeout,
                 **kwargs
             )
+        except Exception as e:
+            raise self._translate_error(e) from e
 
-            latency_ms = (time.time() - start_time) * 1000
-            content = response.content[0].text
-            tokens_used = response.usage.input_tokens + response.usage.output_tokens
+        return self._build_response(response, model, start_time)
 
-            return LLMResponse(
-                content=content,
-                model=model,
-                tokens_used=tokens_used,
-                latency_ms=latency_ms,
-                raw_response=response
-            )
+    async def achat(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        response_schema: Dict = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Send chat completion request to Anthropic using the async client."""
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
+        system_message, user_messages = self._split_messages(messages)
 
-        except AuthenticationError as e:
-            raise LLMAuthenticationError(f"Anthropic authentication failed: {e}")
-        except RateLimitError as e:
-            retry_after = getattr(e, 'retry_after', None)
-            raise LLMRateLimitError(
-                f"Anthropic rate limit exceeded: {e}",
-                retry_after=retry_after
+        timeout = self._request_timeout()
+        start_time = time.time()
+        try:
+            response = await self._async_client.messages.create(
+                model=self.MODEL_NAME_MAP.get(model, model),
+                messages=user_messages,
+                system=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **self._structured_params(response_schema),
+                timeout=timeout,
+                **kwargs
             )
-        except APIError as e:
-            raise LLMAPIError(f"Anthropic API error: {e}")
         except Exception as e:
-            raise LLMAPIError(f"Unexpected error calling Anthropic: {e}")
+            raise self._translate_error(e) from e
+
+        return self._build_response(response, model, start_time)
 
     def chat_stream(
         self,
@@ -207,24 +218,11 @@ class AnthropicProvider(ILLMProvider):
         """
         Send a streaming chat completion request to Anthropic.
         """
-        if not self.is_available():
-            raise LLMAuthenticationError("Anthropic API key not configured.")
+        self._ensure_available()
+        model = self._resolve_model(model)
+        system_message, user_messages = self._split_messages(messages)
 
-        # Use default model if not specified
-        if model is None:
-            if self._config and self._config.default_model:
-                model = self._config.default_model
-            else:
-                model = "claude-sonnet-4-20250514"
-
-        # Convert messages format
-        system_message = None
-        user_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                system_message = msg.get("content")
-            else:
-                user_messages.append(msg)
+        timeout = self._request_timeout()
 
         try:
             with self._client.messages.stream(
@@ -233,13 +231,220 @@ class AnthropicProvider(ILLMProvider):
                 system=system_message,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                timeout=timeout,
                 **kwargs
             ) as stream:
                 for text in stream.text_stream:
                     yield text
 
         except Exception as e:
-            raise LLMAPIError(f"Anthropic API error: {e}")
+            raise self._translate_error(e) from e
+
+    async def achat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ):
+        """
+        Send a streaming chat completion request to Anthropic using the async client.
+        """
+        self._ensure_available()
+        model = self._resolve_model(model)
+        system_message, user_messages = self._split_messages(messages)
+
+        timeout = self._request_timeout()
+
+        try:
+            async with self._async_client.messages.stream(
+                model=self.MODEL_NAME_MAP.get(model, model),
+                messages=user_messages,
+                system=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                **kwargs
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    @property
+    def supports_batch(self) -> bool:
+        return True
+
+    def submit_batch(self, requests: List[BatchRequest]) -> str:
+        """Create a Message Batches job."""
+        self._ensure_available()
+        batch_requests = []
+        for request in requests:
+            model = self._resolve_model(request.model)
+            system_message, user_messages = self._split_messages(request.messages)
+            params = {
+                "model": self.MODEL_NAME_MAP.get(model, model),
+                "messages": user_messages,
+                "temperature": request.temperature,
+                "max_tokens": self._resolve_max_tokens(model, request.max_tokens),
+                **self._structured_params(request.response_schema)
+            }
+            if system_message is not NOT_GIVEN:
+                params["system"] = system_message
+            batch_requests.append({"custom_id": request.custom_id, "params": params})
+
+        try:
+            batch = self._client.messages.batches.create(requests=batch_requests)
+        except Exception as e:
+            raise self._translate_error(e) from e
+        return batch.id
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """Poll a Message Batches job; per-request failures show up in the results."""
+        self._ensure_available()
+        try:
+            batch = self._client.messages.batches.retrieve(batch_id)
+        except Exception as e:
+            raise self._translate_error(e) from e
+        if batch.processing_status == "ended":
+            return BatchStatus.COMPLETED
+        return BatchStatus.IN_PROGRESS
+
+    def get_batch_results(self, batch_id: str) -> List[BatchResult]:
+        """Stream the results of an ended Message Batches job."""
+        self._ensure_available()
+        results = []
+        try:
+            for entry in self._client.messages.batches.results(batch_id):
+                result = entry.result
+                if result.type == "succeeded":
+                    message = result.message
+                    results.append(BatchResult(
+                        custom_id=entry.custom_id,
+                        response=self._build_response(message, message.model, time.time())
+                    ))
+                else:
+                    error = getattr(result, "error", None)
+                    results.append(BatchResult(custom_id=entry.custom_id, error=str(error or result.type)))
+        except Exception as e:
+            raise self._translate_error(e) from e
+        return results
+
+    @staticmethod
+    def _structured_params(response_schema: Optional[Dict]) -> Dict:
+        """Schema-constrained output via a forced tool call."""
+        if not response_schema:
+            return {}
+        name = response_schema.get("title", "result")
+        return {
+            "tools": [{
+                "name": name,
+                "description": "Record the result in the required structure.",
+                "input_schema": response_schema
+            }],
+            "tool_choice": {"type": "tool", "name": name}
+        }
+
+    def _request_timeout(self) -> float:
+        """Configured timeout, shrunk to the remaining request deadline."""
+        return clamp_timeout(self._config.timeout if self._config else 60)
+
+    def _ensure_available(self):
+        """Raise if the API key is not configured."""
+        if not self.is_available():
+            raise LLMAuthenticationError("Anthropic API key not configured.")
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Use default model if not specified."""
+        if model is not None:
+            return model
+        if self._config and self._config.default_model:
+            return self._config.default_model
+        return "claude-sonnet-4-20250514"
+
+    def _resolve_max_tokens(self, model: str, max_tokens: int) -> int:
+        """Get max tokens from config if available."""
+        if self._config:
+            model_cfg = self.get_model_info(model)
+            if model_cfg:
+                return model_cfg.get("max_tokens", max_tokens)
+        return max_tokens
+
+    def _split_messages(self, messages: list):
+        """
+        Convert messages format (Anthropic uses different format).
+
+        Anthropic expects: [{"role": "user", "content": "..."}]
+        System messages should be separate. Each system message becomes a
+        text block; with prompt caching enabled every block ends with a
+        cache_control breakpoint, so the stable instructions/JD prefix is
+        cached across requests.
+        """
+        system_blocks = []
+        user_messages = []
+        for msg in messages:
+            if msg.get("role") == "system":
+                system_blocks.append({"type": "text", "text": msg.get("content")})
+            else:
+                user_messages.append(msg)
+
+        if not system_blocks:
+            return NOT_GIVEN, user_messages
+
+        if self._prompt_caching_enabled():
+            for block in system_blocks[-self.MAX_CACHE_BREAKPOINTS:]:
+                block["cache_control"] = {"type": "ephemeral"}
+
+        return system_blocks, user_messages
+
+    def _prompt_caching_enabled(self) -> bool:
+        """Whether to send cache_control breakpoints."""
+        return self._config.prompt_caching if self._config else True
+
+    def _build_response(self, response, model: str, start_time: float) -> LLMResponse:
+        """Wrap a Messages API response into an LLMResponse."""
+        latency_ms = (time.time() - start_time) * 1000
+        content = self._response_text(response)
+        usage = response.usage
+        cached_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_written = getattr(usage, "cache_creation_input_tokens", None) or 0
+        # input_tokens excludes tokens read from or written to the prompt cache
+        tokens_used = usage.input_tokens + usage.output_tokens + cached_tokens + cache_written
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            tokens_used=tokens_used,
+            latency_ms=latency_ms,
+            raw_response=response,
+            cached_tokens=cached_tokens
+        )
+
+    @staticmethod
+    def _response_text(response) -> str:
+        """Reply text; a forced tool call (structured output) yields its input as JSON."""
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use":
+                return json.dumps(block.input, ensure_ascii=False)
+        return "".join(getattr(block, "text", "") for block in response.content)
+
+    def _translate_error(self, e: Exception) -> LLMProviderError:
+        """Map SDK exceptions onto the TalentOS exception hierarchy."""
+        if isinstance(e, LLMProviderError):
+            return e
+        if isinstance(e, AuthenticationError):
+            return LLMAuthenticationError(f"Anthropic authentication failed: {e}")
+        if isinstance(e, RateLimitError):
+            retry_after = retry_after_from_error(e)
+            return LLMRateLimitError(
+                f"Anthropic rate limit exceeded: {e}",
+                retry_after=retry_after
+            )
+        if isinstance(e, APIError):
+            return LLMAPIError(f"Anthropic API error: {e}", status_code=getattr(e, "status_code", None))
+        return LLMAPIError(f"Unexpected error calling Anthropic: {e}")
 
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
@@ -7,12 +7,15 @@ LLM provider implementation for DeepSeek API.
 import os
 import time
 from typing import Dict, Optional, Any
-from openai import OpenAI, APIError, RateLimitError, AuthenticationError
+from openai import OpenAI, AsyncOpenAI, APIError, RateLimitError, AuthenticationError
 import httpx
 
 from src.interfaces.illm_provider import ILLMProvider, LLMResponse
 from src.core.config import get_config, LLMProviderConfig
+from src.core.deadline import clamp_timeout
+from src.core.rate_limiter import retry_after_from_error
 from src.core.exceptions import (
+    LLMProviderError,
     LLMAuthenticationError,
     LLMRateLimitError,
     LLMAPIError,
@@ -20,19 +23,31 @@ from src.core.exceptions import (
 )
 
 
-def _get_proxy_client() -> Optional[httpx.Client]:
-    """Create an HTTP client with proxy if environment variables are set."""
+def _get_proxy_url() -> Optional[str]:
+    """Get the proxy URL from environment variables, if any."""
     http_proxy = os.getenv("HTTP_PROXY") or os.getenv("http_proxy")
     https_proxy = os.getenv("HTTPS_PROXY") or os.getenv("https_proxy")
 
-    if not http_proxy and not https_proxy:
-        return None
-
     # Use https proxy if available, otherwise http proxy
-    proxy_url = https_proxy or http_proxy
+    return https_proxy or http_proxy
+
+
+def _get_proxy_client() -> Optional[httpx.Client]:
+    """Create an HTTP client with proxy if environment variables are set."""
+    proxy_url = _get_proxy_url()
+    if not proxy_url:
+        return None
     return httpx.Client(proxy=proxy_url)
 
 
+def _get_async_proxy_client() -> Optional[httpx.AsyncClient]:
+    """Create an async HTTP client with proxy if environment variables are set."""
+    proxy_url = _get_proxy_url()
+    if not proxy_url:
+        return None
+    return httpx.AsyncClient(proxy=proxy_url)
+
+
 class DeepSeekProvider(ILLMProvider):
     """
     DeepSeek API provider implementation.
@@ -58,6 +73,7 @@ class DeepSeekProvider(ILLMProvider):
         self._api_key = api_key
         self._base_url = base_url
         self._client: Optional[OpenAI] = None
+        self._async_client: Optional[AsyncOpenAI] = None
         self._setup_client()
 
     def _setup_client(self):
@@ -84,13 +100,19 @@ class DeepSeekProvider(ILLMProvider):
         else:
             base_url = "https://api.deepseek.com"
 
-        # Initialize client with proxy support
-        http_client = _get_proxy_client()
+        # Initialize clients with proxy support
+        timeout = self._config.timeout if self._config else 60
         self._client = OpenAI(
             api_key=api_key,
             base_url=base_url,
-            timeout=self._config.timeout if self._config else 60,
-            http_client=http_client
+            timeout=timeout,
+            http_client=_get_proxy_client()
+        )
+        self._async_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            http_client=_get_async_proxy_client()
         )
         self._api_key = api_key
 
@@ -108,6 +130,7 @@ class DeepSeekProvider(ILLMProvider):
         model: str = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        response_schema: Dict = None,
         **kwargs
     ) -> LLMResponse:
         """
@@ -118,33 +141,18 @@ class DeepSeekProvider(ILLMProvider):
             model: Model name (defaults to deepseek-chat)
             temperature: Response creativity
             max_tokens: Maximum response tokens
+            response_schema: JSON Schema the reply must follow (optional)
             **kwargs: Additional parameters
 
         Returns:
             LLMResponse object
         """
-        if not self.is_available():
-            raise LLMAuthenticationError(
-                "DeepSeek API key not configured. "
-                "Set DEEPSEEK_API_KEY env var or provide api_key parameter."
-            )
-
-        # Use default model if not specified
-        if model is None:
-            if self._config and self._config.default_model:
-                model = self._config.default_model
-            else:
-                model = "deepseek-chat"
-
-        # Get max tokens from config if available
-        if self._config:
-            model_cfg = self.get_model_info(model)
-            if model_cfg:
-                max_tokens = model_cfg.get("max_tokens", max_tokens)
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
 
+        timeout = self._request_timeout()
         start_time = time.time()
-        tokens_used = 0
-
         try:
             response = self._client.chat.completions.create(
                 model=model,
@@ -152,33 +160,46 @@ class DeepSeekProvider(ILLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=False,
+                **self._structured_params(response_schema),
+                timeout=timeout,
                 **kwargs
             )
+        except Exception as e:
+            raise self._translate_error(e) from e
 
-            latency_ms = (time.time() - start_time) * 1000
-            content = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if response.usage else 0
+        return self._build_response(response, model, start_time)
 
-            return LLMResponse(
-                content=content,
-                model=model,
-                tokens_used=tokens_used,
-                latency_ms=latency_ms,
-                raw_response=response
-            )
+    async def achat(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        response_schema: Dict = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Send chat completion request to DeepSeek using the async client."""
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
 
-        except AuthenticationError as e:
-            raise LLMAuthenticationError(f"DeepSeek authentication failed: {e}")
-        except RateLimitError as e:
-            retry_after = getattr(e, 'retry_after', None)
-            raise LLMRateLimitError(
-                f"DeepSeek rate limit exceeded: {e}",
-                retry_after=retry_after
+        timeout = self._request_timeout()
+        start_time = time.time()
+        try:
+            response = await self._async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=False,
+                **self._structured_params(response_schema),
+                timeout=timeout,
+                **kwargs
             )
-        except APIError as e:
-            raise LLMAPIError(f"DeepSeek API error: {e}")
         except Exception as e:
-            raise LLMAPIError(f"Unexpected error calling DeepSeek: {e}")
+            raise self._translate_error(e) from e
+
+        return self._build_response(response, model, start_time)
 
     def chat_stream(
         self,
@@ -191,24 +212,11 @@ class DeepSeekProvider(ILLMProvider):
         """
         Send a streaming chat completion request to DeepSeek.
         """
-        if not self.is_available():
-            raise LLMAuthenticationError(
-                "DeepSeek API key not configured. "
-                "Set DEEPSEEK_API_KEY env var or provide api_key parameter."
-            )
-
-        # Use default model if not specified
-        if model is None:
-            if self._config and self._config.default_model:
-                model = self._config.default_model
-            else:
-                model = "deepseek-chat"
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
 
-        # Get max tokens from config if available
-        if self._config:
-            model_cfg = self.get_model_info(model)
-            if model_cfg:
-                max_tokens = model_cfg.get("max_tokens", max_tokens)
+        timeout = self._request_timeout()
 
         try:
             stream = self._client.chat.completions.create(
@@ -217,46 +225,145 @@ class DeepSeekProvider(ILLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=True,
+                timeout=timeout,
                 **kwargs
             )
 
             # Track if we are in reasoning mode
-            in_reasoning = False
-            
+            state = {"in_reasoning": False}
             for chunk in stream:
-                if chunk.choices:
-                    delta = chunk.choices[0].delta
-                    
-                    # Handle reasoning content (DeepSeek R1/V3)
-                    if hasattr(delta, 'reasoning_content') and delta.reasoning_content:
-                        if not in_reasoning:
-                            yield "> **Thinking Process:**\n> "
-                            in_reasoning = True
-                        
-                        # Replace newlines with newline + > for blockquote continuity
-                        content = delta.reasoning_content.replace("\n", "\n> ")
-                        yield content
-                        
-                    elif hasattr(delta, 'content') and delta.content:
-                        # If we were in reasoning mode and now getting content, close the blockquote
-                        if in_reasoning:
-                            yield "\n\n---\n\n"
-                            in_reasoning = False
-                            
-                        yield delta.content
-
-        except AuthenticationError as e:
-            raise LLMAuthenticationError(f"DeepSeek authentication failed: {e}")
-        except RateLimitError as e:
-            retry_after = getattr(e, 'retry_after', None)
-            raise LLMRateLimitError(
+                yield from self._render_chunk(chunk, state)
+
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    async def achat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ):
+        """
+        Send a streaming chat completion request to DeepSeek using the async client.
+        """
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
+
+        timeout = self._request_timeout()
+
+        try:
+            stream = await self._async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                timeout=timeout,
+                **kwargs
+            )
+
+            state = {"in_reasoning": False}
+            async for chunk in stream:
+                for piece in self._render_chunk(chunk, state):
+                    yield piece
+
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    @staticmethod
+    def _structured_params(response_schema: Optional[Dict]) -> Dict:
+        """DeepSeek supports JSON mode but not schema-constrained output."""
+        if not response_schema:
+            return {}
+        return {"response_format": {"type": "json_object"}}
+
+    def _request_timeout(self) -> float:
+        """Configured timeout, shrunk to the remaining request deadline."""
+        return clamp_timeout(self._config.timeout if self._config else 60)
+
+    def _ensure_available(self):
+        """Raise if the API key is not configured."""
+        if not self.is_available():
+            raise LLMAuthenticationError(
+                "DeepSeek API key not configured. "
+                "Set DEEPSEEK_API_KEY env var or provide api_key parameter."
+            )
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Use default model if not specified."""
+        if model is not None:
+            return model
+        if self._config and self._config.default_model:
+            return self._config.default_model
+        return "deepseek-chat"
+
+    def _resolve_max_tokens(self, model: str, max_tokens: int) -> int:
+        """Get max tokens from config if available."""
+        if self._config:
+            model_cfg = self.get_model_info(model)
+            if model_cfg:
+                return model_cfg.get("max_tokens", max_tokens)
+        return max_tokens
+
+    def _build_response(self, response, model: str, start_time: float) -> LLMResponse:
+        """Wrap a completion response into an LLMResponse."""
+        latency_ms = (time.time() - start_time) * 1000
+        content = response.choices[0].message.content
+        tokens_used = response.usage.total_tokens if response.usage else 0
+
+        # DeepSeek context caching reports hits as prompt_cache_hit_tokens
+        cached_tokens = getattr(response.usage, "prompt_cache_hit_tokens", 0)
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            tokens_used=tokens_used,
+            latency_ms=latency_ms,
+            raw_response=response,
+            cached_tokens=cached_tokens if isinstance(cached_tokens, int) else 0
+        )
+
+    def _render_chunk(self, chunk, state: Dict):
+        """Render one stream chunk, formatting reasoning content as a blockquote."""
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta
+
+        # Handle reasoning content (DeepSeek R1/V3)
+        if hasattr(delta, 'reasoning_content') and delta.reasoning_content:
+            if not state["in_reasoning"]:
+                yield "> **Thinking Process:**\n> "
+                state["in_reasoning"] = True
+
+            # Replace newlines with newline + > for blockquote continuity
+            yield delta.reasoning_content.replace("\n", "\n> ")
+
+        elif hasattr(delta, 'content') and delta.content:
+            # If we were in reasoning mode and now getting content, close the blockquote
+            if state["in_reasoning"]:
+                yield "\n\n---\n\n"
+                state["in_reasoning"] = False
+
+            yield delta.content
+
+    def _translate_error(self, e: Exception) -> LLMProviderError:
+        """Map SDK exceptions onto the TalentOS exception hierarchy."""
+        if isinstance(e, LLMProviderError):
+            return e
+        if isinstance(e, AuthenticationError):
+            return LLMAuthenticationError(f"DeepSeek authentication failed: {e}")
+        if isinstance(e, RateLimitError):
+            retry_after = retry_after_from_error(e)
+            return LLMRateLimitError(
                 f"DeepSeek rate limit exceeded: {e}",
                 retry_after=retry_after
             )
-        except APIError as e:
-            raise LLMAPIError(f"DeepSeek API error: {e}")
-        except Exception as e:
-            raise LLMAPIError(f"Unexpected error calling DeepSeek: {e}")
+        if isinstance(e, APIError):
+            return LLMAPIError(f"DeepSeek API error: {e}", status_code=getattr(e, "status_code", None))
+        return LLMAPIError(f"Unexpected error calling DeepSeek: {e}")
 
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
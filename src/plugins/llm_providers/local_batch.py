@@ -0,0 +1,165 @@
+"""
+Local Batch Provider / 本地批处理提供商
+
+File-based stand-in for provider batch APIs, for tests and providers
+without an offline endpoint. Interactive calls pass through to a wrapped
+provider; batch jobs are written as JSONL under ``batch_dir`` and run
+through the wrapped provider's chat() on the first status poll.
+"""
+
+import json
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+from src.interfaces.illm_provider import (
+    ILLMProvider,
+    LLMResponse,
+    BatchRequest,
+    BatchResult,
+    BatchStatus
+)
+
+
+class LocalBatchProvider(ILLMProvider):
+    """
+    Batch-capable wrapper around another ILLMProvider.
+
+    Layout per job: ``<batch_dir>/<batch_id>/input.jsonl``,
+    ``output.jsonl`` and ``status.json``.
+    """
+
+    PROVIDER_NAME = "local_batch"
+
+    def __init__(self, delegate: ILLMProvider, batch_dir: str = "cache/local_batches", **kwargs):
+        """
+        Initialize local batch provider.
+
+        Args:
+            delegate: Provider that serves chat and processes batch requests
+            batch_dir: Directory for batch job files
+            **kwargs: Additional parameters
+        """
+        self._delegate = delegate
+        self._batch_dir = Path(batch_dir)
+
+    @property
+    def provider_name(self) -> str:
+        return self.PROVIDER_NAME
+
+    @property
+    def supported_models(self) -> list:
+        return self._delegate.supported_models
+
+    def chat(self, messages: list, model: str = None, temperature: float = 0.7,
+             max_tokens: int = 4096, **kwargs) -> LLMResponse:
+        return self._delegate.chat(messages, model=model, temperature=temperature,
+                                   max_tokens=max_tokens, **kwargs)
+
+    async def achat(self, messages: list, model: str = None, temperature: float = 0.7,
+                    max_tokens: int = 4096, **kwargs) -> LLMResponse:
+        return await self._delegate.achat(messages, model=model, temperature=temperature,
+                                          max_tokens=max_tokens, **kwargs)
+
+    def chat_stream(self, messages: list, model: str = None, temperature: float = 0.7,
+                    max_tokens: int = 4096, **kwargs):
+        return self._delegate.chat_stream(messages, model=model, temperature=temperature,
+                                          max_tokens=max_tokens, **kwargs)
+
+    def get_model_info(self, model: str) -> Dict:
+        return self._delegate.get_model_info(model)
+
+    def health_check(self) -> bool:
+        return self._delegate.health_check()
+
+    def is_available(self) -> bool:
+        return self._delegate.is_available()
+
+    @property
+    def supports_batch(self) -> bool:
+        return True
+
+    def submit_batch(self, requests: List[BatchRequest]) -> str:
+        """Write the requests to a new job directory."""
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        job_dir = self._batch_dir / batch_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(job_dir / "input.jsonl", 'w', encoding='utf-8') as f:
+            for request in requests:
+                f.write(json.dumps({
+                    "custom_id": request.custom_id,
+                    "messages": request.messages,
+                    "model": request.model,
+                    "temperature": request.temperature,
+                    "max_tokens": request.max_tokens,
+                    "response_schema": request.response_schema
+                }, ensure_ascii=False) + "\n")
+        self._write_status(batch_id, BatchStatus.IN_PROGRESS)
+        return batch_id
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """Return the job state, processing pending jobs first."""
+        status = self._read_status(batch_id)
+        if status == BatchStatus.IN_PROGRESS:
+            self._process(batch_id)
+            status = self._read_status(batch_id)
+        return status
+
+    def get_batch_results(self, batch_id: str) -> List[BatchResult]:
+        """Read the results of a processed job."""
+        output = self._batch_dir / batch_id / "output.jsonl"
+        if not output.exists():
+            return []
+
+        results = []
+        with open(output, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response")
+                results.append(BatchResult(
+                    custom_id=entry["custom_id"],
+                    response=LLMResponse(**response) if response else None,
+                    error=entry.get("error")
+                ))
+        return results
+
+    def _process(self, batch_id: str):
+        """Run every request of a job through the delegate."""
+        job_dir = self._batch_dir / batch_id
+        lines = []
+        with open(job_dir / "input.jsonl", 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                entry = {"custom_id": request.pop("custom_id")}
+                try:
+                    response = self._delegate.chat(**request)
+                    entry["response"] = {
+                        "content": response.content,
+                        "model": response.model,
+                        "tokens_used": response.tokens_used,
+                        "latency_ms": response.latency_ms,
+                        "cached_tokens": response.cached_tokens
+                    }
+                except Exception as e:
+                    entry["error"] = str(e)
+                lines.append(json.dumps(entry, ensure_ascii=False))
+
+        with open(job_dir / "output.jsonl", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        self._write_status(batch_id, BatchStatus.COMPLETED)
+
+    def _read_status(self, batch_id: str) -> str:
+        path = self._batch_dir / batch_id / "status.json"
+        if not path.exists():
+            return BatchStatus.FAILED
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)["status"]
+
+    def _write_status(self, batch_id: str, status: str):
+        with open(self._batch_dir / batch_id / "status.json", 'w', encoding='utf-8') as f:
+            json.dump({"status": status}, f)
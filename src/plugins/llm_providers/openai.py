@@ -5,13 +5,23 @@ LLM provider implementation for OpenAI API.
 """
 
 import os
+import json
 import time
-from typing import Dict, Optional, Any
-from openai import OpenAI, APIError, RateLimitError, AuthenticationError
-
-from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from typing import Dict, List, Optional, Any
+from openai import OpenAI, AsyncOpenAI, APIError, RateLimitError, AuthenticationError
+
+from src.interfaces.illm_provider import (
+    ILLMProvider,
+    LLMResponse,
+    BatchRequest,
+    BatchResult,
+    BatchStatus
+)
 from src.core.config import get_config, LLMProviderConfig
+from src.core.deadline import clamp_timeout
+from src.core.rate_limiter import retry_after_from_error
 from src.core.exceptions import (
+    LLMProviderError,
     LLMAuthenticationError,
     LLMRateLimitError,
     LLMAPIError
@@ -28,6 +38,18 @@ class OpenAIProvider(ILLMProvider):
     PROVIDER_NAME = "openai"
     SUPPORTED_MODELS = ["gpt-4o", "gpt-4o-mini", "gpt-4-turbo", "gpt-3.5-turbo"]
 
+    # Batch API states -> BatchStatus
+    BATCH_STATUS_MAP = {
+        "validating": BatchStatus.IN_PROGRESS,
+        "in_progress": BatchStatus.IN_PROGRESS,
+        "finalizing": BatchStatus.IN_PROGRESS,
+        "cancelling": BatchStatus.IN_PROGRESS,
+        "completed": BatchStatus.COMPLETED,
+        "failed": BatchStatus.FAILED,
+        "expired": BatchStatus.EXPIRED,
+        "cancelled": BatchStatus.CANCELLED,
+    }
+
     def __init__(self, config: LLMProviderConfig = None, api_key: str = None,
                  base_url: str = None, **kwargs):
         """
@@ -43,6 +65,7 @@ class OpenAIProvider(ILLMProvider):
         self._api_key = api_key
         self._base_url = base_url
         self._client: Optional[OpenAI] = None
+        self._async_client: Optional[AsyncOpenAI] = None
         self._setup_client()
 
     def _setup_client(self):
@@ -69,11 +92,17 @@ class OpenAIProvider(ILLMProvider):
         else:
             base_url = "https://api.openai.com/v1"
 
-        # Initialize client
+        # Initialize clients
+        timeout = self._config.timeout if self._config else 60
         self._client = OpenAI(
             api_key=api_key,
             base_url=base_url,
-            timeout=self._config.timeout if self._config else 60
+            timeout=timeout
+        )
+        self._async_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout
         )
         self._api_key = api_key
 
@@ -91,30 +120,16 @@ class OpenAIProvider(ILLMProvider):
         model: str = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        response_schema: Dict = None,
         **kwargs
     ) -> LLMResponse:
         """Send chat completion request to OpenAI."""
-        if not self.is_available():
-            raise LLMAuthenticationError(
-                "OpenAI API key not configured."
-            )
-
-        # Use default model if not specified
-        if model is None:
-            if self._config and self._config.default_model:
-                model = self._config.default_model
-            else:
-                model = "gpt-4o"
-
-        # Get max tokens from config
-        if self._config:
-            model_cfg = self.get_model_info(model)
-            if model_cfg:
-                max_tokens = model_cfg.get("max_tokens", max_tokens)
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
 
+        timeout = self._request_timeout()
         start_time = time.time()
-        tokens_used = 0
-
         try:
             response = self._client.chat.completions.create(
                 model=model,
@@ -122,33 +137,46 @@ class OpenAIProvider(ILLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=False,
+                **self._structured_params(response_schema),
+                timeout=timeout,
                 **kwargs
             )
+        except Exception as e:
+            raise self._translate_error(e) from e
 
-            latency_ms = (time.time() - start_time) * 1000
-            content = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if response.usage else 0
+        return self._build_response(response, model, start_time)
 
-            return LLMResponse(
-                content=content,
-                model=model,
-                tokens_used=tokens_used,
-                latency_ms=latency_ms,
-                raw_response=response
-            )
+    async def achat(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        response_schema: Dict = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Send chat completion request to OpenAI using the async client."""
+        self._ensure_available()
+        model = self._resolve_model(model)
+        max_tokens = self._resolve_max_tokens(model, max_tokens)
 
-        except AuthenticationError as e:
-            raise LLMAuthenticationError(f"OpenAI authentication failed: {e}")
-        except RateLimitError as e:
-            retry_after = getattr(e, 'retry_after', None)
-            raise LLMRateLimitError(
-                f"OpenAI rate limit exceeded: {e}",
-                retry_after=retry_after
+        timeout = self._request_timeout()
+        start_time = time.time()
+        try:
+            response = await self._async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=False,
+                **self._structured_params(response_schema),
+                timeout=timeout,
+                **kwargs
             )
-        except APIError as e:
-            raise LLMAPIError(f"OpenAI API error: {e}")
         except Exception as e:
-            raise LLMAPIError(f"Unexpected error calling OpenAI: {e}")
+            raise self._translate_error(e) from e
+
+        return self._build_response(response, model, start_time)
 
     def chat_stream(
         self,
@@ -161,15 +189,10 @@ class OpenAIProvider(ILLMProvider):
         """
         Send a streaming chat completion request to OpenAI.
         """
-        if not self.is_available():
-            raise LLMAuthenticationError("OpenAI API key not configured.")
+        self._ensure_available()
+        model = self._resolve_model(model)
 
-        # Use default model if not specified
-        if model is None:
-            if self._config and self._config.default_model:
-                model = self._config.default_model
-            else:
-                model = "gpt-4o"
+        timeout = self._request_timeout()
 
         try:
             stream = self._client.chat.completions.create(
@@ -178,6 +201,7 @@ class OpenAIProvider(ILLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=True,
+                timeout=timeout,
                 **kwargs
             )
 
@@ -186,7 +210,205 @@ class OpenAIProvider(ILLMProvider):
                     yield chunk.choices[0].delta.content
 
         except Exception as e:
-            raise LLMAPIError(f"OpenAI API error: {e}")
+            raise self._translate_error(e) from e
+
+    async def achat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        **kwargs
+    ):
+        """
+        Send a streaming chat completion request to OpenAI using the async client.
+        """
+        self._ensure_available()
+        model = self._resolve_model(model)
+
+        timeout = self._request_timeout()
+
+        try:
+            stream = await self._async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                timeout=timeout,
+                **kwargs
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    @property
+    def supports_batch(self) -> bool:
+        return True
+
+    def submit_batch(self, requests: List[BatchRequest]) -> str:
+        """Upload requests as JSONL and create a /v1/chat/completions batch."""
+        self._ensure_available()
+        lines = []
+        for request in requests:
+            model = self._resolve_model(request.model)
+            lines.append(json.dumps({
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": request.messages,
+                    "temperature": request.temperature,
+                    "max_tokens": self._resolve_max_tokens(model, request.max_tokens),
+                    **self._structured_params(request.response_schema)
+                }
+            }, ensure_ascii=False))
+
+        try:
+            input_file = self._client.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self._client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        except Exception as e:
+            raise self._translate_error(e) from e
+        return batch.id
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """Poll a batch job."""
+        self._ensure_available()
+        try:
+            batch = self._client.batches.retrieve(batch_id)
+        except Exception as e:
+            raise self._translate_error(e) from e
+        return self.BATCH_STATUS_MAP.get(batch.status, BatchStatus.IN_PROGRESS)
+
+    def get_batch_results(self, batch_id: str) -> List[BatchResult]:
+        """Download the output and error files of a finished batch."""
+        self._ensure_available()
+        try:
+            batch = self._client.batches.retrieve(batch_id)
+            results = []
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                text = self._client.files.content(file_id).text
+                results.extend(
+                    self._parse_batch_line(json.loads(line))
+                    for line in text.splitlines() if line.strip()
+                )
+        except Exception as e:
+            raise self._translate_error(e) from e
+        return results
+
+    def _parse_batch_line(self, line: Dict) -> BatchResult:
+        """Convert one line of a batch output/error file."""
+        custom_id = line.get("custom_id")
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        status_code = response.get("status_code", 200)
+
+        if line.get("error") or status_code >= 400:
+            error = line.get("error") or body.get("error") or f"HTTP {status_code}"
+            return BatchResult(custom_id=custom_id, error=str(error))
+
+        usage = body.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return BatchResult(
+            custom_id=custom_id,
+            response=LLMResponse(
+                content=body["choices"][0]["message"]["content"],
+                model=body.get("model", ""),
+                tokens_used=usage.get("total_tokens", 0),
+                latency_ms=0.0,
+                raw_response=body,
+                cached_tokens=details.get("cached_tokens", 0) or 0
+            )
+        )
+
+    @staticmethod
+    def _structured_params(response_schema: Optional[Dict]) -> Dict:
+        """Schema-constrained output via response_format=json_schema."""
+        if not response_schema:
+            return {}
+        return {
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": response_schema.get("title", "result"),
+                    "schema": response_schema
+                }
+            }
+        }
+
+    def _request_timeout(self) -> float:
+        """Configured timeout, shrunk to the remaining request deadline."""
+        return clamp_timeout(self._config.timeout if self._config else 60)
+
+    def _ensure_available(self):
+        """Raise if the API key is not configured."""
+        if not self.is_available():
+            raise LLMAuthenticationError("OpenAI API key not configured.")
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Use default model if not specified."""
+        if model is not None:
+            return model
+        if self._config and self._config.default_model:
+            return self._config.default_model
+        return "gpt-4o"
+
+    def _resolve_max_tokens(self, model: str, max_tokens: int) -> int:
+        """Get max tokens from config if available."""
+        if self._config:
+            model_cfg = self.get_model_info(model)
+            if model_cfg:
+                return model_cfg.get("max_tokens", max_tokens)
+        return max_tokens
+
+    def _build_response(self, response, model: str, start_time: float) -> LLMResponse:
+        """Wrap a completion response into an LLMResponse."""
+        latency_ms = (time.time() - start_time) * 1000
+        content = response.choices[0].message.content
+        tokens_used = response.usage.total_tokens if response.usage else 0
+
+        # Automatic prompt caching reports hits under prompt_tokens_details
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0)
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            tokens_used=tokens_used,
+            latency_ms=latency_ms,
+            raw_response=response,
+            cached_tokens=cached_tokens if isinstance(cached_tokens, int) else 0
+        )
+
+    def _translate_error(self, e: Exception) -> LLMProviderError:
+        """Map SDK exceptions onto the TalentOS exception hierarchy."""
+        if isinstance(e, LLMProviderError):
+            return e
+        if isinstance(e, AuthenticationError):
+            return LLMAuthenticationError(f"OpenAI authentication failed: {e}")
+        if isinstance(e, RateLimitError):
+            retry_after = retry_after_from_error(e)
+            return LLMRateLimitError(
+                f"OpenAI rate limit exceeded: {e}",
+                retry_after=retry_after
+            )
+        if isinstance(e, APIError):
+            return LLMAPIError(f"OpenAI API error: {e}", status_code=getattr(e, "status_code", None))
+        return LLMAPIError(f"Unexpected error calling OpenAI: {e}")
 
     def get_model_info(self, model: str) -> Dict:
         """Get configuration info for a specific model."""
@@ -5,14 +5,20 @@ Plugin implementations for caching and persistence.
 """
 
 from .local_storage import LocalStorage
+from .log_storage import LogStorage
 from .memory_cache import MemoryCache
+from .sqlite_storage import SQLiteStorage
+from .tiered_storage import TieredStorage
 
-__all__ = ['LocalStorage', 'MemoryCache']
+__all__ = ['LocalStorage', 'LogStorage', 'MemoryCache', 'SQLiteStorage', 'TieredStorage']
 
 # Storage registry for dynamic loading
 STORAGE_REGISTRY = {
     'local': LocalStorage,
     'memory': MemoryCache,
+    'sqlite': SQLiteStorage,
+    'logstore': LogStorage,
+    'tiered': TieredStorage,
 }
 
 
@@ -21,7 +27,7 @@ def get_storage(storage_name: str, **kwargs):
     Factory function to get a storage instance.
 
     Args:
-        storage_name: Name of the storage backend (local, memory)
+        storage_name: Name of the storage backend (local, memory, sqlite, logstore, tiered)
         **kwargs: Configuration parameters
 
     Returns:
@@ -7,7 +7,6 @@ File-based storage for caching and persistence.
 import os
 import json
 import hashlib
-import pickle
 from pathlib import Path
 from typing import Dict, Optional, Any
 from datetime import datetime, timedelta
@@ -15,29 +14,33 @@ from threading import Lock
 
 from src.interfaces.istorage import IStorage, StorageItem
 from src.core.exceptions import StorageError
+from .value_codec import ValueCodec
 
 
 class LocalStorage(IStorage):
     """
     Local file-based storage implementation.
 
-    Stores cached data as JSON files in a specified directory.
+    Stores cached data as one file per key in a specified directory,
+    compressed by a ValueCodec (zstd with a trained dictionary, or zlib).
     Supports TTL-based expiration.
     """
 
     STORAGE_NAME = "local"
 
-    def __init__(self, cache_dir: str = "cache", **kwargs):
+    def __init__(self, cache_dir: str = "cache", compression: str = "auto", **kwargs):
         """
         Initialize local storage.
 
         Args:
             cache_dir: Directory for storing cache files
+            compression: Value compression (auto, zstd, zlib, none)
             **kwargs: Additional parameters
         """
         self._cache_dir = Path(cache_dir)
         self._lock = Lock()
         self._ensure_dir()
+        self._codec = ValueCodec(compression, dictionary_dir=str(self._cache_dir / "dictionaries"))
 
     def _ensure_dir(self):
         """Create cache directory if it doesn't exist."""
@@ -76,7 +79,7 @@ class LocalStorage(IStorage):
 
                 file_path = self._get_file_path(key)
                 with open(file_path, 'wb') as f:
-                    pickle.dump(item, f)
+                    f.write(self._codec.encode(item))
 
                 return True
 
@@ -100,11 +103,10 @@ class LocalStorage(IStorage):
                 if not file_path.exists():
                     return None
 
-                with open(file_path, 'rb') as f:
-                    item = pickle.load(f)
+                item = self._read_item(file_path)
 
                 if item.is_expired():
-                    self.delete(key)
+                    file_path.unlink()
                     return None
 
                 return item.value
@@ -143,8 +145,7 @@ class LocalStorage(IStorage):
             if not file_path.exists():
                 return False
 
-            with open(file_path, 'rb') as f:
-                item = pickle.load(f)
+            item = self._read_item(file_path)
 
             if item.is_expired():
                 self.delete(key)
@@ -155,6 +156,19 @@ class LocalStorage(IStorage):
         except Exception:
             return False
 
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until key expires (None = never; 0 = missing or expired)."""
+        try:
+            file_path = self._get_file_path(key)
+            if not file_path.exists():
+                return 0
+            item = self._read_item(file_path)
+        except Exception:
+            return 0
+        if item.expires_at is None:
+            return None
+        return max(0.0, (item.expires_at - datetime.now()).total_seconds())
+
     def clear(self) -> bool:
         """Clear all stored data."""
         try:
@@ -171,6 +185,29 @@ class LocalStorage(IStorage):
         content = json.dumps(args, sort_keys=True)
         return hashlib.md5(content.encode()).hexdigest()
 
+    def _read_item(self, file_path: Path) -> StorageItem:
+        """Decode a cache file (compressed or a plain pickle from older versions)."""
+        with open(file_path, 'rb') as f:
+            return self._codec.decode(f.read())
+
+    def train_dictionary(self, max_samples: int = 500) -> int:
+        """
+        Train the compression dictionary from existing cache files.
+
+        New entries are compressed with it; existing ones keep their codec.
+
+        Returns:
+            The dictionary id (0 if none was trained)
+        """
+        samples = []
+        for file_path in list(self._cache_dir.glob("*.cache"))[:max_samples]:
+            try:
+                with open(file_path, 'rb') as f:
+                    samples.append(self._codec.raw_payload(f.read()))
+            except Exception:
+                continue
+        return self._codec.train(samples)
+
     def _get_file_path(self, key: str) -> Path:
         """Get the file path for a cache key."""
         safe_key = "".join(c if c.isalnum() or c in "_-." else "_" for c in key)
@@ -182,8 +219,7 @@ class LocalStorage(IStorage):
             with self._lock:
                 for file_path in self._cache_dir.glob("*.cache"):
                     try:
-                        with open(file_path, 'rb') as f:
-                            item = pickle.load(f)
+                        item = self._read_item(file_path)
                         if item.is_expired():
                             file_path.unlink()
                     except Exception:
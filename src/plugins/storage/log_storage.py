@@ -0,0 +1,462 @@
+"""
+Log Storage / 日志结构存储
+
+Append-only, log-structured cache store (Bitcask-style).
+
+Values are appended to segment files (``<n>.log``) and located through
+an in-memory hash index ``key -> (segment, offset, length, expires_at)``.
+A lookup is one dict access plus a decode (ValueCodec: decompress and
+unpickle) straight from the segment's mmap; writes are sequential
+appends. When a segment fills up it is sealed and a hint file
+(``<n>.hint``: keys and offsets, no values) is written next to it, so
+the index is rebuilt at startup without reading the values. A background compactor rewrites the sealed
+segments without expired, overwritten and deleted entries.
+
+Only one process may open a store directory; use the sqlite backend
+when several workers share a cache.
+"""
+
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
+
+from src.interfaces.istorage import IStorage
+from src.core.exceptions import StorageError
+from .value_codec import ValueCodec
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows: no advisory lock on the directory
+    HAS_FCNTL = False
+
+_HEADER = struct.Struct("<IBqII")  # crc32, flags, expires_at, key length, value length
+_HINT = struct.Struct("<BQIqI")  # flags, value offset, value length, expires_at, key length
+_TOMBSTONE = 1
+
+# (flags, key, value offset, value length, expires_at) of one record
+_HintEntry = Tuple[int, bytes, int, int, int]
+
+
+class _Entry(NamedTuple):
+    """Location of a live value."""
+    segment: int
+    offset: int
+    length: int
+    expires_at: int  # Epoch seconds, 0 = never
+
+    def expired(self, now: int) -> bool:
+        return bool(self.expires_at) and self.expires_at <= now
+
+
+class LogStorage(IStorage):
+    """
+    Log-structured storage implementation.
+
+    Thread-safe within one process; the directory is locked against
+    other processes (POSIX).
+    """
+
+    STORAGE_NAME = "logstore"
+
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        directory: str = None,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        compact_interval: int = 300,
+        compact_min_garbage: float = 0.5,
+        compression: str = "auto",
+        **kwargs
+    ):
+        """
+        Initialize log storage.
+
+        Args:
+            cache_dir: Parent directory (when directory is not given)
+            directory: Store directory (default: <cache_dir>/logstore)
+            max_segment_bytes: Size at which the active segment is sealed
+            compact_interval: Seconds between background compactions (0 = off)
+            compact_min_garbage: Share of dead bytes in sealed segments that
+                triggers a background compaction
+            compression: Value compression (auto, zstd, zlib, none)
+            **kwargs: Additional parameters
+        """
+        self._dir = Path(directory) if directory else Path(cache_dir) / "logstore"
+        self._max_segment_bytes = max_segment_bytes
+        self._compact_min_garbage = compact_min_garbage
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._index: Dict[str, _Entry] = {}
+        self._sizes: Dict[int, int] = {}  # Bytes per segment
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._active = None
+        self._codec = ValueCodec(compression, dictionary_dir=str(self._dir / "dictionaries"))
+
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            self._lock_directory()
+            self._recover()
+        except OSError as e:
+            raise StorageError(f"Failed to open log storage {self._dir}: {e}")
+
+        self._stop = threading.Event()
+        self._compactor = None
+        if compact_interval:
+            self._compactor = threading.Thread(
+                target=self._compact_loop, args=(compact_interval,), name="logstore-compactor", daemon=True
+            )
+            self._compactor.start()
+
+    @property
+    def storage_name(self) -> str:
+        return self.STORAGE_NAME
+
+    # --- IStorage ---
+
+    def save(self, key: str, value: Any, ttl: int = None, **kwargs) -> bool:
+        """
+        Append a value to the active segment.
+
+        Args:
+            key: Unique identifier
+            value: Value to store
+            ttl: Time-to-live in seconds
+            **kwargs: Additional parameters
+
+        Returns:
+            True if save successful
+        """
+        expires_at = int(time.time()) + int(ttl) if ttl else 0
+        try:
+            blob = self._codec.encode(value)
+            with self._lock:
+                self._index[key] = self._append(key, blob, expires_at, 0)
+            return True
+        except Exception as e:
+            raise StorageError(f"Failed to save to log storage: {e}")
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Load a value from its segment's mmap.
+
+        Args:
+            key: Unique identifier
+
+        Returns:
+            Stored value or None if not found/expired
+        """
+        try:
+            # A compaction may close the map between lookup and read; the
+            # index then points at the rewritten segment, so look up again.
+            for _ in range(2):
+                with self._lock:
+                    entry = self._index.get(key)
+                    if entry is None or entry.expired(int(time.time())):
+                        return None
+                    mm = self._map(entry.segment, entry.offset + entry.length)
+                try:
+                    with memoryview(mm)[entry.offset:entry.offset + entry.length] as view:
+                        return self._codec.decode(view)
+                except ValueError:
+                    continue
+            return None
+        except Exception as e:
+            raise StorageError(f"Failed to load from log storage: {e}")
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until key expires (None = never; 0 = missing or expired)."""
+        now = time.time()
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None or entry.expired(int(now)):
+            return 0
+        return max(0.0, entry.expires_at - now) if entry.expires_at else None
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a value (appends a tombstone).
+
+        Args:
+            key: Unique identifier
+
+        Returns:
+            True if deleted
+        """
+        try:
+            with self._lock:
+                if self._index.pop(key, None) is None:
+                    return False
+                self._append(key, b"", 0, _TOMBSTONE)
+                return True
+        except OSError as e:
+            raise StorageError(f"Failed to delete from log storage: {e}")
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists and is not expired."""
+        with self._lock:
+            entry = self._index.get(key)
+        return entry is not None and not entry.expired(int(time.time()))
+
+    def clear(self) -> bool:
+        """Clear all stored data."""
+        try:
+            with self._compact_lock, self._lock:
+                self._active.close()
+                for segment in list(self._sizes):
+                    self._drop_segment(segment)
+                self._index.clear()
+                self._open_active(1)
+            return True
+        except OSError as e:
+            raise StorageError(f"Failed to clear log storage: {e}")
+
+    def get_cache_key(self, *args) -> str:
+        """Generate a consistent cache key from arguments."""
+        content = json.dumps(args, sort_keys=True)
+        return hashlib.md5(content.encode()).hexdigest()
+
+    # --- Maintenance ---
+
+    def cleanup_expired(self) -> int:
+        """
+        Drop expired entries from the index and compact.
+
+        Returns:
+            Number of entries removed
+        """
+        now = int(time.time())
+        with self._lock:
+            expired = [key for key, entry in self._index.items() if entry.expired(now)]
+            for key in expired:
+                del self._index[key]
+        self.compact()
+        return len(expired)
+
+    def compact(self, force: bool = False) -> int:
+        """
+        Rewrite the sealed segments with only their live entries.
+
+        The rewritten data takes the id of the newest sealed segment, so
+        it still sorts before the active segment on recovery.
+
+        Args:
+            force: Compact even below ``compact_min_garbage``
+
+        Returns:
+            Bytes reclaimed
+        """
+        with self._compact_lock:
+            with self._lock:
+                sealed = sorted(s for s in self._sizes if s != self._active_id)
+                if not sealed:
+                    return 0
+                sealed_set = set(sealed)
+                now = int(time.time())
+                live, expired = [], []
+                for key, entry in self._index.items():
+                    if entry.segment in sealed_set:
+                        (expired if entry.expired(now) else live).append((key, entry))
+                total = sum(self._sizes[s] for s in sealed)
+                live_bytes = sum(_HEADER.size + len(key.encode('utf-8')) + e.length for key, e in live)
+                if not force and total - live_bytes < total * self._compact_min_garbage:
+                    return 0
+                maps = {s: self._map(s, self._sizes[s]) for s in sealed if self._sizes[s]}
+
+            # Sealed segments are immutable: copy without holding the lock
+            target = sealed[-1]
+            tmp = self._segment_path(target).with_suffix(".compact.tmp")
+            hints: List[_HintEntry] = []
+            moved: Dict[str, _Entry] = {}
+            offset = 0
+            with open(tmp, 'wb') as f:
+                for key, entry in live:
+                    value = maps[entry.segment][entry.offset:entry.offset + entry.length]
+                    record, value_offset = _record(key, value, entry.expires_at, 0)
+                    f.write(record)
+                    moved[key] = _Entry(target, offset + value_offset, entry.length, entry.expires_at)
+                    hints.append((0, key.encode('utf-8'), offset + value_offset, entry.length, entry.expires_at))
+                    offset += len(record)
+                f.flush()
+                os.fsync(f.fileno())
+            maps.clear()
+
+            with self._lock:
+                for key, entry in live:
+                    # Skip keys overwritten or deleted while copying
+                    if self._index.get(key) == entry:
+                        self._index[key] = moved[key]
+                for key, entry in expired:
+                    if self._index.get(key) == entry:
+                        del self._index[key]
+                for segment in sealed:
+                    self._drop_segment(segment)
+                # Without a hint the log is scanned on recovery, so the
+                # hint goes in after the log
+                os.replace(tmp, self._segment_path(target))
+                self._write_hint(target, hints)
+                self._sizes[target] = offset
+            return total - offset
+
+    def close(self):
+        """Stop the compactor, seal the active segment and release the directory."""
+        self._stop.set()
+        if self._compactor:
+            self._compactor.join()
+        with self._lock:
+            if self._active and not self._active.closed:
+                self._seal_active()
+            for segment in list(self._maps):
+                self._unmap(segment)
+            if not self._dir_lock.closed:
+                self._dir_lock.close()
+
+    # --- Internals ---
+
+    def _lock_directory(self):
+        """Hold an exclusive lock on the directory for this process's lifetime."""
+        self._dir_lock = open(self._dir / "LOCK", 'a+')
+        if HAS_FCNTL:
+            try:
+                fcntl.flock(self._dir_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._dir_lock.close()
+                raise StorageError(
+                    f"Log storage {self._dir} is open in another process "
+                    "(use the sqlite backend for multiple workers)"
+                )
+
+    def _recover(self):
+        """Rebuild the index from hint files (or by scanning logs without one)."""
+        for tmp in self._dir.glob("*.tmp"):
+            tmp.unlink()
+        segments = sorted(int(path.stem) for path in self._dir.glob("*.log"))
+        for segment in segments:
+            hint_path = self._segment_path(segment).with_suffix(".hint")
+            if hint_path.exists():
+                hints = self._read_hint(hint_path)
+            else:
+                hints = self._scan(segment)
+                self._write_hint(segment, hints)
+            for flags, key, offset, length, expires_at in hints:
+                if flags & _TOMBSTONE:
+                    self._index.pop(key.decode('utf-8'), None)
+                else:
+                    self._index[key.decode('utf-8')] = _Entry(segment, offset, length, expires_at)
+            self._sizes[segment] = self._segment_path(segment).stat().st_size
+        # Earlier logs stay sealed; appends start in a fresh segment
+        self._open_active(segments[-1] + 1 if segments else 1)
+
+    def _scan(self, segment: int) -> List[_HintEntry]:
+        """Records of a log without a hint; a torn tail is truncated."""
+        path = self._segment_path(segment)
+        data = path.read_bytes()
+        hints: List[_HintEntry] = []
+        pos = 0
+        while pos + _HEADER.size <= len(data):
+            crc, flags, expires_at, key_len, value_len = _HEADER.unpack_from(data, pos)
+            end = pos + _HEADER.size + key_len + value_len
+            if end > len(data) or zlib.crc32(data[pos + 4:end]) != crc:
+                break
+            key = data[pos + _HEADER.size:pos + _HEADER.size + key_len]
+            hints.append((flags, key, end - value_len, value_len, expires_at))
+            pos = end
+        if pos < len(data):
+            with open(path, 'r+b') as f:
+                f.truncate(pos)
+        return hints
+
+    def _read_hint(self, path: Path) -> List[_HintEntry]:
+        data = path.read_bytes()
+        hints: List[_HintEntry] = []
+        pos = 0
+        while pos + _HINT.size <= len(data):
+            flags, offset, length, expires_at, key_len = _HINT.unpack_from(data, pos)
+            pos += _HINT.size
+            hints.append((flags, data[pos:pos + key_len], offset, length, expires_at))
+            pos += key_len
+        return hints
+
+    def _write_hint(self, segment: int, hints: List[_HintEntry]):
+        path = self._segment_path(segment).with_suffix(".hint")
+        tmp = path.with_suffix(".hint.tmp")
+        with open(tmp, 'wb') as f:
+            for flags, key, offset, length, expires_at in hints:
+                f.write(_HINT.pack(flags, offset, length, expires_at, len(key)))
+                f.write(key)
+        os.replace(tmp, path)
+
+    def _open_active(self, segment: int):
+        self._active_id = segment
+        self._active = open(self._segment_path(segment), 'ab')
+        self._active_hints: List[_HintEntry] = []
+        self._sizes[segment] = self._active.tell()
+
+    def _seal_active(self):
+        self._active.close()
+        self._write_hint(self._active_id, self._active_hints)
+
+    def _append(self, key: str, value: bytes, expires_at: int, flags: int) -> _Entry:
+        """Write one record to the active segment (caller holds the lock)."""
+        record, value_offset = _record(key, value, expires_at, flags)
+        offset = self._sizes[self._active_id]
+        self._active.write(record)
+        self._active.flush()
+        entry = _Entry(self._active_id, offset + value_offset, len(value), expires_at)
+        self._active_hints.append((flags, key.encode('utf-8'), entry.offset, entry.length, expires_at))
+        self._sizes[self._active_id] = offset + len(record)
+        if self._sizes[self._active_id] >= self._max_segment_bytes:
+            self._seal_active()
+            self._open_active(self._active_id + 1)
+        return entry
+
+    def _map(self, segment: int, size: int) -> mmap.mmap:
+        """Read-only map of a segment covering ``size`` bytes (caller holds the lock)."""
+        mm = self._maps.get(segment)
+        if mm is None or len(mm) < size:
+            # The active segment grows; remap it (readers keep the old map alive)
+            with open(self._segment_path(segment), 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mm
+        return mm
+
+    def _unmap(self, segment: int):
+        mm = self._maps.pop(segment, None)
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                pass  # A reader still has a view; freed when it is done
+
+    def _drop_segment(self, segment: int):
+        """Unmap and delete a segment and its hint (caller holds the lock)."""
+        self._unmap(segment)
+        self._sizes.pop(segment, None)
+        path = self._segment_path(segment)
+        for file_path in (path.with_suffix(".hint"), path):
+            if file_path.exists():
+                file_path.unlink()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self._dir / f"{segment:08d}.log"
+
+    def _compact_loop(self, interval: int):
+        while not self._stop.wait(interval):
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                print(f"Warning: Log storage compaction failed: {e}")
+
+
+def _record(key: str, value: bytes, expires_at: int, flags: int) -> Tuple[bytes, int]:
+    """Encoded record and the offset of its value within it."""
+    key_bytes = key.encode('utf-8')
+    body = _HEADER.pack(0, flags, expires_at, len(key_bytes), len(value))[4:] + key_bytes + value
+    return struct.pack("<I", zlib.crc32(body)) + body, _HEADER.size + len(key_bytes)
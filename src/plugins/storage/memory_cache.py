@@ -4,36 +4,63 @@ Memory Cache / 内存缓存
 In-memory storage for fast access caching.
 """
 
+import sys
+import time
 import hashlib
 import json
-from typing import Dict, Optional, Any
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Any
 from threading import Lock
 
-from src.interfaces.istorage import IStorage, StorageItem
+from src.interfaces.istorage import IStorage
 from src.core.exceptions import StorageError
 
 
+class _Item(NamedTuple):
+    value: Any
+    expires_at: Optional[float]  # time.monotonic() deadline, None = never
+    size: int  # Approximate bytes
+
+    def is_expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+
 class MemoryCache(IStorage):
     """
     In-memory storage implementation.
 
     Stores cached data in memory with thread-safe access.
     Useful for short-lived caches within a single process.
+
+    Entries are kept in recency order (an OrderedDict), so get and put
+    are O(1) and the least recently used entry is evicted first when
+    either ``max_size`` items or ``max_bytes`` (approximate value size)
+    is exceeded. Expired entries are dropped when read and by a sweep
+    that runs from save() every ``sweep_interval`` seconds.
     """
 
     STORAGE_NAME = "memory"
 
-    def __init__(self, max_size: int = 1000, **kwargs):
+    def __init__(self, max_size: int = 1000, max_bytes: int = None, sweep_interval: int = 60, **kwargs):
         """
         Initialize memory cache.
 
         Args:
             max_size: Maximum number of items to store
+            max_bytes: Maximum approximate size of stored values (None = no limit)
+            sweep_interval: Seconds between expiry sweeps (0 = only on access)
             **kwargs: Additional parameters
         """
-        self._cache: Dict[str, StorageItem] = {}
+        self._cache: "OrderedDict[str, _Item]" = OrderedDict()
         self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
         self._lock = Lock()
 
     @property
@@ -54,25 +81,23 @@ class MemoryCache(IStorage):
             True if save successful
         """
         try:
+            size = approximate_size(value)
+            now = time.monotonic()
+            item = _Item(value, now + ttl if ttl else None, size)
+
             with self._lock:
-                # Calculate expiration
-                expires_at = None
-                if ttl:
-                    expires_at = datetime.now() + timedelta(seconds=ttl)
-
-                item = StorageItem(
-                    key=key,
-                    value=value,
-                    created_at=datetime.now(),
-                    expires_at=expires_at,
-                    metadata=kwargs
-                )
-
-                # Evict oldest if at capacity
-                if len(self._cache) >= self._max_size:
-                    self._evict_oldest()
+                if self._max_bytes is not None and size > self._max_bytes:
+                    # Would evict everything else and still not fit
+                    self._remove(key)
+                    return False
 
+                self._remove(key)
                 self._cache[key] = item
+                self._bytes += size
+
+                if self._sweep_interval and now - self._last_sweep >= self._sweep_interval:
+                    self._sweep(now)
+                self._evict()
                 return True
 
         except Exception as e:
@@ -90,16 +115,20 @@ class MemoryCache(IStorage):
         """
         try:
             with self._lock:
-                if key not in self._cache:
+                item = self._cache.get(key)
+                if item is None:
+                    self._misses += 1
                     return None
 
-                item = self._cache[key]
-
                 # Check expiration
-                if item.is_expired():
-                    self.delete(key)
+                if item.is_expired(time.monotonic()):
+                    self._remove(key)
+                    self._expirations += 1
+                    self._misses += 1
                     return None
 
+                self._cache.move_to_end(key)
+                self._hits += 1
                 return item.value
 
         except Exception as e:
@@ -117,10 +146,7 @@ class MemoryCache(IStorage):
         """
         try:
             with self._lock:
-                if key in self._cache:
-                    del self._cache[key]
-                    return True
-                return False
+                return self._remove(key)
 
         except Exception as e:
             raise StorageError(f"Failed to delete from memory cache: {e}")
@@ -129,13 +155,13 @@ class MemoryCache(IStorage):
         """Check if key exists and is not expired."""
         try:
             with self._lock:
-                if key not in self._cache:
+                item = self._cache.get(key)
+                if item is None:
                     return False
 
-                item = self._cache[key]
-
-                if item.is_expired():
-                    self.delete(key)
+                if item.is_expired(time.monotonic()):
+                    self._remove(key)
+                    self._expirations += 1
                     return False
 
                 return True
@@ -148,6 +174,7 @@ class MemoryCache(IStorage):
         try:
             with self._lock:
                 self._cache.clear()
+                self._bytes = 0
                 return True
 
         except Exception as e:
@@ -162,24 +189,87 @@ class MemoryCache(IStorage):
         content = json.dumps(args, sort_keys=True)
         return hashlib.md5(content.encode()).hexdigest()
 
-    def _evict_oldest(self):
-        """Remove the oldest item from cache."""
-        if not self._cache:
-            return
+    def cleanup_expired(self) -> int:
+        """
+        Remove all expired items.
+
+        Returns:
+            Number of items removed
+        """
+        with self._lock:
+            return self._sweep(time.monotonic())
 
-        oldest_key = min(
-            self._cache.keys(),
-            key=lambda k: self._cache[k].created_at
-        )
-        del self._cache[oldest_key]
+    def _remove(self, key: str) -> bool:
+        """Drop an item (caller holds the lock)."""
+        item = self._cache.pop(key, None)
+        if item is None:
+            return False
+        self._bytes -= item.size
+        return True
+
+    def _evict(self):
+        """Drop least recently used items until within both limits (caller holds the lock)."""
+        while self._cache and (
+            len(self._cache) > self._max_size
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _, item = self._cache.popitem(last=False)
+            self._bytes -= item.size
+            self._evictions += 1
+
+    def _sweep(self, now: float) -> int:
+        """Drop all expired items (caller holds the lock)."""
+        self._last_sweep = now
+        expired = [key for key, item in self._cache.items() if item.is_expired(now)]
+        for key in expired:
+            self._remove(key)
+        self._expirations += len(expired)
+        return len(expired)
 
     def get_stats(self) -> Dict:
         """Get cache statistics."""
         with self._lock:
-            expired = sum(1 for item in self._cache.values() if item.is_expired())
+            now = time.monotonic()
+            expired = sum(1 for item in self._cache.values() if item.is_expired(now))
+            lookups = self._hits + self._misses
             return {
                 "total_items": len(self._cache),
                 "valid_items": len(self._cache) - expired,
                 "expired_items": expired,
-                "max_size": self._max_size
+                "max_size": self._max_size,
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations
             }
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Rough in-memory size of a value in bytes.
+
+    Walks dicts, sequences and object attributes; shared objects are
+    counted once.
+    """
+    seen = set()
+    size = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return size
@@ -0,0 +1,229 @@
+"""
+SQLite Storage / SQLite 存储
+
+Single-file cache in SQLite (WAL mode).
+
+One table ``cache(key PRIMARY KEY, value BLOB, expires_at INTEGER)``
+with an index on ``expires_at``: lookups are a primary-key read, and
+purging expired entries is one indexed DELETE instead of unpickling
+every file. WAL lets readers run alongside a writer, and SQLite's file
+locking (with a busy timeout) makes the cache safe to share between
+uvicorn worker processes.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Any
+
+from src.interfaces.istorage import IStorage
+from src.core.exceptions import StorageError
+from .value_codec import ValueCodec
+
+# Statements are constant strings with parameters, so sqlite3 prepares
+# each once per connection and reuses it from its statement cache.
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at INTEGER)",
+    "CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at)",
+)
+_UPSERT = "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)"
+_SELECT = "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)"
+_EXISTS = "SELECT 1 FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)"
+_EXPIRES = "SELECT expires_at FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)"
+_DELETE = "DELETE FROM cache WHERE key = ?"
+_PURGE = "DELETE FROM cache WHERE expires_at <= ?"
+_CLEAR = "DELETE FROM cache"
+
+
+class SQLiteStorage(IStorage):
+    """
+    SQLite-backed storage implementation.
+
+    Values are encoded by a ValueCodec (pickle, then zstd with a trained
+    dictionary or zlib) into a BLOB column; expired rows are invisible
+    to reads and removed by cleanup_expired(), which also runs from
+    save() every ``purge_interval`` seconds.
+    """
+
+    STORAGE_NAME = "sqlite"
+
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        db_path: str = None,
+        busy_timeout_ms: int = 5000,
+        purge_interval: int = 3600,
+        compression: str = "auto",
+        **kwargs
+    ):
+        """
+        Initialize SQLite storage.
+
+        Args:
+            cache_dir: Directory for the database (when db_path is not given)
+            db_path: Database file (default: <cache_dir>/cache.sqlite3)
+            busy_timeout_ms: How long a write waits for another process's lock
+            purge_interval: Seconds between expiry purges on save (0 = never)
+            compression: Value compression (auto, zstd, zlib, none)
+            **kwargs: Additional parameters
+        """
+        self._db_path = Path(db_path) if db_path else Path(cache_dir) / "cache.sqlite3"
+        self._busy_timeout_ms = busy_timeout_ms
+        self._purge_interval = purge_interval
+        self._last_purge = time.time()
+        self._codec = ValueCodec(compression, dictionary_dir=str(self._db_path.parent / "dictionaries"))
+        # sqlite3 connections must not be shared across threads or forks
+        self._local = threading.local()
+
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._conn()
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open SQLite storage {self._db_path}: {e}")
+
+    @property
+    def storage_name(self) -> str:
+        return self.STORAGE_NAME
+
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection (reopened after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(
+                str(self._db_path),
+                timeout=self._busy_timeout_ms / 1000,
+                isolation_level=None,  # Autocommit: each statement is its own transaction
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def save(self, key: str, value: Any, ttl: int = None, **kwargs) -> bool:
+        """
+        Save a value to SQLite storage.
+
+        Args:
+            key: Unique identifier
+            value: Value to store
+            ttl: Time-to-live in seconds
+            **kwargs: Additional parameters
+
+        Returns:
+            True if save successful
+        """
+        expires_at = int(time.time()) + int(ttl) if ttl else None
+        try:
+            blob = self._codec.encode(value)
+            self._conn().execute(_UPSERT, (key, sqlite3.Binary(blob), expires_at))
+        except Exception as e:
+            raise StorageError(f"Failed to save to SQLite storage: {e}")
+
+        if self._purge_interval and time.time() - self._last_purge >= self._purge_interval:
+            self.cleanup_expired()
+        return True
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Load a value from SQLite storage.
+
+        Args:
+            key: Unique identifier
+
+        Returns:
+            Stored value or None if not found/expired
+        """
+        try:
+            row = self._conn().execute(_SELECT, (key, int(time.time()))).fetchone()
+            return self._codec.decode(row[0]) if row else None
+        except Exception as e:
+            raise StorageError(f"Failed to load from SQLite storage: {e}")
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a value from SQLite storage.
+
+        Args:
+            key: Unique identifier
+
+        Returns:
+            True if deleted
+        """
+        try:
+            return self._conn().execute(_DELETE, (key,)).rowcount > 0
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to delete from SQLite storage: {e}")
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists and is not expired."""
+        try:
+            return self._conn().execute(_EXISTS, (key, int(time.time()))).fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until key expires (None = never; 0 = missing or expired)."""
+        now = time.time()
+        try:
+            row = self._conn().execute(_EXPIRES, (key, int(now))).fetchone()
+        except sqlite3.Error:
+            return 0
+        if row is None:
+            return 0
+        return None if row[0] is None else max(0.0, row[0] - now)
+
+    def clear(self) -> bool:
+        """Clear all stored data."""
+        try:
+            self._conn().execute(_CLEAR)
+            return True
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to clear SQLite storage: {e}")
+
+    def get_cache_key(self, *args) -> str:
+        """Generate a consistent cache key from arguments."""
+        content = json.dumps(args, sort_keys=True)
+        return hashlib.md5(content.encode()).hexdigest()
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove all expired cache entries (one indexed DELETE).
+
+        Returns:
+            Number of entries removed
+        """
+        self._last_purge = time.time()
+        try:
+            return self._conn().execute(_PURGE, (int(self._last_purge),)).rowcount
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to cleanup expired items: {e}")
+
+    def train_dictionary(self, max_samples: int = 500) -> int:
+        """
+        Train the compression dictionary from existing rows.
+
+        Returns:
+            The dictionary id (0 if none was trained)
+        """
+        try:
+            rows = self._conn().execute("SELECT value FROM cache LIMIT ?", (max_samples,)).fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to read SQLite storage: {e}")
+        return self._codec.train([self._codec.raw_payload(row[0]) for row in rows])
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
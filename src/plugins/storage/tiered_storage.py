@@ -0,0 +1,253 @@
+"""
+Tiered Storage / 分层存储
+
+A MemoryCache (L1) in front of a persistent backend (L2).
+
+Reads check L1 first and promote L2 hits into it, so hot entries are
+served from memory while everything still survives a restart in L2.
+Writes go to both tiers, either synchronously ("through") or to L2
+from a background thread ("behind"). L2 misses are remembered in L1
+for ``negative_ttl`` seconds, so repeated lookups of an uncached key do
+not hit the disk each time. Promoted entries live in L1 for at most
+``promote_ttl`` seconds and never past their L2 expiry; backends that
+cannot report an entry's expiry get no promotion.
+"""
+
+import queue
+import threading
+from typing import Any, Dict, Optional
+
+from src.interfaces.istorage import IStorage
+from src.core.exceptions import ConfigurationError, StorageError
+from .memory_cache import MemoryCache
+
+# Stored in L1 for a key known to be missing from L2
+_MISS = object()
+
+WRITE_POLICIES = ("through", "behind")
+
+
+class TieredStorage(IStorage):
+    """
+    Two-tier storage implementation (memory over a persistent backend).
+    """
+
+    STORAGE_NAME = "tiered"
+
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        l2: str = "local",
+        l1_options: Dict[str, Any] = None,
+        l2_options: Dict[str, Any] = None,
+        write_policy: str = "through",
+        negative_ttl: int = 5,
+        promote_ttl: int = 300,
+        **kwargs
+    ):
+        """
+        Initialize tiered storage.
+
+        Args:
+            cache_dir: Directory passed to the L2 backend
+            l2: Persistent backend name (local, sqlite, logstore)
+            l1_options: MemoryCache parameters (max_size, max_bytes, ...)
+            l2_options: L2 backend parameters
+            write_policy: "through" (L2 written before save returns) or
+                "behind" (L2 written by a background thread)
+            negative_ttl: Seconds an L2 miss is remembered (0 = off)
+            promote_ttl: Longest L1 lifetime of entries promoted from L2
+                (capped at their remaining L2 lifetime)
+            **kwargs: Additional parameters
+        """
+        from . import get_storage
+
+        if l2 in ("memory", self.STORAGE_NAME):
+            raise ConfigurationError(f"Tiered storage needs a persistent L2 backend, got '{l2}'")
+        if write_policy not in WRITE_POLICIES:
+            raise ConfigurationError(f"Unknown write_policy '{write_policy}'. Available: {list(WRITE_POLICIES)}")
+
+        self._l1 = MemoryCache(**(l1_options or {}))
+        self._l2 = get_storage(l2, **{"cache_dir": cache_dir, **(l2_options or {})})
+        self._negative_ttl = negative_ttl
+        self._promote_ttl = promote_ttl
+        self._write_behind = write_policy == "behind"
+
+        self._lock = threading.Lock()
+        self._stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0, "negative_hits": 0}
+        self._pending: Dict[str, Any] = {}  # Write-behind values not yet in L2
+        self._queue: "queue.Queue" = queue.Queue()
+        if self._write_behind:
+            threading.Thread(target=self._write_loop, name="tiered-write-behind", daemon=True).start()
+
+    @property
+    def storage_name(self) -> str:
+        return self.STORAGE_NAME
+
+    def save(self, key: str, value: Any, ttl: int = None, **kwargs) -> bool:
+        """
+        Save a value to both tiers.
+
+        Args:
+            key: Unique identifier
+            value: Value to store
+            ttl: Time-to-live in seconds
+            **kwargs: Additional parameters
+
+        Returns:
+            True if save successful (write-behind: once queued)
+        """
+        with self._lock:
+            self._l1.save(key, value, ttl=ttl)
+        if not self._write_behind:
+            return self._l2.save(key, value, ttl=ttl, **kwargs)
+
+        with self._lock:
+            self._pending[key] = value
+        self._queue.put((key, value, ttl, kwargs))
+        return True
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Load a value from L1, else from L2 (promoting it into L1).
+
+        Args:
+            key: Unique identifier
+
+        Returns:
+            Stored value or None if not found/expired
+        """
+        value = self._l1.load(key)
+        if value is _MISS:
+            self._count("negative_hits")
+            return None
+        if value is not None:
+            self._count("l1_hits")
+            return value
+        self._count("l1_misses")
+
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+
+        value = self._l2.load(key)
+        if value is None:
+            self._count("l2_misses")
+            with self._lock:
+                # Not over a value saved since the L1 lookup
+                if self._negative_ttl and not self._l1.exists(key):
+                    self._l1.save(key, _MISS, ttl=self._negative_ttl)
+            return None
+
+        self._count("l2_hits")
+        ttl = self._promotion_ttl(key)
+        if ttl:
+            with self._lock:
+                if not self._l1.exists(key):
+                    self._l1.save(key, value, ttl=ttl)
+        return value
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a value from both tiers.
+
+        Args:
+            key: Unique identifier
+
+        Returns:
+            True if deleted
+        """
+        self.flush()
+        in_l1 = self._l1.load(key) not in (None, _MISS)
+        self._l1.delete(key)
+        return self._l2.delete(key) or in_l1
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists and is not expired."""
+        value = self._l1.load(key)
+        if value is _MISS:
+            return False
+        if value is not None:
+            return True
+        with self._lock:
+            if key in self._pending:
+                return True
+        return self._l2.exists(key)
+
+    def clear(self) -> bool:
+        """Clear all stored data."""
+        self.flush()
+        self._l1.clear()
+        return self._l2.clear()
+
+    def get_cache_key(self, *args) -> str:
+        """Generate a consistent cache key from arguments."""
+        return self._l2.get_cache_key(*args)
+
+    def cleanup_expired(self):
+        """Remove expired entries from both tiers."""
+        self._l1.cleanup_expired()
+        if hasattr(self._l2, "cleanup_expired"):
+            self._l2.cleanup_expired()
+
+    def flush(self):
+        """Wait until queued write-behind saves are in L2."""
+        if self._write_behind:
+            self._queue.join()
+
+    def close(self):
+        """Flush pending writes and close L2."""
+        self.flush()
+        if hasattr(self._l2, "close"):
+            self._l2.close()
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counts per tier, plus L1 size and evictions."""
+        l1 = self._l1.get_stats()
+        with self._lock:
+            stats = dict(self._stats)
+            pending = len(self._pending)
+        return {
+            "l1": {
+                "hits": stats["l1_hits"],
+                "misses": stats["l1_misses"],
+                "negative_hits": stats["negative_hits"],
+                "items": l1["total_items"],
+                "bytes": l1["bytes"],
+                "evictions": l1["evictions"]
+            },
+            "l2": {
+                "backend": self._l2.storage_name,
+                "hits": stats["l2_hits"],
+                "misses": stats["l2_misses"],
+                "pending_writes": pending
+            }
+        }
+
+    def _promotion_ttl(self, key: str) -> int:
+        """L1 lifetime for an entry promoted from L2 (0 = do not promote)."""
+        expires_in = getattr(self._l2, "expires_in", None)
+        if expires_in is None:
+            return 0  # Remaining lifetime unknown
+        left = expires_in(key)
+        if left is None:
+            return self._promote_ttl  # Never expires in L2
+        return min(self._promote_ttl, int(left))
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _write_loop(self):
+        """Write-behind worker: saves queued values to L2 in order."""
+        while True:
+            key, value, ttl, kwargs = self._queue.get()
+            try:
+                self._l2.save(key, value, ttl=ttl, **kwargs)
+            except StorageError as e:
+                print(f"Warning: Write-behind save failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    if self._pending.get(key) is value:
+                        del self._pending[key]
+                self._queue.task_done()
@@ -0,0 +1,220 @@
+"""
+Value Codec / 缓存值编解码
+
+Serialization plus compression for the persistent storage backends.
+
+Cached reports and match results repeat the same headings, Chinese
+boilerplate and JSON keys, so they compress well, and much better with
+a zstd dictionary trained on earlier values. Each encoded value starts
+with a small header naming its codec and dictionary, so entries written
+with another codec (or before compression existed: bare pickles) stay
+readable.
+
+Header: ``MAGIC (3 bytes) | codec (1 byte) | dictionary id (4 bytes)``.
+"""
+
+import os
+import zlib
+import pickle
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.core.exceptions import ConfigurationError, StorageError
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Never the first bytes of a pickle (protocol 2+ starts with 0x80)
+MAGIC = b"\xfeRS"
+_HEADER = struct.Struct("<3sBI")
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+COMPRESSION_NAMES = ("auto", "zstd", "zlib", "none")
+
+
+class ValueCodec:
+    """
+    Encodes values for storage (pickle, then zstd/zlib) and decodes them.
+
+    With zstd and a ``dictionary_dir``, the first ``train_after`` values
+    are kept as samples and a dictionary is trained from them on a
+    background thread; values saved after it is ready are compressed
+    with it. Dictionaries are saved as
+    ``<dictionary_dir>/<id>.zdict`` and loaded on demand, so processes
+    sharing a cache can read each other's entries.
+    """
+
+    def __init__(
+        self,
+        compression: str = "auto",
+        level: int = None,
+        dictionary_dir: str = None,
+        train_after: int = 200,
+        dict_size: int = 64 * 1024,
+        min_size: int = 256
+    ):
+        """
+        Args:
+            compression: "auto" (zstd if installed, else zlib), "zstd", "zlib" or "none"
+            level: Compression level (default: 3 for zstd, 6 for zlib)
+            dictionary_dir: Where trained dictionaries live (None = no dictionary)
+            train_after: Number of sample values to train a dictionary on
+            dict_size: Target dictionary size in bytes
+            min_size: Values smaller than this are stored uncompressed
+        """
+        if compression not in COMPRESSION_NAMES:
+            raise ConfigurationError(
+                f"Unknown compression '{compression}'. Available: {list(COMPRESSION_NAMES)}"
+            )
+        if compression == "zstd" and not HAS_ZSTD:
+            raise ConfigurationError("zstd compression requires the zstandard package")
+        if compression == "auto":
+            compression = "zstd" if HAS_ZSTD else "zlib"
+
+        self._codec = {"zstd": CODEC_ZSTD, "zlib": CODEC_ZLIB, "none": CODEC_NONE}[compression]
+        self._level = level if level is not None else (3 if self._codec == CODEC_ZSTD else 6)
+        self._dictionary_dir = Path(dictionary_dir) if dictionary_dir else None
+        self._train_after = train_after
+        self._dict_size = dict_size
+        self._min_size = min_size
+
+        self._lock = threading.Lock()
+        self._dictionaries: Dict[int, Any] = {}  # id -> zstandard.ZstdCompressionDict
+        self._dict_id = 0  # Dictionary used for new values
+        self._samples: List[bytes] = []
+        self._trainer = None  # Background training thread, once started
+        if self._codec == CODEC_ZSTD and self._dictionary_dir:
+            self._load_newest_dictionary()
+
+    @property
+    def compression(self) -> str:
+        return {CODEC_ZSTD: "zstd", CODEC_ZLIB: "zlib", CODEC_NONE: "none"}[self._codec]
+
+    @property
+    def dictionary_id(self) -> int:
+        """Id of the dictionary used for new values (0 = none)."""
+        return self._dict_id
+
+    def encode(self, value: Any) -> bytes:
+        """Pickle and compress a value, with a codec header."""
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._codec == CODEC_NONE or len(raw) < self._min_size:
+            return _HEADER.pack(MAGIC, CODEC_NONE, 0) + raw
+
+        if self._codec == CODEC_ZLIB:
+            return _HEADER.pack(MAGIC, CODEC_ZLIB, 0) + zlib.compress(raw, self._level)
+
+        self._sample(raw)
+        dict_id = self._dict_id
+        compressor = zstandard.ZstdCompressor(
+            level=self._level, dict_data=self._dictionaries.get(dict_id) if dict_id else None
+        )
+        return _HEADER.pack(MAGIC, CODEC_ZSTD, dict_id) + compressor.compress(raw)
+
+    def decode(self, blob: bytes) -> Any:
+        """Inverse of encode(); bare pickles (pre-compression entries) pass through."""
+        data = memoryview(blob)
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            return pickle.loads(data)
+
+        _, codec, dict_id = _HEADER.unpack_from(data)
+        payload = data[_HEADER.size:]
+        if codec == CODEC_NONE:
+            return pickle.loads(payload)
+        if codec == CODEC_ZLIB:
+            return pickle.loads(zlib.decompress(payload))
+        if codec == CODEC_ZSTD:
+            if not HAS_ZSTD:
+                raise StorageError("Entry is zstd-compressed but the zstandard package is not installed")
+            dictionary = self._dictionary(dict_id) if dict_id else None
+            return pickle.loads(zstandard.ZstdDecompressor(dict_data=dictionary).decompress(payload))
+        raise StorageError(f"Unknown value codec {codec}")
+
+    def train(self, samples: List[bytes]) -> int:
+        """
+        Train a zstd dictionary from raw (pickled) values and use it for
+        new values.
+
+        Returns:
+            The dictionary id (0 if zstd/dictionaries are not in use or
+            there are too few samples)
+        """
+        if self._codec != CODEC_ZSTD or not self._dictionary_dir or len(samples) < 8:
+            return 0
+        try:
+            dictionary = zstandard.train_dictionary(self._dict_size, samples)
+        except zstandard.ZstdError:
+            return 0  # Samples too small or too uniform
+
+        dictionary.precompute_compress(level=self._level)
+        dict_id = dictionary.dict_id()
+        self._dictionary_dir.mkdir(parents=True, exist_ok=True)
+        path = self._dictionary_dir / f"{dict_id}.zdict"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(dictionary.as_bytes())
+        os.replace(tmp, path)
+        with self._lock:
+            self._dictionaries[dict_id] = dictionary
+            self._dict_id = dict_id
+            self._samples = []
+        return dict_id
+
+    def raw_payload(self, blob: bytes) -> bytes:
+        """Pickled form of an encoded value (training sample)."""
+        return pickle.dumps(self.decode(blob), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _sample(self, raw: bytes):
+        """Collect training samples; the first dictionary is trained in the background."""
+        if self._dict_id or not self._dictionary_dir:
+            return
+        with self._lock:
+            if len(self._samples) >= self._train_after:
+                return  # Full (training is running)
+            self._samples.append(raw)
+            if len(self._samples) < self._train_after:
+                return
+            trainer = threading.Thread(
+                target=self._train_samples, args=(list(self._samples),), name="zstd-dictionary", daemon=True
+            )
+            self._trainer = trainer
+        trainer.start()
+
+    def _train_samples(self, samples: List[bytes]):
+        """Training thread: train, or start collecting fresh samples on failure."""
+        try:
+            trained = self.train(samples)
+        except Exception as e:
+            print(f"Warning: zstd dictionary training failed: {e}")
+            trained = 0
+        if not trained:
+            with self._lock:
+                self._samples.clear()
+
+    def _dictionary(self, dict_id: int):
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is not None:
+            return dictionary
+        path = self._dictionary_dir / f"{dict_id}.zdict" if self._dictionary_dir else None
+        if path is None or not path.exists():
+            raise StorageError(f"zstd dictionary {dict_id} not found")
+        dictionary = zstandard.ZstdCompressionDict(path.read_bytes())
+        dictionary.precompute_compress(level=self._level)
+        with self._lock:
+            return self._dictionaries.setdefault(dict_id, dictionary)
+
+    def _load_newest_dictionary(self):
+        if not self._dictionary_dir.exists():
+            return
+        paths = sorted(self._dictionary_dir.glob("*.zdict"), key=lambda p: p.stat().st_mtime)
+        if paths:
+            dict_id = int(paths[-1].stem)
+            self._dictionary(dict_id)
+            self._dict_id = dict_id
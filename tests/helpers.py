@@ -0,0 +1,85 @@
+"""
+Shared test doubles: a scriptable fake LLM provider and an engine factory.
+"""
+
+from src.core.config import ConfigManager
+from src.core.engine import TalentOSEngine
+from src.interfaces.illm_provider import ILLMProvider, LLMResponse
+from src.plugins.storage.memory_cache import MemoryCache
+
+
+class FakeProvider(ILLMProvider):
+    """
+    Stand-in LLM provider.
+
+    chat() raises the queued ``errors`` in order, then answers with
+    ``content``; subclasses override answer() to reply per prompt.
+    Every call is counted in ``calls``.
+    """
+
+    provider_name = "fake"
+    supported_models = ["fake-model"]
+
+    def __init__(self, content: str = "Score: 75", errors=(), tokens_used: int = 10):
+        self.content = content
+        self.errors = list(errors)
+        self.tokens_used = tokens_used
+        self.calls = 0
+
+    def answer(self, messages, **kwargs) -> str:
+        return self.content
+
+    def respond(self, messages, **kwargs) -> LLMResponse:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return LLMResponse(
+            content=self.answer(messages, **kwargs), model="fake-model", tokens_used=self.tokens_used, latency_ms=1
+        )
+
+    def chat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        return self.respond(messages, **kwargs)
+
+    def chat_stream(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        yield ""
+
+    def get_model_info(self, model):
+        return {"name": model}
+
+    def health_check(self):
+        return True
+
+    def is_available(self):
+        return True
+
+
+def make_engine(provider=None, cache_dir: str = None, **analysis) -> TalentOSEngine:
+    """
+    Engine with persistent storage disabled and an in-memory cache.
+
+    Args:
+        provider: LLM provider to use (default: the configured one)
+        cache_dir: Directory for the engine's on-disk state
+        **analysis: Sections merged into a copy of config.analysis
+    """
+    config = ConfigManager().config
+    config.storage.enabled = False
+    if cache_dir:
+        config.cache_dir = cache_dir
+    if analysis:
+        config.analysis = {**config.analysis, **analysis}
+    engine = TalentOSEngine(config=config)
+    if provider is not None:
+        engine._llm_provider = provider
+    engine._storage = MemoryCache()
+    return engine
+
+
+def make_retrying_engine(provider, max_retries: int = 3, **retry) -> TalentOSEngine:
+    """make_engine() with millisecond retry delays and the circuit breaker off."""
+    engine = make_engine(provider)
+    provider_config = engine._config.llm_providers[engine._current_provider]
+    provider_config.max_retries = max_retries
+    provider_config.retry = {"base_delay": 0.001, "max_delay": 0.01, **retry}
+    provider_config.circuit_breaker = {"enabled": False}
+    return engine
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from src.core.engine import AnalysisResult
+from src.plugins.storage.memory_cache import MemoryCache
+from tests.helpers import FakeProvider, make_engine
+
+
+class SlowAsyncProvider(FakeProvider):
+    """Fake provider whose async calls take a fixed time without blocking."""
+
+    def __init__(self, delay: float = 0.2):
+        super().__init__(content="Match Score: 80/100")
+        self.delay = delay
+        self.sync_calls = 0
+        self.async_calls = 0
+
+    def answer(self, messages, **kwargs):
+        if any("JOB DESCRIPTION" in m["content"] for m in messages):
+            return '{"score": 75, "status": "Suitable"}'
+        return self.content
+
+    def chat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        self.sync_calls += 1
+        return self.respond(messages)
+
+    async def achat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        self.async_calls += 1
+        await asyncio.sleep(self.delay)
+        return self.respond(messages)
+
+    def chat_stream(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        yield "chunk-1"
+        yield "chunk-2"
+
+
+class ThreadRecordingCache(MemoryCache):
+    """MemoryCache that notes which threads touched it."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def load(self, key):
+        self.threads.add(threading.current_thread())
+        return super().load(key)
+
+    def save(self, key, value, ttl=None, **kwargs):
+        self.threads.add(threading.current_thread())
+        return super().save(key, value, ttl=ttl, **kwargs)
+
+
+class TestAsyncEngine(unittest.TestCase):
+    def test_concurrent_analyses_overlap(self):
+        provider = SlowAsyncProvider(delay=0.2)
+        engine = make_engine(provider)
+
+        async def run():
+            return await asyncio.gather(*[
+                engine.aanalyze(f"resume {i}", "a job description", use_cache=False)
+                for i in range(20)
+            ])
+
+        start = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - start
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(isinstance(r, AnalysisResult) for r in results))
+        self.assertEqual(results[0].score, 80)
+        self.assertEqual(provider.async_calls, 20)
+        self.assertEqual(provider.sync_calls, 0)
+        # Sequential would take 4s; concurrent should be close to one call.
+        self.assertLess(elapsed, 1.5)
+
+    def test_concurrent_batches_share_the_provider_limit(self):
+        provider = SlowAsyncProvider(delay=0.05)
+        engine = make_engine(provider)
+        engine._config.llm_providers[engine._current_provider].max_concurrency = 2
+        state = {"active": 0, "peak": 0}
+        achat = provider.achat
+
+        async def counting_achat(*args, **kwargs):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                return await achat(*args, **kwargs)
+            finally:
+                state["active"] -= 1
+
+        provider.achat = counting_achat
+
+        async def run():
+            return await asyncio.gather(*[
+                engine.abatch_evaluate_match([f"resume {b}-{i}" for i in range(4)], "a job description text")
+                for b in range(3)
+            ])
+
+        asyncio.run(run())
+        self.assertEqual(state["peak"], 2)
+
+    def test_storage_io_stays_off_the_event_loop(self):
+        engine = make_engine(SlowAsyncProvider(delay=0))
+        engine._storage = storage = ThreadRecordingCache()
+
+        async def run():
+            await engine.aevaluate_match("resume", "a job description text")
+            await engine.aevaluate_match("resume", "a job description text")
+            async for _ in engine.aevaluate_match_stream("resume", "a job description text"):
+                pass
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(run())
+        self.assertTrue(storage.threads)
+        self.assertNotIn(loop_thread, storage.threads)
+
+    def test_async_results_are_cached(self):
+        provider = SlowAsyncProvider(delay=0)
+        engine = make_engine(provider)
+
+        first = asyncio.run(engine.aevaluate_match("resume", "a job description text"))
+        second = asyncio.run(engine.aevaluate_match("resume", "a job description text"))
+
+        self.assertEqual(first["score"], 75)
+        self.assertEqual(second, first)
+        self.assertEqual(provider.async_calls, 1)
+
+    def test_default_async_stream_wraps_sync_stream(self):
+        provider = SlowAsyncProvider()
+
+        async def collect():
+            return [chunk async for chunk in provider.achat_stream([{"role": "user", "content": "hi"}])]
+
+        self.assertEqual(asyncio.run(collect()), ["chunk-1", "chunk-2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from src.core.batch import BatchExecutor, ConcurrencyLimit
+
+
+class TestBatchExecutor(unittest.TestCase):
+    def test_run_keeps_order_and_captures_errors(self):
+        def work(x):
+            time.sleep(0.01 * (5 - x))
+            if x == 2:
+                raise ValueError("bad item")
+            return x * 10
+
+        progress = []
+        results = BatchExecutor(max_concurrency=3).run(
+            range(5), work, lambda done, total, item: progress.append((done, total))
+        )
+
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual([r.value for r in results if r.ok], [0, 10, 30, 40])
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertEqual(sorted(progress), [(i, 5) for i in range(1, 6)])
+
+    def test_run_respects_concurrency_limit(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def work(_):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+        BatchExecutor(max_concurrency=2).run(range(8), work)
+        self.assertEqual(state["peak"], 2)
+
+    def test_arun_is_concurrent_and_bounded(self):
+        state = {"active": 0, "peak": 0}
+
+        async def work(x):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.05)
+            state["active"] -= 1
+            return x
+
+        start = time.time()
+        results = asyncio.run(BatchExecutor(max_concurrency=10).arun(range(20), work))
+        elapsed = time.time() - start
+
+        self.assertEqual([r.value for r in results], list(range(20)))
+        self.assertEqual(state["peak"], 10)
+        self.assertLess(elapsed, 0.5)
+
+    def test_shared_limit_bounds_concurrent_batches(self):
+        limit = ConcurrencyLimit(3)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def enter():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+
+        def leave():
+            with lock:
+                state["active"] -= 1
+
+        def work(_):
+            enter()
+            time.sleep(0.02)
+            leave()
+
+        async def awork(_):
+            enter()
+            await asyncio.sleep(0.02)
+            leave()
+
+        def sync_batch():
+            BatchExecutor(max_concurrency=3, limit=limit).run(range(12), work)
+
+        async def run():
+            batches = [asyncio.to_thread(sync_batch) for _ in range(2)]
+            batches += [BatchExecutor(max_concurrency=3, limit=limit).arun(range(12), awork) for _ in range(2)]
+            await asyncio.gather(*batches)
+
+        asyncio.run(run())
+        self.assertEqual(state["peak"], 3)
+
+    def test_cancelled_waiter_frees_its_place(self):
+        limit = ConcurrencyLimit(1)
+
+        async def run():
+            await limit.aacquire()
+            waiter = asyncio.ensure_future(limit.aacquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            limit.release()
+            await asyncio.wait_for(limit.aacquire(), timeout=1)
+
+        asyncio.run(run())
+
+    def test_progress_callback_errors_are_ignored(self):
+        def boom(*args):
+            raise RuntimeError("progress hook failed")
+
+        results = BatchExecutor().run([1, 2], lambda x: x, boom)
+        self.assertTrue(all(r.ok for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
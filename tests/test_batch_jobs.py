@@ -0,0 +1,139 @@
+import json
+import tempfile
+import unittest
+
+from src.core.batch_jobs import BatchJobStore
+from src.core.cache_keys import text_digest
+from src.core.exceptions import LLMProviderError
+from src.core.schemas import MATCH_SCHEMA
+from src.interfaces.illm_provider import BatchStatus
+from src.plugins.llm_providers import LocalBatchProvider
+from tests.helpers import FakeProvider, make_engine
+
+JD = "Senior Java engineer with Spring Boot and Kafka"
+
+
+class ScoringProvider(FakeProvider):
+    """Scores every resume; fails on 'broken' resumes and garbles 'garbled' ones."""
+
+    def __init__(self):
+        super().__init__(content=json.dumps({"score": 70, "status": "Suitable", "name": "Li"}), tokens_used=40)
+        self.schemas = []
+
+    def answer(self, messages, **kwargs):
+        self.schemas.append(kwargs.get("response_schema"))
+        prompt = json.dumps(messages)
+        if "broken" in prompt:
+            raise RuntimeError("upstream failure")
+        if "garbled" in prompt:
+            return '{"score": "high"}'
+        return self.content
+
+
+class TestBatchJobs(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.delegate = ScoringProvider()
+        self.engine = make_engine(LocalBatchProvider(self.delegate, batch_dir=self.tmp + "/batches"), self.tmp)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_submit_poll_and_cache_write_back(self):
+        job = self.engine.submit_batch_job(["resume a", "resume b"], JD)
+
+        self.assertEqual(job.status, BatchStatus.IN_PROGRESS)
+        self.assertEqual(self.delegate.calls, 0)
+
+        results = self.engine.get_batch_job_results(job.job_id)
+        self.assertEqual([r["score"] for r in results], [70, 70])
+        self.assertEqual(results[0]["_metadata"]["batch_job"], job.job_id)
+
+        # Written back into the cache: no further LLM call
+        single = self.engine.evaluate_match("resume b", JD)
+        self.assertEqual(single["score"], 70)
+        self.assertEqual(self.delegate.calls, 2)
+
+    def test_job_record_is_persisted(self):
+        job = self.engine.submit_batch_job(["resume a"], JD, weights={"skills": 50})
+        self.engine.poll_batch_job(job.job_id)
+
+        stored = BatchJobStore(self.tmp + "/batch_jobs").load(job.job_id)
+        self.assertEqual(stored.status, BatchStatus.COMPLETED)
+        self.assertEqual(stored.weights, {"skills": 50})
+        self.assertEqual(stored.results[0]["score"], 70)
+        self.assertEqual([j.job_id for j in self.engine.list_batch_jobs()], [job.job_id])
+
+    def test_cached_resumes_are_not_submitted(self):
+        self.engine.evaluate_match("resume a", JD)
+
+        job = self.engine.submit_batch_job(["resume a", "resume b"], JD)
+        results = self.engine.get_batch_job_results(job.job_id)
+
+        self.assertEqual([item.submitted for item in job.items], [False, True])
+        self.assertEqual(self.delegate.calls, 2)
+        self.assertEqual(len(results), 2)
+
+    def test_failed_requests_stay_in_place(self):
+        job = self.engine.submit_batch_job(["resume a", "broken resume"], JD)
+        job = self.engine.poll_batch_job(job.job_id)
+
+        self.assertEqual(job.failed, 1)
+        self.assertEqual(job.results[1]["status"], "Error")
+        self.assertIn("upstream failure", job.results[1]["error"])
+        self.assertEqual(self.engine.get_metrics()["batch_jobs.failed"], 1)
+
+    def test_requests_use_structured_output(self):
+        job = self.engine.submit_batch_job(["resume a"], JD)
+        self.engine.poll_batch_job(job.job_id)
+
+        self.assertEqual(self.delegate.schemas[0], MATCH_SCHEMA)
+
+    def test_malformed_replies_count_as_failed(self):
+        job = self.engine.submit_batch_job(["resume a", "garbled resume"], JD)
+        job = self.engine.poll_batch_job(job.job_id)
+
+        self.assertEqual(job.failed, 1)
+        self.assertEqual(job.results[1]["status"], "Error")
+        self.assertIn("Malformed reply", job.results[1]["error"])
+        # Not cached: asking again calls the LLM
+        calls = self.delegate.calls
+        self.engine.evaluate_match("garbled resume", JD)
+        self.assertGreater(self.delegate.calls, calls)
+
+    def test_finished_record_keeps_only_resume_digests(self):
+        job = self.engine.submit_batch_job(["resume a"], JD)
+        self.assertEqual(BatchJobStore(self.tmp + "/batch_jobs").load(job.job_id).items[0].resume_text, "resume a")
+
+        self.engine.poll_batch_job(job.job_id)
+
+        item = BatchJobStore(self.tmp + "/batch_jobs").load(job.job_id).items[0]
+        self.assertIsNone(item.resume_text)
+        self.assertEqual(item.resume_digest, text_digest("resume a"))
+
+    def test_extraction_without_jd(self):
+        job = self.engine.submit_batch_job(["resume a"])
+
+        self.assertEqual(job.kind, "extract")
+        self.assertEqual(self.engine.get_batch_job_results(job.job_id)[0]["name"], "Li")
+
+    def test_failed_extraction_is_extraction_shaped(self):
+        job = self.engine.submit_batch_job(["resume a", "broken resume"])
+        job = self.engine.poll_batch_job(job.job_id)
+
+        self.assertEqual(job.failed, 1)
+        self.assertIn("upstream failure", job.results[1]["error"])
+        self.assertNotIn("score", job.results[1])
+
+    def test_provider_without_batch_api(self):
+        engine = make_engine(self.delegate, self.tmp)
+        self.assertFalse(self.delegate.supports_batch)
+        with self.assertRaises(LLMProviderError):
+            engine.submit_batch_job(["resume a"], JD)
+        with self.assertRaises(LLMProviderError):
+            self.delegate.submit_batch([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from src.core.cache_keys import cache_key, canonicalize, text_digest, weights_component
+from tests.helpers import FakeProvider, make_engine
+
+JD = "Senior Java engineer with Spring Boot and Kafka"
+RESUME = "Zhang Wei\nJava engineer, 8 years\nSpring Boot, Kafka"
+
+
+class TestCanonicalKeys(unittest.TestCase):
+    def test_layout_differences_share_a_key(self):
+        variants = [
+            RESUME,
+            RESUME.replace("\n", "\r\n"),
+            "  " + RESUME.replace(" ", "\u00a0") + "\n\n\n",
+            RESUME.replace("Java", "Ｊava"),  # Fullwidth J (NFKC)
+        ]
+        self.assertEqual(len({cache_key("match", v, JD) for v in variants}), 1)
+        self.assertEqual(canonicalize(variants[2]), RESUME)
+        # Runs of blank lines collapse to one
+        self.assertEqual(canonicalize("a\n\n\n\nb"), canonicalize("a\n\nb"))
+
+    def test_components_are_not_concatenated(self):
+        self.assertNotEqual(cache_key("match", "ab", "c"), cache_key("match", "a", "bc"))
+        self.assertNotEqual(cache_key("match", RESUME, JD), cache_key("analyze", RESUME, JD))
+        self.assertNotEqual(cache_key("analyze", RESUME, None), cache_key("analyze", RESUME))
+
+    def test_weights_include_every_dimension(self):
+        base = {"skills": 30, "experience": 30, "education": 20, "soft_skills": 20}
+        changed = {**base, "soft_skills": 10, "education": 30}
+        self.assertNotEqual(weights_component(base), weights_component(changed))
+        self.assertEqual(weights_component(base), weights_component(dict(reversed(list(base.items())))))
+
+    def test_component_digests_are_memoized(self):
+        jd = JD + " (memo test)"
+        text_digest(jd)
+        hits = text_digest.cache_info().hits
+        for i in range(10):
+            cache_key("match", f"resume {i}", jd)
+        self.assertGreaterEqual(text_digest.cache_info().hits - hits, 10)
+
+
+class TestEngineCacheKeys(unittest.TestCase):
+    def make_engine(self):
+        return make_engine(FakeProvider('{"score": 81, "status": "Suitable"}'))
+
+    def test_reparsed_resume_hits_cache(self):
+        engine = self.make_engine()
+
+        engine.evaluate_match(RESUME, JD)
+        engine.evaluate_match(RESUME.replace("\n", "\r\n") + "\n", JD)
+
+        self.assertEqual(engine._llm_provider.calls, 1)
+
+    def test_soft_skills_weight_changes_key(self):
+        engine = self.make_engine()
+        weights = {"skills": 30, "experience": 30, "education": 20, "soft_skills": 20}
+
+        engine.evaluate_match(RESUME, JD, weights=weights)
+        engine.evaluate_match(RESUME, JD, weights={**weights, "soft_skills": 40, "skills": 10})
+
+        self.assertEqual(engine._llm_provider.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import time
+import unittest
+
+from src.core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from src.core.deadline import deadline_scope
+from src.core.exceptions import AnalysisError, DeadlineExceededError, LLMAPIError, LLMRateLimitError
+from tests.helpers import FakeProvider, make_engine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedProvider(FakeProvider):
+    """Fake provider that either fails or answers with fixed content."""
+
+    def __init__(self, fail: bool = False, content: str = "Score: 70"):
+        super().__init__(content=content)
+        self.fail = fail
+
+    def answer(self, messages, **kwargs):
+        if self.fail:
+            raise LLMAPIError("upstream 503", status_code=503)
+        return self.content
+
+    def health_check(self):
+        return not self.fail
+
+
+def make_breaker(clock, **overrides):
+    values = dict(window_size=4, min_calls=4, failure_rate_threshold=0.5, open_seconds=10)
+    values.update(overrides)
+    return CircuitBreaker("p", CircuitBreakerConfig(**values), clock=clock)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_on_failure_rate_and_rejects(self):
+        breaker = make_breaker(FakeClock())
+        breaker.record_success(10)
+        breaker.record_success(10)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)  # Below min_calls
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(breaker.stats()["rejected"], 1)
+
+    def test_opens_on_slow_calls(self):
+        breaker = make_breaker(FakeClock(), slow_call_ms=1000, slow_call_rate_threshold=0.75)
+        for latency in (1500, 1500, 1500, 10):
+            breaker.record_success(latency)
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+    def test_half_open_probe_closes_or_reopens(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, min_calls=1, window_size=1)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertAlmostEqual(breaker.retry_in(), 10)
+
+        clock.now = 10
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())  # One probe at a time
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        clock.now = 20
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success(5)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_release_returns_probe_slot(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, min_calls=1, window_size=1)
+        breaker.record_failure()
+        clock.now = 10
+
+        self.assertTrue(breaker.allow_request())
+        breaker.release()
+        self.assertTrue(breaker.allow_request())
+
+
+class TestEngineFailover(unittest.TestCase):
+    def make_engine(self, primary, backup):
+        engine = make_engine(primary)
+        config = engine._config
+        current = engine._current_provider
+        other = next(name for name in ("openai", "anthropic", "deepseek") if name != current)
+
+        config.llm_providers[current].max_retries = 1
+        config.llm_providers[current].circuit_breaker = {"min_calls": 2, "window_size": 2, "open_seconds": 60}
+        config.llm_providers[other].enabled = True
+        config.llm_failover = [other]
+
+        engine._providers[other] = backup
+        return engine, current, other
+
+    def test_failover_and_skip_open_circuit(self):
+        primary = ScriptedProvider(fail=True)
+        backup = ScriptedProvider(content="Score: 88")
+        engine, current, other = self.make_engine(primary, backup)
+
+        for i in range(4):
+            result = engine.analyze(f"resume {i}", "jd", use_cache=False)
+            self.assertEqual(result.score, 88)
+            self.assertEqual(result.metadata["provider"], other)
+
+        # The circuit opened after two failures; later calls skip the primary
+        self.assertEqual(primary.calls, 2)
+        self.assertEqual(engine.health_check()["circuit_breakers"][current]["state"], "open")
+        self.assertEqual(engine.get_metrics()["circuit.rejected"], 2)
+
+    def test_open_circuit_without_failover_fails_fast(self):
+        primary = ScriptedProvider(fail=True)
+        engine, current, _ = self.make_engine(primary, ScriptedProvider())
+        engine._config.llm_failover = []
+
+        for i in range(3):
+            with self.assertRaises(AnalysisError):
+                engine.analyze(f"resume {i}", "jd", use_cache=False)
+        self.assertEqual(primary.calls, 2)
+
+    def test_rate_limits_do_not_trip_the_circuit(self):
+        engine, current, _ = self.make_engine(ScriptedProvider(), ScriptedProvider())
+        breaker = engine._circuit_breaker(current)
+        for _ in range(4):
+            engine._record_circuit_failure(breaker, LLMRateLimitError("slow down"))
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_deadline_failures_do_not_trip_the_circuit(self):
+        engine, current, _ = self.make_engine(ScriptedProvider(), ScriptedProvider())
+        breaker = engine._circuit_breaker(current)
+        for _ in range(4):
+            engine._record_circuit_failure(breaker, DeadlineExceededError("late", stage="llm"))
+        # A timeout caused by a spent client budget is ours, not the provider's
+        with deadline_scope(0.001):
+            time.sleep(0.01)
+            for _ in range(4):
+                engine._record_circuit_failure(breaker, LLMAPIError("Request timed out"))
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
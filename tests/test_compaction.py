@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.core.compaction import CompactionConfig, compact_text, dedupe_lines, normalize_text, truncate_to_budget
+from src.core.tokens import estimate_tokens
+from src.interfaces.illm_provider import LLMResponse
+from tests.helpers import make_engine
+
+
+class TestCompaction(unittest.TestCase):
+    def test_normalize_collapses_whitespace_and_width(self):
+        self.assertEqual(normalize_text("Ｐｙｔｈｏｎ\t\t3​  dev \r\n  next"), "Python 3 dev\nnext")
+
+    def test_dedupe_drops_repeats_and_page_markers(self):
+        lines = [
+            "ACME Corp - Confidential", "Experience", "", "", "Built things",
+            "Page 1 of 2", "ACME Corp - Confidential", "第2页", "- 2 -", "Python", "Python", ""
+        ]
+        self.assertEqual(
+            dedupe_lines(lines),
+            ["ACME Corp - Confidential", "Experience", "", "Built things", "Python", "Python"]
+        )
+
+    def test_dates_and_short_bullets_survive(self):
+        lines = [
+            "Team lead", "2019 / 2021", "Built the payments platform",
+            "Team lead", "03/2020", "1/2", "Migrated billing to Kafka"
+        ]
+        self.assertEqual(dedupe_lines(lines), lines)
+
+    def test_bare_page_counters_and_footers(self):
+        lines = [
+            "Zhang Wei", "Experience", "Confidential", "1/2",
+            "Zhang Wei", "Education", "Confidential", "2/2"
+        ]
+        self.assertEqual(dedupe_lines(lines), ["Zhang Wei", "Experience", "Confidential", "Education"])
+
+    def test_truncate_keeps_head_and_tail(self):
+        text = "\n".join(f"line {i:03d} of the resume body" for i in range(300))
+        truncated, cut = truncate_to_budget(text, 200)
+
+        self.assertTrue(cut)
+        self.assertTrue(truncated.startswith("line 000"))
+        self.assertTrue(truncated.endswith("line 299 of the resume body"))
+        self.assertIn("lines omitted", truncated)
+        self.assertLessEqual(estimate_tokens(truncated), 220)
+
+    def test_truncate_single_long_line(self):
+        truncated, cut = truncate_to_budget("a" * 4000 + "END", 100)
+        self.assertTrue(cut)
+        self.assertTrue(truncated.endswith("END"))
+        self.assertLess(len(truncated), 500)
+
+    def test_compact_reports_savings(self):
+        text = "".join(f"Header line repeated\n\n\n   Some   content   here\n- {page} -\n" for page in range(1, 21))
+        result = compact_text(text, config=CompactionConfig())
+        self.assertEqual(result.text, "Header line repeated\n\nSome content here")
+        self.assertGreater(result.tokens_saved, 0)
+        self.assertFalse(result.truncated)
+
+
+class TestEngineCompaction(unittest.TestCase):
+    def make_engine(self):
+        provider = MagicMock()
+        provider.chat.return_value = LLMResponse(content="Score: 70", model="m", tokens_used=100, latency_ms=1)
+        return make_engine(provider)
+
+    def test_prompt_uses_compacted_resume(self):
+        engine = self.make_engine()
+        resume = "Page 1\nJane    Doe\nJane    Doe\n\n\n\nSkills: Python\n" * 3
+
+        result = engine.analyze(resume, "jd text", use_cache=False)
+
+        prompt = engine._llm_provider.chat.call_args.kwargs["messages"][-1]["content"]
+        self.assertIn("Jane Doe\n\nSkills: Python", prompt)
+        self.assertEqual(prompt.count("Jane Doe"), 1)
+        self.assertGreater(result.metadata["input_tokens_saved"], 0)
+        self.assertEqual(engine.get_metrics()["compaction.tokens_saved"], result.metadata["input_tokens_saved"])
+
+    def test_budget_is_capped_by_context_window(self):
+        engine = self.make_engine()
+        model = engine._config.get_model_config(engine._current_provider)
+        model.context_window = model.max_tokens + 1000
+
+        self.assertEqual(engine._input_budget("resume"), 800)
+        self.assertEqual(engine._input_budget("unknown"), 800)
+
+    def test_disabled_compaction_passes_text_through(self):
+        engine = self.make_engine()
+        engine._compaction.enabled = False
+        self.assertEqual(engine._compact_input("a    b", "resume"), ("a    b", 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
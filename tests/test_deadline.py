@@ -0,0 +1,143 @@
+import asyncio
+import time
+import unittest
+
+from src.core.batch import BatchExecutor
+from src.core.deadline import clamp_timeout, deadline_scope, remaining, within_deadline
+from src.core.exceptions import DeadlineExceededError, LLMAPIError
+from src.core.hedging import Hedger, HedgingPolicy
+from src.core.metrics import MetricsRegistry
+from src.core.rate_limiter import RateLimiter
+from src.interfaces.illm_provider import LLMResponse
+from tests.helpers import FakeProvider, make_retrying_engine
+
+
+class TestDeadlineScope(unittest.TestCase):
+    def test_nested_scopes_only_shorten(self):
+        self.assertIsNone(remaining())
+        with deadline_scope(10):
+            self.assertLessEqual(remaining(), 10)
+            with deadline_scope(60):
+                self.assertLessEqual(remaining(), 10)
+            with deadline_scope(1):
+                self.assertLessEqual(remaining(), 1)
+            with deadline_scope(0):
+                self.assertGreater(remaining(), 1)
+        self.assertIsNone(remaining())
+
+    def test_clamp_timeout(self):
+        self.assertEqual(clamp_timeout(60), 60)
+        with deadline_scope(5):
+            self.assertLessEqual(clamp_timeout(60), 5)
+            self.assertEqual(clamp_timeout(2), 2)
+        with deadline_scope(0.001):
+            time.sleep(0.01)
+            with self.assertRaises(DeadlineExceededError) as ctx:
+                clamp_timeout(60)
+            self.assertEqual(ctx.exception.stage, "llm")
+
+    def test_within_deadline(self):
+        async def run():
+            with deadline_scope(0.05):
+                await within_deadline(asyncio.sleep(1), "parse_resume")
+
+        with self.assertRaises(DeadlineExceededError) as ctx:
+            asyncio.run(run())
+        self.assertEqual(ctx.exception.stage, "parse_resume")
+
+    def test_context_reaches_worker_threads(self):
+        with deadline_scope(30):
+            results = BatchExecutor(max_concurrency=2).run([1, 2], lambda _: remaining())
+            hedged = Hedger(HedgingPolicy(enabled=True), MetricsRegistry()).call(
+                "k",
+                lambda: LLMResponse(content=str(remaining()), model="fake-model", tokens_used=1, latency_ms=1),
+                lambda: None
+            )
+        self.assertTrue(all(0 < r.value <= 30 for r in results))
+        self.assertTrue(0 < float(hedged.content) <= 30)
+
+
+class SlowStreamProvider(FakeProvider):
+    """Streams a chunk every 20ms."""
+
+    def chat_stream(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        for _ in range(50):
+            time.sleep(0.02)
+            yield "Score"
+
+    async def achat_stream(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            yield "Score"
+
+
+class TestEngineDeadline(unittest.TestCase):
+    def test_expired_deadline_stops_before_provider(self):
+        provider = FakeProvider()
+        engine = make_retrying_engine(provider, max_retries=5)
+
+        with deadline_scope(0.001):
+            time.sleep(0.01)
+            with self.assertRaises(DeadlineExceededError):
+                engine.analyze("resume", "jd", use_cache=False)
+        self.assertEqual(provider.calls, 0)
+
+    def test_retry_backoff_past_deadline_gives_up(self):
+        provider = FakeProvider(errors=[LLMAPIError("503", status_code=503)] * 5)
+        engine = make_retrying_engine(provider, max_retries=5, base_delay=5, max_delay=5)
+
+        with deadline_scope(1):
+            with self.assertRaises(DeadlineExceededError) as ctx:
+                engine.analyze("resume", "jd", use_cache=False)
+        self.assertEqual(ctx.exception.stage, "llm_retry")
+        self.assertEqual(provider.calls, 1)
+
+    def test_async_expired_deadline(self):
+        provider = FakeProvider()
+        engine = make_retrying_engine(provider, max_retries=5)
+
+        async def run():
+            with deadline_scope(0.001):
+                await asyncio.sleep(0.01)
+                await engine.aanalyze("resume", "jd", use_cache=False)
+
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(run())
+        self.assertEqual(provider.calls, 0)
+
+    def test_rate_limit_wait_past_deadline_fails_fast(self):
+        provider = FakeProvider()
+        engine = make_retrying_engine(provider, max_retries=3)
+        limiter = RateLimiter(requests_per_minute=1)
+        limiter.reserve()  # Next request in 60s
+        engine._rate_limiter = lambda provider_name=None: limiter
+
+        start = time.time()
+        with deadline_scope(1):
+            with self.assertRaises(DeadlineExceededError):
+                engine.analyze("resume", "jd", use_cache=False)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(provider.calls, 0)
+
+    def test_streams_stop_at_deadline(self):
+        engine = make_retrying_engine(SlowStreamProvider(), max_retries=1)
+
+        with deadline_scope(0.1):
+            with self.assertRaises(DeadlineExceededError):
+                list(engine.analyze_resume_stream("resume", "jd", use_cache=False))
+        with deadline_scope(0.1):
+            with self.assertRaises(DeadlineExceededError):
+                list(engine.evaluate_match_stream("resume", "jd", use_cache=False))
+
+        async def run(stream):
+            with deadline_scope(0.1):
+                return [chunk async for chunk in stream()]
+
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(run(lambda: engine.aanalyze_resume_stream("resume", "jd", use_cache=False)))
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(run(lambda: engine.aevaluate_match_stream("resume", "jd", use_cache=False)))
+
+
+if __name__ == '__main__':
+    unittest.main()
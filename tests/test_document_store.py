@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.document_store import DocumentStore, document_id
+from src.core.exceptions import UnsupportedFormatError
+from src.interfaces.idocument_parser import ParsedDocument
+from src.plugins.document_parsers.text_parser import TextParser
+from tests.helpers import make_engine
+
+RESUME = (Path(__file__).parent / "fixtures" / "resumes" / "Resume_Senior_Java_Backend_Engineer.txt").read_bytes()
+
+
+class TestDocumentStore(unittest.TestCase):
+    def test_persisted_by_content_address(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            doc_id = document_id(RESUME)
+            parsed = ParsedDocument(content="Zhang Wei", file_path="/tmp/x.pdf", file_type="pdf", metadata={"pages": 2})
+            DocumentStore(tmp).put(doc_id, parsed, "resume.pdf", len(RESUME))
+
+            document = DocumentStore(tmp).get(doc_id)
+            self.assertEqual(len(doc_id), 64)
+            self.assertEqual(document.metadata, {"pages": 2})
+            self.assertEqual(document.to_parsed().file_path, "resume.pdf")
+            self.assertEqual(document.summary()["chars"], len("Zhang Wei"))
+            self.assertTrue(DocumentStore(tmp).delete(doc_id))
+            self.assertIsNone(DocumentStore(tmp).get(doc_id))
+
+
+class TestEngineDocumentStore(unittest.TestCase):
+    def test_reupload_skips_parsing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(cache_dir=tmp)
+            with patch.object(TextParser, "parse", autospec=True, side_effect=TextParser.parse) as parse:
+                first = engine.store_document(RESUME, "resume.txt")
+                # Same bytes under another name, and after a restart
+                second = engine.store_document(RESUME, "copy.txt")
+                third = make_engine(cache_dir=tmp).store_document(RESUME, "resume.txt")
+
+            self.assertEqual(parse.call_count, 1)
+            self.assertEqual(first.doc_id, document_id(RESUME))
+            self.assertEqual(second.doc_id, first.doc_id)
+            self.assertEqual(third.content, first.content)
+            self.assertEqual(second.filename, "resume.txt")
+            self.assertIn("Zhang Wei", first.content)
+            metrics = engine.get_metrics()
+            self.assertEqual(metrics["documents.parsed"], 1)
+            self.assertEqual(metrics["documents.reused"], 1)
+
+    def test_changed_bytes_are_parsed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(cache_dir=tmp)
+            first = engine.store_document(RESUME, "resume.txt")
+            second = engine.store_document(RESUME + b"\n", "resume.txt")
+
+            self.assertNotEqual(first.doc_id, second.doc_id)
+            self.assertEqual(engine.get_document(second.doc_id).doc_id, second.doc_id)
+
+    def test_unsupported_format(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(cache_dir=tmp)
+            with self.assertRaises(UnsupportedFormatError):
+                engine.store_document(b"binary", "resume.exe")
+            self.assertIsNone(engine.get_document(document_id(b"binary")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.fingerprint import HAS_FCNTL, FingerprintIndex, simhash, similarity
+from src.plugins.storage.memory_cache import MemoryCache
+from tests.helpers import FakeProvider, make_engine
+
+FIXTURES = Path(__file__).parent / "fixtures" / "resumes"
+JD = "Senior Java engineer with Spring Boot and Kafka"
+RESUME = (FIXTURES / "Resume_Senior_Java_Backend_Engineer.txt").read_text(encoding="utf-8")
+OTHER = (FIXTURES / "Resume_Frontend_Developer_(React-Vue).txt").read_text(encoding="utf-8")
+# Same resume, new phone number and email
+EDITED = RESUME.replace("+86 138 0000 0000", "+86 139 1234 5678").replace("zhangwei.fake@", "zw.new@")
+REPLY = '{"score": 80, "status": "Suitable", "reason": "Score: 80"}'
+
+
+def add_entries(path: str, scope: str):
+    """Worker process: add 150 entries to its own scope."""
+    index = FingerprintIndex(path, max_entries=20)
+    for i in range(150):
+        index.add(scope, i, f"key{i}")
+
+
+class TestSimHash(unittest.TestCase):
+    def test_similar_and_different_inputs(self):
+        self.assertEqual(simhash(RESUME), simhash(EDITED))
+        self.assertGreater(similarity(simhash(RESUME), simhash(RESUME + "\nAlso: Go, Rust")), 0.9)
+        self.assertLess(similarity(simhash(RESUME), simhash(OTHER)), 0.8)
+
+    def test_stable_across_processes(self):
+        # Fingerprints are persisted, so they must not depend on hash() salting
+        code = "from src.core.fingerprint import simhash; print(simhash('Java Spring Boot Kafka'))"
+        root = str(Path(__file__).parent.parent)
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+            env={**os.environ, "PYTHONHASHSEED": "123"}
+        ).stdout
+        self.assertEqual(int(output), simhash("java  spring boot kafka"))
+
+
+class TestFingerprintIndex(unittest.TestCase):
+    def test_find_and_persist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fingerprints.jsonl")
+            index = FingerprintIndex(path)
+            index.add("jd1", simhash(RESUME), "key1")
+            index.add("jd1", simhash(OTHER), "key2")
+
+            self.assertEqual(index.find("jd1", simhash(EDITED), 0.95), [(1.0, "key1")])
+            self.assertEqual(index.find("jd2", simhash(EDITED), 0.95), [])
+
+            reloaded = FingerprintIndex(path)
+            self.assertEqual(len(reloaded), 2)
+            self.assertEqual(reloaded.find("jd1", simhash(RESUME), 0.95), [(1.0, "key1")])
+
+    def test_max_entries_per_scope(self):
+        index = FingerprintIndex(max_entries=1)
+        index.add("jd", simhash(RESUME), "key1")
+        index.add("jd", simhash(OTHER), "key2")
+        self.assertEqual(index.find("jd", simhash(RESUME), 0.95), [])
+
+    def test_file_stays_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fingerprints.jsonl")
+            index = FingerprintIndex(path, max_entries=5)
+            for i in range(50):
+                index.add("jd", i, f"key{i}")
+            index.discard("jd", "key49")
+            with open(path, encoding="utf-8") as f:
+                self.assertLessEqual(len(f.readlines()), 10)
+
+            reloaded = FingerprintIndex(path, max_entries=5)
+            self.assertEqual(len(reloaded), 4)
+            self.assertEqual(reloaded.find("jd", 49, 1.0), [])
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 4)
+
+    def test_other_processes_see_new_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fingerprints.jsonl")
+            worker_a, worker_b = FingerprintIndex(path), FingerprintIndex(path)
+            worker_a.add("jd", simhash(RESUME), "key1")
+            self.assertEqual(worker_b.find("jd", simhash(EDITED), 0.95), [(1.0, "key1")])
+            worker_a.discard("jd", "key1")
+            self.assertEqual(worker_b.find("jd", simhash(EDITED), 0.95), [])
+
+    @unittest.skipUnless(HAS_FCNTL, "needs fcntl")
+    def test_concurrent_workers_keep_each_others_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fingerprints.jsonl")
+            context = multiprocessing.get_context("fork")
+            workers = [context.Process(target=add_entries, args=(path, f"w{n}")) for n in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(timeout=60)
+                self.assertEqual(worker.exitcode, 0)
+
+            index = FingerprintIndex(path, max_entries=20)
+            for n in range(4):
+                self.assertEqual(index.find(f"w{n}", 149, 1.0), [(1.0, "key149")])
+                self.assertEqual(len(index.find(f"w{n}", 140, 0.0)), 20)
+
+
+class TestEngineNearDuplicate(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_match_reuses_near_duplicate(self):
+        provider = FakeProvider(REPLY)
+        engine = make_engine(provider, self._tmp.name, near_duplicate={"enabled": True})
+
+        first = engine.evaluate_match(RESUME, JD)
+        second = engine.evaluate_match(EDITED, JD)
+
+        self.assertEqual(provider.calls, 1)
+        self.assertNotIn("near_duplicate", first["_metadata"])
+        self.assertEqual(second["score"], 80)
+        self.assertEqual(second["_metadata"]["near_duplicate"]["similarity"], 1.0)
+        self.assertEqual(engine.get_metrics()["near_duplicate.hits"], 1)
+
+    def test_scope_includes_jd_and_weights(self):
+        provider = FakeProvider(REPLY)
+        engine = make_engine(provider, self._tmp.name, near_duplicate={"enabled": True})
+
+        engine.evaluate_match(RESUME, JD)
+        engine.evaluate_match(EDITED, JD + " and Redis")
+        engine.evaluate_match(EDITED, JD, weights={"skills": 70, "experience": 10, "education": 10, "soft_skills": 10})
+        engine.evaluate_match(OTHER, JD)
+
+        self.assertEqual(provider.calls, 4)
+
+    def test_analyze_result_is_flagged(self):
+        provider = FakeProvider(REPLY)
+        engine = make_engine(provider, self._tmp.name, near_duplicate={"enabled": True})
+
+        engine.analyze(RESUME, JD)
+        result = engine.analyze(EDITED, JD)
+
+        self.assertTrue(result.cached)
+        self.assertIn("near_duplicate", result.metadata)
+        self.assertEqual(provider.calls, 1)
+
+    def test_index_survives_restart(self):
+        provider = FakeProvider(REPLY)
+        storage = MemoryCache()
+        engine = make_engine(provider, self._tmp.name, near_duplicate={"enabled": True})
+        engine._storage = storage
+        engine.evaluate_match(RESUME, JD)
+
+        restarted = make_engine(provider, self._tmp.name, near_duplicate={"enabled": True})
+        restarted._storage = storage
+        restarted.evaluate_match(EDITED, JD)
+
+        self.assertEqual(provider.calls, 1)
+
+    def test_edited_contacts_are_extracted_again(self):
+        provider = FakeProvider(REPLY)
+        engine = make_engine(provider, self._tmp.name, near_duplicate={"enabled": True})
+
+        engine.extract_resume_fields(RESUME)
+        edited = engine.extract_resume_fields(EDITED)
+
+        self.assertEqual(provider.calls, 2)
+        self.assertNotIn("near_duplicate", edited.get("_metadata", {}))
+
+    def test_expired_entries_are_dropped(self):
+        engine = make_engine(FakeProvider(REPLY), self._tmp.name, near_duplicate={"enabled": True})
+        engine.evaluate_match(RESUME, JD)
+        engine._storage.clear()
+
+        engine.evaluate_match(EDITED, JD)
+        self.assertEqual(len(engine._fingerprints), 1)  # Only EDITED's own entry
+
+    def test_disabled(self):
+        provider = FakeProvider(REPLY)
+        engine = make_engine(provider, self._tmp.name, near_duplicate={"enabled": False})
+
+        engine.evaluate_match(RESUME, JD)
+        engine.evaluate_match(EDITED, JD)
+
+        self.assertEqual(provider.calls, 2)
+        self.assertFalse(os.path.exists(os.path.join(self._tmp.name, "fingerprints.jsonl")))
+
+
+if __name__ == '__main__':
+    unittest.main()
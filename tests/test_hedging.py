@@ -0,0 +1,190 @@
+import asyncio
+import time
+import unittest
+
+from src.core.config import ConfigManager
+from src.core.hedging import Hedger, HedgingPolicy, LatencyTracker
+from src.core.metrics import MetricsRegistry
+from src.interfaces.illm_provider import LLMResponse
+from tests.helpers import FakeProvider, make_engine
+
+
+class DelayProvider(FakeProvider):
+    """Fake provider answering after a fixed delay."""
+
+    def __init__(self, delay: float, content: str = "Score: 70"):
+        super().__init__(content=content)
+        self.delay = delay
+        self.cancelled = False
+
+    def chat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        time.sleep(self.delay)
+        return self.respond(messages)
+
+    async def achat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.respond(messages)
+
+
+def fast_policy(**overrides):
+    values = dict(enabled=True, initial_delay_ms=50, min_delay_ms=50, max_delay_ms=1000, min_samples=3)
+    values.update(overrides)
+    return HedgingPolicy(**values)
+
+
+def response(latency_ms=0, tokens=10):
+    return LLMResponse(content="ok", model="m", tokens_used=tokens, latency_ms=latency_ms)
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_percentile(self):
+        tracker = LatencyTracker()
+        for latency in range(1, 11):
+            tracker.record("match", latency * 100)
+
+        self.assertEqual(tracker.percentile("match", 0.9), 900)
+        self.assertEqual(tracker.percentile("match", 0.0), 100)
+        self.assertIsNone(tracker.percentile("analyze", 0.9))
+
+    def test_delay_uses_observed_percentile_once_warm(self):
+        hedger = Hedger(fast_policy(min_delay_ms=10), MetricsRegistry())
+        self.assertAlmostEqual(hedger.delay_for("match"), 0.05)
+
+        for _ in range(3):
+            hedger.call("match", lambda: response(latency_ms=300), lambda: response())
+        self.assertAlmostEqual(hedger.delay_for("match"), 0.3)
+
+
+class TestHedger(unittest.TestCase):
+    def test_fast_primary_is_not_hedged(self):
+        metrics = MetricsRegistry()
+        hedger = Hedger(fast_policy(), metrics)
+        secondary_calls = []
+
+        result = hedger.call("k", lambda: response(), lambda: secondary_calls.append(1))
+
+        self.assertEqual(result.content, "ok")
+        self.assertEqual(secondary_calls, [])
+        self.assertEqual(metrics.get("hedge.requests"), 1)
+        self.assertEqual(metrics.get("hedge.fired"), 0)
+
+    def test_slow_primary_loses_to_secondary(self):
+        metrics = MetricsRegistry()
+        hedger = Hedger(fast_policy(), metrics)
+
+        def slow():
+            time.sleep(0.3)
+            return LLMResponse(content="primary", model="m", tokens_used=40, latency_ms=300)
+
+        def fast():
+            return LLMResponse(content="secondary", model="m", tokens_used=10, latency_ms=1)
+
+        start = time.time()
+        result = hedger.call("k", slow, fast)
+        self.assertLess(time.time() - start, 0.25)
+        self.assertEqual(result.content, "secondary")
+
+        time.sleep(0.4)  # Let the losing primary finish and be charged
+        self.assertEqual(metrics.get("hedge.fired"), 1)
+        self.assertEqual(metrics.get("hedge.secondary_wins"), 1)
+        self.assertEqual(metrics.get("hedge.extra_tokens"), 40)
+
+    def test_failed_leg_falls_back_to_other(self):
+        hedger = Hedger(fast_policy(), MetricsRegistry())
+
+        def slow():
+            time.sleep(0.15)
+            return response()
+
+        def broken():
+            raise RuntimeError("down")
+
+        self.assertEqual(hedger.call("k", slow, broken).content, "ok")
+
+    def test_async_loser_is_cancelled(self):
+        metrics = MetricsRegistry()
+        hedger = Hedger(fast_policy(), metrics)
+        primary = DelayProvider(delay=1.0, content="primary")
+        secondary = DelayProvider(delay=0, content="secondary")
+
+        async def run():
+            result = await hedger.acall(
+                "k",
+                lambda: primary.achat([]),
+                lambda: secondary.achat([]),
+                estimated_tokens=25
+            )
+            await asyncio.sleep(0)  # Let the cancellation be delivered
+            return result
+
+        result = asyncio.run(run())
+        self.assertEqual(result.content, "secondary")
+        self.assertTrue(primary.cancelled)
+        self.assertEqual(metrics.get("hedge.extra_tokens"), 25)
+
+    def test_losing_primaries_keep_the_delay_up(self):
+        hedger = Hedger(fast_policy(min_delay_ms=10, percentile=0.5), MetricsRegistry())
+        slow = DelayProvider(delay=1.0, content="primary")
+
+        async def fast_primary():
+            return response(latency_ms=10)
+
+        async def instant_secondary():
+            return response()
+
+        async def run():
+            for _ in range(3):
+                await hedger.acall("k", lambda: asyncio.sleep(0, response(latency_ms=100)), instant_secondary)
+            for _ in range(10):
+                await hedger.acall("k", fast_primary, instant_secondary)
+                await hedger.acall("k", lambda: slow.achat([]), instant_secondary)
+                await asyncio.sleep(0)
+
+        asyncio.run(run())
+        self.assertGreaterEqual(hedger.delay_for("k"), 0.09)
+
+
+class TestEngineHedging(unittest.TestCase):
+    def make_engine(self, primary, secondary):
+        current = make_engine()._current_provider
+        other = next(name for name in ("openai", "anthropic", "deepseek") if name != current)
+        engine = make_engine(primary, hedging={
+            "enabled": True, "secondary_provider": other,
+            "initial_delay_ms": 50, "min_delay_ms": 50
+        })
+        engine._config.llm_providers[other].enabled = True
+        engine._providers[other] = secondary
+        return engine, other
+
+    def test_engine_returns_secondary_result(self):
+        primary = DelayProvider(delay=0.5, content="Score: 10")
+        secondary = DelayProvider(delay=0, content="Score: 90")
+        engine, other = self.make_engine(primary, secondary)
+
+        result = engine.analyze("resume", "jd", use_cache=False)
+
+        self.assertEqual(result.score, 90)
+        self.assertEqual(result.metadata["provider"], other)
+        metrics = engine.get_metrics()
+        self.assertEqual(metrics["hedge.fired"], 1)
+        self.assertEqual(metrics["hedge.rate"], 1.0)
+
+    def test_config_changes_do_not_leak_into_defaults(self):
+        ConfigManager().config.analysis["hedging"]["enabled"] = True
+        self.assertFalse(ConfigManager().config.analysis["hedging"]["enabled"])
+
+    def test_engine_async_hedge(self):
+        primary = DelayProvider(delay=1.0, content="Score: 10")
+        secondary = DelayProvider(delay=0, content="Score: 90")
+        engine, _ = self.make_engine(primary, secondary)
+
+        result = asyncio.run(engine.aanalyze("resume", "jd", use_cache=False))
+        self.assertEqual(result.score, 90)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.exceptions import AnalysisError
+from src.core.jd_registry import JDRegistry, extract_requirements
+from tests.helpers import FakeProvider, make_engine
+
+JD = (Path(__file__).parent / "fixtures" / "jds" / "jd_java_expert.txt").read_text(encoding="utf-8")
+
+
+class TestExtractRequirements(unittest.TestCase):
+    def test_chinese_jd(self):
+        requirements = extract_requirements(JD)
+        self.assertEqual(len(requirements), 6)
+        self.assertTrue(requirements[0].startswith("统招本科及以上学历"))
+
+    def test_english_headings(self):
+        jd = "Backend Engineer\n## Responsibilities\n- Build APIs\n## Requirements\n- 5+ years Java\n- Kafka\nBenefits:\n- Remote"
+        self.assertEqual(extract_requirements(jd), ["5+ years Java", "Kafka"])
+
+
+class TestJDRegistry(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_content_addressed(self):
+        registry = JDRegistry(self._tmp.name)
+        record = registry.register(JD, "jd.txt")
+
+        self.assertEqual(registry.register(JD.replace("\n", "\r\n") + "\n\n").jd_id, record.jd_id)
+        self.assertNotEqual(registry.register(JD + "\n有金融行业经验者优先").jd_id, record.jd_id)
+        self.assertEqual(record.source, "jd.txt")
+        self.assertTrue(record.title.startswith("职位名称"))
+
+    def test_persisted_with_artifacts(self):
+        registry = JDRegistry(self._tmp.name)
+        record = registry.register(JD)
+        registry.set_artifact(record.jd_id, "optimized", {"report": "better JD"})
+
+        reloaded = JDRegistry(self._tmp.name)
+        self.assertEqual(reloaded.get(record.jd_id).artifacts["optimized"], {"report": "better JD"})
+        self.assertEqual([r.jd_id for r in reloaded.list_records()], [record.jd_id])
+        self.assertTrue(reloaded.delete(record.jd_id))
+        self.assertIsNone(JDRegistry(self._tmp.name).get(record.jd_id))
+
+    def test_changes_by_other_workers_are_seen(self):
+        worker_a, worker_b = JDRegistry(self._tmp.name), JDRegistry(self._tmp.name)
+        jd_id = worker_a.register(JD).jd_id
+        self.assertIsNotNone(worker_b.get(jd_id))
+
+        worker_a.delete(jd_id)
+        self.assertIsNone(worker_b.get(jd_id))
+
+        worker_a.register(JD)
+        worker_a.set_artifact(jd_id, "optimized", {"report": "better JD"})
+        self.assertEqual(worker_b.get(jd_id).artifacts["optimized"], {"report": "better JD"})
+        self.assertEqual(list(Path(self._tmp.name).glob("*.tmp")), [])
+
+
+class TestEngineJDRegistry(unittest.TestCase):
+    def make_engine(self, cache_dir):
+        return make_engine(FakeProvider("## JD Diagnostic\nClarity Score: 65"), cache_dir)
+
+    def test_optimized_jd_kept_per_jd_id(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = self.make_engine(tmp)
+            jd_id = engine.register_jd(JD).jd_id
+
+            first = engine.optimize_registered_jd(jd_id)
+            # A new engine (empty result cache) still has the artifact
+            restarted = self.make_engine(tmp)
+            second = restarted.optimize_registered_jd(jd_id)
+
+            self.assertFalse(first.cached)
+            self.assertTrue(second.cached)
+            self.assertEqual(second.report, first.report)
+            self.assertEqual(second.metadata["jd_id"], jd_id)
+            self.assertEqual(engine._llm_provider.calls, 1)
+            self.assertEqual(restarted._llm_provider.calls, 0)
+
+    def test_unknown_jd(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(AnalysisError):
+                self.make_engine(tmp).optimize_registered_jd("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import unittest
+
+from src.core.json_stream import JsonStreamParser, iter_events
+from tests.helpers import FakeProvider, make_engine
+
+JD = "Senior Java engineer with Spring Boot and Kafka"
+MATCH = {
+    "score": 85,
+    "status": "Suitable",
+    "dimensions": {
+        "skills": {"score": 90, "comment": "熟悉 Spring \"Boot\""},
+        "experience": {"score": 80, "comment": "5年"}
+    },
+    "strengths": ["Java", "Kafka"],
+    "recommendation": "Hire"
+}
+ANSWER = "```json\n" + json.dumps(MATCH, ensure_ascii=False, indent=2) + "\n```"
+
+
+def chunked(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class StreamingProvider(FakeProvider):
+    def __init__(self, answer=ANSWER):
+        super().__init__(content=answer)
+        self.streams = 0
+
+    def chat(self, messages, **kwargs):
+        raise AssertionError("chat() should not be used")
+
+    def chat_stream(self, messages, **kwargs):
+        self.streams += 1
+        yield from chunked(self.content)
+
+
+class TestJsonStreamParser(unittest.TestCase):
+    def test_events_in_generation_order(self):
+        parser = JsonStreamParser()
+        events = []
+        for chunk in chunked(ANSWER):
+            events.extend(parser.feed(chunk))
+
+        self.assertEqual([e.key for e in events], [
+            "score", "status", "dimensions.skills", "dimensions.experience", "dimensions",
+            "strengths.0", "strengths.1", "strengths", "recommendation"
+        ])
+        self.assertEqual(events[0].value, 85)
+        self.assertEqual(events[2].value["comment"], "熟悉 Spring \"Boot\"")
+        self.assertEqual(parser.close(), MATCH)
+
+    def test_score_emitted_before_rest_arrives(self):
+        parser = JsonStreamParser()
+        events = parser.feed('{"score": 72, "status": "Sui')
+        self.assertEqual([(e.key, e.value) for e in events], [("score", 72)])
+
+    def test_literals_split_across_chunks(self):
+        parser = JsonStreamParser(emit_depth=1)
+        events = parser.feed('{"a": tr') + parser.feed('ue, "b": -1.') + parser.feed('5e2, "c": null}')
+        self.assertEqual([(e.key, e.value) for e in events], [("a", True), ("b", -150.0), ("c", None)])
+
+    def test_incomplete_and_malformed_input(self):
+        parser = JsonStreamParser()
+        parser.feed('{"score": 1')
+        with self.assertRaises(ValueError):
+            parser.close()
+        with self.assertRaises(ValueError):
+            JsonStreamParser().feed('{"score": 1 ? }')
+
+    def test_iter_events_matches_parser(self):
+        parser = JsonStreamParser()
+        streamed = parser.feed(json.dumps(MATCH))
+        self.assertEqual(list(iter_events(MATCH)), streamed)
+
+
+class TestEvaluateMatchStream(unittest.TestCase):
+    def test_streams_fields_then_result(self):
+        engine = make_engine(StreamingProvider())
+
+        events = list(engine.evaluate_match_stream("resume", JD))
+
+        self.assertEqual(events[0], {"event": "field", "path": "score", "value": 85})
+        self.assertEqual(events[-1]["event"], "result")
+        self.assertEqual(events[-1]["value"]["dimensions"], MATCH["dimensions"])
+
+    def test_result_is_cached_and_replayed(self):
+        provider = StreamingProvider()
+        engine = make_engine(provider)
+        streamed = list(engine.evaluate_match_stream("resume", JD))
+
+        replayed = list(engine.evaluate_match_stream("resume", JD))
+
+        self.assertEqual(provider.streams, 1)
+        self.assertEqual([e.get("path") for e in replayed], [e.get("path") for e in streamed])
+        self.assertEqual(engine.evaluate_match("resume", JD)["score"], 85)
+
+    def test_invalid_json_falls_back_to_regular_parsing(self):
+        engine = make_engine(StreamingProvider(answer="Sorry, no JSON today"))
+
+        events = list(engine.evaluate_match_stream("resume", JD))
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["value"]["status"], "Error")
+
+    def test_async_stream(self):
+        engine = make_engine(StreamingProvider())
+
+        async def collect():
+            return [e async for e in engine.aevaluate_match_stream("resume", JD)]
+
+        events = asyncio.run(collect())
+        self.assertEqual(events[1], {"event": "field", "path": "status", "value": "Suitable"})
+        self.assertEqual(events[-1]["value"]["score"], 85)
+
+
+if __name__ == '__main__':
+    unittest.main()
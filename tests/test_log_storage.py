@@ -0,0 +1,125 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.exceptions import StorageError
+from src.plugins.storage import get_storage
+from src.plugins.storage.log_storage import HAS_FCNTL, LogStorage
+
+
+class TestLogStorage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name) / "logstore"
+
+    def open(self, **kwargs):
+        storage = get_storage("logstore", cache_dir=self._tmp.name, compact_interval=0, **kwargs)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_round_trip_and_overwrite(self):
+        storage = self.open()
+        storage.save("k", {"score": 80})
+        storage.save("k", {"score": 90})
+
+        self.assertEqual(storage.load("k"), {"score": 90})
+        self.assertTrue(storage.exists("k"))
+        self.assertTrue(storage.delete("k"))
+        self.assertFalse(storage.delete("k"))
+        self.assertIsNone(storage.load("k"))
+
+    def test_index_rebuilt_from_hints(self):
+        storage = self.open(max_segment_bytes=200)
+        for i in range(20):
+            storage.save(f"k{i}", "x" * 50)
+        storage.save("k0", "new")
+        storage.delete("k1")
+        storage.close()
+
+        self.assertTrue(list(self.directory.glob("*.hint")))
+        reopened = self.open()
+        self.assertEqual(reopened.load("k0"), "new")
+        self.assertIsNone(reopened.load("k1"))
+        self.assertEqual(reopened.load("k19"), "x" * 50)
+
+    def test_torn_tail_after_crash(self):
+        storage = self.open()
+        storage.save("a", 1)
+        storage.save("b", 2)
+        storage.close()
+        # Lost hint and a half-written record, as after a crash
+        for hint in self.directory.glob("*.hint"):
+            hint.unlink()
+        segment = sorted(self.directory.glob("*.log"))[-1]
+        with open(segment, 'ab') as f:
+            f.write(b"\x00" * 7)
+
+        reopened = self.open()
+        self.assertEqual((reopened.load("a"), reopened.load("b")), (1, 2))
+        reopened.save("c", 3)
+        self.assertEqual(reopened.load("c"), 3)
+
+    def test_compaction_drops_dead_entries(self):
+        storage = self.open(max_segment_bytes=300)
+        for round_ in range(5):
+            for i in range(10):
+                storage.save(f"k{i}", f"{round_}-{i}" * 10)
+        storage.delete("k9")
+        with patch("src.plugins.storage.log_storage.time.time", return_value=1000.0):
+            storage.save("short", "x", ttl=10)
+        size_before = sum(p.stat().st_size for p in self.directory.glob("*.log"))
+
+        with patch("src.plugins.storage.log_storage.time.time", return_value=2000.0):
+            self.assertGreater(storage.compact(force=True), 0)
+        self.assertFalse(storage.exists("short"))
+
+        size_after = sum(p.stat().st_size for p in self.directory.glob("*.log"))
+        self.assertLess(size_after, size_before / 2)
+        self.assertEqual(storage.load("k3"), "4-3" * 10)
+        self.assertIsNone(storage.load("k9"))
+        storage.close()
+
+        reopened = self.open()
+        self.assertEqual(reopened.load("k0"), "4-0" * 10)
+        self.assertIsNone(reopened.load("k9"))
+        self.assertIsNone(reopened.load("short"))
+
+    def test_concurrent_writes_and_compaction(self):
+        storage = self.open(max_segment_bytes=1000)
+
+        def write(n):
+            for i in range(200):
+                storage.save(f"{n}:{i % 20}", i)
+                storage.load(f"{n}:{i % 20}")
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            storage.compact(force=True)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([storage.load(f"{n}:19") for n in range(4)], [199] * 4)
+
+    def test_cleanup_expired(self):
+        storage = self.open()
+        with patch("src.plugins.storage.log_storage.time.time", return_value=1000.0):
+            storage.save("short", 1, ttl=10)
+            storage.save("long", 2, ttl=100)
+        with patch("src.plugins.storage.log_storage.time.time", return_value=1050.0):
+            self.assertEqual(storage.cleanup_expired(), 1)
+            self.assertEqual(storage.load("long"), 2)
+
+    @unittest.skipUnless(HAS_FCNTL, "directory lock needs fcntl")
+    def test_single_process_per_directory(self):
+        self.open()
+        with self.assertRaises(StorageError):
+            LogStorage(cache_dir=self._tmp.name, compact_interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.plugins.storage.memory_cache import MemoryCache, approximate_size
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_size=3)
+        for key in "abc":
+            cache.save(key, key)
+        cache.load("a")  # "b" is now the least recently used
+        cache.save("d", "d")
+
+        self.assertIsNone(cache.load("b"))
+        self.assertEqual([cache.load(k) for k in "acd"], ["a", "c", "d"])
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_byte_budget(self):
+        report = {"report": "x" * 10_000, "score": 80}
+        size = approximate_size(report)
+        cache = MemoryCache(max_size=1000, max_bytes=int(size * 3.5))
+        for i in range(5):
+            cache.save(f"r{i}", {**report, "id": i})
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["total_items"], 3)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+        self.assertEqual(cache.load("r4")["id"], 4)
+        self.assertIsNone(cache.load("r0"))
+        # Larger than the whole budget: not stored
+        self.assertFalse(cache.save("huge", "x" * size * 4))
+
+    def test_overwrite_keeps_byte_count(self):
+        cache = MemoryCache()
+        cache.save("k", "x" * 1000)
+        cache.save("k", "y")
+        cache.delete("k")
+        self.assertEqual(cache.get_stats()["bytes"], 0)
+
+    def test_expired_read_does_not_deadlock(self):
+        cache = MemoryCache()
+        with patch("src.plugins.storage.memory_cache.time.monotonic", return_value=100.0):
+            cache.save("k", 1, ttl=10)
+        with patch("src.plugins.storage.memory_cache.time.monotonic", return_value=111.0):
+            result = []
+            reader = threading.Thread(target=lambda: result.append((cache.load("k"), cache.exists("k"))))
+            reader.start()
+            reader.join(timeout=5)
+
+        self.assertFalse(reader.is_alive())
+        self.assertEqual(result, [(None, False)])
+        stats = cache.get_stats()
+        self.assertEqual((stats["misses"], stats["expirations"]), (1, 1))
+
+    def test_periodic_sweep(self):
+        cache = MemoryCache(sweep_interval=60)
+        with patch("src.plugins.storage.memory_cache.time.monotonic", return_value=1000.0):
+            cache._last_sweep = 1000.0
+            for i in range(10):
+                cache.save(f"k{i}", i, ttl=5)
+        with patch("src.plugins.storage.memory_cache.time.monotonic", return_value=1061.0):
+            cache.save("fresh", 1)
+
+        self.assertEqual(cache.get_stats()["total_items"], 1)
+        self.assertEqual(cache.get_stats()["expirations"], 10)
+
+    def test_hit_stats(self):
+        cache = MemoryCache()
+        cache.save("k", 1)
+        cache.load("k")
+        cache.load("k")
+        cache.load("missing")
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
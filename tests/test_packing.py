@@ -0,0 +1,105 @@
+import asyncio
+import json
+import re
+import unittest
+
+from tests.helpers import FakeProvider, make_engine
+
+JD = "Senior Java engineer with Spring Boot and Kafka"
+
+
+class PackingProvider(FakeProvider):
+    """Answers packed prompts with one entry per candidate (optionally breaking some)."""
+
+    def __init__(self, broken=()):
+        super().__init__(tokens_used=90)
+        self.broken = set(broken)
+        self.packed_calls = 0
+        self.single_calls = 0
+
+    def answer(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        count = len(re.findall(r"=== CANDIDATE \d+ ===", prompt))
+        if not count:
+            self.single_calls += 1
+            return json.dumps({"score": 50, "status": "Unsuitable", "reason": "single"})
+
+        self.packed_calls += 1
+        entries = []
+        for n in range(1, count + 1):
+            if n in self.broken:
+                entries.append({"candidate": n, "score": "high"})
+            else:
+                entries.append({"candidate": n, "score": 60 + n, "status": "Suitable", "reason": f"c{n}"})
+        return "```json\n" + json.dumps(entries) + "\n```"
+
+
+def packing_engine(provider, **packing):
+    return make_engine(provider, packing={"enabled": True, "max_items": 3, **packing})
+
+
+class TestPacking(unittest.TestCase):
+    def test_resumes_share_requests(self):
+        provider = PackingProvider()
+        engine = packing_engine(provider)
+        resumes = [f"Java developer number {i}" for i in range(5)]
+
+        results = engine.batch_evaluate_match(resumes, JD)
+
+        self.assertEqual(provider.packed_calls, 2)  # 3 + 2
+        self.assertEqual(provider.single_calls, 0)
+        self.assertEqual([r["score"] for r in results], [61, 62, 63, 61, 62])
+        self.assertTrue(all(r["_metadata"]["packed"] for r in results))
+        self.assertEqual(results[0]["_metadata"]["pack_size"], 3)
+
+    def test_invalid_entries_fall_back_to_single_calls(self):
+        provider = PackingProvider(broken={2})
+        engine = packing_engine(provider)
+
+        results = engine.batch_evaluate_match(["resume a", "resume b", "resume c"], JD)
+
+        self.assertEqual(provider.packed_calls, 1)
+        self.assertEqual(provider.single_calls, 1)
+        self.assertEqual([r["score"] for r in results], [61, 50, 63])
+        self.assertEqual(engine.get_metrics()["packing.fallbacks"], 1)
+
+    def test_packed_results_are_cached_per_resume(self):
+        provider = PackingProvider()
+        engine = packing_engine(provider)
+        engine.batch_evaluate_match(["resume a", "resume b"], JD)
+
+        single = engine.evaluate_match("resume b", JD)
+
+        self.assertEqual(single["score"], 62)
+        self.assertEqual(provider.single_calls, 0)
+
+    def test_long_resumes_are_not_packed(self):
+        provider = PackingProvider()
+        engine = packing_engine(provider, max_resume_tokens=50)
+
+        engine.batch_evaluate_match(["short one", "x " * 400, "short two"], JD)
+
+        self.assertEqual(provider.packed_calls, 1)
+        self.assertEqual(provider.single_calls, 1)
+
+    def test_pack_size_limited_by_output_allowance(self):
+        engine = packing_engine(PackingProvider(), max_items=8, output_tokens_per_item=600)
+        model = engine._config.get_model_config(engine._current_provider)
+        model.max_tokens = 1200
+
+        tasks = [engine._match_task(f"resume {i}", JD, False, None, {}) for i in range(5)]
+        self.assertEqual(engine._plan_packs(tasks, list(range(5))), [[0, 1], [2, 3], [4]])
+
+    def test_async_packing(self):
+        provider = PackingProvider(broken={1})
+        engine = packing_engine(provider)
+
+        results = asyncio.run(engine.abatch_evaluate_match(["a1", "a2", "a3", "a4"], JD))
+
+        self.assertEqual([r["score"] for r in results], [50, 62, 63, 50])
+        self.assertEqual(provider.packed_calls, 1)
+        self.assertEqual(provider.single_calls, 2)  # Broken entry + the 4th resume alone
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from src.core.prefilter import lexical_prefilter, tokenize
+from tests.helpers import FakeProvider, make_engine
+
+JD = "Senior Java engineer: Spring Boot, Kafka, microservices, 分布式系统设计"
+RESUMES = [
+    "Python data scientist, pandas and scikit-learn",
+    "Java engineer, 5 years Spring Boot and Kafka microservices, 分布式系统",
+    "Line cook, 厨师, 烹饪经验",
+    "Java developer with Spring experience",
+]
+
+
+class TestTokenize(unittest.TestCase):
+    def test_mixed_language_terms(self):
+        self.assertEqual(
+            tokenize("熟悉Java和C++开发, the Node.js"),
+            ["熟悉", "java", "和", "c++", "开发", "node.js"]
+        )
+
+
+class TestLexicalPrefilter(unittest.TestCase):
+    def test_ranks_relevant_resumes_first(self):
+        matches = lexical_prefilter(RESUMES, JD, top_k=2)
+
+        self.assertEqual([m.index for m in matches], [0, 1, 2, 3])
+        self.assertEqual(matches[1].rank, 1)
+        self.assertEqual(matches[3].rank, 2)
+        self.assertEqual([m.selected for m in matches], [False, True, False, True])
+        self.assertEqual(matches[2].score, 0)
+
+    def test_relative_score_threshold(self):
+        matches = lexical_prefilter(RESUMES, JD, top_k=0, min_relative_score=0.5)
+        self.assertEqual([m.index for m in matches if m.selected], [1])
+
+    def test_always_keeps_best_candidate(self):
+        matches = lexical_prefilter(["nothing relevant"], JD, top_k=0, min_relative_score=1.0)
+        self.assertTrue(matches[0].selected)
+
+
+class TestEnginePrefilter(unittest.TestCase):
+    def make_engine(self):
+        return make_engine(FakeProvider('{"score": 81, "status": "Suitable"}'))
+
+    def test_only_top_candidates_reach_the_llm(self):
+        engine = self.make_engine()
+
+        results = engine.batch_evaluate_match(RESUMES, JD, prefilter=True, top_k=2)
+
+        self.assertEqual(engine._llm_provider.calls, 2)
+        self.assertEqual([r["status"] for r in results], ["Prefiltered", "Suitable", "Prefiltered", "Suitable"])
+        self.assertTrue(all("lexical_score" in r for r in results))
+        self.assertEqual(engine.get_metrics()["prefilter.skipped"], 2)
+
+    def test_small_batches_skip_prefilter_by_default(self):
+        engine = self.make_engine()
+        engine._prefilter.enabled = True
+
+        results = engine.batch_evaluate_match(RESUMES, JD)
+
+        self.assertEqual(engine._llm_provider.calls, 4)
+        self.assertTrue(all("lexical_score" not in r for r in results))
+
+    def test_async_batch_prefilter(self):
+        engine = self.make_engine()
+
+        results = asyncio.run(engine.abatch_evaluate_match(RESUMES, JD, prefilter=True, top_k=1))
+
+        self.assertEqual(engine._llm_provider.calls, 1)
+        self.assertEqual(results[1]["score"], 81)
+        self.assertEqual(sum(1 for r in results if r.get("status") == "Prefiltered"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.interfaces.illm_provider import LLMResponse
+from src.plugins.llm_providers.anthropic import AnthropicProvider
+from src.plugins.llm_providers.openai import OpenAIProvider
+from tests.helpers import make_engine
+
+
+class TestPromptLayout(unittest.TestCase):
+    def test_analysis_prefix_is_stable_across_resumes(self):
+        engine = make_engine()
+        a = engine._analyze_task("resume A", "JD text", "hrbp", False, {}).messages
+        b = engine._analyze_task("resume B", "JD text", "hrbp", False, {}).messages
+
+        self.assertEqual(a[:-1], b[:-1])
+        self.assertEqual(a[-1]["role"], "user")
+        self.assertIn("resume A", a[-1]["content"])
+        self.assertNotIn("resume A", "".join(m["content"] for m in a[:-1]))
+        self.assertIn("JD text", a[-2]["content"])
+
+    def test_match_prefix_is_stable_across_resumes(self):
+        engine = make_engine()
+        a = engine._match_task("resume A", "JD text", False, None, {}).messages
+        b = engine._match_task("resume B", "JD text", False, None, {}).messages
+        self.assertEqual(a[:-1], b[:-1])
+
+
+class TestProviderPromptCaching(unittest.TestCase):
+    def test_anthropic_marks_system_blocks_for_caching(self):
+        with patch('src.plugins.llm_providers.anthropic.Anthropic'), \
+                patch('src.plugins.llm_providers.anthropic.AsyncAnthropic'):
+            provider = AnthropicProvider(api_key="fake-key")
+
+        system, user_messages = provider._split_messages([
+            {"role": "system", "content": "instructions"},
+            {"role": "system", "content": "TARGET JD"},
+            {"role": "user", "content": "resume"},
+        ])
+
+        self.assertEqual([b["text"] for b in system], ["instructions", "TARGET JD"])
+        self.assertTrue(all(b["cache_control"] == {"type": "ephemeral"} for b in system))
+        self.assertEqual(user_messages, [{"role": "user", "content": "resume"}])
+
+    def test_anthropic_reports_cache_reads(self):
+        with patch('src.plugins.llm_providers.anthropic.Anthropic'), \
+                patch('src.plugins.llm_providers.anthropic.AsyncAnthropic'):
+            provider = AnthropicProvider(api_key="fake-key")
+
+        response = MagicMock()
+        response.content = [MagicMock(text="ok")]
+        response.usage = MagicMock(
+            input_tokens=10, output_tokens=5,
+            cache_read_input_tokens=900, cache_creation_input_tokens=0
+        )
+        result = provider._build_response(response, "claude", 0)
+
+        self.assertEqual(result.cached_tokens, 900)
+        self.assertEqual(result.tokens_used, 915)
+
+    def test_openai_reports_cached_prompt_tokens(self):
+        with patch('src.plugins.llm_providers.openai.OpenAI'), \
+                patch('src.plugins.llm_providers.openai.AsyncOpenAI'):
+            provider = OpenAIProvider(api_key="fake-key")
+
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "ok"
+        response.usage.total_tokens = 1200
+        response.usage.prompt_tokens_details.cached_tokens = 1024
+
+        self.assertEqual(provider._build_response(response, "gpt-4o", 0).cached_tokens, 1024)
+
+    def test_engine_surfaces_cached_tokens(self):
+        engine = make_engine()
+        engine._llm_provider = MagicMock()
+        engine._llm_provider.chat.return_value = LLMResponse(
+            content="Score: 70", model="m", tokens_used=100, latency_ms=1, cached_tokens=64
+        )
+
+        result = engine.analyze("resume", "jd", use_cache=False)
+        self.assertEqual(result.metadata["cached_prompt_tokens"], 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
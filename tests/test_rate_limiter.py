@@ -0,0 +1,79 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.core.config import LLMProviderConfig
+from src.core.deadline import deadline_scope
+from src.core.exceptions import DeadlineExceededError
+from src.core.rate_limiter import RateLimiter, get_rate_limiter, retry_after_from_error
+from src.core.tokens import estimate_tokens
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_requests_bucket_allows_burst_then_waits(self):
+        limiter = RateLimiter(requests_per_minute=60)
+        waits = [limiter.reserve() for _ in range(61)]
+
+        self.assertTrue(all(w == 0 for w in waits[:60]))
+        self.assertAlmostEqual(waits[60], 1.0, delta=0.05)
+
+    def test_tokens_bucket_charges_estimate_and_reconciles(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        self.assertEqual(limiter.reserve(500), 0)
+
+        # Actual usage was higher than estimated: the debt delays the next caller
+        limiter.record_usage(500, 700)
+        self.assertAlmostEqual(limiter.reserve(10), 11.0, delta=0.1)
+
+    def test_pause_blocks_whole_bucket(self):
+        limiter = RateLimiter(requests_per_minute=1000)
+        limiter.pause(2)
+        self.assertAlmostEqual(limiter.reserve(), 2.0, delta=0.05)
+        self.assertAlmostEqual(limiter.reserve(), 2.0, delta=0.05)
+
+    def test_async_acquire_waits(self):
+        limiter = RateLimiter(requests_per_minute=600)  # 10/s after the burst
+        for _ in range(600):
+            limiter.reserve()
+
+        start = time.time()
+        asyncio.run(limiter.aacquire())
+        self.assertGreaterEqual(time.time() - start, 0.08)
+
+    def test_wait_past_deadline_fails_and_refunds(self):
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600)
+        limiter.reserve(600)  # Tokens exhausted: the next 100 need 10s
+
+        start = time.time()
+        with deadline_scope(1):
+            with self.assertRaises(DeadlineExceededError) as ctx:
+                limiter.acquire(100)
+            with self.assertRaises(DeadlineExceededError):
+                asyncio.run(limiter.aacquire(100))
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(ctx.exception.stage, "rate_limit")
+        # The failed reservations were given back
+        self.assertAlmostEqual(limiter.reserve(100), 10.0, delta=0.1)
+
+    def test_registry_shares_limiter_per_provider(self):
+        config = LLMProviderConfig(provider="shared-test", requests_per_minute=10)
+        self.assertIs(get_rate_limiter("shared-test", config), get_rate_limiter("shared-test", config))
+        self.assertIsNone(get_rate_limiter("unlimited", LLMProviderConfig(provider="unlimited")))
+
+    def test_retry_after_from_headers(self):
+        error = Exception("429")
+        error.response = MagicMock(headers={"retry-after": "7"})
+        self.assertEqual(retry_after_from_error(error), 7.0)
+        self.assertIsNone(retry_after_from_error(Exception("no response")))
+
+
+class TestTokenEstimate(unittest.TestCase):
+    def test_cjk_counts_per_character(self):
+        self.assertEqual(estimate_tokens("你好世界"), 4)
+        self.assertEqual(estimate_tokens("abcdefgh"), 2)
+        self.assertEqual(estimate_tokens(""), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import unittest
+from pathlib import Path
+
+from src.core.resume_profile import ResumeProfile, split_sections
+from tests.helpers import FakeProvider, make_engine
+
+RESUME = (Path(__file__).parent / "fixtures" / "resumes" / "Resume_Senior_Java_Backend_Engineer.txt").read_text(
+    encoding="utf-8"
+)
+JDS = [
+    "Senior Java engineer with Spring Boot and Kafka",
+    "Backend lead for payment systems, Java and microservices",
+    "Platform engineer: Kubernetes, observability, Java",
+]
+FIELDS = {
+    "name": "Zhang Wei",
+    "current_position": "Senior Backend Engineer",
+    "current_company": "TechFuture Inc.",
+    "years_of_experience": 8,
+    "skills": ["Java", "Spring Boot", "Kafka"],
+    "education": [{"school": "Zhejiang University", "degree": "Master"}],
+    "experience": [{"company": "TechFuture Inc.", "title": "Senior Backend Engineer"}]
+}
+
+
+class ProfileProvider(FakeProvider):
+    """Answers extraction with FIELDS and matches with a score; records prompts."""
+
+    def __init__(self, extraction=None):
+        super().__init__(content='{"score": 80, "status": "Suitable"}')
+        self.extraction = json.dumps(FIELDS) if extraction is None else extraction
+        self.prompts = []
+
+    def answer(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        return self.extraction if prompt.startswith("Resume Content:") else self.content
+
+
+def profile_engine(provider, **profile):
+    return make_engine(provider, resume_profile={"enabled": True, **profile})
+
+
+class TestSplitSections(unittest.TestCase):
+    def test_fixture_sections(self):
+        sections = split_sections(RESUME)
+        self.assertEqual(list(sections), ["header", "summary", "experience", "education", "skills"])
+        self.assertIn("Zhang Wei", sections["header"])
+        self.assertTrue(sections["summary"].startswith("A results-driven"))
+
+    def test_chinese_headings(self):
+        sections = split_sections("张三\n## 工作经历\n阿里巴巴 Java工程师\n项目经历：\n交易系统重构\n教育背景\n浙江大学")
+        self.assertEqual(sections["experience"], "阿里巴巴 Java工程师")
+        self.assertEqual(sections["projects"], "交易系统重构")
+        self.assertEqual(sections["education"], "浙江大学")
+
+
+class TestResumeProfile(unittest.TestCase):
+    def test_render(self):
+        profile = ResumeProfile("d", FIELDS, split_sections(RESUME))
+        text = profile.render(["summary", "experience"], max_section_chars=200)
+
+        self.assertIn("Skills: Java, Spring Boot, Kafka", text)
+        self.assertIn("- school: Zhejiang University; degree: Master", text)
+        self.assertIn("## Summary", text)
+        self.assertNotIn("## Skills", text)
+        self.assertIn("[...]", text)
+        self.assertNotIn("zhangwei.fake@email.com", text)
+        self.assertLess(len(text), len(RESUME))
+
+    def test_failed_extraction_is_not_usable(self):
+        self.assertFalse(ResumeProfile("d", {"raw_content": "x", "error": "Failed to parse JSON"}, {}).usable)
+
+
+class TestEngineResumeProfile(unittest.TestCase):
+    def test_resume_understood_once_for_many_jds(self):
+        provider = ProfileProvider()
+        engine = profile_engine(provider)
+
+        for jd in JDS:
+            self.assertEqual(engine.evaluate_match(RESUME, jd)["score"], 80)
+
+        extractions = [p for p in provider.prompts if p.startswith("Resume Content:")]
+        self.assertEqual(len(extractions), 1)
+        self.assertEqual(len(provider.prompts), 1 + len(JDS))
+        for prompt in provider.prompts[1:]:
+            self.assertIn("CANDIDATE PROFILE", prompt)
+            self.assertNotIn("zhangwei.fake@email.com", prompt)
+        metrics = engine.get_metrics()
+        self.assertEqual(metrics["resume_profile.used"], len(JDS))
+        self.assertGreater(metrics["resume_profile.tokens_saved"], 0)
+
+    def test_per_call_override(self):
+        provider = ProfileProvider()
+        engine = profile_engine(provider, enabled=False)
+
+        engine.evaluate_match(RESUME, JDS[0])
+        engine.analyze(RESUME, JDS[0], use_profile=True)
+
+        self.assertIn("zhangwei.fake@email.com", provider.prompts[0])
+        self.assertIn("CANDIDATE PROFILE", provider.prompts[-1])
+
+    def test_uncached_calls_skip_the_default_profile(self):
+        provider = ProfileProvider()
+        engine = profile_engine(provider)
+
+        engine.evaluate_match(RESUME, JDS[0], use_cache=False)
+        engine.evaluate_match(RESUME, JDS[1], use_cache=False)
+
+        self.assertEqual(len(provider.prompts), 2)
+        self.assertFalse(any(p.startswith("Resume Content:") for p in provider.prompts))
+        self.assertIn("zhangwei.fake@email.com", provider.prompts[-1])
+
+    def test_failed_extraction_falls_back_to_raw_text(self):
+        provider = ProfileProvider(extraction="not json")
+        engine = profile_engine(provider)
+        engine._structured = {"enabled": True, "reask": False}
+
+        engine.diagnose_resume(RESUME)
+
+        self.assertIn("zhangwei.fake@email.com", provider.prompts[-1])
+        self.assertEqual(engine.get_metrics()["resume_profile.fallbacks"], 1)
+
+    def test_async_and_packed_batch(self):
+        provider = ProfileProvider()
+        engine = profile_engine(provider)
+
+        results = asyncio.run(engine.abatch_evaluate_match([RESUME], JDS[0], pack=True))
+        profile = asyncio.run(engine.aget_resume_profile(RESUME))
+
+        self.assertEqual(results[0]["score"], 80)
+        self.assertEqual(profile.fields["name"], "Zhang Wei")
+        self.assertEqual(len([p for p in provider.prompts if p.startswith("Resume Content:")]), 1)
+        self.assertIn("CANDIDATE PROFILE", provider.prompts[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import random
+import unittest
+
+from src.core.exceptions import (
+    AnalysisError,
+    CircuitOpenError,
+    ConfigurationError,
+    LLMAPIError,
+    LLMAuthenticationError,
+    LLMRateLimitError,
+)
+from src.core.retry import (
+    DecorrelatedJitterPolicy,
+    ErrorClass,
+    ExponentialBackoffPolicy,
+    RetryConfig,
+    RetryState,
+    classify_error,
+    get_retry_policy,
+)
+from tests.helpers import FakeProvider, make_retrying_engine
+
+
+class TestClassifyError(unittest.TestCase):
+    def test_classes(self):
+        self.assertEqual(classify_error(LLMRateLimitError("slow down")), ErrorClass.RATE_LIMITED)
+        self.assertEqual(classify_error(LLMAuthenticationError("bad key")), ErrorClass.FATAL)
+        self.assertEqual(classify_error(CircuitOpenError("open")), ErrorClass.FATAL)
+        self.assertEqual(classify_error(LLMAPIError("bad request", status_code=400)), ErrorClass.FATAL)
+        self.assertEqual(classify_error(LLMAPIError("timeout", status_code=408)), ErrorClass.RETRYABLE)
+        self.assertEqual(classify_error(LLMAPIError("overloaded", status_code=529)), ErrorClass.RETRYABLE)
+        self.assertEqual(classify_error(LLMAPIError("no status")), ErrorClass.RETRYABLE)
+        self.assertEqual(classify_error(ConnectionError("reset")), ErrorClass.RETRYABLE)
+        self.assertEqual(classify_error(TypeError("bug")), ErrorClass.FATAL)
+
+
+class TestPolicies(unittest.TestCase):
+    def test_decorrelated_jitter_bounds(self):
+        policy = DecorrelatedJitterPolicy(RetryConfig(base_delay=1, max_delay=20), rng=random.Random(7))
+        state = RetryState(None)
+        delays = []
+        for attempt in range(30):
+            delay = policy.backoff(attempt, state)
+            self.assertGreaterEqual(delay, 1)
+            self.assertLessEqual(delay, min(20, max(1, (state.last_delay or 1) * 3)))
+            state.last_delay = delay
+            delays.append(delay)
+        self.assertEqual(max(delays), 20)  # Reaches the cap
+        self.assertGreater(len(set(delays)), 5)  # Not a fixed schedule
+
+    def test_exponential(self):
+        policy = ExponentialBackoffPolicy(RetryConfig(base_delay=1, max_delay=5))
+        self.assertEqual([policy.backoff(a, None) for a in range(4)], [1, 2, 4, 5])
+
+    def test_deadline(self):
+        now = [100.0]
+        policy = get_retry_policy({"deadline_seconds": 30}, clock=lambda: now[0])
+        state = policy.start()
+        now[0] = 120.0
+        self.assertEqual(state.remaining(), 10.0)
+        self.assertIsNone(get_retry_policy({}).start().remaining())
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ConfigurationError):
+            get_retry_policy({"policy": "forever"})
+
+
+class TestEngineRetry(unittest.TestCase):
+    def test_transient_errors_are_retried(self):
+        provider = FakeProvider(errors=[LLMAPIError("503", status_code=503), ConnectionError("reset")])
+        engine = make_retrying_engine(provider)
+
+        result = engine.analyze("resume", "jd", use_cache=False)
+
+        self.assertEqual(result.score, 75)
+        self.assertEqual(provider.calls, 3)
+        metrics = engine.get_metrics()
+        self.assertEqual(metrics["retry.attempts"], 2)
+        self.assertGreater(metrics["retry.backoff_ms"], 0)
+
+    def test_fatal_errors_are_not_retried(self):
+        for error in (LLMAuthenticationError("bad key"), LLMAPIError("bad request", status_code=400)):
+            provider = FakeProvider(errors=[error])
+            engine = make_retrying_engine(provider)
+
+            with self.assertRaises(AnalysisError):
+                engine.analyze("resume", "jd", use_cache=False)
+            self.assertEqual(provider.calls, 1)
+            self.assertEqual(engine.get_metrics()["retry.fatal"], 1)
+
+    def test_attempts_exhausted(self):
+        provider = FakeProvider(errors=[LLMAPIError("503", status_code=503)] * 5)
+        engine = make_retrying_engine(provider, max_retries=2)
+
+        with self.assertRaises(AnalysisError):
+            engine.analyze("resume", "jd", use_cache=False)
+        self.assertEqual(provider.calls, 2)
+        self.assertEqual(engine.get_metrics()["retry.exhausted"], 1)
+
+    def test_deadline_budget_stops_retries(self):
+        provider = FakeProvider(errors=[LLMAPIError("503", status_code=503)] * 5)
+        engine = make_retrying_engine(provider, max_retries=5, base_delay=5, max_delay=5, deadline_seconds=1)
+
+        with self.assertRaises(AnalysisError):
+            engine.analyze("resume", "jd", use_cache=False)
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(engine.get_metrics()["retry.deadline_exceeded"], 1)
+
+    def test_retry_after_is_honored(self):
+        provider = FakeProvider(errors=[LLMRateLimitError("429", retry_after=0.02)])
+        engine = make_retrying_engine(provider)
+
+        engine.analyze("resume", "jd", use_cache=False)
+
+        self.assertEqual(provider.calls, 2)
+        self.assertAlmostEqual(engine.get_metrics()["retry.backoff_ms"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
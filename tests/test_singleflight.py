@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from src.core.deadline import deadline_scope
+from src.core.exceptions import DeadlineExceededError
+from src.core.singleflight import SingleFlight
+from tests.helpers import FakeProvider, make_engine
+
+
+class SlowProvider(FakeProvider):
+    """Takes 0.1s per call, sync or async."""
+
+    def __init__(self):
+        super().__init__(content='{"score": 66}', tokens_used=5)
+
+    def chat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        time.sleep(0.1)
+        return self.respond(messages)
+
+    async def achat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        await asyncio.sleep(0.1)
+        return self.respond(messages)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_threads_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(5)
+        results = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        def caller():
+            barrier.wait()
+            results.append(flight.do("key", work))
+
+        threads = [threading.Thread(target=caller) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_leader_exception_reaches_followers(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.05)
+            raise ValueError("boom")
+
+        async def run():
+            return await asyncio.gather(
+                flight.ado("k", fail), flight.ado("k", fail), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_cancelled_leader_hands_off_to_follower(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "value"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.ado("k", work))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(flight.ado("k", work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(run()), ("value", False))
+        self.assertEqual(len(calls), 2)
+
+    def test_leader_deadline_is_not_shared(self):
+        flight = SingleFlight()
+        results = []
+
+        def work():
+            time.sleep(0.05)
+            return "value"
+
+        def leader():
+            try:
+                flight.do("k", self._expire)
+            except DeadlineExceededError as e:
+                results.append(e)
+
+        def follower():
+            time.sleep(0.01)
+            results.append(flight.do("k", work))
+
+        threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertIn(("value", False), results)
+        self.assertTrue(any(isinstance(r, DeadlineExceededError) for r in results))
+
+    def test_follower_waits_no_longer_than_its_deadline(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.3)
+            return "value"
+
+        leader = threading.Thread(target=flight.do, args=("k", slow))
+        leader.start()
+        started.wait()
+        began = time.monotonic()
+        with deadline_scope(0.05):
+            with self.assertRaises(DeadlineExceededError):
+                flight.do("k", slow)
+        self.assertLess(time.monotonic() - began, 0.2)
+        leader.join()
+
+    @staticmethod
+    def _expire():
+        time.sleep(0.05)
+        raise DeadlineExceededError("Request deadline exceeded", stage="llm")
+
+    def test_engine_coalesces_identical_analyses(self):
+        provider = SlowProvider()
+        engine = make_engine(provider)
+
+        async def run():
+            return await asyncio.gather(*[
+                engine.aevaluate_match("same resume", "same job description") for _ in range(3)
+            ])
+
+        results = asyncio.run(run())
+        self.assertEqual(provider.calls, 1)
+        coalesced = [r.get("_metadata", {}).get("coalesced", False) for r in results]
+        self.assertEqual(coalesced.count(True), 2)
+        self.assertTrue(all(r["score"] == 66 for r in results))
+
+    def test_engine_coalesces_sync_threads(self):
+        provider = SlowProvider()
+        engine = make_engine(provider)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(engine.analyze("r", "jd")))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(sum(1 for r in results if r.metadata.get("coalesced")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
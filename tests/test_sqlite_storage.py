@@ -0,0 +1,82 @@
+import multiprocessing
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.plugins.storage import get_storage
+from src.plugins.storage.sqlite_storage import SQLiteStorage
+
+
+def _write_many(db_path, worker, count):
+    storage = SQLiteStorage(db_path=db_path)
+    for i in range(count):
+        storage.save(f"{worker}:{i}", {"worker": worker, "i": i})
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.storage = get_storage("sqlite", cache_dir=self._tmp.name)
+        self.addCleanup(self.storage.close)
+
+    def test_round_trip(self):
+        self.storage.save("k", {"score": 80, "tags": ["java"]})
+
+        self.assertEqual(self.storage.load("k"), {"score": 80, "tags": ["java"]})
+        self.assertTrue(self.storage.exists("k"))
+        self.assertIsNone(self.storage.load("missing"))
+        self.assertTrue(self.storage.delete("k"))
+        self.assertFalse(self.storage.delete("k"))
+        self.assertTrue((Path(self._tmp.name) / "cache.sqlite3").exists())
+
+    def test_wal_and_expiry_index(self):
+        conn = sqlite3.connect(str(Path(self._tmp.name) / "cache.sqlite3"))
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = " ".join(str(row) for row in conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM cache WHERE expires_at <= 0"
+        ))
+        self.assertIn("idx_cache_expires_at", plan)
+
+    def test_expired_entries_hidden_then_purged(self):
+        with patch("src.plugins.storage.sqlite_storage.time.time", return_value=1000.0):
+            self.storage.save("old", 1, ttl=10)
+            self.storage.save("forever", 2)
+        with patch("src.plugins.storage.sqlite_storage.time.time", return_value=1011.0):
+            self.assertIsNone(self.storage.load("old"))
+            self.assertFalse(self.storage.exists("old"))
+            self.assertEqual(self.storage.cleanup_expired(), 1)
+        self.assertEqual(self.storage.load("forever"), 2)
+
+    def test_threads_share_the_database(self):
+        threads = [
+            threading.Thread(target=lambda n=n: [self.storage.save(f"{n}:{i}", i) for i in range(50)])
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.storage.load("3:49"), 49)
+
+    def test_processes_share_the_database(self):
+        db_path = str(Path(self._tmp.name) / "cache.sqlite3")
+        processes = [multiprocessing.Process(target=_write_many, args=(db_path, n, 100)) for n in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual([p.exitcode for p in processes], [0, 0, 0])
+        self.assertEqual(self.storage.load("2:99"), {"worker": 2, "i": 99})
+        conn = sqlite3.connect(db_path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0], 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from types import SimpleNamespace
+
+from src.core.json_repair import extract_json, repair_json
+from src.core.schemas import MATCH_SCHEMA, validate
+from src.interfaces.illm_provider import LLMResponse
+from src.plugins.llm_providers.anthropic import AnthropicProvider
+from src.plugins.llm_providers.openai import OpenAIProvider
+from tests.helpers import FakeProvider, make_engine
+
+JD = "Senior Java engineer with Spring Boot and Kafka"
+GOOD = '{"score": 77, "status": "Suitable", "reason": "ok"}'
+
+
+class ScriptedProvider(FakeProvider):
+    """Returns the scripted replies in order and records every call."""
+
+    def __init__(self, *replies):
+        super().__init__()
+        self.replies = list(replies)
+        self.calls = []
+
+    def chat(self, messages, model=None, temperature=0.7, max_tokens=4096, **kwargs):
+        self.calls.append({"messages": messages, **kwargs})
+        return LLMResponse(content=self.replies.pop(0), model="fake-model", tokens_used=10, latency_ms=1)
+
+
+def structured_engine(provider, **structured):
+    return make_engine(provider, structured_output={"enabled": True, "reask": True, **structured})
+
+
+class TestJsonRepair(unittest.TestCase):
+    def test_fences_prose_and_trailing_commas(self):
+        text = 'Sure! ```json\n{"score": 80, "strengths": ["a", "b",],}\n``` Hope it helps.'
+        self.assertEqual(extract_json(text), {"score": 80, "strengths": ["a", "b"]})
+
+    def test_truncated_output_drops_incomplete_member(self):
+        self.assertEqual(
+            extract_json('{"score": 80, "status": "Suitable", "reason": "熟悉Ja'),
+            {"score": 80, "status": "Suitable"}
+        )
+        self.assertEqual(extract_json('{"score": 80, "missing": ["k8s"'), {"score": 80, "missing": ["k8s"]})
+
+    def test_truncation_is_reported(self):
+        self.assertEqual(repair_json('{"score": 85, "status": "Suit'), ({"score": 85}, True))
+        self.assertEqual(repair_json('{"score": 85}'), ({"score": 85}, False))
+
+    def test_unrecoverable(self):
+        self.assertIsNone(extract_json("I cannot evaluate this resume."))
+
+
+class TestValidate(unittest.TestCase):
+    def test_errors(self):
+        errors = validate({"score": 140, "strengths": ["a", 3]}, MATCH_SCHEMA)
+        self.assertEqual(errors, ["$.score: above 100", "$.strengths[1]: expected string"])
+        self.assertEqual(validate({"score": "high"}, MATCH_SCHEMA), ["$.score: expected number"])
+        self.assertEqual(validate({"score": 50}, MATCH_SCHEMA), [])
+
+
+class TestEngineStructuredOutput(unittest.TestCase):
+    def test_schema_sent_to_provider(self):
+        provider = ScriptedProvider(GOOD)
+        structured_engine(provider).evaluate_match("resume", JD)
+        self.assertIs(provider.calls[0]["response_schema"], MATCH_SCHEMA)
+
+    def test_schema_not_sent_when_disabled(self):
+        provider = ScriptedProvider(GOOD)
+        structured_engine(provider, enabled=False).evaluate_match("resume", JD)
+        self.assertNotIn("response_schema", provider.calls[0])
+
+    def test_repairable_reply_needs_no_reask(self):
+        provider = ScriptedProvider('```json\n{"score": 77, "status": "Suitable",}\n```')
+        engine = structured_engine(provider)
+
+        result = engine.evaluate_match("resume", JD)
+
+        self.assertEqual(result["score"], 77)
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(engine.get_metrics()["structured.repaired"], 1)
+
+    def test_single_reask_with_errors(self):
+        provider = ScriptedProvider('{"score": "high"}', GOOD)
+        engine = structured_engine(provider)
+
+        result = engine.evaluate_match("resume", JD)
+
+        self.assertEqual(result["score"], 77)
+        followup = provider.calls[1]["messages"]
+        self.assertEqual(followup[-2], {"role": "assistant", "content": '{"score": "high"}'})
+        self.assertIn("$.score: expected number", followup[-1]["content"])
+        # Good result is cached
+        self.assertEqual(engine.evaluate_match("resume", JD)["score"], 77)
+        self.assertEqual(len(provider.calls), 2)
+
+    def test_malformed_result_is_not_cached(self):
+        provider = ScriptedProvider("no json", "still no json", GOOD)
+        engine = structured_engine(provider)
+
+        first = engine.evaluate_match("resume", JD)
+        second = engine.evaluate_match("resume", JD)
+
+        self.assertEqual(first["status"], "Error")
+        self.assertEqual(second["score"], 77)
+        self.assertEqual(engine.get_metrics()["structured.failures"], 1)
+
+    def test_truncated_reply_is_reasked_and_not_cached(self):
+        truncated = '{"name": "Zhang", "education": [{"school": "Zhejiang Univ'
+        provider = ScriptedProvider(truncated, truncated, '{"name": "Zhang", "skills": ["Java"]}')
+        engine = structured_engine(provider)
+
+        engine.extract_resume_fields("resume")
+        self.assertIn("reply was truncated", provider.calls[1]["messages"][-1]["content"])
+
+        self.assertEqual(engine.extract_resume_fields("resume")["skills"], ["Java"])
+        self.assertEqual(len(provider.calls), 3)
+
+    def test_reask_can_be_disabled(self):
+        provider = ScriptedProvider("no json")
+        engine = structured_engine(provider, reask=False)
+
+        self.assertIn("error", engine.extract_resume_fields("resume"))
+        self.assertEqual(len(provider.calls), 1)
+
+
+class TestProviderStructuredParams(unittest.TestCase):
+    def test_openai_json_schema(self):
+        params = OpenAIProvider._structured_params(MATCH_SCHEMA)
+        self.assertEqual(params["response_format"]["type"], "json_schema")
+        self.assertEqual(params["response_format"]["json_schema"]["name"], "match_result")
+        self.assertEqual(OpenAIProvider._structured_params(None), {})
+
+    def test_anthropic_forced_tool(self):
+        params = AnthropicProvider._structured_params(MATCH_SCHEMA)
+        self.assertEqual(params["tool_choice"], {"type": "tool", "name": "match_result"})
+        self.assertIs(params["tools"][0]["input_schema"], MATCH_SCHEMA)
+
+        response = SimpleNamespace(content=[SimpleNamespace(type="tool_use", input={"score": 5})])
+        self.assertEqual(AnthropicProvider._response_text(response), '{"score": 5}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.core.config import ConfigManager
+from src.core.engine import TalentOSEngine
+from src.core.exceptions import ConfigurationError
+from src.plugins.storage import get_storage
+from src.plugins.storage.local_storage import LocalStorage
+from src.plugins.storage.tiered_storage import TieredStorage
+
+
+class TestTieredStorage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def open(self, **kwargs) -> TieredStorage:
+        storage = get_storage("tiered", cache_dir=self._tmp.name, **kwargs)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_survives_restart_and_promotes(self):
+        self.open().save("k", {"score": 80})
+
+        restarted = self.open()
+        with patch.object(LocalStorage, "load", autospec=True, side_effect=LocalStorage.load) as l2_load:
+            self.assertEqual(restarted.load("k"), {"score": 80})
+            self.assertEqual(restarted.load("k"), {"score": 80})
+
+        self.assertEqual(l2_load.call_count, 1)
+        stats = restarted.get_stats()
+        self.assertEqual((stats["l1"]["hits"], stats["l1"]["misses"]), (1, 1))
+        self.assertEqual((stats["l2"]["hits"], stats["l2"]["misses"]), (1, 0))
+
+    def test_promotion_stops_at_l2_expiry(self):
+        writer = self.open()
+        writer.save("short", 1, ttl=2)
+        writer.save("forever", 2)
+
+        storage = self.open(promote_ttl=300)
+        with patch.object(storage._l1, "save", wraps=storage._l1.save) as l1_save:
+            storage.load("short")
+            storage.load("forever")
+        ttls = {c.args[0]: c.kwargs["ttl"] for c in l1_save.call_args_list}
+        self.assertLessEqual(ttls["short"], 2)
+        self.assertEqual(ttls["forever"], 300)
+
+    def test_misses_are_remembered_briefly(self):
+        storage = self.open(negative_ttl=5)
+        with patch.object(LocalStorage, "load", autospec=True, return_value=None) as l2_load:
+            self.assertIsNone(storage.load("missing"))
+            self.assertIsNone(storage.load("missing"))
+            self.assertFalse(storage.exists("missing"))
+        self.assertEqual(l2_load.call_count, 1)
+        self.assertEqual(storage.get_stats()["l1"]["negative_hits"], 1)
+
+        # A save replaces the remembered miss
+        storage.save("missing", 1)
+        self.assertEqual(storage.load("missing"), 1)
+
+    def test_write_behind(self):
+        storage = self.open(write_policy="behind")
+        for i in range(20):
+            storage.save(f"k{i}", i)
+        self.assertEqual(storage.load("k19"), 19)
+
+        storage.flush()
+        self.assertEqual(storage.get_stats()["l2"]["pending_writes"], 0)
+        self.assertEqual(LocalStorage(cache_dir=self._tmp.name).load("k7"), 7)
+        self.assertTrue(storage.delete("k7"))
+        self.assertFalse(storage.exists("k7"))
+
+    def test_engine_close_flushes_write_behind(self):
+        config = ConfigManager().config
+        config.cache_dir = self._tmp.name
+        config.storage.backend = "tiered"
+        config.storage.options = {"write_policy": "behind"}
+        engine = TalentOSEngine(config=config)
+
+        with patch.object(LocalStorage, "save", autospec=True, side_effect=LocalStorage.save) as l2_save:
+            engine._storage.save("k", {"score": 80})
+            engine.close()
+        self.assertEqual(l2_save.call_count, 1)
+        self.assertEqual(LocalStorage(cache_dir=self._tmp.name).load("k"), {"score": 80})
+
+    def test_rejects_memory_l2(self):
+        with self.assertRaises(ConfigurationError):
+            TieredStorage(cache_dir=self._tmp.name, l2="memory")
+
+    def test_engine_passes_storage_options(self):
+        config = ConfigManager().config
+        config.cache_dir = self._tmp.name
+        config.storage.backend = "tiered"
+        config.storage.options = {"l2": "sqlite", "l1_options": {"max_size": 10}}
+
+        engine = TalentOSEngine(config=config)
+
+        self.assertIsInstance(engine._storage, TieredStorage)
+        self.assertEqual(engine._storage.get_stats()["l2"]["backend"], "sqlite")
+
+
+if __name__ == '__main__':
+    unittest.main()
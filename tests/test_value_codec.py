@@ -0,0 +1,125 @@
+import pickle
+import random
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from src.interfaces.istorage import StorageItem
+from src.plugins.storage.local_storage import LocalStorage
+from src.plugins.storage.sqlite_storage import SQLiteStorage
+from src.plugins.storage.value_codec import HAS_ZSTD, ValueCodec
+
+SKILLS = ["Java", "Spring Boot", "Kafka", "Redis", "MySQL", "Kubernetes", "React", "Python", "微服务", "分布式"]
+
+
+def match_result(rng: random.Random, i: int) -> dict:
+    """A cached evaluate_match-style result with the usual boilerplate."""
+    score = rng.randint(40, 95)
+    return {
+        "id": f"cand_{i}",
+        "score": score,
+        "status": "Suitable" if score > 70 else "Not Suitable",
+        "dimensions": {k: rng.randint(40, 95) for k in ("skills", "experience", "education", "soft_skills")},
+        "strengths": [f"具备{rng.choice(SKILLS)}的实战经验，能够独立负责核心模块的设计与开发" for _ in range(3)],
+        "weaknesses": [f"缺少{rng.choice(SKILLS)}相关的大规模生产环境经验，建议在面试中重点考察" for _ in range(2)],
+        "report": "## 综合评估\n\n### 核心优势\n- " + "\n- ".join(
+            f"{rng.choice(SKILLS)}: 熟练掌握，有{rng.randint(2, 8)}年项目经验" for _ in range(4)
+        ) + "\n\n### 面试建议\n请重点考察系统设计能力与团队协作经验。"
+    }
+
+
+def encoded_ratio(codec: ValueCodec, values) -> float:
+    raw = sum(len(pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)) for v in values)
+    return raw / sum(len(codec.encode(v)) for v in values)
+
+
+class TestValueCodec(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        rng = random.Random(7)
+        self.values = [match_result(rng, i) for i in range(300)]
+
+    def test_round_trip_per_codec(self):
+        for compression in ["zlib", "none"] + (["zstd"] if HAS_ZSTD else []):
+            codec = ValueCodec(compression)
+            self.assertEqual(codec.decode(codec.encode(self.values[0])), self.values[0])
+
+    def test_legacy_pickles_and_other_codecs_stay_readable(self):
+        legacy = pickle.dumps(self.values[0])
+        zlib_entry = ValueCodec("zlib").encode(self.values[1])
+
+        codec = ValueCodec("auto")
+        self.assertEqual(codec.decode(legacy), self.values[0])
+        self.assertEqual(codec.decode(zlib_entry), self.values[1])
+
+    @unittest.skipUnless(HAS_ZSTD, "zstandard not installed")
+    def test_trained_dictionary(self):
+        codec = ValueCodec("zstd", dictionary_dir=self._tmp.name, train_after=200)
+        plain = encoded_ratio(ValueCodec("zstd"), self.values[200:])
+        for value in self.values[:200]:
+            codec.encode(value)
+        codec._trainer.join()
+
+        self.assertTrue(codec.dictionary_id)
+        trained = encoded_ratio(codec, self.values[200:])
+        self.assertGreater(trained, 5)
+        self.assertGreater(trained, plain * 2)
+        # Another process finds the dictionary on disk
+        entry = codec.encode(self.values[-1])
+        self.assertEqual(ValueCodec("zstd", dictionary_dir=self._tmp.name).decode(entry), self.values[-1])
+
+    @unittest.skipUnless(HAS_ZSTD, "zstandard not installed")
+    def test_training_does_not_block_saves(self):
+        codec = ValueCodec("zstd", dictionary_dir=self._tmp.name, train_after=50)
+        release = threading.Event()
+        real_train = codec.train
+        with patch.object(codec, "train", side_effect=lambda samples: release.wait(5) and real_train(samples)):
+            for value in self.values[:60]:
+                codec.encode(value)
+            self.assertEqual(codec.dictionary_id, 0)  # Saves went on while training waits
+            release.set()
+            codec._trainer.join()
+        self.assertTrue(codec.dictionary_id)
+
+
+class TestStorageCompression(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_local_storage_reads_uncompressed_files(self):
+        storage = LocalStorage(cache_dir=self._tmp.name)
+        item = StorageItem(key="old", value={"score": 80}, created_at=datetime.now())
+        with open(storage._get_file_path("old"), 'wb') as f:
+            pickle.dump(item, f)
+        storage.save("new", {"report": "## 综合评估\n" * 100})
+
+        self.assertEqual(storage.load("old"), {"score": 80})
+        self.assertEqual(storage.load("new"), {"report": "## 综合评估\n" * 100})
+        self.assertLess(storage._get_file_path("new").stat().st_size, len("## 综合评估\n".encode() * 100))
+
+    @unittest.skipUnless(HAS_ZSTD, "zstandard not installed")
+    def test_train_from_existing_entries(self):
+        rng = random.Random(3)
+        storage = SQLiteStorage(cache_dir=self._tmp.name, compression="zstd")
+        self.addCleanup(storage.close)
+        conn = sqlite3.connect(str(Path(self._tmp.name) / "cache.sqlite3"))
+        self.addCleanup(conn.close)
+        for i in range(100):
+            # Rows written before compression existed
+            conn.execute("INSERT INTO cache VALUES (?, ?, NULL)", (f"k{i}", pickle.dumps(match_result(rng, i))))
+        conn.commit()
+
+        self.assertTrue(storage.train_dictionary())
+        storage.save("fresh", match_result(rng, 100))
+        self.assertEqual(storage.load("k5")["id"], "cand_5")
+        self.assertEqual(storage.load("fresh")["id"], "cand_100")
+
+
+if __name__ == '__main__':
+    unittest.main()